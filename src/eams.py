@@ -1,19 +1,20 @@
 import sys
+import bisect
 import logging
-from collections import Counter
 from collections import namedtuple
 from configobj import ConfigObj, ConfigObjError, flatten_errors
 from copy import deepcopy
 from datetime import datetime
 from validate import Validator, ValidateError
 
+from eams_cache import ProblemCache
 from eams_error import EAMS_Error
 from eams_meeting import Meeting
 from eams_meeting_config import MeetingConfig
 from eams_outdoor_temp import OutdoorTemperature
 from eams_room_config import RoomConfig
 from eams_room_thermal_config import RoomThermalCfg
-from eams_timeslot import TimeSlot
+from eams_timegrid import TimeGrid
 
 
 class EAMS():
@@ -21,6 +22,11 @@ class EAMS():
 
         self.err = EAMS_Error()        
         self.PROBLEM_CONFIG_SPEC = 'Data/ConfigSpecs/eams_prob_spec.cfg'
+        self.USE_CACHE = 1                  # load parsed problem instance from (or save it to) CACHE_DIR
+        self.CACHE_DIR = 'Cache/'
+        self.MEETING_ORDER = None           # meeting keys, order of ML instead of the shuffled one, e.g. of a resumed LNS run
+        self.RELATEDNESS_ATTENDEE_WEIGHT = 1.0  # relatedness score per shared conflict attendee of two meeting types, see MTR
+        self.RELATEDNESS_ROOM_WEIGHT = 1.0      # relatedness score of two meeting types with identical feasible rooms, see MTR
         
         if enableLog:
 #           # activate log
@@ -43,6 +49,11 @@ class EAMS():
         # Room list. Eg: ['Room1', 'Room3', 'Room2']
         #=======================================================================
         
+        self.TG = None
+        #=======================================================================
+        # TimeGrid of the scheduling period: slot list & timestamps, day boundaries, working hour & HVAC standard hour masks
+        #=======================================================================
+        
         self.TS = None
         #=======================================================================
         #  Idx -> datetime. Eg: {0: datetime.datetime(2013, 1, 1, 8, 0), 1: datetime.datetime(2013, 1, 1, 8, 30), 2: datetime.datetime(2013, 1, 1, 9, 0), 3: datetime.datetime(2013, 1, 1, 9, 30), 4: datetime.datetime(2013, 1, 1, 10, 0),
@@ -54,6 +65,11 @@ class EAMS():
         # [Meeting_Desc(Key='M110133', TimeWindows=[[datetime.datetime(2013, 1, 1, 9, 0), datetime.datetime(2013, 1, 1, 10, 30)], [datetime.datetime(2013, 1, 1, 12, 0), datetime.datetime(2013, 1, 1, 14, 0)], [datetime.datetime(2013, 1, 2, 14, 0), datetime.datetime(2013, 1, 2, 16, 0)]], Duration='3', Room='', Attendees=['1119', '2578', '3470', '4601', '6823', '7105', '7908', '12736', '12996', '20479']), Meeting_Desc(Key='M316335', TimeWindows=[[datetime.datetime(2013, 1, 1, 9, 0), datetime.datetime(2013, 1, 1, 18, 0)]], Duration='7', Room='', Attendees=['219', '246', '2852', '3304', '4095', '6845', '8495', '8811', '8927', '15695']), Meeting_Desc(Key='M325401', TimeWindows=[[datetime.datetime(2013, 1, 1, 9, 0), datetime.datetime(2013, 1, 1, 18, 0)]], Duration='7', Room='', Attendees=['264', '2165', '2528', '2890', '3167', '4273', '5258', '5363', '10719', '20204']), Meeting_Desc(Key='M433676', TimeWindows=[[datetime.datetime(2013, 1, 1, 9, 0), datetime.datetime(2013, 1, 1, 18, 0)]], Duration='7', Room='', Attendees=['413', '1104', '2192', '2674', '3201', '6866', '13958', '13998', '14601', '14607'])]
         #=======================================================================
                 
+        self.ML_FILE = None
+        #=======================================================================
+        # Meetings in the order of the meeting configuration file, i.e. ML before shuffle. Saved in problem cache
+        #=======================================================================
+                
         self.CALS = {}
         #=======================================================================
         # List of Conflicting Meetings follow the sequence of self.ML
@@ -76,23 +92,42 @@ class EAMS():
         # Meeting_Type(MTW=(162, 177), MA=15, MD=None, MCA=[], MLS=[0, 5, 7])
         #=======================================================================
         
+        self.MTK = {}
+        #=======================================================================   
+        # Meeting type index. Key: (MTW, MA, frozenset of MCA), Value: offset in self.MTYPE
+        # {((66, 81), 15, frozenset([])): 4, ((162, 177), 15, frozenset([])): 5}
+        #=======================================================================
+        
         self.CMT = {}
         #=======================================================================   
         # List of Conflicting Meeting Type because of an attendee
         # Key: Attendee ID, Value: Follow offset of Meeting Type in self.MTYPE
         # {'1068': [1, 2], '6153': [0, 1, 2], '2425': [0, 1], '895': [0, 1]}
         #=======================================================================
+        
+        self.MTR = {}
+        #=======================================================================   
+        # Relatedness of meeting types, based on shared conflict attendees (CMT) and shared feasible rooms (MR) in overlapping time windows
+        # Key: offset in self.MTYPE, Value: list of [score, offset in self.MTYPE] of related meeting types, most related first
+        # {0: [[2.5, 1], [1.0, 2]], 1: [[2.5, 0], [2.0, 2]], 2: [[2.0, 1], [1.0, 0]]}
+        #=======================================================================
        
         self.OAT = None
         #=======================================================================
         # Sorted outdoor temperature. Eg: OrderedDict([(datetime.datetime(2013, 1, 1, 8, 0), '26.00'), (datetime.datetime(2013, 1, 1, 8, 30), '26.00'), (datetime.datetime(2013, 1, 1, 9, 0), '28.00')
         #=======================================================================
         
+        self.OATV = None
+        #=======================================================================
+        # A list follow the sequence of OAT. Outdoor temperature as float, NaN if the record is missing
+        # Eg: [26.0, 26.0, 28.0]
+        #=======================================================================
+        
         self.SH = None
         #=======================================================================
-        # A list follow the sequence of TS
+        # A list follow the sequence of TS. 1 if HVAC is in standard operating hour, 0 otherwise
         #=======================================================================
-                
+        
         self.MTW = None
         #=======================================================================
         # A Double array follow the sequence of self.ML
@@ -109,6 +144,25 @@ class EAMS():
         #
         #=======================================================================
         
+        self.MFS = None
+        #=======================================================================
+        # A Double array follow the sequence of self.ML, one 0/1 mask per meeting follow the sequence of TS
+        # 1 if the meeting can start at slot k (between earliest-start-time and latest-start-time)
+        #  [
+        #    [0, 0, 1, 1, 0, ...], 
+        #    [0, 1, 1, 1, 1, ...] 
+        #  ]
+        #=======================================================================
+        
+        self.MKS = None
+        #=======================================================================
+        # A Double array follow the sequence of self.ML, one list per slot k follow the sequence of TS
+        # List of feasible start slots kp of the meeting which is still on-going at slot k
+        #  [
+        #    [[], [], [2], [2, 3], [3], [], ...], 
+        #  ]
+        #=======================================================================
+        
         self.MOM = None
         #=======================================================================
         # A Double array follow the sequence of self.ML with list of meetings which has similar attendee(s)
@@ -119,6 +173,16 @@ class EAMS():
         #  ]
         #=======================================================================
         
+        self.AM = None
+        #=======================================================================
+        # Attendee -> sorted list of meetings (offset of self.ML) attended. Eg: {'6153': [1, 2, 3], '1068': [2, 3], '2425': [1, 2]}
+        #=======================================================================
+        
+        self.MAS = None
+        #=======================================================================
+        # A list follow the sequence of self.ML with set of attendees of each meeting
+        #=======================================================================
+        
         self.MODE_CONFIG = ""
         self.STANDBY_MODE = ""
         self.MEETINGS_CONFIG_DATA = ""      
@@ -129,6 +193,7 @@ class EAMS():
         self.SCHEDULING_INTERVAL = -1
         self.DAILY_WORKING_HOUR_START = ""    
         self.DAILY_WORKING_HOUR_END = ""
+        self.MEETING_TYPE_ATTENDEE_GROUP = []
         self.HVAC_NON_PEAK_OFF = -1
         self.HVAC_SHUT_DOWN = ""
         self.HVAC_TURN_ON = ""    
@@ -213,6 +278,7 @@ class EAMS():
         self.SCHEDULING_INTERVAL = int(config['SCHEDULING_INTERVAL'])
         self.DAILY_WORKING_HOUR_START = config['DAILY_WORKING_HOUR_START']
         self.DAILY_WORKING_HOUR_END = config['DAILY_WORKING_HOUR_END']         
+        self.MEETING_TYPE_ATTENDEE_GROUP = sorted([int(x) for x in config['MEETING_TYPE_ATTENDEE_GROUP']])
         self.HVAC_NON_PEAK_OFF = config['HVAC_NON_PEAK_OFF']
         self.HVAC_SHUT_DOWN = config['HVAC_SHUT_DOWN']
         self.HVAC_TURN_ON = config['HVAC_TURN_ON'] 
@@ -299,7 +365,10 @@ class EAMS():
 
     def _populateOutdoorTemperature(self):
         self.OTC = OutdoorTemperature()
-        ret = self.OTC.loadOutdoorTemperature(self.OUTDOOR_TEMP_DATA)    
+        store_dir = None
+        if self.USE_CACHE:
+            store_dir = self.CACHE_DIR
+        ret = self.OTC.loadOutdoorTemperature(self.OUTDOOR_TEMP_DATA, store_dir)    
         if ret == 0:
             # Populate outdoor temperature
             # option 1:
@@ -341,6 +410,7 @@ class EAMS():
             if ret < 0:
                 return ret
                 
+            self.ML_FILE = list(self.M.mlist)
             self.ML = self.M.getMeetingsList() 
             logging.debug("Total number of meetings: %d" %(len(self.ML)))
             logging.debug(self.ML)
@@ -349,59 +419,81 @@ class EAMS():
     
     def _populateSchedulingTimeSlot(self):
         """Form timeslot based on given work week and time slot interval"""
-        self.TSC = TimeSlot(self.SCHEDULING_START_DATETIME, self.SCHEDULING_END_DATETIME, (int)(self.SCHEDULING_INTERVAL))
-        self.TS = self.TSC.getTimeSlots()
+        self.TG = TimeGrid(self.SCHEDULING_START_DATETIME, self.SCHEDULING_END_DATETIME, (int)(self.SCHEDULING_INTERVAL))
+        self.TS = self.TG.getTimeSlots()
         logging.debug("Timeslot: %s" %self.TS) 
         logging.debug("Total number of timeslot: %d" %len(self.TS))
             
     def _populateHVACStdTimeslot(self):
         """Populate binary indicator list which denotes if the timeslot is in standard operating hour of HVAC (i.e. always on) """  
-        self.SH = []
-        if self.HVAC_NON_PEAK_OFF ==  '1':
-            s = datetime.strptime(self.HVAC_SHUT_DOWN, "%H:%M")
-            e = datetime.strptime(self.HVAC_TURN_ON, "%H:%M")
-         
-            for _, v in self.TS.iteritems():
-                if (v.time() >= s.time() or v.time() < e.time()):
-                    self.SH.append(0)  #off HVAC
-                else:
-                    self.SH.append(1)
-        else:
-            for _, v in self.TS.iteritems():
-                self.SH.append(1)
+        self.SH = self.TG.getHVACStdHourMask(self.HVAC_NON_PEAK_OFF, self.HVAC_SHUT_DOWN, self.HVAC_TURN_ON).tolist()
                 
         logging.debug("HVAC Standard Hours:\n%s" %(self.SH))
                 
+    def _getMeetingTimeWindows(self, md):
+        """Slot index of time windows [Start_Time, End_Time] of meeting md"""
+        mtw = []
+        for j in xrange(len(md.TimeWindows)):
+            s = md.TimeWindows[j][0]
+            e = md.TimeWindows[j][1]
+            sidx = self.TG.getTimeSlotIdxByDatetime(s)
+            eidx = self.TG.getTimeSlotIdxByDatetime(e)        
+
+            if sidx is None:
+                logging.error("Meeting request falls outside of timeslot range. HALT.")
+                return [self.err.eams_meeting_out_of_timeslot_range(), None]
+            if eidx is None:
+                logging.error("Meeting ends outside of timeslot range. ")
+                return [self.err.eams_meeting_out_of_timeslot_range(), None]
+            
+            logging.debug("Meeting %s start at %s [slot %d], deadline at %s[slot %d], duration of %s slot(s)" %(md.Key, s, sidx, e, eidx-1, md.Duration))
+            
+#             logging.debug("sidx=%s eidx=%s d=%d" %(sidx, eidx-1, int(md.Duration)))
+            if (eidx - sidx) < int(md.Duration):
+                logging.error("Meeting duration longer than Earliest-Start-Time to Latest-Finished-Time timeslot. HALT.")
+                return [self.err.eams_meeting_invalid_duration(), None]
+            
+            mtw.append([sidx, eidx-1]) #Note: Meeting end at the slot before 'End' time, hence -1
+        return [0, mtw]
+                
     def _populateMeetingRequestTimeslot(self):       
         """Populate slot index of meetings' time windows """         
         self.MTW = []
         for i in xrange(len(self.ML)):
-            self.MTW.append([])
-            for j in xrange(len(self.ML[i].TimeWindows)):
-                s = self.ML[i].TimeWindows[j][0]
-                e = self.ML[i].TimeWindows[j][1]
-                sidx = self.TSC.getTimeSlotIdxByDatetime(s)
-                eidx = self.TSC.getTimeSlotIdxByDatetime(e)        
-
-                if sidx is None:
-                    logging.error("Meeting request falls outside of timeslot range. HALT.")
-                    return self.err.eams_meeting_out_of_timeslot_range()  
-                if eidx is None:
-                    logging.error("Meeting ends outside of timeslot range. ")
-                    return self.err.eams_meeting_out_of_timeslot_range()
-                
-                logging.debug("Meeting %s start at %s [slot %d], deadline at %s[slot %d], duration of %s slot(s)" %(self.ML[i].Key, s, sidx, e, eidx-1, self.ML[i].Duration))
-                
-#                 logging.debug("sidx=%s eidx=%s d=%d" %(sidx, eidx-1, int(self.ML[i].Duration)))
-                if (eidx - sidx) < int(self.ML[i].Duration):
-                    logging.error("Meeting duration longer than Earliest-Start-Time to Latest-Finished-Time timeslot. HALT.")
-                    return self.err.eams_meeting_invalid_duration()
-                
-                self.MTW[i].append([sidx, eidx-1]) #Note: Meeting end at the slot before 'End' time, hence -1
+            [ret, mtw] = self._getMeetingTimeWindows(self.ML[i])
+            if ret < 0:
+                return ret
+            self.MTW.append(mtw)
         
         logging.debug("Meetings' time windows:")
         logging.debug(self.MTW)                    
         return 0
+    
+    def _getFeasibleRoomsOfMeeting(self, md):
+        """Rooms which have the capacity to accommodate meeting md"""
+        mr = []
+        a = len(md.Attendees)
+        
+        if not md.Room:  # no preferred room            
+            for j in xrange(len(self.RCL)):
+                if a <= self.RCL[j]:
+                    mr.append(j)
+                    
+            if not mr:
+                logging.error("No feasible room for meeting [%s]" %md.Key) 
+                return [self.err.eams_meeting_no_feasible_room(), None]
+        else: # has preferred room
+            if md.Room not in self.RL:
+                logging.critical("Mode Config: %s. Preferred room [%s] for meeting [%s] does not exist in room list." %(self.MODE_CONFIG, md.Room, md.Key))
+                return [self.err.eams_config_meeting_err(), None]
+            
+            ridx = self.RL.index(md.Room)
+            if a > self.RCL[ridx]:
+                logging.critical("Mode Config: %s. Preferred room [%s] for meeting [%s] has smaller capacity (only for %d people) than the number of attendee." %(self.MODE_CONFIG, md.Room, md.Key, self.RCL[ridx]))
+                return [self.err.eams_config_meeting_err(), None]
+            
+            mr.append(ridx)  # limit feasible room to preferred room
+        return [0, mr]
         
     def _populateFeasibleRoomsForMeeting(self):
         """Does location l has the capacity to accommodate meeting midx? """   
@@ -410,56 +502,92 @@ class EAMS():
         
         self.MR = []
         for i in xrange(len(self.ML)):
-            self.MR.append([])
-            
-            a = len(self.ML[i].Attendees)
-            
-            if not self.ML[i].Room:  # no preferred room            
-                for j in xrange(len(self.RCL)):
-                    if a <= self.RCL[j]:
-                        self.MR[i].append(j)
-                        
-                if not self.MR[i]:
-                    logging.error("No feasible room for meeting [%d]" %i) 
-                    return self.err.eams_meeting_no_feasible_room()
-            else: # has preferred room
-                if self.ML[i].Room not in self.RL:
-                    logging.critical("Mode Config: %s. Preferred room [%s] for meeting [%s] does not exist in room list." %(self.MODE_CONFIG, self.ML[i].Room, self.ML[i].Key))
-                    return self.err.eams_config_meeting_err()
-                
-                ridx = self.RL.index(self.ML[i].Room)
-                if len(self.ML[i].Attendees) > self.RCL[ridx]:
-                    logging.critical("Mode Config: %s. Preferred room [%s] for meeting [%s] has smaller capacity (only for %d people) than the number of attendee." %(self.MODE_CONFIG, self.ML[i].Room, self.ML[i].Key, self.RCL[ridx]))
-                    return self.err.eams_config_meeting_err()
-                
-                self.MR[i].append(ridx)  # limit feasible room to preferred room
+            [ret, mr] = self._getFeasibleRoomsOfMeeting(self.ML[i])
+            if ret < 0:
+                return ret
+            self.MR.append(mr)
                 
         logging.debug("Feasible rooms based on meetings' attendees and room capacity:")
         logging.debug(self.MR)    
         return 0
             
     
+    def _getFeasibleStartTimeOfMeeting(self, midx):
+        """Start mask and start slots covering every slot k of meeting midx"""
+        
+        mask = [0] * len(self.TS)
+        cover = []
+        for k in xrange(len(self.TS)):
+            cover.append([])
+        
+        d = self.ML[midx].Duration
+        for i in xrange(len(self.MTW[midx])):
+            tw = self.MTW[midx][i]
+            for kp in xrange(tw[0], tw[1]-d+2):
+                if mask[kp]:
+                    continue    # overlapping time windows
+                mask[kp] = 1
+                for k in xrange(kp, kp+d):
+                    cover[k].append(kp)
+        
+        return [mask, cover]
+    
+    def _populateFeasibleStartTime(self):
+        """Precompute feasible start slots of meetings, see isInTimeWindows() and getFeasibleStartTime()"""
+        
+        self.MFS = []
+        self.MKS = []
+        for i in xrange(len(self.ML)):
+            [mask, cover] = self._getFeasibleStartTimeOfMeeting(i)
+            self.MFS.append(mask)
+            self.MKS.append(cover)
+            
+        logging.debug("Meetings' feasible start time:")
+        logging.debug(self.MFS)
+        
+    def _populateAttendeeMeetingIndex(self):
+        """Inverted index of attendee to meetings, used to find meetings with similar attendee(s)"""
+        
+        self.AM = {}
+        self.MAS = []
+        for m in xrange(len(self.ML)):
+            self.MAS.append(set(self.ML[m].Attendees))
+            for aid in self.MAS[m]:
+                if aid in self.AM:
+                    self.AM.get(aid).append(m)
+                else:
+                    self.AM[aid] = [m]
+        
+        logging.debug("Attendee to meetings index: %s" %self.AM)
+        
+    def _getMeetingsWithSimilarAttendees(self, mx):
+        """Sorted list of meetings (after mx) which share at least an attendee with meeting mx"""
+        
+        oms = set()
+        for aid in self.MAS[mx]:
+            ls = self.AM[aid]
+            # ls is sorted, skip everything up to and including mx
+            for i in xrange(len(ls)-1, -1, -1):
+                if ls[i] <= mx:
+                    break
+                oms.add(ls[i])
+        return sorted(oms)
+    
     def _populateMeetingsWithSimilarAttendees(self):
         """Does meeting m has similar attendee(s) as meeting om"""
         
         self.MOM = []        
         for mx in xrange(len(self.ML)):
-            self.MOM.append([])
-            # TODO: use set.intersection instead! See _populateMeetingConflicts()
-            mx_multiset = Counter(self.ML[mx].Attendees)
-            for my in xrange(mx+1, len(self.ML)):
-#                 logging.debug("checking m[%d, %d]" %(mx, my))
-                my_multiset = Counter(self.ML[my].Attendees)
-                if (list((mx_multiset & my_multiset).elements())):
-                    logging.debug("Meeting %d and %d have similar attendees" %(mx,my))    
-                    self.MOM[mx].append(my)
+            self.MOM.append(self._getMeetingsWithSimilarAttendees(mx))
+            if self.MOM[mx]:
+                logging.debug("Meeting %d has similar attendees with %s" %(mx, self.MOM[mx]))
         
         logging.debug("Meetings which has similar attendee(s)") 
         logging.debug(self.MOM)
         
     def _populateRoomThermalCfg(self):
         """Populate individual room config to be used by Gurobi"""        
-        self.RTC = RoomThermalCfg(self.Z, self.TS, 
+        self.RTC = RoomThermalCfg(self.Z, self.RL, self.TG, self.SCHEDULING_INTERVAL,
                                   self.SOLAR_RADIATION_AM_START,
                                   self.SOLAR_RADIATION_NOON_START,
                                   self.SOLAR_RADIATION_PM_START,
@@ -470,18 +598,18 @@ class EAMS():
          
         self.CALS = {}
         for mx in xrange(len(self.ML)):
-            for my in xrange(mx+1, len(self.ML)):  
-                oa = set(self.ML[mx].Attendees) & set(self.ML[my].Attendees)
-                if oa:
-                    if mx in self.CALS.keys():
-                        self.CALS.get(mx).update({my:list(oa)})
-                    else:
-                        self.CALS[mx]={my:list(oa)}
-                        
-                    if my in self.CALS.keys():
-                        self.CALS.get(my).update({mx:list(oa)})
-                    else:
-                        self.CALS[my]={mx:list(oa)}
+            # Only visit meetings sharing attendee(s) with mx, see _populateAttendeeMeetingIndex()
+            for my in self.MOM[mx]:  
+                oa = self.MAS[mx] & self.MAS[my]
+                if mx in self.CALS:
+                    self.CALS.get(mx).update({my:list(oa)})
+                else:
+                    self.CALS[mx]={my:list(oa)}
+                    
+                if my in self.CALS:
+                    self.CALS.get(my).update({mx:list(oa)})
+                else:
+                    self.CALS[my]={mx:list(oa)}
 
 #                 for k, v in self.CALS.iteritems():
 #                     print k, ": ", v
@@ -532,6 +660,44 @@ class EAMS():
     def _getConflictMeetings(self, m):
         return self.CALS[m].keys()
 
+    def _getAttendeeGroup(self, numa):
+        """Smallest attendee group which can hold numa attendees. The last group takes the rest.
+           Without groups, all meetings are in the same group 0."""
+        if not self.MEETING_TYPE_ATTENDEE_GROUP:
+            return 0
+        for g in self.MEETING_TYPE_ATTENDEE_GROUP:
+            if numa <= g:
+                return g
+        return self.MEETING_TYPE_ATTENDEE_GROUP[-1]
+    
+    def _getUniqueConflictAttendees(self, m):
+        """Unique list of attendees causing conflict to meeting m, in order of first appearance"""
+        uniq_mca = []
+        seen = set()
+        for oa in self._getConflictAttendees(m):
+            for aid in oa:
+                if aid not in seen:
+                    seen.add(aid)
+                    uniq_mca.append(aid)
+        return uniq_mca
+    
+    def _getTimeWindowKey(self, m):
+        """Tuple of MTW of meeting m. Eg: [[66, 81], [114, 129]] --> (66, 81, 114, 129)"""
+        mtw_tup = ()
+        for j in xrange(len(self.MTW[m])):
+            mtw_tup = mtw_tup + tuple(self.MTW[m][j])
+        return mtw_tup
+    
+    def _getMeetingTypeKey(self, m):
+        """Key of the meeting type of meeting m, see self.MTK"""
+        return (self._getTimeWindowKey(m), 
+                self._getAttendeeGroup(len(self.ML[m].Attendees)), 
+                frozenset(self._getUniqueConflictAttendees(m)))
+    
+    def _getMeetingTypeKeyOfType(self, t):
+        """Key of meeting type t, see self.MTK"""
+        return (self.MTYPE[t].MTW, self.MTYPE[t].MA, frozenset(self.MTYPE[t].MCA))
+    
     # TODO: move this to new file which compute meeting clique!
     # TODO: For simplicity, we do not classify meeting further based on duration and room.
     def _populateMeetingClique(self):        
@@ -541,18 +707,9 @@ class EAMS():
         logging.debug("Group based on time window... ")
         dg_mtw = {}
         for i in xrange(len(self.ML)):
-#             print "ML[", i, "]=", self.ML[i].Key
-#             print "MTW[", i, "]:", self.MTW[i]
-#             print "MOM[", i, "]:", self.MOM[i]
-#             print "MA:", len(self.ML[i].Attendees)
-#             print "MD:", self.ML[i].Duration
-#             print "MR:", self.MR[i]
- 
-            mtw_tup = ()                                # create tuple for MTW object [[66, 81], [114, 129]] --> (66, 81, 114, 129)
-            for j in xrange(len(self.MTW[i])):
-                mtw_tup = mtw_tup + tuple(self.MTW[i][j])       
+            mtw_tup = self._getTimeWindowKey(i)
 
-            if mtw_tup in dg_mtw.keys():                # use tuple as key, store index of ML which has that MTW properties 
+            if mtw_tup in dg_mtw:                       # use tuple as key, store index of ML which has that MTW properties 
                 dg_mtw.get(mtw_tup).append(i)           #  (66, 81, 114, 129): [4]  --> ML[4] has  [[66, 81], [114, 129]
             else:
                 dg_mtw[mtw_tup] = [i]                
@@ -562,25 +719,20 @@ class EAMS():
         
         # Re-group based on number of attendee
         logging.debug("\nWithin group of same time window, re-group based on number of attendee... ")
-        logging.debug("For simplicity, meetings are grouped based on 2-5, 6-15, 16-30 ppl")
+        logging.debug("Meetings are grouped based on number of attendee <= %s" %self.MEETING_TYPE_ATTENDEE_GROUP)
         for k, v in dg_mtw.iteritems():
             logging.debug("k=%s, ---v=%s" %(k,v))
-            numals = {5:[],15:[],30:[], 100:[]}  # a dict of based on number of attendee (num attendee less than 'key')            
+            numals = {}  # a dict of based on number of attendee (num attendee less than 'key')            
             for m in xrange(len(v)):
                 mid = v[m]
-                numa = len(self.ML[mid].Attendees)
-                if numa <= 5:
-                    numals.get(5).append(mid)
-                elif numa <= 15:
-                    numals.get(15).append(mid)
-                elif numa <= 30:
-                    numals.get(30).append(mid)
+                g = self._getAttendeeGroup(len(self.ML[mid].Attendees))
+                if g in numals:
+                    numals.get(g).append(mid)
                 else:
-                    numals.get(100).append(mid)
+                    numals[g] = [mid]
             
-            for nk,nv in numals.iteritems():
-                if len(nv):
-                    self.MTYPE.append(self.mtdesc(k, nk, None, None, nv))
+            for nk in sorted(numals.keys()):
+                self.MTYPE.append(self.mtdesc(k, nk, None, None, numals.get(nk)))
          
         logging.debug("%s" %(self.MTYPE))
         logging.debug("Num meeting type:%d" %len(self.MTYPE))
@@ -591,87 +743,350 @@ class EAMS():
         for i in xrange(len(self.MTYPE)):
             mls = self.MTYPE[i].MLS 
             logging.debug("Evaluating MTYPE %d: %s" %(i, mls))
-            tmp_mtype = []   
+            tmp_mtype = {}      # frozenset of conflict attendees -> offset in new_mtype
             for x in xrange(len(mls)):
-                stat = False
                 m = mls[x]
-                mca = self._getConflictAttendees(m)
-                # Get a unique list of mca
-                uniq_mca = []
-                for a in xrange(len(mca)):
-                    for b in xrange(len(mca[a])):
-                        if mca[a][b] not in uniq_mca:
-                            uniq_mca.append(mca[a][b])
+                uniq_mca = self._getUniqueConflictAttendees(m)
                 logging.debug(uniq_mca)
                 
-                for y in xrange(len(tmp_mtype)):  
-#                     print "tmp_mtype[y].MCA:", tmp_mtype[y].MCA
-#                     print "uniq_mca:", uniq_mca
-#                     print tmp_mtype[y].MCA == uniq_mca
-                    if tmp_mtype[y].MCA == uniq_mca:
-                        tmp_mtype[y].MLS.append(m)
-                        stat = True
-                        break
-                if stat == False:
-                    tmp_mtype.append(self.mtdesc(self.MTYPE[i].MTW, self.MTYPE[i].MA, None, uniq_mca, [m]))
-                
-            for j in xrange(len(tmp_mtype)):
-                new_mtype.append(tmp_mtype[j]) 
+                # Same set of conflict attendees regardless of order
+                mca_key = frozenset(uniq_mca)
+                if mca_key in tmp_mtype:
+                    new_mtype[tmp_mtype.get(mca_key)].MLS.append(m)
+                else:
+                    tmp_mtype[mca_key] = len(new_mtype)
+                    new_mtype.append(self.mtdesc(self.MTYPE[i].MTW, self.MTYPE[i].MA, None, uniq_mca, [m]))
         
         logging.info("%s" %new_mtype)   
         logging.info("Number of new MTYPE:%d" %len(new_mtype))
-#         # debug only -------------
-#         for i in xrange(len(new_mtype)):
-#             print new_mtype[i]
-#         print "Num MTYPE:" + str(len(new_mtype))
-#         # debug only -------------
         for i in xrange(len(new_mtype)):
             logging.info("MTYPE[%d]:%s" %(i, str(new_mtype[i])))
                 
         # Overwrite MTYPE
         self.MTYPE = new_mtype
         
+        self.MTK = {}
+        for i in xrange(len(self.MTYPE)):
+            self.MTK[self._getMeetingTypeKeyOfType(i)] = i
+        
         
     def _populateConflictMeetingTypesBasedOnAttendee(self):
         self.CMT = {}        
         for i in xrange(len(self.MTYPE)): 
             for j in xrange(len(self.MTYPE[i].MCA)):
                 aid = self.MTYPE[i].MCA[j]
-                if aid not in self.CMT.keys():
+                if aid not in self.CMT:
                     self.CMT[aid] = [i]
                 else:
                     self.CMT.get(aid).append(i)
                     
         logging.debug("ConflictMeetingTypes: %s" %self.CMT)
         
+    def _getMeetingTypeRooms(self, t):
+        """Union of the feasible rooms of the meetings of meeting type t"""
+        rooms = set()
+        for m in self.MTYPE[t].MLS:
+            rooms.update(self.MR[m])
+        return rooms
+        
+    def _hasOverlappingTimeWindow(self, t1, t2):
+        """Does any time window of meeting type t1 overlap with a time window of meeting type t2? See self.MTYPE MTW"""
+        w1 = self.MTYPE[t1].MTW
+        w2 = self.MTYPE[t2].MTW
+        for i in xrange(0, len(w1), 2):
+            for j in xrange(0, len(w2), 2):
+                if w1[i] <= w2[j+1] and w2[j] <= w1[i+1]:
+                    return True
+        return False
+    
+    def _getMeetingTypeRelatedness(self, types):
+        """Relatedness score of every pair of meeting types which compete for attendees or rooms, 
+           of the pairs with at least one meeting type in types: d[(t1, t2)] = score, t1 < t2
+           RELATEDNESS_ATTENDEE_WEIGHT per shared conflict attendee 
+           + RELATEDNESS_ROOM_WEIGHT x Jaccard similarity of feasible rooms if their time windows overlap"""
+        score = {}
+        for t1 in types:
+            for aid in self.MTYPE[t1].MCA:
+                for t2 in self.CMT[aid]:
+                    if t2 != t1 and (t2 not in types or t1 < t2):
+                        key = (min(t1, t2), max(t1, t2))
+                        score[key] = score.get(key, 0.0) + self.RELATEDNESS_ATTENDEE_WEIGHT
+        
+        rooms = [self._getMeetingTypeRooms(t) for t in xrange(len(self.MTYPE))]
+        for t1 in types:
+            for t2 in xrange(len(self.MTYPE)):
+                if t2 == t1 or (t2 in types and t2 < t1):
+                    continue
+                shared = len(rooms[t1] & rooms[t2])
+                if shared and self._hasOverlappingTimeWindow(t1, t2):
+                    key = (min(t1, t2), max(t1, t2))
+                    score[key] = score.get(key, 0.0) + self.RELATEDNESS_ROOM_WEIGHT * shared / len(rooms[t1] | rooms[t2])
+        return score
+    
+    def _populateMeetingTypeRelatedness(self, changed=None):
+        """Relatedness of meeting types, see self.MTR. 
+           changed: offset of MTYPE which has changed after an incremental update of meetings, only their scores are recomputed"""
+        if changed is None:
+            self.MTR = {}
+            types = set(xrange(len(self.MTYPE)))
+        else:
+            types = set(changed)
+        
+        # Drop meeting types which no longer exist, and the scores of changed ones
+        for t in self.MTR.keys():
+            if t >= len(self.MTYPE):
+                del self.MTR[t]
+        for t in xrange(len(self.MTYPE)):
+            if t in types:
+                self.MTR[t] = []
+            else:
+                self.MTR[t] = [[v, t2] for [v, t2] in self.MTR.get(t, []) if t2 not in types and t2 < len(self.MTYPE)]
+        
+        updated = set(types)
+        for (t1, t2), v in self._getMeetingTypeRelatedness(types).iteritems():
+            self.MTR[t1].append([v, t2])
+            self.MTR[t2].append([v, t1])
+            updated.update([t1, t2])
+        for t in updated:
+            self.MTR[t].sort(reverse=True)
+        
+        logging.debug("MeetingTypeRelatedness of %d meeting types: %s", len(types), self.MTR)
+        
             
+#==================================================================
+#     Incremental update of meetings
+#==================================================================    
+    
+    def _getMeetingIdx(self, key):
+        """Offset of meeting in self.ML, None if not found"""
+        for i in xrange(len(self.ML)):
+            if self.ML[i].Key == key:
+                return i
+        return None
+    
+    def _getMeetingData(self, key, windows, duration, room, attendees):
+        """Validate a meeting against timeslot and rooms. Return [ret, [meeting, time windows, feasible rooms]]"""
+        [ret, md] = self.M.createMeeting(key, windows, duration, room, attendees)
+        if ret < 0:
+            return [ret, None]
+        
+        [ret, mtw] = self._getMeetingTimeWindows(md)
+        if ret < 0:
+            return [ret, None]
+        
+        [ret, mr] = self._getFeasibleRoomsOfMeeting(md)
+        if ret < 0:
+            return [ret, None]
+        
+        return [0, [md, mtw, mr]]
+    
+    def _setMeetingData(self, m, data):
+        """Set meeting m and its time windows, feasible rooms and feasible start time"""
+        [self.ML[m], self.MTW[m], self.MR[m]] = data
+        [self.MFS[m], self.MKS[m]] = self._getFeasibleStartTimeOfMeeting(m)
+    
+    def _linkMeeting(self, m):
+        """Add meeting m into attendee index and conflict maps. Return set of meetings which has similar attendee(s)"""
+        self.MAS[m] = set(self.ML[m].Attendees)
+        oms = set()
+        for aid in self.MAS[m]:
+            if aid in self.AM:
+                ls = self.AM.get(aid)
+                oms.update(ls)
+                bisect.insort(ls, m)
+            else:
+                self.AM[aid] = [m]
+        
+        self.CALS[m] = {}
+        for my in oms:
+            oa = self.MAS[m] & self.MAS[my]
+            self.CALS[m][my] = list(oa)
+            self.CALS[my][m] = list(oa)
+        return oms
+    
+    def _unlinkMeeting(self, m):
+        """Remove meeting m from attendee index and conflict maps. Return set of meetings which has similar attendee(s)"""
+        for aid in self.MAS[m]:
+            ls = self.AM.get(aid)
+            ls.remove(m)
+            if not ls:
+                del self.AM[aid]
+        self.MAS[m] = set()
+        
+        oms = set(self.CALS[m].keys())
+        for my in oms:
+            del self.CALS[my][m]
+        self.CALS[m] = {}
+        return oms
+    
+    def _moveMeeting(self, src, dst):
+        """Renumber meeting src as dst. dst must have been unlinked. Return offset of MTYPE which has meeting src"""
+        for ls in [self.ML, self.MTW, self.MR, self.MFS, self.MKS, self.MAS, self.MOM]:
+            ls[dst] = ls[src]
+            
+        for aid in self.MAS[dst]:
+            ls = self.AM.get(aid)
+            ls.remove(src)
+            bisect.insort(ls, dst)
+        
+        self.CALS[dst] = self.CALS.pop(src)
+        for my in self.CALS[dst].keys():
+            self.CALS[my][dst] = self.CALS[my].pop(src)
+        
+        for t in xrange(len(self.MTYPE)):
+            if src in self.MTYPE[t].MLS:
+                mls = self.MTYPE[t].MLS
+                mls.remove(src)
+                bisect.insort(mls, dst)
+                return t
+        return None
+    
+    def _getMeetingTypeOfMeetings(self):
+        """Meeting -> offset of MTYPE"""
+        mt = {}
+        for t in xrange(len(self.MTYPE)):
+            for m in self.MTYPE[t].MLS:
+                mt[m] = t
+        return mt
+    
+    def _regroupMeetings(self, mls, removed=()):
+        """Move meetings mls to the meeting type matching their current properties, drop meetings in removed. 
+           Return set of offset of MTYPE which has changed"""
+        mt = self._getMeetingTypeOfMeetings()
+        changed = set()
+        for m in list(mls) + list(removed):
+            t = mt.get(m)
+            if t is not None:
+                self.MTYPE[t].MLS.remove(m)
+                changed.add(t)
+        
+        for m in sorted(mls):
+            key = self._getMeetingTypeKey(m)
+            t = self.MTK.get(key)
+            if t is None:
+                t = len(self.MTYPE)
+                self.MTK[key] = t
+                self.MTYPE.append(self.mtdesc(key[0], key[1], None, self._getUniqueConflictAttendees(m), [m]))
+            else:
+                bisect.insort(self.MTYPE[t].MLS, m)
+            changed.add(t)
+        
+        # Drop empty meeting type, the last meeting type takes over its offset
+        for t in sorted(changed, reverse=True):
+            if not self.MTYPE[t].MLS:
+                del self.MTK[self._getMeetingTypeKeyOfType(t)]
+                last = self.MTYPE.pop()
+                if t < len(self.MTYPE):
+                    self.MTYPE[t] = last
+                    self.MTK[self._getMeetingTypeKeyOfType(t)] = t
+        
+        return set([t for t in changed if t < len(self.MTYPE)])
+    
+    def _updateMeetingsWithSimilarAttendees(self, mls):
+        """Recompute self.MOM of meetings mls"""
+        for mx in mls:
+            self.MOM[mx] = self._getMeetingsWithSimilarAttendees(mx)
+    
+    def _populateOutdoorTemperatureList(self):
+        """Convert OAT into a list of float, so that solvers need not to parse OAT values per time slot"""
+        self.OATV = [float('nan') if v == 'M' else float(v) for v in self.OAT.itervalues()]
+        
+    def _getProbInput(self, config):
+        """Parsed & validated content of problem, room, meeting and outdoor temperature files"""
+        z = {}
+        for zk, zv in self.Z.iteritems():
+            z[zk] = {}
+            for rk, rv in zv.iteritems():
+                z[zk][rk] = rv.dict()
+        
+        return {'config': config.dict(), 
+                'Z': z, 'ZL': self.ZL, 'RL': self.RL, 'RCL': self.RCL, 'RNL': self.RNL,
+                'ML': [tuple(m) for m in self.ML_FILE], 
+                'OAT': self.OAT, 'INITIAL_TEMPERATURE': self.INITIAL_TEMPERATURE}
+    
+    def _restoreProbInput(self, data):
+        """Restore problem data saved by _getProbInput()"""
+        self._loadProblemConfig(data.get('config'))
+        
+        self.Z = data.get('Z')
+        self.ZL = data.get('ZL')
+        self.RL = data.get('RL')
+        self.RCL = data.get('RCL')
+        self.RNL = data.get('RNL')
+        
+        # Cached meeting list is in file order, shuffle it once as _populateMeetingConfig() does
+        self.M = Meeting()
+        for m in data.get('ML'):
+            self.M.mlist.append(self.M.mdesc(*m))
+        self.ML_FILE = list(self.M.mlist)
+        self.ML = self.M.getMeetingsList()
+        logging.debug("Total number of meetings: %d" %(len(self.ML)))
+        
+        self.OAT = data.get('OAT')
+        self.INITIAL_TEMPERATURE = data.get('INITIAL_TEMPERATURE')
+    
+    def _applyMeetingOrder(self):
+        """Reorder ML as MEETING_ORDER, if it is set"""
+        if self.MEETING_ORDER is None:
+            return 0
+        
+        idx = dict((m.Key, m) for m in self.ML)
+        if len(idx) != len(self.MEETING_ORDER) or set(idx) != set(self.MEETING_ORDER):
+            logging.critical("%d meeting keys to order, %d meetings in the meeting list" %(len(self.MEETING_ORDER), len(idx)))
+            return self.err.eams_config_meeting_err()
+        
+        self.ML[:] = [idx[k] for k in self.MEETING_ORDER]   # ML is M.mlist
+        logging.debug("Meeting list is reordered as given")
+        return 0
+    
     def _populateProbData(self, filename):            
         ret = 0
         try:
-            # Load problem configuration
-            config = ConfigObj(filename,  configspec=self.PROBLEM_CONFIG_SPEC, file_error=True)   
-            ret = self._validateProblemConfig(config)
-            if ret < 0:                 
-                raise ValidateError()
-            self._loadProblemConfig(config)
-            ret = self._diagMode()
-            if ret < 0:
-                raise ValueError("Invalid problem configuration.")
-                        
-            # Initialize & load room, meeting, timeslot, outdoor temperature etc information
-            ret = self._populateRoomConfig()
-            if ret < 0:
-                raise ValueError("Invalid room configuration.")
-            
-            ret = self._populateMeetingConfig()
-            if ret < 0:
-                raise ValueError("Invalid meeting configuration.")
+            data = None
+            if self.USE_CACHE:
+                self.CACHE = ProblemCache(self.CACHE_DIR)
+                data = self.CACHE.load(filename)
+                
+            if data:
+                self._restoreProbInput(data)
+                ret = self._diagMode()
+                if ret < 0:
+                    raise ValueError("Invalid problem configuration.")
+            else:
+                # Load problem configuration
+                config = ConfigObj(filename,  configspec=self.PROBLEM_CONFIG_SPEC, file_error=True)   
+                ret = self._validateProblemConfig(config)
+                if ret < 0:                 
+                    raise ValidateError()
+                self._loadProblemConfig(config)
+                ret = self._diagMode()
+                if ret < 0:
+                    raise ValueError("Invalid problem configuration.")
+                            
+                # Initialize & load room, meeting, timeslot, outdoor temperature etc information
+                ret = self._populateRoomConfig()
+                if ret < 0:
+                    raise ValueError("Invalid room configuration.")
+                
+                ret = self._populateMeetingConfig()
+                if ret < 0:
+                    raise ValueError("Invalid meeting configuration.")
+                
+                ret = self._populateOutdoorTemperature()
+                if ret < 0:
+                    raise ValueError("Invalid outdoor temperature configuration.")
+                
+                if self.USE_CACHE:
+                    self.CACHE.store(filename, 
+                                     [self.ROOM_CONFIG_DATA, self.MEETINGS_CONFIG_DATA, self.OUTDOOR_TEMP_DATA], 
+                                     self._getProbInput(config))
             
-            ret = self._populateOutdoorTemperature()
+            ret = self._applyMeetingOrder()
             if ret < 0:
-                raise ValueError("Invalid outdoor temperature configuration.")
+                raise ValueError("Meeting order differs from the meeting list.")
              
             self._populateSchedulingTimeSlot()
+            self._populateOutdoorTemperatureList()
              
             ret = self._populateMeetingRequestTimeslot()
             if ret < 0:
@@ -681,12 +1096,15 @@ class EAMS():
             if ret < 0:
                 raise ValueError("Invalid room configuration for a meeting.")
              
+            self._populateFeasibleStartTime()
             self._populateHVACStdTimeslot()
+            self._populateAttendeeMeetingIndex()
             self._populateMeetingsWithSimilarAttendees()
             
             self._populateMeetingConflicts()
             self._populateMeetingClique()
             self._populateConflictMeetingTypesBasedOnAttendee()
+            self._populateMeetingTypeRelatedness()
                          
             self._populateRoomThermalCfg()            
             
@@ -704,7 +1122,9 @@ class EAMS():
 #     API
 #==================================================================    
     
-    def readProblemInstance(self, filename, enableLog):    
+    def readProblemInstance(self, filename, enableLog, meeting_order=None):    
+        """meeting_order: meeting keys in the order of ML, instead of shuffling the meeting list"""
+        self.MEETING_ORDER = meeting_order
         if enableLog:
             # Configure log file
             if '/' in filename:
@@ -723,118 +1143,120 @@ class EAMS():
         if ret < 0:
             self._critical_err()
                 
+    def addMeeting(self, key, windows, duration, room, attendees):
+        """API to add a meeting, windows is a list of [Start, End] in "%Y-%m-%d %H:%M".
+           Return [ret, sorted offset of MTYPE which has changed]. MTYPE is shrunk if a meeting type becomes empty."""
+        if self._getMeetingIdx(key) is not None:
+            logging.error("Meeting [%s] already exists." %key)
+            return [self.err.eams_config_meeting_err(), []]
+        
+        [ret, data] = self._getMeetingData(key, windows, duration, room, attendees)
+        if ret < 0:
+            return [ret, []]
+        
+        m = len(self.ML)
+        for ls in [self.ML, self.MTW, self.MR, self.MFS, self.MKS, self.MAS, self.MOM]:
+            ls.append(None)
+        self._setMeetingData(m, data)
+        
+        oms = self._linkMeeting(m)
+        oms.add(m)
+        self._updateMeetingsWithSimilarAttendees(oms)
+        changed = self._regroupMeetings(oms)
+        self._populateConflictMeetingTypesBasedOnAttendee()
+        self._populateMeetingTypeRelatedness(changed)
+        
+        logging.info("Added meeting [%s] as meeting %d. Changed meeting type(s): %s" %(key, m, sorted(changed)))
+        return [0, sorted(changed)]
+    
+    def removeMeeting(self, key):
+        """API to cancel a meeting. The last meeting in self.ML takes over its offset.
+           Return [ret, sorted offset of MTYPE which has changed]. MTYPE is shrunk if a meeting type becomes empty."""
+        m = self._getMeetingIdx(key)
+        if m is None:
+            logging.error("Meeting [%s] does not exist." %key)
+            return [self.err.eams_config_meeting_err(), []]
+        
+        oms = self._unlinkMeeting(m)
+        changed = self._regroupMeetings(oms, [m])
+        
+        last = len(self.ML)-1
+        if m != last:
+            t = self._moveMeeting(last, m)
+            if t is not None:
+                changed.add(t)
+            if last in oms:
+                oms.remove(last)
+                oms.add(m)
+            oms.update(self.CALS[m].keys())
+            oms.add(m)
+        
+        else:
+            del self.CALS[m]
+        
+        for ls in [self.ML, self.MTW, self.MR, self.MFS, self.MKS, self.MAS, self.MOM]:
+            ls.pop()
+        
+        self._updateMeetingsWithSimilarAttendees(oms)
+        self._populateConflictMeetingTypesBasedOnAttendee()
+        self._populateMeetingTypeRelatedness(changed)
+        
+        logging.info("Removed meeting [%s]. Changed meeting type(s): %s" %(key, sorted(changed)))
+        return [0, sorted(changed)]
+    
+    def modifyMeeting(self, key, windows, duration, room, attendees):
+        """API to edit a meeting, windows is a list of [Start, End] in "%Y-%m-%d %H:%M".
+           Return [ret, sorted offset of MTYPE which has changed]. MTYPE is shrunk if a meeting type becomes empty."""
+        m = self._getMeetingIdx(key)
+        if m is None:
+            logging.error("Meeting [%s] does not exist." %key)
+            return [self.err.eams_config_meeting_err(), []]
+        
+        [ret, data] = self._getMeetingData(key, windows, duration, room, attendees)
+        if ret < 0:
+            return [ret, []]
+        
+        oms = self._unlinkMeeting(m)
+        self._setMeetingData(m, data)
+        oms.update(self._linkMeeting(m))
+        oms.add(m)
+        self._updateMeetingsWithSimilarAttendees(oms)
+        changed = self._regroupMeetings(oms)
+        self._populateConflictMeetingTypesBasedOnAttendee()
+        self._populateMeetingTypeRelatedness(changed)
+        
+        logging.info("Modified meeting [%s]. Changed meeting type(s): %s" %(key, sorted(changed)))
+        return [0, sorted(changed)]
+    
     def getRoomThermalConfig(self, ridx, param):
         """API to retrieve room thermal resistance and capacitance"""
-        
-        if param == "C":
-            return self.RTC.getRoomC(self.RL[ridx])
-        
-        if param == "Rij":
-            return self.RTC.getRoomRij(self.RL[ridx])
-        if param == "Rimj":
-            return self.RTC.getRoomRimj(self.RL[ridx])
-        if param == "Rji":
-            return self.RTC.getRoomRji(self.RL[ridx])
-        if param == "Cij":
-            return self.RTC.getRoomCij(self.RL[ridx])
-        if param == "Cji":
-            return self.RTC.getRoomCji(self.RL[ridx])
-        
-        if param == "Rik":
-            return self.RTC.getRoomRik(self.RL[ridx])
-        if param == "Rimk":
-            return self.RTC.getRoomRimk(self.RL[ridx])
-        if param == "Rki":
-            return self.RTC.getRoomRki(self.RL[ridx])
-        if param == "Cik":
-            return self.RTC.getRoomCik(self.RL[ridx])
-        if param == "Cki":
-            return self.RTC.getRoomCki(self.RL[ridx])
-        
-        if param == "Ril":
-            return self.RTC.getRoomRil(self.RL[ridx])
-        if param == "Riml":
-            return self.RTC.getRoomRiml(self.RL[ridx])
-        if param == "Rli":
-            return self.RTC.getRoomRli(self.RL[ridx])
-        if param == "Cil":
-            return self.RTC.getRoomCil(self.RL[ridx])
-        if param == "Cli":
-            return self.RTC.getRoomCli(self.RL[ridx])
-        
-        if param == "Rio":
-            return self.RTC.getRoomRio(self.RL[ridx])
-        if param == "Rimo":
-            return self.RTC.getRoomRimo(self.RL[ridx])
-        if param == "Roi":
-            return self.RTC.getRoomRoi(self.RL[ridx])
-        if param == "Cio":
-            return self.RTC.getRoomCio(self.RL[ridx])
-        if param == "Coi":
-            return self.RTC.getRoomCoi(self.RL[ridx])
-        
-        if param == "Rif":
-            return self.RTC.getRoomRif(self.RL[ridx])
-        if param == "Rfi":
-            return self.RTC.getRoomRfi(self.RL[ridx])
-        if param == "Cif":
-            return self.RTC.getRoomCif(self.RL[ridx])
-        if param == "Cfi":
-            return self.RTC.getRoomCfi(self.RL[ridx])
-        
-        if param == "Ric":
-            return self.RTC.getRoomRic(self.RL[ridx])
-        if param == "Rci":
-            return self.RTC.getRoomRci(self.RL[ridx])
-        if param == "Cic":
-            return self.RTC.getRoomCic(self.RL[ridx])
-        if param == "Cci":
-            return self.RTC.getRoomCci(self.RL[ridx])
-        
-        if param == "Rwij":
-            return self.RTC.getRoomRwij(self.RL[ridx])
-        if param == "Rwik":
-            return self.RTC.getRoomRwik(self.RL[ridx])
-        if param == "Rwil":
-            return self.RTC.getRoomRwil(self.RL[ridx])
-        if param == "Rwio":
-            return self.RTC.getRoomRwio(self.RL[ridx])
-                
         if param == "Dim":
-            return self.RTC.getRoomDim(self.RL[ridx])
+            return self.RTC.getRoomDim(ridx)
+        return self.RTC.getRoomParam(ridx, param)
+    
+    def getRoomCoefficients(self, ridx):
+        """API to retrieve room temperature coefficients [D, E1, ..., E7]"""
+        return self.RTC.getRoomCoefficients(ridx)
+    
+    def getNodeCoefficients(self, ridx, node):
+        """API to retrieve wall/floor/ceiling temperature coefficients [A, H, D, E, S]"""
+        return self.RTC.getNodeCoefficients(ridx, node)
              
     def getRoomSolarGain(self, slot, ridx, wall):
         """API to retrieve room solar gain"""
-        return self.RTC.getRoomSolarGainByTime(slot, self.RL[ridx], wall) 
+        return self.RTC.getRoomSolarGainByTime(slot, ridx, wall) 
+    
+    def getRoomSolarGainTable(self, ridx, wall):
+        """API to retrieve room solar gain of a wall at all timeslots"""
+        return self.RTC.getRoomSolarGainTable(ridx, wall)
     
     def isInTimeWindows(self, midx, k):
         """Is k within feasible timeslot between earliest-start-time and latest-start-time? """
-        d = self.ML[midx].Duration        
-        for i in xrange(len(self.MTW[midx])):            
-            tw = self.MTW[midx][i]
-            if k >= tw[0] and  k <= (tw[1]-d+1): 
-                return 1            
+        if self.MFS[midx][k]:
+            return 1
         return -1       
     
     def getFeasibleStartTime(self, midx, k):
         """If meeting m starts at kp, is it still on-going at time period k?"""
-        ls = []        
-        d = self.ML[midx].Duration
-        for i in xrange(len(self.MTW[midx])):
-            tw = self.MTW[midx][i]
-            if tw[0] <= k and tw[1] >= k:
-                kp = tw[0]
-                while kp <= tw[1]-d+1:
-                    if kp not in ls and kp <= k and kp+d-1 >= k:
-                        ls.append(kp)
-                    kp = kp+1                
-        return ls
+        return self.MKS[midx][k]
     
-
-    
-            
-          
- 
-                
-                
-                
\ No newline at end of file
@@ -0,0 +1,85 @@
+import os
+import logging
+import hashlib
+import cPickle as pickle
+
+class ProblemCache:
+    """On-disk cache of parsed & validated problem instance, keyed by content hash of the input files"""
+    
+    def __init__(self, cache_dir):
+        self.CACHE_VERSION = 2          # bump this whenever the content of a cache entry changes
+        self.CACHE_DIR = cache_dir
+        self.SPEC_FILES = ['Data/ConfigSpecs/eams_prob_spec.cfg', 
+                           'Data/ConfigSpecs/eams_room_spec.cfg']
+    
+    def _hashFile(self, fn):
+        h = hashlib.sha1()
+        f = open(fn, 'rb')
+        try:
+            for chunk in iter(lambda: f.read(65536), b''):
+                h.update(chunk)
+        finally:
+            f.close()
+        return h.hexdigest()
+    
+    def _getEntryFile(self, prob_cfg):
+        """Cache entry of a problem config, identified by its content, the spec files and the cache version"""
+        h = hashlib.sha1()
+        h.update(str(self.CACHE_VERSION))
+        for fn in [prob_cfg] + self.SPEC_FILES:
+            h.update(self._hashFile(fn))
+        return os.path.join(self.CACHE_DIR, 'eams_' + h.hexdigest() + '.pkl')
+    
+    def load(self, prob_cfg):
+        """Return cached problem data of prob_cfg, or None if not cached or any input file has changed"""
+        try:
+            fn = self._getEntryFile(prob_cfg)
+            if not os.path.exists(fn):
+                logging.info("No cached problem instance for %s" %prob_cfg)
+                return None
+            
+            f = open(fn, 'rb')
+            try:
+                entry = pickle.load(f)
+            finally:
+                f.close()
+                
+            if entry.get('version') != self.CACHE_VERSION:
+                logging.info("Cached problem instance %s has version %s, expect %s. Ignored." %(fn, entry.get('version'), self.CACHE_VERSION))
+                return None
+            
+            for dep, dh in entry.get('deps').iteritems():
+                if not os.path.exists(dep) or self._hashFile(dep) != dh:
+                    logging.info("Cached problem instance %s is outdated, %s has changed." %(fn, dep))
+                    return None
+                
+            logging.info("Load problem instance %s from cache %s" %(prob_cfg, fn))
+            return entry.get('data')
+        
+        except (IOError, OSError, EOFError, pickle.UnpicklingError, AttributeError), e:
+            logging.warning("Failed to load cached problem instance. %s" %(e))
+            return None
+        
+    def store(self, prob_cfg, deps, data):
+        """Cache problem data of prob_cfg which is loaded from deps"""
+        try:
+            if not os.path.exists(self.CACHE_DIR):
+                os.makedirs(self.CACHE_DIR)
+            
+            entry = {'version': self.CACHE_VERSION, 
+                     'deps': dict((dep, self._hashFile(dep)) for dep in deps), 
+                     'data': data}
+            
+            fn = self._getEntryFile(prob_cfg)
+            # Write to a temp file then rename, so concurrent runs never read a partial entry
+            tmp = fn + '.' + str(os.getpid())
+            f = open(tmp, 'wb')
+            try:
+                pickle.dump(entry, f, pickle.HIGHEST_PROTOCOL)
+            finally:
+                f.close()
+            os.rename(tmp, fn)
+            logging.info("Cache problem instance %s to %s" %(prob_cfg, fn))
+            
+        except (IOError, OSError, pickle.PicklingError), e:
+            logging.warning("Failed to cache problem instance. %s" %(e))
@@ -1,8 +1,18 @@
 import datetime
 import logging
+from time import time
 from gurobipy import *
+from solver_trace import getTraceWriter
 
 
+def cb_deadline(model, where):
+    """Terminate the solve once time() reaches model._DEADLINE. model._CB (if any) is called first, e.g. cb_mipsol"""
+    if model._CB is not None:
+        model._CB(model, where)
+    if time() >= model._DEADLINE:
+        model.terminate()
+        
+
 def cb_mipsol(model, where):
     if where == GRB.callback.MIPSOL:
         currtime = datetime.datetime.now()        
@@ -19,16 +29,10 @@ def cb_mipsol(model, where):
 #         _cb_logTemperatures(caseid, model)
         
 def _cb_logSolutionsStat(logcase, currtime, obj, objbnd, nodecnt, solcnt, gap):
-    try:            
+    """Buffered, the file is written by a background thread, see TraceWriter"""
 #         fstr = 'Output\\' + logcase + '_solstats'
-        fstr = 'Output/' + logcase + '_solstats'
-        f = open(fstr,'a')
-        f.write(",".join(map(str, [solcnt, currtime, nodecnt, obj, objbnd, gap])))
-        f.write("\n")
-        f.close()      
-        
-    except (ValueError), e:
-        logging.critical('%s' % (e)) 
+    fstr = 'Output/' + logcase + '_solstats'
+    getTraceWriter(fstr).write([solcnt, currtime, nodecnt, obj, objbnd, gap])
 
 def _cb_logSchedules(logcase, model):
     try:
@@ -38,7 +42,7 @@ def _cb_logSchedules(logcase, model):
         f = open(fstr,'a')   
         
         # Log timeslot
-        f.write(",".join(map(str,model._EAMS.TS.values())))            
+        f.write(",".join(map(str,model._EAMS.TG.getTimeSlotList())))            
         f.write("\n")
         
         # Log number of rooms
@@ -87,7 +91,7 @@ def _cb_logTemperatures(logcase, model):
         f = open(fstr,'a')   
          
         # Log timeslot
-        f.write(",".join(map(str,model._EAMS.TS.values())))            
+        f.write(",".join(map(str,model._EAMS.TG.getTimeSlotList())))            
         f.write("\n")
          
         # Log outdoor temperature
@@ -17,28 +17,36 @@ class Meeting:
                 return EAMS_Error().eams_meeting_overlapped_time_windows()
         return 0
     
+    def createMeeting(self, key, windows, duration, room, attendees):
+        """Validate and create a meeting. windows is a list of [Start, End] in "%Y-%m-%d %H:%M" """
+        tw = []
+        for i in xrange(len(windows)):
+            st = datetime.strptime(windows[i][0], "%Y-%m-%d %H:%M")
+            et = datetime.strptime(windows[i][1], "%Y-%m-%d %H:%M")
+            if et < st:
+                logging.critical("Meeting[%s] Invalid time windows [%s, %s]. End Time earlier than Start Time." %(key, windows[i][0], windows[i][1]))
+                return [EAMS_Error().eams_meeting_invalid_time_windows(), None]
+            elif self._validateOverlappedTimeWindows(tw, st, et) < 0:
+                logging.critical("Meeting[%s] Invalid time windows [%s, %s]. Duplicate time windows." %(key, windows[i][0], windows[i][1]))
+                return [EAMS_Error().eams_meeting_overlapped_time_windows(), None]
+            else:
+                tw.append([st,et])
+        
+        stw = sorted(tw, key=itemgetter(0))
+        return [0, self.mdesc(key, stw, int(duration), room, attendees)]
+    
     def populateMeetingsForRoomAllocNSchedule(self, meetings):
         """Populate meetings from configuration files"""
         for k, v in meetings.iteritems():
-            tw = []
+            windows = []
             for sk, sv in v.iteritems():                
                 if sk.startswith("W"):
-                    st = datetime.strptime(sv.get('Start'), "%Y-%m-%d %H:%M")
-                    et = datetime.strptime(sv.get('End'), "%Y-%m-%d %H:%M")
-                    if et < st:
-                        logging.critical("Meeting[%s] Invalid time windows [%s]. End Time earlier than Start Time." %(k,sk))
-                        return EAMS_Error().eams_meeting_invalid_time_windows()
-                    elif self._validateOverlappedTimeWindows(tw, st, et) < 0:
-                        logging.critical("Meeting[%s] Invalid time windows [%s]. Duplicate time windows." %(k,sk))
-                        return EAMS_Error().eams_meeting_overlapped_time_windows()
-                    else:
-                        tw.append([st,et])      
+                    windows.append([sv.get('Start'), sv.get('End')])
             
-            stw = sorted(tw, key=itemgetter(0))                
-            if 'Preferred_Room' in v:
-                self.mlist.append(self.mdesc(k, stw, int(v['Duration']), v['Preferred_Room'], v['Attendees']))                
-            else:
-                self.mlist.append(self.mdesc(k, stw, int(v['Duration']), "", v['Attendees']))
+            [ret, md] = self.createMeeting(k, windows, v['Duration'], v.get('Preferred_Room', ""), v['Attendees'])
+            if ret < 0:
+                return ret
+            self.mlist.append(md)
                 
         
         # debug only
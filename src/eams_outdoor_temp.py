@@ -1,6 +1,8 @@
-
+import os
 import logging
+import hashlib
 import collections
+import numpy as np
 from datetime import datetime
 from datetime import timedelta
 from eams_error import EAMS_Error 
@@ -11,67 +13,149 @@ class OutdoorTemperature:
         self.half_hourly = 30
         self.hourly = 60
         self.OUTDOOR_TEMP_DATA = None
-        self.temperature = {}      
+        self.EPOCH = datetime(1970, 1, 1)
+        self.MISSING = 'M'          # missing record in data file, stored as NaN
+        self.minutes = None         # sorted numpy array of record time in epoch minutes
+        self.temperature = None     # numpy array of temperature follow the sequence of self.minutes
         
-    def loadOutdoorTemperature(self, tfile):
-        """Load outdoor temperature from OUTDOOR_TEMP_DATA"""
+    def loadOutdoorTemperature(self, tfile, store_dir=None):
+        """Load outdoor temperature from OUTDOOR_TEMP_DATA, or its binary store in store_dir if it is up to date.
+           The store is not used if store_dir is None"""
         logging.info("Loading outdoor temperature data from %s" %tfile)
+        self.OUTDOOR_TEMP_DATA = tfile
         
         try:
+            store = None
+            if store_dir is not None:
+                store = self._getStoreFile(tfile, store_dir)
+                if os.path.exists(store):
+                    data = np.load(store)
+                    try:
+                        self.minutes = data['minutes']
+                        self.temperature = data['temperature']
+                    finally:
+                        data.close()
+                    logging.info("Loaded %d outdoor temperature records from %s" %(len(self.minutes), store))
+                    return 0
+            
             df = open(tfile, 'r')
             data = ''.join(df.readlines())
             df.close()
             
-            self._parseOutdoorTemperature(data)            
+            self._parseOutdoorTemperature(data)
+            if store is not None:
+                self._saveOutdoorTemperature(store)
         except (IOError), e:        
             logging.error('%s' % (e))
             return self.err.eams_config_otc_err()
         
         return 0  
+    
+    def _getStoreFile(self, tfile, store_dir):
+        """Binary store of tfile, keyed by its path, size and modification time"""
+        st = os.stat(tfile)
+        h = hashlib.sha1('%s|%d|%r' %(os.path.abspath(tfile), st.st_size, st.st_mtime)).hexdigest()
+        return os.path.join(store_dir, 'oat_' + h + '.npz')
+    
+    def _saveOutdoorTemperature(self, store):
+        """Convert the parsed temperature into binary store, so it is parsed only once"""
+        try:
+            if not os.path.exists(os.path.dirname(store)):
+                os.makedirs(os.path.dirname(store))
+            # np.savez appends .npz if missing, hence write to a *.npz temp file and rename
+            tmp = store[:-len('.npz')] + '.' + str(os.getpid()) + '.npz'
+            np.savez(tmp, minutes=self.minutes, temperature=self.temperature)
+            os.rename(tmp, store)
+        except (IOError, OSError), e:
+            logging.warning("Failed to save outdoor temperature store %s. %s" %(store, e))
+            
+    def _toMinutes(self, dt):
+        d = dt - self.EPOCH
+        return d.days*1440 + d.seconds/60
+    
+    def _toDatetime(self, minutes):
+        return self.EPOCH + timedelta(minutes=int(minutes))
+    
+    def _toOrderedDict(self, minutes, temperature):
+        """{datetime: temperature string} in date/time order, as the original data file"""
+        dtm = collections.OrderedDict()
+        for i in xrange(len(minutes)):
+            if np.isnan(temperature[i]):
+                dtm[self._toDatetime(minutes[i])] = self.MISSING
+            else:
+                dtm[self._toDatetime(minutes[i])] = '%.2f' %temperature[i]
+        return dtm
+    
+    def _toFloatOrderedDict(self, minutes, temperature):
+        """{datetime: temperature} in date/time order"""
+        dtm = collections.OrderedDict()
+        for i in xrange(len(minutes)):
+            dtm[self._toDatetime(minutes[i])] = float(temperature[i])
+        return dtm
             
     def _parseOutdoorTemperature(self, data):
         """Parse the temperature input data"""
         
         #TODO: Adjust temperature to GMT+8, GMT+11 or GMT+10!!!   
         GMT = 8     
-        temperature = {}
         lines = data.split('\n')    
         count = int(lines[0])
-        for i in range(1, count+1):
-            line = lines[i]
-            parts = line.split()
+        minutes = np.empty(count, dtype=np.int64)
+        temperature = np.empty(count, dtype=np.float64)
+        for i in xrange(1, count+1):
+            parts = lines[i].split()
             dtstr = ' '.join((parts[1], parts[2]))
-            #NOTE: As dict type is used, duplicate entries with the same date/time is filtered.
-            temperature[datetime.strptime(dtstr, "%Y-%m-%d %H:%M") - timedelta(hours=GMT)] = parts[3]
+            minutes[i-1] = self._toMinutes(datetime.strptime(dtstr, "%Y-%m-%d %H:%M") - timedelta(hours=GMT))
+            if parts[3] == self.MISSING:
+                temperature[i-1] = np.nan
+            else:
+                temperature[i-1] = float(parts[3])
             
-        #NOTE: Python dictionary is unordered by default. Use OrderedDict to make sure temperature is recorded in date/time order.
-        self.temperature = collections.OrderedDict(sorted(temperature.items()))        
+        # Sort by date/time. NOTE: duplicate entries with the same date/time are filtered, the last entry is kept.
+        order = np.argsort(minutes, kind='mergesort')
+        minutes = minutes[order]
+        temperature = temperature[order]
+        last = np.append(minutes[1:] != minutes[:-1], True)
+        self.minutes = minutes[last]
+        self.temperature = temperature[last]
         
-#         for k,v in self.temperature.iteritems():
-#             logging.debug("[%s]: %s" %(k,v))
-            
+    def _getRange(self, s, e):
+        """Offset of records within [s, e)"""
+        return np.searchsorted(self.minutes, [self._toMinutes(s), self._toMinutes(e)])
+    
+    def _getIntervalMask(self, minutes, interval):
+        """Records which fall on the 30 or 60 mins interval. All records otherwise."""
+        if int(interval) == self.half_hourly: 
+            return (minutes % 30) == 0
+        elif int(interval) == self.hourly:
+            return (minutes % 60) == 0
+        return np.ones(len(minutes), dtype=bool)
+    
+    def getOutdoorTemperatureArray(self, start, end, interval):
+        """Get [epoch minutes, temperature] numpy arrays between specific timeframe"""
+        s = datetime.strptime(start, "%Y-%m-%d %H:%M")
+        e = datetime.strptime(end, "%Y-%m-%d %H:%M")
+        [si, ei] = self._getRange(s, e)
+        minutes = self.minutes[si:ei]
+        mask = self._getIntervalMask(minutes, interval)
+        return [minutes[mask], self.temperature[si:ei][mask]]
     
     def getOutdoorTemperature(self, start, end, interval):
         """Get outdoor temperature between specific timeframe"""
+        logging.info("Extracting temperature data between %s and %s" %(start, end))
+        [minutes, temperature] = self.getOutdoorTemperatureArray(start, end, interval)
+        return self._toOrderedDict(minutes, temperature)
+    
+    def getResampledOutdoorTemperature(self, start, end, interval):
+        """Linearly interpolate outdoor temperature at every interval mins between specific timeframe"""
         s = datetime.strptime(start, "%Y-%m-%d %H:%M")
         e = datetime.strptime(end, "%Y-%m-%d %H:%M")
-        logging.info("Extracting temperature data between %s and %s" %(start, end))
-        
-        temperature = {}   
-        for k, v in self.temperature.iteritems():
-            if (k >= s and k < e):
-                if int(interval) == self.half_hourly: 
-                    if (k.minute == 0 or k.minute == 30):                
-                        temperature[k]=v                    
-                elif int(interval) == self.hourly:
-                    if (k.minute == 0):                
-                        temperature[k]=v                   
-                else:
-                    temperature[k]=v           
+        logging.info("Resampling temperature data between %s and %s for %s mins interval" %(start, end, interval))
         
-        #TODO: double check if assigning dict to OrderedDict always returns the correct order!
-        dtm = collections.OrderedDict(sorted(temperature.items()))        
-        return dtm
+        valid = ~np.isnan(self.temperature)
+        minutes = np.arange(self._toMinutes(s), self._toMinutes(e), int(interval), dtype=np.int64)
+        temperature = np.interp(minutes, self.minutes[valid], self.temperature[valid])
+        return self._toFloatOrderedDict(minutes, temperature)
     
     #NOTE: This is only for experiment - START
     def getSingleDayOutdoorTemperature(self, start, end, interval):
@@ -80,51 +164,17 @@ class OutdoorTemperature:
         e = datetime.strptime(end, "%Y-%m-%d %H:%M")
         logging.info("Extracting temperature data between %s and %s" %(start, end))
         
-        de = (s + timedelta(hours=24))
-        
-        i=0
-        oneday_temp = []
-        for k, v in self.temperature.iteritems():
-            if (k >= s and k < de):
-                if int(interval) == self.half_hourly: 
-                    if (k.minute == 0 or k.minute == 30):
-                        oneday_temp.append(v)      
-                        i = i+1            
-                elif int(interval) == self.hourly:
-                    if (k.minute == 0):
-                        oneday_temp.append(v)                        
-                        i = i+1              
-                else:
-                    oneday_temp.append(v)
-                    i = i+1
+        # Temperature of the first day
+        [si, ei] = self._getRange(s, s + timedelta(hours=24))
+        mask = self._getIntervalMask(self.minutes[si:ei], interval)
+        oneday_temp = self.temperature[si:ei][mask]
         
-        total_i = i
-                              
-        # TODO: a bit stupid way
-        ii=0
-        temperature = {}
-        for k, v in self.temperature.iteritems():
-#             if (k >= de and k <= e):
-#             if (k >= s and k <= e):
-            if (k >= s and k < e):
-                if int(interval) == self.half_hourly: 
-                    if (k.minute == 0 or k.minute == 30):                                                
-                        temperature[k] = oneday_temp[ii]      
-                        ii = ii+1                     
-                elif int(interval) == self.hourly:
-                    if (k.minute == 0):  
-                        temperature[k] = oneday_temp[ii]
-                        ii = ii+1                                 
-                else:
-                    temperature[k] = oneday_temp[ii]
-                    ii = ii+1    
-                    
-                if ii == total_i: ii=0                   
-                
-                    
-#         #TODO: double check if assigning dict to OrderedDict always returns the correct order!
-        dtm = collections.OrderedDict(sorted(temperature.items()))        
-        return dtm
+        # Repeat the first day over the whole timeframe
+        [si, ei] = self._getRange(s, e)
+        minutes = self.minutes[si:ei]
+        minutes = minutes[self._getIntervalMask(minutes, interval)]
+        temperature = oneday_temp[np.arange(len(minutes)) % len(oneday_temp)]
+        return self._toOrderedDict(minutes, temperature)
     
     def getSingleDayOutdoorTemperatureShortInterval(self, start, end, interval):
         """Get outdoor temperature between specific timeframe"""
@@ -136,56 +186,27 @@ class OutdoorTemperature:
             # TODO: this is quick fix, silly way. Error code should be return to halt the app.
             logging.critical("Scheduling interval is longer than %d, you SHOULD NOT call this function." %self.half_hourly)
              
-        de = (s + timedelta(hours=24))
+        # Half hourly temperature of the first day
+        [si, ei] = self._getRange(s, s + timedelta(hours=24))
+        oneday_temp = self.temperature[si:ei][self._getIntervalMask(self.minutes[si:ei], self.half_hourly)]
         
-        i=0
-        oneday_temp = []
-        for k, v in self.temperature.iteritems():
-            if (k >= s and k < de):
-                if (k.minute == 0 or k.minute == 30):
-                    oneday_temp.append(v)      
-                    logging.debug("Time [%s]: %s" %(k,v))
-                    i = i+1    
-        total_i = i
+        # Half hourly records over the whole timeframe, take temperature from the first day
+        [si, ei] = self._getRange(s, e)
+        curr_t = self.minutes[si:ei]
+        curr_t = curr_t[self._getIntervalMask(curr_t, self.half_hourly)]
+        ii = np.arange(len(curr_t)) % len(oneday_temp)
+        curr_rec = oneday_temp[ii]
+        next_rec = oneday_temp[(ii+1) % len(oneday_temp)]
         
-#         logging.debug("total_i: %d, len: %d, One day temp: %s" %(total_i, len(oneday_temp), oneday_temp))
-                
-        ii=0
-        temperature = {}
-        for k, v in self.temperature.iteritems():
-            if (k >= s and k < e):
-#                 logging.debug("For time period t=%s" %(k))    
-                if (k.minute == 0 or k.minute == 30):
-                    curr_t = k
-                    next_t = (curr_t + timedelta(minutes=30))
-#                     logging.debug("curr_t: %s, next_t: %s" %(curr_t, next_t))
-                    t = curr_t
-                    
-                    curr_rec = float(oneday_temp[ii])
-                    if ii < total_i-1:
-                        next_rec = float(oneday_temp[ii+1])                    
-                    else:
-                        next_rec = float(oneday_temp[0])
-#                     logging.debug("current temp record [%s], next [%s]" %(curr_rec, next_rec))
-                        
-                    if interval==1:
-                        delta_rec = float(next_rec - curr_rec)/10
-                    else:
-                        delta_rec = float((next_rec - curr_rec)/float(interval))
-                        
-                    j = 0
-                    while t < next_t:
-#                         logging.debug("interpolate at t=%s, +%.3f" %(t, delta_rec * j))
-                        temperature[t] = curr_rec + (delta_rec * j)
-                        
-                        t =  t + timedelta(minutes=int(interval))
-                        j = j+1
-                
-                    ii = ii + 1
-                    if ii == total_i: ii=0  
-                    
-        dtm = collections.OrderedDict(sorted(temperature.items()))
-                
-        return dtm
+        if interval==1:
+            delta_rec = (next_rec - curr_rec)/10
+        else:
+            delta_rec = (next_rec - curr_rec)/float(interval)
+        
+        # Interpolate every interval mins until the next half hour
+        j = np.arange(len(xrange(0, self.half_hourly, int(interval))))
+        minutes = (curr_t[:, np.newaxis] + j*int(interval)).ravel()
+        temperature = (curr_rec[:, np.newaxis] + delta_rec[:, np.newaxis]*j).ravel()
+        
+        return self._toFloatOrderedDict(minutes, temperature)
         #NOTE: This is only for experiment - END
-
@@ -1,310 +1,156 @@
-
 import logging
+import numpy as np
 from datetime import datetime
 
 class RoomThermalCfg:
-    def __init__(self, room_config, timeslot, am, noon, pm, night):
+    def __init__(self, room_config, roomlist, timegrid, interval, am, noon, pm, night):
         self.Z = room_config
-        self.TS = timeslot
+        self.RL = roomlist
+        self.TG = timegrid
+        self.DT = float(interval)*60
         self.AM = datetime.strptime(am, "%H:%M")
         self.NOON = datetime.strptime(noon, "%H:%M")
         self.PM = datetime.strptime(pm, "%H:%M")
         self.NIGHT = datetime.strptime(night, "%H:%M")
         
-        self.C = {}
-        self.Rij = {}
-        self.Rik = {}
-        self.Ril = {}
-        self.Rio = {}
-        self.Rif = {}
-        self.Ric = {}
+        self.PARAM = [
+            # Given zone i is adjacent to zone j
+            # CR - R(i), R1 - R(i, j), R2 - Rmid(i,j), R3 - R(j, i), C1 - C(i, j), C2 - C(j, i)
+            ['C',    None,      'CR'],
+            ['Rij',  'Wall1',   'R1'], ['Rik',  'Wall2',   'R1'], ['Ril',  'Wall3',   'R1'],
+            ['Rio',  'Wall4',   'R1'], ['Rif',  'Floor',   'R1'], ['Ric',  'Ceiling', 'R1'],
+            ['Rimj', 'Wall1',   'R2'], ['Rimk', 'Wall2',   'R2'], ['Riml', 'Wall3',   'R2'],
+            ['Rimo', 'Wall4',   'R2'], ['Rimf', 'Floor',   'R2'], ['Rimc', 'Ceiling', 'R2'],
+            ['Rji',  'Wall1',   'R3'], ['Rki',  'Wall2',   'R3'], ['Rli',  'Wall3',   'R3'],
+            ['Roi',  'Wall4',   'R3'], ['Rfi',  'Floor',   'R3'], ['Rci',  'Ceiling', 'R3'],
+            ['Rwij', 'Wall1',   'RW'], ['Rwik', 'Wall2',   'RW'], ['Rwil', 'Wall3',   'RW'],
+            ['Rwio', 'Wall4',   'RW'],
+            ['Cij',  'Wall1',   'C1'], ['Cik',  'Wall2',   'C1'], ['Cil',  'Wall3',   'C1'],
+            ['Cio',  'Wall4',   'C1'], ['Cif',  'Floor',   'C1'], ['Cic',  'Ceiling', 'C1'],
+            ['Cji',  'Wall1',   'C2'], ['Cki',  'Wall2',   'C2'], ['Cli',  'Wall3',   'C2'],
+            ['Coi',  'Wall4',   'C2'], ['Cfi',  'Floor',   'C2'], ['Cci',  'Ceiling', 'C2']]
         
-        self.Rimj = {}
-        self.Rimk = {}
-        self.Riml = {}
-        self.Rimo = {}
-        self.Rimf = {}
-        self.Rimc = {}
+        self.NODE = {
+            # Wall/floor/ceiling node: [capacitance, R of D term, R of E term, capacitance of solar gain term]
+            'z1_l': ['Cij', 'Rimj', 'Rji', 'Cij'], 'l_z1': ['Cji', 'Rij', 'Rimj', 'Cji'],
+            'z2_l': ['Cik', 'Rimk', 'Rki', 'Cik'], 'l_z2': ['Cki', 'Rik', 'Rimk', 'Cki'],
+            'z3_l': ['Cil', 'Riml', 'Rli', 'Cil'], 'l_z3': ['Cli', 'Ril', 'Riml', 'Cli'],
+            'z4_l': ['Cio', 'Rimo', 'Roi', 'Cio'], 'l_z4': ['Coi', 'Rio', 'Rimo', 'Coi'],
+            'l_f':  ['Cif', 'Rif',  'Rfi', 'Cfi'], 'l_c':  ['Cic', 'Ric', 'Rci', 'Cci']}
         
-        self.Rji = {}
-        self.Rki = {}
-        self.Rli = {}
-        self.Roi = {}
-        self.Rfi = {}
-        self.Rci = {}
+        self.P = {}
+        #=======================================================================
+        # Thermal parameter table. Key: name in PARAM, Value: numpy array follow the sequence of RL
+        #=======================================================================
         
-        self.Rwij = {}
-        self.Rwik = {}
-        self.Rwil = {}
-        self.Rwio = {}
-                
-        self.Cij = {}
-        self.Cik = {}
-        self.Cil = {}
-        self.Cio = {}
-        self.Cif = {}
-        self.Cic = {}
+        self.DIM = None
+        #=======================================================================
+        # Room dimension. numpy array of [Width, Length, Height] follow the sequence of RL
+        #=======================================================================
+        
+        self.QS = None
+        #=======================================================================
+        # Solar gain. numpy array of rooms x timeslots x [Wall1, Wall2, Wall3, Wall4, Floor]
+        #=======================================================================
         
-        self.Cji = {}
-        self.Cki = {}
-        self.Cli = {}
-        self.Coi = {}
-        self.Cfi = {}
-        self.Cci = {}
+        self.RCOEF = None
+        #=======================================================================
+        # Room temperature coefficients. numpy array of rooms x [D, E1, E2, E3, E4, E5, E6, E7]
+        # D = interval / C, En = interval / (C * Rn), Rn = Rij, Rik, Ril, Rio, Rif, Ric, Rwij
+        #=======================================================================
         
-        self.RoomSolarGain = {}
-        self.RoomDim = {}
+        self.NCOEF = {}
+        #=======================================================================
+        # Wall/floor/ceiling temperature coefficients. Key: node in NODE, Value: numpy array of rooms x [A, H, D, E, S]
+        # A = interval / C, H = 1 - A*(1/RD + 1/RE), D = interval / (C * RD), E = interval / (C * RE), S = interval / CS
+        #=======================================================================
         
         self._populateRoomDimension()
         self._populateRoomThermalProperties()
         self._populateRoomSolarGain()
+        self._populateRoomCoefficients()
+        self._populateNodeCoefficients()
+        
+    def _getRooms(self):
+        """{room name: room properties} of all zones"""
+        rooms = {}
+        for _, v in self.Z.iteritems(): # for each zone
+            rooms.update(v)
+        return rooms
         
     def _populateRoomDimension(self):
-        for _, v in self.Z.iteritems(): # for each zone            
-            for rk, rv in v.iteritems():  # for each room
-                self.RoomDim[rk] = [rv['Width'], rv['Length'], rv['Height']]
+        rooms = self._getRooms()
+        self.DIM = np.array([[rooms[r]['Width'], rooms[r]['Length'], rooms[r]['Height']] for r in self.RL], dtype=np.float64)
                 
-    #TODO: populate all data in room_config. Now only two!!
     def _populateRoomThermalProperties(self):
-        for _, v in self.Z.iteritems(): # for each zone            
-            for rk, rv in v.iteritems():  # for each room
-                #=========================================
-                # Given zone i is adjacent to zone j
-                # CR - R(i)
-                # R1 - R(i, j)
-                # R2 - Rmid(i,j)
-                # R3 - R(j, i)
-                # C1 - C(i, j)
-                # C2 - C(j, i)                
-                #=========================================
-                self.C[rk] = rv['CR']
-                self.Rij[rk] = rv['Wall1']['R1']
-                self.Rik[rk] = rv['Wall2']['R1']
-                self.Ril[rk] = rv['Wall3']['R1']
-                self.Rio[rk] = rv['Wall4']['R1']
-                self.Rif[rk] = rv['Floor']['R1']
-                self.Ric[rk] = rv['Ceiling']['R1']
-                
-                self.Rimj[rk] = rv['Wall1']['R2']
-                self.Rimk[rk] = rv['Wall2']['R2']
-                self.Riml[rk] = rv['Wall3']['R2']
-                self.Rimo[rk] = rv['Wall4']['R2']
-                self.Rimf[rk] = rv['Floor']['R2']
-                self.Rimc[rk] = rv['Ceiling']['R2']
-                
-                self.Rji[rk] = rv['Wall1']['R3']
-                self.Rki[rk] = rv['Wall2']['R3']
-                self.Rli[rk] = rv['Wall3']['R3']
-                self.Roi[rk] = rv['Wall4']['R3']
-                self.Rfi[rk] = rv['Floor']['R3']
-                self.Rci[rk] = rv['Ceiling']['R3']
-                
-                self.Rwij[rk] = rv['Wall1']['RW']
-                self.Rwik[rk] = rv['Wall2']['RW']
-                self.Rwil[rk] = rv['Wall3']['RW']
-                self.Rwio[rk] = rv['Wall4']['RW']
-                
-                self.Cij[rk] = rv['Wall1']['C1']
-                self.Cik[rk] = rv['Wall2']['C1']
-                self.Cil[rk] = rv['Wall3']['C1']
-                self.Cio[rk] = rv['Wall4']['C1']
-                self.Cif[rk] = rv['Floor']['C1']
-                self.Cic[rk] = rv['Ceiling']['C1']
-                
-                self.Cji[rk] = rv['Wall1']['C2']
-                self.Cki[rk] = rv['Wall2']['C2']
-                self.Cli[rk] = rv['Wall3']['C2']
-                self.Coi[rk] = rv['Wall4']['C2']
-                self.Cfi[rk] = rv['Floor']['C2']
-                self.Cci[rk] = rv['Ceiling']['C2']
-
+        rooms = self._getRooms()
+        for [name, section, key] in self.PARAM:
+            if section is None:
+                self.P[name] = np.array([rooms[r][key] for r in self.RL], dtype=np.float64)
+            else:
+                self.P[name] = np.array([rooms[r][section][key] for r in self.RL], dtype=np.float64)
         
     def _populateRoomSolarGain(self):
-        for _, v in self.Z.iteritems(): # for each zone            
-            for rk, rv in v.iteritems():  # for each room
-                self.RoomSolarGain[rk] = []
-                for _, tv in self.TS.iteritems():
-                    self.RoomSolarGain[rk].append(self._getRoomSolarGainByTime(tv, rv))
-#                 logging.debug("Solar Gain of room[%s] = %s" %(rk, self.RoomSolarGain[rk]))
-                
-    def _getRoomSolarGainByTime(self, ts, rprop):        
-#         logging.debug("current time: %s, room prop: %s" %(ts.time(), rprop))
-        if ts.time() >= self.AM.time() and ts.time() < self.NOON.time():
-            return self._getMorningSolarGain(rprop)
-        elif ts.time() >= self.NOON.time() and ts.time() < self.PM.time():
-            return self._getNoonSolarGain(rprop)
-        elif ts.time() >= self.PM.time() and ts.time() < self.NIGHT.time():
-            return self._getEveningSolarGain(rprop)            
-        else:            
-#             logging.debug("Night. No Solar Gain")
-            return [0,0,0,0,0]
-       
-    def _getMorningSolarGain(self, rprop):
-        Qs = []
-        if (rprop['Wall1']['HasWindow'] == 1):
-            Qs.append(float((rprop['Wall1']['WinWidth']*rprop['Wall1']['WinHeight'])*rprop['Wall1']['QS_AM'])/1000)
-        else:
-            Qs.append(0)
-            
-        if (rprop['Wall2']['HasWindow'] == 1):
-            Qs.append(float((rprop['Wall2']['WinWidth']*rprop['Wall2']['WinHeight'])*rprop['Wall2']['QS_AM'])/1000)
-        else:
-            Qs.append(0)
-            
-        if (rprop['Wall3']['HasWindow'] == 1):
-            Qs.append(float((rprop['Wall3']['WinWidth']*rprop['Wall3']['WinHeight'])*rprop['Wall3']['QS_AM'])/1000)
-        else:
-            Qs.append(0)
-                
-        if (rprop['Wall4']['HasWindow'] == 1):
-            Qs.append(float((rprop['Wall4']['WinWidth']*rprop['Wall4']['WinHeight'])*rprop['Wall4']['QS_AM'])/1000)
-        else:
-            Qs.append(0)
-            
-        #TODO: currently assume only Wall1 has window
-        Qs.append(float((rprop['Wall1']['WinWidth']*rprop['Wall1']['WinHeight'])*rprop['Floor']['QS_AM'])/1000)
-            
-        return Qs
-            
-    def _getNoonSolarGain(self, rprop):
-        Qs = []
-        if (rprop['Wall1']['HasWindow'] == 1):
-            Qs.append(float((rprop['Wall1']['WinWidth']*rprop['Wall1']['WinHeight'])*rprop['Wall1']['QS_NOON'])/1000)
-        else:
-            Qs.append(0)
-            
-        if (rprop['Wall2']['HasWindow'] == 1):
-            Qs.append(float((rprop['Wall2']['WinWidth']*rprop['Wall2']['WinHeight'])*rprop['Wall2']['QS_NOON'])/1000)
-        else:
-            Qs.append(0)
-            
-        if (rprop['Wall3']['HasWindow'] == 1):
-            Qs.append(float((rprop['Wall3']['WinWidth']*rprop['Wall3']['WinHeight'])*rprop['Wall3']['QS_NOON'])/1000)
-        else:
-            Qs.append(0)
-            
-        if (rprop['Wall4']['HasWindow'] == 1):
-            Qs.append(float((rprop['Wall4']['WinWidth']*rprop['Wall4']['WinHeight'])*rprop['Wall4']['QS_NOON'])/1000)
-        else:
-            Qs.append(0)
-            
-        #TODO: currently assume only Wall1 has window
-        Qs.append(float((rprop['Wall1']['WinWidth']*rprop['Wall1']['WinHeight'])*rprop['Floor']['QS_NOON'])/1000)
-            
-        return Qs
-            
-    def _getEveningSolarGain(self, rprop):
+        # Solar gain only depends on the period of the day, classify each slot once
+        am = self.TG.getTimeOfDayMask(self.AM.strftime("%H:%M"), self.NOON.strftime("%H:%M")).astype(bool)
+        noon = self.TG.getTimeOfDayMask(self.NOON.strftime("%H:%M"), self.PM.strftime("%H:%M")).astype(bool)
+        pm = self.TG.getTimeOfDayMask(self.PM.strftime("%H:%M"), self.NIGHT.strftime("%H:%M")).astype(bool)
+        
+        rooms = self._getRooms()
+        self.QS = np.zeros((len(self.RL), self.TG.getNumTimeSlot(), 5), dtype=np.float64)
+        for r in xrange(len(self.RL)):
+            rv = rooms[self.RL[r]]
+            # Earlier period takes precedence if periods overlap
+            self.QS[r][pm] = self._getSolarGain(rv, 'QS_PM')
+            self.QS[r][noon] = self._getSolarGain(rv, 'QS_NOON')
+            self.QS[r][am] = self._getSolarGain(rv, 'QS_AM')
+#             logging.debug("Solar Gain of room[%s] = %s" %(self.RL[r], self.QS[r]))
+            
+    def _getSolarGain(self, rprop, period):
         Qs = []
-        if (rprop['Wall1']['HasWindow'] == 1):
-            Qs.append(float((rprop['Wall1']['WinWidth']*rprop['Wall1']['WinHeight'])*rprop['Wall1']['QS_PM'])/1000)
-        else:
-            Qs.append(0)
-            
-        if (rprop['Wall2']['HasWindow'] == 1):
-            Qs.append(float((rprop['Wall2']['WinWidth']*rprop['Wall2']['WinHeight'])*rprop['Wall2']['QS_PM'])/1000)
-        else:
-            Qs.append(0)
-            
-        if (rprop['Wall3']['HasWindow'] == 1):
-            Qs.append(float((rprop['Wall3']['WinWidth']*rprop['Wall3']['WinHeight'])*rprop['Wall3']['QS_PM'])/1000)
-        else:
-            Qs.append(0)
-            
-        if (rprop['Wall4']['HasWindow'] == 1):
-            Qs.append(float((rprop['Wall4']['WinWidth']*rprop['Wall4']['WinHeight'])*rprop['Wall4']['QS_PM'])/1000)
-        else:
-            Qs.append(0)
+        for wall in ['Wall1', 'Wall2', 'Wall3', 'Wall4']:
+            if (rprop[wall]['HasWindow'] == 1):
+                Qs.append(float((rprop[wall]['WinWidth']*rprop[wall]['WinHeight'])*rprop[wall][period])/1000)
+            else:
+                Qs.append(0)
             
         #TODO: currently assume only Wall1 has window
-        Qs.append(float((rprop['Wall1']['WinWidth']*rprop['Wall1']['WinHeight'])*rprop['Floor']['QS_PM'])/1000)
+        Qs.append(float((rprop['Wall1']['WinWidth']*rprop['Wall1']['WinHeight'])*rprop['Floor'][period])/1000)
             
         return Qs
     
-#     =====================================================================
-            
-    def getRoomC(self, rname):
-        return float(self.C.get(rname))
-    
-    def getRoomRij(self, rname):
-        return float(self.Rij.get(rname))    
-    def getRoomRik(self, rname):
-        return float(self.Rik.get(rname))    
-    def getRoomRil(self, rname):
-        return float(self.Ril.get(rname))    
-    def getRoomRio(self, rname):
-        return float(self.Rio.get(rname))    
-    def getRoomRif(self, rname):
-        return float(self.Rif.get(rname))    
-    def getRoomRic(self, rname):
-        return float(self.Ric.get(rname))    
-    
-    def getRoomRimj(self, rname):
-        return float(self.Rimj.get(rname))    
-    def getRoomRimk(self, rname):
-        return float(self.Rimk.get(rname))   
-    def getRoomRiml(self, rname):
-        return float(self.Riml.get(rname))   
-    def getRoomRimo(self, rname):
-        return float(self.Rimo.get(rname))   
-    def getRoomRimf(self, rname):
-        return float(self.Rimf.get(rname))   
-    def getRoomRimc(self, rname):
-        return float(self.Rimc.get(rname))   
-    
-    def getRoomRji(self, rname):
-        return float(self.Rji.get(rname))         
-    def getRoomRki(self, rname):
-        return float(self.Rki.get(rname))
-    def getRoomRli(self, rname):
-        return float(self.Rli.get(rname))
-    def getRoomRoi(self, rname):
-        return float(self.Roi.get(rname))
-    def getRoomRfi(self, rname):
-        return float(self.Rfi.get(rname))
-    def getRoomRci(self, rname):
-        return float(self.Rci.get(rname))
+    def _populateRoomCoefficients(self):
+        #TODO: For the moment, only 1 wall could have window. Test with more windows
+        C = self.P['C']
+        R = np.column_stack([self.P['Rij'], self.P['Rik'], self.P['Ril'], self.P['Rio'], self.P['Rif'], self.P['Ric'], self.P['Rwij']])
+        self.RCOEF = np.column_stack([self.DT / C, self.DT / (C[:, np.newaxis] * R)])
+        
+    def _populateNodeCoefficients(self):
+        for node, [c, rd, re, cs] in self.NODE.iteritems():
+            C = self.P[c]
+            A = self.DT / C
+            H = 1-(A*((1/self.P[re]) + (1/self.P[rd])))
+            D = self.DT / (C * self.P[rd])
+            E = self.DT / (C * self.P[re])
+            S = self.DT / self.P[cs]
+            self.NCOEF[node] = np.column_stack([A, H, D, E, S])
     
-    def getRoomRwij(self, rname):
-        return float(self.Rwij.get(rname))        
-    def getRoomRwik(self, rname):
-        return float(self.Rwik.get(rname))
-    def getRoomRwil(self, rname):
-        return float(self.Rwil.get(rname))
-    def getRoomRwio(self, rname):
-        return float(self.Rwio.get(rname))
-
-    def getRoomCij(self, rname):
-        return float(self.Cij.get(rname))    
-    def getRoomCik(self, rname):
-        return float(self.Cik.get(rname))    
-    def getRoomCil(self, rname):
-        return float(self.Cil.get(rname))    
-    def getRoomCio(self, rname):
-        return float(self.Cio.get(rname))    
-    def getRoomCif(self, rname):
-        return float(self.Cif.get(rname))    
-    def getRoomCic(self, rname):
-        return float(self.Cic.get(rname))    
+#     =====================================================================
     
-    def getRoomCji(self, rname):
-        return float(self.Cji.get(rname))         
-    def getRoomCki(self, rname):
-        return float(self.Cki.get(rname))
-    def getRoomCli(self, rname):
-        return float(self.Cli.get(rname))
-    def getRoomCoi(self, rname):
-        return float(self.Coi.get(rname))
-    def getRoomCfi(self, rname):
-        return float(self.Cfi.get(rname))
-    def getRoomCci(self, rname):
-        return float(self.Cci.get(rname))      
+    def getRoomParam(self, ridx, param):
+        return float(self.P[param][ridx])
             
-    def getRoomDim(self, rname):
-        return self.RoomDim.get(rname)
+    def getRoomDim(self, ridx):
+        return self.DIM[ridx].tolist()
+    
+    def getRoomCoefficients(self, ridx):
+        return self.RCOEF[ridx].tolist()
     
-    def getRoomSolarGainByTime(self, slot, rname, wall):
-        return float(self.RoomSolarGain.get(rname)[slot][wall])
-#         logging.debug("Room 0 slot 0 Qs =  %s" %(EAMS.getRoomSolarGain(0,0)))
+    def getNodeCoefficients(self, ridx, node):
+        return self.NCOEF[node][ridx].tolist()
     
+    def getRoomSolarGainByTime(self, slot, ridx, wall):
+        return float(self.QS[ridx, slot, wall])
     
-    
\ No newline at end of file
+    def getRoomSolarGainTable(self, ridx, wall):
+        return self.QS[ridx, :, wall].tolist()
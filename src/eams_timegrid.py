@@ -0,0 +1,123 @@
+import logging
+import numpy as np
+from datetime import datetime
+from datetime import timedelta
+
+#TODO: form working hour timeslot only
+
+class TimeGrid:    
+    def __init__(self, start, end, interval):   
+        self.start = datetime.strptime(start, "%Y-%m-%d %H:%M")  
+        self.end = datetime.strptime(end, "%Y-%m-%d %H:%M")
+        self.interval = interval  
+        self.step = timedelta(minutes=self.interval)
+        
+        #TODO: check start time must have tm_min=00, else invalid
+        self.timeslots = {}         # idx -> datetime, kept for EAMS.TS
+        self.tslist = []            # idx -> datetime
+        self.tstamps = None         # numpy datetime64 array of slot timestamps
+        self.tod = None             # numpy array of minute of the day of each slot
+        self.days = {}              # (day start, day end) -> [daily slot idx, day idx of each slot]
+        self._createTimeSlot()
+    
+    def _createTimeSlot(self):
+        logging.info("Populate timeslot between %s and %s for %s mins interval" %(self.start, self.end, self.interval))
+        curr_time = self.start
+        self.tslist.append(curr_time)
+        while curr_time < self.end:          
+            curr_time = curr_time + self.step
+            self.tslist.append(curr_time)
+        
+        for idx in xrange(len(self.tslist)):
+            self.timeslots[idx] = self.tslist[idx]
+        
+        self.tstamps = np.array(self.tslist, dtype='datetime64[m]')
+        self.tod = np.array([v.hour*60 + v.minute for v in self.tslist], dtype=np.int32)
+        
+    def _getMinuteOfDay(self, hm):
+        t = datetime.strptime(hm, "%H:%M")
+        return t.hour*60 + t.minute
+    
+    def getTimeSlots(self):
+        return self.timeslots
+    
+    def getTimeSlotList(self):
+        return self.tslist
+    
+    def getTimeStamps(self):
+        return self.tstamps
+    
+    def getNumTimeSlot(self):
+        return len(self.tslist)
+        
+    def getTimeSlotIdxByString(self, dts):        
+        return self.getTimeSlotIdxByDatetime(datetime.strptime(dts, "%Y-%m-%d %H:%M:%S"))
+    
+    def getTimeSlotIdxByDatetime(self, dt):        
+        """Slot index of dt, or None if dt is not on the grid"""
+        offset = dt - self.start
+        if offset.days < 0 or offset.microseconds:
+            return None
+        
+        secs = offset.days*86400 + offset.seconds
+        if secs % (self.interval*60):
+            return None
+        
+        idx = secs / (self.interval*60)
+        if idx >= len(self.tslist):
+            return None
+        return idx
+    
+    def getTimeOfDayMask(self, start, end):
+        """0/1 mask of slots with time of the day within [start, end), start and end in %H:%M"""
+        s = self._getMinuteOfDay(start)
+        e = self._getMinuteOfDay(end)
+        return ((self.tod >= s) & (self.tod < e)).astype(np.int8)
+    
+    def getHVACStdHourMask(self, non_peak_off, shut_down, turn_on):
+        """0/1 mask of slots in standard operating hour of HVAC (i.e. always on)"""
+        if non_peak_off == '1':
+            s = self._getMinuteOfDay(shut_down)
+            e = self._getMinuteOfDay(turn_on)
+            return (~((self.tod >= s) | (self.tod < e))).astype(np.int8)
+        return np.ones(len(self.tslist), dtype=np.int8)
+    
+    def _populateDays(self, dstart, dend):
+        """Pair each dstart slot with the following dend slot as a day"""
+        s = self._getMinuteOfDay(dstart)
+        e = self._getMinuteOfDay(dend)
+        
+        k_m = []
+        slot_day = np.empty(len(self.tslist), dtype=np.int32)
+        slot_day.fill(-1)
+        d_start = -1
+        for k in np.flatnonzero((self.tod == s) | (self.tod == e)):
+            k = int(k)
+            if self.tod[k] == s:
+                if d_start == -1:
+                    d_start = k
+                else:
+                    logging.error("d_end or d_start != -1. Invalid start/end scheduling period")
+            
+            if self.tod[k] == e and d_start != -1:
+                slot_day[d_start:k+1] = len(k_m)
+                k_m.append([d_start, k])
+                d_start = -1
+                
+        self.days[(dstart, dend)] = [k_m, slot_day]
+        
+    def getDailySlotIdx(self, dstart="09:00", dend="16:30"):
+        """List of [first slot, last slot] of every day"""
+        if (dstart, dend) not in self.days:
+            self._populateDays(dstart, dend)
+        return self.days.get((dstart, dend))[0]
+    
+    def getDayForSlotIdx(self, k, dstart="09:00", dend="16:30"):
+        """Day index of slot k, or None if k is not within a day"""
+        if (dstart, dend) not in self.days:
+            self._populateDays(dstart, dend)
+        d = self.days.get((dstart, dend))[1][k]
+        if d < 0:
+            return None
+        return int(d)
+            
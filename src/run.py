@@ -32,9 +32,20 @@ def run_it(cfg_data, runcfg):
             lns_solver.log_all()        # Option 3: Note: call this only if schedule + HVAC model is run.
              
 
+def resume_it(fn):
+    
+    lns_solver = Solver_LNS()
+    lns_solver.resume(fn)
+    lns_solver.log_all()
+    
+
 if __name__ == '__main__':    
           
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 2 and sys.argv[1] == '-resume':
+        # Continue a run from its checkpoint, i.e. python run.py -resume Output/<case>_LNS_checkpoint
+        resume_it(sys.argv[2].strip())
+        
+    elif len(sys.argv) > 1:
         file_location = sys.argv[1].strip()
         run_config_file = open(file_location, 'r')
         cfg_data = ''.join(run_config_file.readlines())
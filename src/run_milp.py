@@ -35,6 +35,7 @@ def run_it(cfg_data, runcfg):
         milp_solver.logEnergy(runcfg, casecfgid[1])
         milp_solver.logSchedules(casecfgid[1])
         milp_solver.logTemperatures(casecfgid[1])
+        milp_solver.logBuildProfile(casecfgid[1])
             
 
 if __name__ == '__main__':    
@@ -0,0 +1,60 @@
+import os
+import logging
+import cPickle as pickle
+from time import time
+
+class LNS_Checkpoint:
+    """On-disk checkpoint of an LNS run, taken every PERIOD_SEC. See Solver_LNS.resume()
+       The state is pickled to a temp file, synced to disk and renamed over the checkpoint, 
+       so a run killed at any time leaves either the previous or the new checkpoint, never a partial one."""
+    
+    def __init__(self, fn, period):
+        self.CKPT_VERSION = 1           # bump this whenever the content of a checkpoint changes
+        self.fn = fn
+        self.PERIOD_SEC = period        # <= 0 to disable
+        self.last_t = None              # time() of the last save()
+        
+    def isEnabled(self):
+        return self.PERIOD_SEC > 0
+    
+    def isDue(self):
+        return self.isEnabled() and (self.last_t is None or (time() - self.last_t) >= self.PERIOD_SEC)
+    
+    def save(self, state):
+        try:
+            tmp = self.fn + '.' + str(os.getpid())
+            f = open(tmp, 'wb')
+            try:
+                pickle.dump({'version': self.CKPT_VERSION, 'state': state}, f, pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            finally:
+                f.close()
+            if os.name == 'nt' and os.path.exists(self.fn):
+                os.remove(self.fn)      # rename does not replace an existing file on Windows
+            os.rename(tmp, self.fn)
+            self.last_t = time()
+            logging.info("Checkpoint is written to %s" %self.fn)
+            
+        except (IOError, OSError, pickle.PicklingError), e:
+            logging.error("Failed to write checkpoint %s. %s" %(self.fn, e))
+            
+    def load(self):
+        """Return the state of the checkpoint, or None if it does not exist or cannot be read"""
+        try:
+            f = open(self.fn, 'rb')
+            try:
+                entry = pickle.load(f)
+            finally:
+                f.close()
+            
+            if entry.get('version') != self.CKPT_VERSION:
+                logging.error("Checkpoint %s has version %s, expect %s." %(self.fn, entry.get('version'), self.CKPT_VERSION))
+                return None
+            
+            logging.info("Load checkpoint %s" %self.fn)
+            return entry.get('state')
+        
+        except (IOError, OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError), e:
+            logging.error("Failed to load checkpoint %s. %s" %(self.fn, e))
+            return None
@@ -3,11 +3,17 @@ import logging
 from math import ceil
 from time import time
 from datetime import datetime
-from random import randrange, sample
+from random import random, randrange, sample, getstate, setstate
 from configobj import ConfigObj, ConfigObjError, flatten_errors
 
 from eams import EAMS
 from solver_milp import Solver_MILP
+from solver_lns_parallel import LNS_WorkerPool
+from solver_lns_adaptive import LNS_OperatorSelector, LNS_DestroySizeController
+from solver_lns_tabu import TabuStore
+from solver_lns_budget import LNS_TimeBudget
+from solver_checkpoint import LNS_Checkpoint
+from solver_trace import LNS_Trace
 from solver_error import SOLVER_LNS_Error
 from plot_LNS import plot_LNS_graph
 
@@ -22,7 +28,10 @@ class Solver_LNS:
         self.TABU_LOC_ONLY = 0
         self.TABU_TIME_ONLY = 1
         self.TABU_LOC_N_TIME = 2
+        self.TABU_MTYPE_N_LOC = 3     # finer attributes of TABU_LOC_N_TIME, see LNS_TABU_ATTRIBUTE
+        self.TABU_LOC_N_DAY = 4
         self.RANDOMIZE_ORDER = 1
+        self.ADAPTIVE_ORDER = 2
         self.MIP_DEFAULT_NOTIMELIMIT = 1e+100
         
         # variable
@@ -36,10 +45,24 @@ class Solver_LNS:
         self.TABU_EXPIRED_TYPE                  = -1
         self.TABU_PERIOD_SEC                    = -1
         self.TABU_CYCLE                         = -1
+        self.LNS_TABU_ATTRIBUTE                 = 0     # tabu of meeting [m,l,k]. 1: also (meeting type, room), 2: also (meeting type, room) and (room, day)
         
         self.MIP_TIMELIMIT_SEC                  = -1
         self.MIP_LOG_CB                         = 0
         self.MIP_SOLUTION_LIMIT                 = -1
+        self.LNS_BUDGET_TAIL_SEC                = 0.0   # reserved at the end of LNS_TIMELIMIT_SEC for the final re-optimization and logging, at least MIP_TIMELIMIT_SEC, see LNS_TimeBudget
+        self.LNS_BUDGET_MIN_SOLVE_SEC           = 0.5   # no sub-MIP is started with less time left
+        self.LNS_CHECKPOINT_SEC                 = 0     # > 0 to checkpoint the run every LNS_CHECKPOINT_SEC, see resume()
+        self.LNS_LOG_VERBOSITY                  = 1     # 0: warning only, 1: per LNS run, 2: 1 + schedules & temperatures of every LNS run, 3: debug
+        self.LNS_NUM_WORKER                     = 1     # >1 to repair neighbourhoods in parallel, see _runParallel()
+        self.LNS_ADAPTIVE_DECAY                 = 0.8   # LNS_ORDER_RANDOMIZE = ADAPTIVE_ORDER: weight given to the history of a neighbourhood type
+        self.LNS_ADAPTIVE_MIN_WEIGHT            = 0.05  # LNS_ORDER_RANDOMIZE = ADAPTIVE_ORDER: min. weight of a neighbourhood type, relative to the largest
+        self.LNS_ADAPTIVE_DESTROY               = 0     # 1 to tune LNS_MAX_*_DESTROY per neighbourhood type, see LNS_DestroySizeController
+        self.LNS_DESTROY_TARGET_LO              = 0.25  # LNS_ADAPTIVE_DESTROY: target sub-MIP runtime band, as fraction of MIP_TIMELIMIT_SEC
+        self.LNS_DESTROY_TARGET_HI              = 0.75
+        self.LNS_DESTROY_INIT_FRACTION          = 0.1   # LNS_ADAPTIVE_DESTROY: initial fraction if LNS_MAX_*_DESTROY is random (-1)
+        self.LNS_ENERGY_NOISE                   = 0.5   # ENERGY_GUIDED: energy of a meeting is scaled by a random factor in [1, 1+noise]
+        self.LNS_ENERGY_PRECOOL_SLOT            = 4     # ENERGY_GUIDED: slots before a meeting which count towards its energy (pre-cooling)
         
         self.LNS_OBJVALUE_EPSILON = 1.0e-06
         
@@ -60,6 +83,16 @@ class Solver_LNS:
         self.logger.setLevel(logging.INFO)
 #         self.logger.setLevel(logging.DEBUG)
 
+    def _applyLogVerbosity(self):
+        """Set the log level and the per LNS run schedule & temperature dumps of milp_solver according to LNS_LOG_VERBOSITY"""
+        if self.LNS_LOG_VERBOSITY <= 0:
+            self.logger.setLevel(logging.WARNING)
+        elif self.LNS_LOG_VERBOSITY >= 3:
+            self.logger.setLevel(logging.DEBUG)
+        else:
+            self.logger.setLevel(logging.INFO)
+        self.milp_solver.LOG_MIP_EAMS = int(self.LNS_LOG_VERBOSITY >= 2)
+        
     def _activateLogFile(self, f):        
         # remove old handler
         for old_handler in self.logger.handlers:
@@ -80,6 +113,10 @@ class Solver_LNS:
                 ns.append("RANDOM_RANGE_TIME_N_LOCATION")
             elif idxlist[i] == '3':
                 ns.append("ARBITRARY_MEETING")
+            elif idxlist[i] == '4':
+                ns.append("RELATED_MEETING")
+            elif idxlist[i] == '5':
+                ns.append("ENERGY_GUIDED")
             else:
                 ns.append("UNKNOWN")                
         return ns
@@ -97,7 +134,7 @@ class Solver_LNS:
             self.LNS_EXPLORE_MAX_ITERATION = int(config['LNS_EXPLORE_MAX_ITERATION'])
             self.LNS_NEIGHOURHOOD_ORDER = self._getNeighbourhoodOrder(list(config['LNS_NEIGHOURHOOD_ORDER']))                        
             self.NUM_NEIGHBOURHOOD_TYPE = len(self.LNS_NEIGHOURHOOD_ORDER)
-            if self.NUM_NEIGHBOURHOOD_TYPE > 4:  #TODO: currently max 4 types of neighbourhood only
+            if self.NUM_NEIGHBOURHOOD_TYPE > 6:  #TODO: currently max 6 types of neighbourhood only
                 raise ValueError("self.NUM_NEIGHBOURHOOD_TYPE=%d, self.LNS_NEIGHOURHOOD_ORDER=%s" %(self.NUM_NEIGHBOURHOOD_TYPE, self.LNS_NEIGHOURHOOD_ORDER))
             
             self.LNS_ORDER_RANDOMIZE = int(config['LNS_ORDER_RANDOMIZE'])
@@ -107,14 +144,28 @@ class Solver_LNS:
             self.TABU_EXPIRED_TYPE = int(config['TABU_EXPIRED_TYPE'])
             self.TABU_PERIOD_SEC = int(config['TABU_PERIOD_SEC']) 
             self.TABU_CYCLE = int(config['TABU_CYCLE'])
+            self.LNS_TABU_ATTRIBUTE = int(config.get('LNS_TABU_ATTRIBUTE', 0))
             
             self.MIP_TIMELIMIT_SEC = float(config['MIP_TIMELIMIT_SEC'])
             self.MIP_LOG_CB = int(config['MIP_LOG_CB'])
             self.MIP_SOLUTION_LIMIT = -1 #int(config['MIP_SOLUTION_LIMIT'])
+            self.LNS_BUDGET_TAIL_SEC = float(config.get('LNS_BUDGET_TAIL_SEC', 0.0))
+            self.LNS_BUDGET_MIN_SOLVE_SEC = float(config.get('LNS_BUDGET_MIN_SOLVE_SEC', 0.5))
+            self.LNS_CHECKPOINT_SEC = float(config.get('LNS_CHECKPOINT_SEC', 0))
+            self.LNS_LOG_VERBOSITY = int(config.get('LNS_LOG_VERBOSITY', 1))
             
             self.LNS_MAX_K_DESTROY = float(config['LNS_MAX_K_DESTROY'])
             self.LNS_MAX_L_DESTROY = float(config['LNS_MAX_L_DESTROY'])
             self.LNS_MAX_M_DESTROY = float(config['LNS_MAX_M_DESTROY'])
+            self.LNS_NUM_WORKER = int(config.get('LNS_NUM_WORKER', 1))
+            self.LNS_ADAPTIVE_DECAY = float(config.get('LNS_ADAPTIVE_DECAY', 0.8))
+            self.LNS_ADAPTIVE_MIN_WEIGHT = float(config.get('LNS_ADAPTIVE_MIN_WEIGHT', 0.05))
+            self.LNS_ADAPTIVE_DESTROY = int(config.get('LNS_ADAPTIVE_DESTROY', 0))
+            self.LNS_DESTROY_TARGET_LO = float(config.get('LNS_DESTROY_TARGET_LO', 0.25))
+            self.LNS_DESTROY_TARGET_HI = float(config.get('LNS_DESTROY_TARGET_HI', 0.75))
+            self.LNS_DESTROY_INIT_FRACTION = float(config.get('LNS_DESTROY_INIT_FRACTION', 0.1))
+            self.LNS_ENERGY_NOISE = float(config.get('LNS_ENERGY_NOISE', 0.5))
+            self.LNS_ENERGY_PRECOOL_SLOT = int(config.get('LNS_ENERGY_PRECOOL_SLOT', 4))
                         
             logging.info("=====================================================")
             logging.info("    Initialize LNS    ")
@@ -123,13 +174,18 @@ class Solver_LNS:
             logging.info("LNS time limit: %d" %(self.LNS_TIMELIMIT_SEC))
             logging.info("MIP time limit: %d" %(self.MIP_TIMELIMIT_SEC))
             logging.info("MIP solution limit: %d" %(self.MIP_SOLUTION_LIMIT))
+            logging.info("LNS time budget tail: %g s, min. sub-MIP time: %g s" %(self.LNS_BUDGET_TAIL_SEC, self.LNS_BUDGET_MIN_SOLVE_SEC))
             logging.info("Neighbourhood order: %s" %(self.LNS_NEIGHOURHOOD_ORDER))
             logging.info("Number of neighbourhood type: %d" %(self.NUM_NEIGHBOURHOOD_TYPE))
-            logging.info("Randomize neighbourhood change order?: %d" %(self.LNS_ORDER_RANDOMIZE))
+            logging.info("Randomize neighbourhood change order? (0: fixed, 1: random, 2: adaptive): %d" %(self.LNS_ORDER_RANDOMIZE))
             logging.info("LNS explore max iteration: %d" %(self.LNS_EXPLORE_MAX_ITERATION))
             logging.info("Percent of occupied slot to be destroyed: %g" %(self.LNS_MAX_K_DESTROY))
             logging.info("Percent of occupied location to be destroyed: %g" %(self.LNS_MAX_L_DESTROY))
             logging.info("Percent of occupied meeting to be destroyed: %g" %(self.LNS_MAX_M_DESTROY))
+            logging.info("Number of LNS workers: %d" %(self.LNS_NUM_WORKER))
+            logging.info("Adaptive neighbourhood weight decay: %g, min. weight: %g" %(self.LNS_ADAPTIVE_DECAY, self.LNS_ADAPTIVE_MIN_WEIGHT))
+            logging.info("Adaptive destroy size: %d, target sub-MIP runtime band: [%g, %g] x MIP time limit, initial fraction: %g" %(self.LNS_ADAPTIVE_DESTROY, self.LNS_DESTROY_TARGET_LO, self.LNS_DESTROY_TARGET_HI, self.LNS_DESTROY_INIT_FRACTION))
+            logging.info("Energy-guided destroy noise: %g, pre-cooling slots: %d" %(self.LNS_ENERGY_NOISE, self.LNS_ENERGY_PRECOOL_SLOT))
              
         except (ConfigObjError, IOError), e:        
             logging.critical('%s' % (e))
@@ -160,6 +216,7 @@ class Solver_LNS:
         self.casecfgid = casecfgid[1] + '_OPTCFG_' + str(lnscount)
         self.casecfgid_LNS_stats_only = casecfgid[1]  
         self.runcfg = runcfg
+        self.casecfg = casecfg
         
         # Activate log file
 #         fn = 'Output\EAMS_LNS_' + self.casecfgid + '_' + datetime.now().strftime('%Y_%m_%d_%H_%M_%S_%f')
@@ -173,13 +230,12 @@ class Solver_LNS:
          
         # Initialize & Read EAMS
         if reloadEAMS:
-            enable_log = 0   # do not need to enable log from within EAMS, it has been done by solver_lns ... this param is for solver_milp which need to log eams w/o LNS
-            self.eams = EAMS(enable_log)        
-            self.eams.readProblemInstance(casecfg, enable_log)
+            self._loadEAMS(casecfg)
         
         # Initialize MILP
         #     Note: self.MIP_TIMELIMIT_SEC = -1 for initial solution. For subsequent LNS-MIP, updateGurobiParam after getting initial solution
         self.milp_solver = Solver_MILP(self.eams, fn, self.casecfgid, self.MIP_SOLUTION_LIMIT, self.MIP_LOG_CB)   
+        self._applyLogVerbosity()
         
     #===========================================================================
     # EAMS_LNS INIT SMAC
@@ -198,6 +254,7 @@ class Solver_LNS:
         self.casecfgid = casecfgid[1] + '_OPTCFG_' + datetime.now().strftime('%Y_%m_%d_%H_%M_%S_%f')
         self.casecfgid_LNS_stats_only = casecfgid[1]  
         self.runcfg = runcfg
+        self.casecfg = casecfg
         
         # Activate log file
         fn = 'Output/EAMS_LNS_' + self.casecfgid
@@ -224,6 +281,7 @@ class Solver_LNS:
         self.TABU_EXPIRED_TYPE = 0
         self.TABU_CYCLE = 1
         self.MIP_LOG_CB = 0       
+        self.LNS_NUM_WORKER = 1
                 
         logging.info("=====================================================")
         logging.info("    Initialize LNS    ")
@@ -234,7 +292,7 @@ class Solver_LNS:
         logging.info("MIP solution limit: %d" %(self.MIP_SOLUTION_LIMIT))
         logging.info("Neighbourhood order: %s" %(self.LNS_NEIGHOURHOOD_ORDER))
         logging.info("Number of neighbourhood type: %d" %(self.NUM_NEIGHBOURHOOD_TYPE))
-        logging.info("Randomize neighbourhood change order?: %d" %(self.LNS_ORDER_RANDOMIZE))
+        logging.info("Randomize neighbourhood change order? (0: fixed, 1: random, 2: adaptive): %d" %(self.LNS_ORDER_RANDOMIZE))
         logging.info("LNS explore max iteration: %d" %(self.LNS_EXPLORE_MAX_ITERATION))
         logging.info("Percent of occupied slot to be destroyed: %g" %(self.LNS_MAX_K_DESTROY))
         logging.info("Percent of occupied location to be destroyed: %g" %(self.LNS_MAX_L_DESTROY))
@@ -242,14 +300,70 @@ class Solver_LNS:
          
          
         # Initialize & Read EAMS
-        enable_log = 0   # do not need to enable log from within EAMS, it has been done by solver_lns ... this param is for solver_milp which need to log eams w/o LNS
-        self.eams = EAMS(enable_log)        
-        self.eams.readProblemInstance(casecfg, enable_log) # casecfg is the eams config file
+        self._loadEAMS(casecfg) # casecfg is the eams config file
          
         # Initialize MILP
         #     Note: self.MIP_TIMELIMIT_SEC = -1 for initial solution. For subsequent LNS-MIP, updateGurobiParam after getting initial solution        
         self.milp_solver = Solver_MILP(self.eams, fn, self.casecfgid, -1, self.MIP_LOG_CB) 
+        self._applyLogVerbosity()
      
+    def _loadEAMS(self, casecfg, meetings=None):
+        """Read the problem instance. meetings: meeting keys in the order of a checkpointed run, see resume()"""
+        enable_log = 0   # do not need to enable log from within EAMS, it has been done by solver_lns ... this param is for solver_milp which need to log eams w/o LNS
+        self.eams = EAMS(enable_log)        
+        self.eams.readProblemInstance(casecfg, enable_log, meetings)
+        
+    #===========================================================================
+    # EAMS_LNS Resume
+    #===========================================================================
+    def resume(self, fn):
+        """Continue an LNS run from its checkpoint fn (see LNS_CHECKPOINT_SEC) instead of init_run() + run(). 
+           Return the best objective value."""
+        state = LNS_Checkpoint(fn, 0).load()
+        if state is None:
+            self._lns_critical_err("Failed to load checkpoint %s" %fn)
+        
+        self.runcfg = state['runcfg']
+        self.casecfg = state['casecfg']
+        self.casecfgid = state['casecfgid']
+        self.casecfgid_LNS_stats_only = state['casecfgid_LNS_stats_only']
+        
+        # Activate log file
+        logfn = 'Output/EAMS_LNS_' + self.casecfgid + '_' + datetime.now().strftime('%Y_%m_%d_%H_%M_%S_%f')
+        self._activateLogFile(logfn)
+        logging.info("Resume LNS run #%d from checkpoint %s" %(state['lns_run_count'], fn))
+        
+        # LNS configuration & benchmark
+        self.__dict__.update(state['param'])
+        
+        # Read EAMS, the meeting list is in the order of the checkpointed run
+        self._loadEAMS(self.casecfg, state['meetings'])
+        
+        # Initialize MILP from the incumbent, no initial schedule is solved
+        self.milp_solver = Solver_MILP(self.eams, logfn, self.casecfgid, -1, self.MIP_LOG_CB)
+        self._applyLogVerbosity()
+        self.milp_solver.initLNSWorkerModel(self.INIT_SOLTYPE, state['incumbent'])
+        self.milp_solver.updateGurobiParam(self.MIP_TIMELIMIT_SEC, self.MIP_SOLUTION_LIMIT)
+        
+        self.lns_run_count = state['lns_run_count']
+        self.curr_optval = state['curr_optval']
+        self.curr_best_schedule = state['curr_best_schedule']
+        self.curr_best_from_start_t = state['curr_best_from_start_t']
+        self.is_bestsche_initsol = state['is_bestsche_initsol']
+        self.tabu = state['tabu']
+        self.op_selector = state['op_selector']
+        self.destroy_ctrl = state['destroy_ctrl']
+        setstate(state['rng'])
+        
+        # Continue with the time budget left
+        self.start_t = time() - state['elapsed']
+        self.budget = LNS_TimeBudget(self.LNS_TIMELIMIT_SEC, self.MIP_TIMELIMIT_SEC, self.LNS_BUDGET_TAIL_SEC, self.LNS_BUDGET_MIN_SOLVE_SEC)
+        self.budget.start(self.start_t)
+        self.ckpt = self._initCheckpoint()
+        self.trace = self._initTrace()
+        logging.info("+++++++++++++++++++++++++++ Resumed optimal value :  %g, %g s of LNS time budget used" %(self.curr_optval, state['elapsed']))
+        
+        return self._runLNS()
         
     def run(self):
         
@@ -258,16 +372,16 @@ class Solver_LNS:
         self.lns_run_count = 0
         self.curr_best_schedule = []
         self.curr_optval = -1
-        self.tabulist = {}
-        self.tabulist[self.TABU_LOC_ONLY] = {}
-        self.tabulist[self.TABU_TIME_ONLY] = {}
-        self.tabulist[self.TABU_LOC_N_TIME] = {}                
+        self.tabu = self._initTabuStore()
         # LNS Benchmark
         self.LNS_NS_TYPE = []
         self.LNS_NS_DESTROY = []
         self.LNS_NS_IMPACT = []
         self.LNS_NS_TYPE_POS_IMPACT = [0] * self.NUM_NEIGHBOURHOOD_TYPE
         self.LNS_NS_TYPE_TRIGGER = [0] * self.NUM_NEIGHBOURHOOD_TYPE
+        self.op_selector = LNS_OperatorSelector(self.LNS_NEIGHOURHOOD_ORDER, self.LNS_ADAPTIVE_DECAY, self.LNS_ADAPTIVE_MIN_WEIGHT)
+        self.destroy_ctrl = self._initDestroySizeController()
+        self.trace = self._initTrace()
         
         # Get initial schedule without HVAC model
             #         self.SCHE_TYPE_ARBITRARY = 0
@@ -310,12 +424,36 @@ class Solver_LNS:
             
         # Run LNS
         self.start_t = time()
-        curr_t = self.start_t
+        self.budget = LNS_TimeBudget(self.LNS_TIMELIMIT_SEC, self.MIP_TIMELIMIT_SEC, self.LNS_BUDGET_TAIL_SEC, self.LNS_BUDGET_MIN_SOLVE_SEC)
+        self.budget.start(self.start_t)
         self._storeCurrentBestSchedule(self.curr_optval, 1)                                        # TODO: this must be called only if initial FEASIBLE SOLUTION is available
         self.milp_solver.updateGurobiParam(self.MIP_TIMELIMIT_SEC, self.MIP_SOLUTION_LIMIT)     # Update this after initial solution (because we don't want to limit initial solution)
-           
+        self.ckpt = self._initCheckpoint()
+        self._saveCheckpoint(1)
+        
+        return self._runLNS()
+    
+    def _runLNS(self):
+        """Improve the incumbent until the time budget runs out. Return the best objective value."""
+        self.milp_solver.setDeadline(self.budget.getDeadline())
+        if self.LNS_NUM_WORKER > 1:
+            self._runParallel()
+        else:
+            self._runSequential()
+        self.milp_solver.setDeadline(None)
+                  
+        self._syncCurrentBestSchedule()
+        self._log_LNS_stats()
+        self.trace.close()
+        self.budget.stop()
+        self.budget.logSummary()
+#         plot_LNS_graph(self.casecfgid + '_LNS_trace', self.LNS_NEIGHOURHOOD_ORDER, 0, 2) #4,5
+
+        return self.curr_optval
+    
+    def _runSequential(self):
         # Run until system time limit is reached
-        while curr_t - self.start_t < self.LNS_TIMELIMIT_SEC:            
+        while not self.budget.isExpired():            
             # Restart from the first neighbourhood type everytime
             curr_nt = 0
             # Loop until all neighbourhood type is explored
@@ -325,21 +463,108 @@ class Solver_LNS:
                                               
                 # ChangeNeighbourhood (if necessary)
                 curr_nt = self.changeNeighbourhood(new_optval, self.curr_optval, curr_nt)
+                self._saveCheckpoint()
                                                    
                 # Prevent infinite loop. 
                 # Current implementation of changeNeighbourhood() might lead to infinite loop
                 #    when better solution is always found.
-                if (time() - self.start_t) > self.LNS_TIMELIMIT_SEC:
+                if self.budget.isExpired():
                     break
                
-            curr_t = time()
 #             print "***************************************** Last round solve time from the start time: ", curr_t - self.start_t," sec"
-            logging.info("***************************************** Last round solve time from the start time: %g sec" %(curr_t - self.start_t))
-                  
-        self._log_LNS_stats()
-#         plot_LNS_graph(self.casecfgid + '_LNS_trace', self.LNS_NEIGHOURHOOD_ORDER, 0, 2) #4,5
-
-        return self.curr_optval
+            logging.info("***************************************** Last round solve time from the start time: %g sec", self.budget.getElapsed())
+            
+    def _runParallel(self):
+        """LNS_NUM_WORKER workers repair different neighbourhoods of the shared incumbent at the same time.
+           Shake (destroy), tabu and acceptance are done here, so the tabu list and the incumbent stay consistent.
+           An improvement found by a worker becomes the incumbent, which is sent along with the next task of every worker.
+           If all workers fail, the remaining time is spent in _runSequential()."""
+        pool = LNS_WorkerPool(self.LNS_NUM_WORKER, self.eams, self.milp_solver.GUROBI_LOGFILE, self.casecfgid, 
+                              self.INIT_SOLTYPE, self.MIP_TIMELIMIT_SEC, self.budget.getDeadline(), self.LNS_OBJVALUE_EPSILON)
+        pool.start(self.milp_solver.incumbent)
+        
+        version = 0                                         # incremented every time the incumbent changes
+        worker_version = [0] * self.LNS_NUM_WORKER          # version of the incumbent every worker holds
+        worker_nt = [wid % self.NUM_NEIGHBOURHOOD_TYPE for wid in xrange(self.LNS_NUM_WORKER)]  # next neighbourhood type of every worker
+        idle = range(self.LNS_NUM_WORKER)
+        busy = set()
+        all_failed = False
+        
+        while True:
+            # Dispatch a neighbourhood to every idle worker until the system time limit is reached
+            while idle and not self.budget.isExpired():
+                wid = idle.pop(0)
+                nt = worker_nt[wid]
+                [locls, timels, mls] = self.shakeNeighbourhood(nt)
+                if len(locls) == 0 and len(timels) == 0 and len(mls) == 0:
+                    # All options are tabu-ed, try the next neighbourhood type on the next dispatch
+                    self.LNS_NS_TYPE.append(nt+10)
+                    self.LNS_NS_DESTROY.append(0)
+                    self.LNS_NS_IMPACT.append(0)
+                    self.LNS_NS_TYPE_TRIGGER[nt] = self.LNS_NS_TYPE_TRIGGER[nt] + 1
+                    logging.info("************************* All options are tabued. Worker %d changes neighbourhood.", wid)
+                    self._log_ObjValue_Neighbourhood(datetime.strftime(datetime.now(), "%Y-%m-%d %H:%M:%S"), self.curr_optval, nt+10, self.lns_run_count)
+                    worker_nt[wid] = self.changeNeighbourhood(self.curr_optval, self.curr_optval, nt) % self.NUM_NEIGHBOURHOOD_TYPE
+                    self.lns_run_count = self.lns_run_count+1
+                    idle.append(wid)
+                    if not busy:
+                        continue
+                    break
+                
+                sol = None
+                if worker_version[wid] != version:
+                    sol = self.milp_solver.incumbent
+                    worker_version[wid] = version
+                logging.info("Dispatch run #%d [%s] to worker %d", self.lns_run_count, self.LNS_NEIGHOURHOOD_ORDER[nt], wid)
+                pool.submit(wid, self.lns_run_count, nt, sol, locls, timels, mls, self.budget.getMIPTimeLimit())
+                busy.add(wid)
+                self.lns_run_count = self.lns_run_count+1
+            
+            if not busy:
+                break
+            
+            # Accept the result of a worker
+            [wid, runidx, nt, newval, ndestroy, runtime, solvestats, sol] = pool.getResult()
+            busy.discard(wid)
+            if newval is None:
+                logging.critical("********************************* LNS worker %d failed. Continue without it.", wid)
+                if wid in idle:
+                    idle.remove(wid)
+                if pool.getNumAlive() == 0:
+                    all_failed = True
+                    break
+                continue
+            
+            logging.info("+++++++++++++++++++++++++++ Worker %d run #%d newval= %g, optval=%g", wid, runidx, newval, self.curr_optval)
+            self._updateDestroySize(nt, solvestats)
+            self.LNS_NS_TYPE.append(nt)
+            self.LNS_NS_TYPE_TRIGGER[nt] = self.LNS_NS_TYPE_TRIGGER[nt] + 1
+            self.LNS_NS_DESTROY.append(ndestroy)
+            
+            retval = self.curr_optval
+            if (sol is not None) and (newval + self.LNS_OBJVALUE_EPSILON) <= self.curr_optval:
+                self.LNS_NS_IMPACT.append(1)
+                self.LNS_NS_TYPE_POS_IMPACT[nt] = self.LNS_NS_TYPE_POS_IMPACT[nt] + 1
+                self.op_selector.update(nt, self.curr_optval - newval, runtime)
+                self.milp_solver.loadIncumbent(sol)
+                version = version + 1
+                worker_version[wid] = version
+                retval = newval
+            else:
+                self.LNS_NS_IMPACT.append(0)
+                self.op_selector.update(nt, 0.0, runtime)
+            
+            logging.info("+++++++++++++++++++++++++++ Current optimal :  %s", retval)
+            self._log_ObjValue_Neighbourhood(datetime.strftime(datetime.now(), "%Y-%m-%d %H:%M:%S"), retval, nt, runidx, ndestroy, runtime, solvestats[0])
+            worker_nt[wid] = self.changeNeighbourhood(retval, self.curr_optval, nt) % self.NUM_NEIGHBOURHOOD_TYPE
+            idle.append(wid)
+            self._saveCheckpoint()
+        
+        pool.stop()
+        logging.info("***************************************** Parallel LNS finished after %g sec", time() - self.start_t)
+        if all_failed and not self.budget.isExpired():
+            logging.critical("********************************* All %d LNS workers failed. Continue with sequential LNS.", self.LNS_NUM_WORKER)
+            self._runSequential()
          
         
     def exploreNeighbourhood(self, optval, nt):
@@ -348,10 +573,10 @@ class Solver_LNS:
         
         i = 0
         retval = optval         
-        while (retval >= optval) and (i < self.LNS_EXPLORE_MAX_ITERATION):  
+        while (retval >= optval) and (i < self.LNS_EXPLORE_MAX_ITERATION) and not self.budget.isExpired():  
             
             logging.info("\n\n==================================================================")
-            logging.info("\t\t Explore Neighbourhood Run #%d [%s], ExploreCount %d" %(self.lns_run_count, self.LNS_NEIGHOURHOOD_ORDER[nt], i))
+            logging.info("\t\t Explore Neighbourhood Run #%d [%s], ExploreCount %d", self.lns_run_count, self.LNS_NEIGHOURHOOD_ORDER[nt], i)
             logging.info("==================================================================")
             
             [locls, timels, mls] = self.shakeNeighbourhood(nt)
@@ -363,21 +588,24 @@ class Solver_LNS:
                 self.LNS_NS_IMPACT.append(0)  
                 self.LNS_NS_TYPE_TRIGGER[nt] = self.LNS_NS_TYPE_TRIGGER[nt] + 1              
                 logging.info("************************* All options are tabued. Stop exploreNeighbourhood.")
-                logging.info("+++++++++++++++++++++++++++ Current optimal :  %s" %retval)
-                self._log_ObjValue_Neighbourhood(datetime.strftime(datetime.now(), "%Y-%m-%d %H:%M:%S"), retval, nt+10) 
+                logging.info("+++++++++++++++++++++++++++ Current optimal :  %s", retval)
+                self._log_ObjValue_Neighbourhood(datetime.strftime(datetime.now(), "%Y-%m-%d %H:%M:%S"), retval, nt+10, self.lns_run_count) 
                 self.lns_run_count = self.lns_run_count+1               
                 break
             
+            self.milp_solver.setTimeLimit(self.budget.getMIPTimeLimit())
             timestart = time()
-            logging.info("solveLNSConstrainedMILP TimeStart: %s" %(timestart))
+            logging.info("solveLNSConstrainedMILP TimeStart: %s", timestart)
             newval = self.milp_solver.solveLNSConstrainedMILP(self.lns_run_count, locls, timels, mls)
-            logging.info("solveLNSConstrainedMILP TimeEnd after: %s s" %(time()-timestart))            
+            runtime = time()-timestart
+            logging.info("solveLNSConstrainedMILP TimeEnd after: %s s", runtime)
+            self._updateDestroySize(nt, self.milp_solver.LNS_SOLVE_STATS)
             if (newval == self.milp_solver.MIP_TIMELIMITREACHED_NOSOLUTION):
-                logging.critical("********************************* solveLNSConstrainedMILP() return %g. Time Limit reached without finding a feasible solution." %newval)
+                logging.critical("********************************* solveLNSConstrainedMILP() return %g. Time Limit (or Cutoff) reached without finding a feasible (improving) solution.", newval)
                 
             
             # checking only...
-            logging.info("+++++++++++++++++++++++++++ newval= %g, optval=%g" %(newval, optval))            
+            logging.info("+++++++++++++++++++++++++++ newval= %g, optval=%g", newval, optval)
             # Benchmark LNS impact
             self.LNS_NS_TYPE.append(nt)
             self.LNS_NS_TYPE_TRIGGER[nt] = self.LNS_NS_TYPE_TRIGGER[nt] + 1
@@ -386,7 +614,9 @@ class Solver_LNS:
             if (newval + self.LNS_OBJVALUE_EPSILON) < optval:  
                 self.LNS_NS_IMPACT.append(1)                 
                 self.LNS_NS_TYPE_POS_IMPACT[nt] = self.LNS_NS_TYPE_POS_IMPACT[nt] + 1
+                self.op_selector.update(nt, optval - newval, runtime)
             else:  
+                self.op_selector.update(nt, 0.0, runtime)
                 # NOTE: when (newval + self.LNS_OBJVALUE_EPSILON) > optval, no impact, LNS rollback to previous best solution
                 #   The retval, that is logged below, is generated by the previous best schedule.
                 #   So there is a little inconsistent between Destroy_trace vs. impact graphs 
@@ -396,34 +626,29 @@ class Solver_LNS:
             #        But the logics in the next few lines need to be changed...
             # only accept newval if ((newval + self.LNS_OBJVALUE_EPSILON) <= optval)
             #    newval |---  LNS_OBJVALUE_EPSILON ----| optval
-            logging.info("((newval + self.LNS_OBJVALUE_EPSILON) - optval) %g - %g = %g" %(newval + self.LNS_OBJVALUE_EPSILON, optval, (newval + self.LNS_OBJVALUE_EPSILON - optval)))
+            logging.info("((newval + self.LNS_OBJVALUE_EPSILON) - optval) %g - %g = %g", newval + self.LNS_OBJVALUE_EPSILON, optval, (newval + self.LNS_OBJVALUE_EPSILON - optval))
             if (newval + self.LNS_OBJVALUE_EPSILON)  <= optval:                
                 retval = newval
             else:  
                 if (newval == self.milp_solver.MIP_TIMELIMITREACHED_NOSOLUTION):
-                    logging.info("TimeLimit reached without getting a solution this round. Rollback.")
+                    logging.info("TimeLimit (or Cutoff) reached without getting a solution this round. Rollback.")
                     
                 else:             
                     logging.info(" WELL! a (slightly) worse solution is found......expecting newval+eps == optval, or newval+eps <= optval ")
-                    logging.info("***************************************** Below is the *worse* schedule")
-                    logging.info("worse_schedule = %s" %self.milp_solver.getOccupiedLocationNSlot())
+                    if logging.getLogger().isEnabledFor(logging.DEBUG):
+                        logging.debug("***************************************** Below is the *worse* schedule")
+                        logging.debug("worse_schedule = %s", self.milp_solver.getOccupiedLocationNSlot())
                     
-                # As initial HVAC solution is generated without time limit, therefore the rollback should be done w/o too. Otherwise will result in getting infeasible solution.
-                if self.is_bestsche_initsol == 1:
-                        self.milp_solver.updateGurobiParam(self.MIP_DEFAULT_NOTIMELIMIT, self.MIP_SOLUTION_LIMIT)
+                # The incumbent is restored from memory, no solve is needed.
                 retval = self.milp_solver.rollbackPreviousBestSchedule(self.lns_run_count, self.curr_best_schedule)  # self.initsol_schetime
-                # After rollback to initial HVAC solution, reset the MIP time limit.
-                if self.is_bestsche_initsol == 1:
-                        self.milp_solver.updateGurobiParam(self.MIP_TIMELIMIT_SEC, self.MIP_SOLUTION_LIMIT)
 
-            logging.info("+++++++++++++++++++++++++++ Current optimal :  %s" %retval)
+            logging.info("+++++++++++++++++++++++++++ Current optimal :  %s", retval)
             # Log LNS trace
-            self._log_ObjValue_Neighbourhood(datetime.strftime(datetime.now(), "%Y-%m-%d %H:%M:%S"), retval, nt)
+            self._log_ObjValue_Neighbourhood(datetime.strftime(datetime.now(), "%Y-%m-%d %H:%M:%S"), retval, nt, 
+                                             self.lns_run_count, self.milp_solver.NUMVAR_BDV_x_MLK_DESTROY, runtime, self.milp_solver.LNS_SOLVE_STATS[0])
                                    
             i = i+1
             self.lns_run_count = self.lns_run_count+1
-                        
-            #TODO:  also add a time check in this loop??? change start_t to self.start_t
             
         return retval 
     
@@ -440,6 +665,7 @@ class Solver_LNS:
         mls = []
         shakels = []  # [locls, timels, mls] contains x=1 to destroyed
         empty_ls = [[], [], []]
+        [max_k_destroy, max_l_destroy, max_m_destroy] = self._getDestroyFractions(nt)
         
         # TODO: identify how long it takes to construct optimal solution for max_k, max_l, and tailor max_k, max_l
         # TODO: more method to shake...
@@ -460,9 +686,9 @@ class Solver_LNS:
                     return empty_ls
             
 #             occ_k.sort()
-            if self.LNS_MAX_K_DESTROY > 0:                
-                idxls = sample(range(len(occ_k)), int(ceil(self.LNS_MAX_K_DESTROY*len(occ_k))))
-                logging.info("LNS_MAX_K_DESTROY idxls: %s" %(idxls))
+            if max_k_destroy > 0:                
+                idxls = sample(range(len(occ_k)), int(ceil(max_k_destroy*len(occ_k))))
+                logging.info("LNS_MAX_K_DESTROY idxls: %s", idxls)
                 for i in xrange(len(idxls)):
                     timels.append(occ_k[idxls[i]])
             else:
@@ -488,9 +714,9 @@ class Solver_LNS:
                     return empty_ls            
             
 #             occ_l.sort()
-            if self.LNS_MAX_L_DESTROY > 0:                
-                idxls = sample(range(len(occ_l)), int(ceil(self.LNS_MAX_L_DESTROY*len(occ_l))))
-                logging.info("LNS_MAX_L_DESTROY idxls: %s" %(idxls))
+            if max_l_destroy > 0:                
+                idxls = sample(range(len(occ_l)), int(ceil(max_l_destroy*len(occ_l))))
+                logging.info("LNS_MAX_L_DESTROY idxls: %s", idxls)
                 for i in xrange(len(idxls)):
                     locls.append(occ_l[idxls[i]])
             else:     
@@ -512,9 +738,9 @@ class Solver_LNS:
                 occ_k = self._remTabuedOption(self.TABU_TIME_ONLY, occ_k)
             if len(occ_k) != 0:  
 #                 occ_k.sort()     
-                if self.LNS_MAX_K_DESTROY > 0:                
-                    idxls = sample(range(len(occ_k)), int(ceil(self.LNS_MAX_K_DESTROY*len(occ_k))))
-                    logging.info("LNS_MAX_K_DESTROY idxls: %s" %(idxls))
+                if max_k_destroy > 0:                
+                    idxls = sample(range(len(occ_k)), int(ceil(max_k_destroy*len(occ_k))))
+                    logging.info("LNS_MAX_K_DESTROY idxls: %s", idxls)
                     for i in xrange(len(idxls)):
                         timels.append(occ_k[idxls[i]])
                 else:       
@@ -529,9 +755,9 @@ class Solver_LNS:
                 occ_l = self._remTabuedOption(self.TABU_LOC_ONLY, occ_l)
             if len(occ_l) != 0:
 #                 occ_l.sort()  
-                if self.LNS_MAX_L_DESTROY > 0:                
-                    idxls = sample(range(len(occ_l)), int(ceil(self.LNS_MAX_L_DESTROY*len(occ_l))))
-                    logging.info("LNS_MAX_L_DESTROY idxls: %s" %(idxls))
+                if max_l_destroy > 0:                
+                    idxls = sample(range(len(occ_l)), int(ceil(max_l_destroy*len(occ_l))))
+                    logging.info("LNS_MAX_L_DESTROY idxls: %s", idxls)
                     for i in xrange(len(idxls)):
                         locls.append(occ_l[idxls[i]])
                 else:             
@@ -562,9 +788,9 @@ class Solver_LNS:
                     return empty_ls
             
 #             occ_m.sort()    
-            if self.LNS_MAX_M_DESTROY > 0:                
-                idxls = sample(range(len(occ_m)), int(ceil(self.LNS_MAX_M_DESTROY*len(occ_m))))
-                logging.info("LNS_MAX_M_DESTROY idxls: %s" %(idxls))
+            if max_m_destroy > 0:                
+                idxls = sample(range(len(occ_m)), int(ceil(max_m_destroy*len(occ_m))))
+                logging.info("LNS_MAX_M_DESTROY idxls: %s", idxls)
                 for i in xrange(len(idxls)):
                     mls.append(occ_m[idxls[i]])
             else:           
@@ -577,19 +803,141 @@ class Solver_LNS:
             if self.ACTIVATE_TABU:   
                 self._addTabuList(self.TABU_LOC_N_TIME, mls)
             
+        elif ('RELATED_MEETING' in self.LNS_NEIGHOURHOOD_ORDER) and (nt == self.LNS_NEIGHOURHOOD_ORDER.index('RELATED_MEETING')):
+            logging.info("Shaking based on [RELATED_MEETING]")
+            
+            occ_m = self.milp_solver.getOccupiedLocationNSlot()
+            if self.ACTIVATE_TABU:
+                occ_m = self._remTabuedOption(self.TABU_LOC_N_TIME, occ_m)
+                if len(occ_m) == 0: # all options tabu-ed
+                    logging.info("all RELATED_MEETING option tabued")
+                    return empty_ls
+            
+            if max_m_destroy > 0:
+                num_m = int(ceil(max_m_destroy*len(occ_m)))
+            else:
+                num_m = randrange(1, len(occ_m)+1)
+            mls = self._getRelatedMeetings(occ_m, num_m)
+            max_m = len(mls)
+            shakels = [[], [], mls]
+            
+            if self.ACTIVATE_TABU:
+                self._addTabuList(self.TABU_LOC_N_TIME, mls)
+            
+        elif ('ENERGY_GUIDED' in self.LNS_NEIGHOURHOOD_ORDER) and (nt == self.LNS_NEIGHOURHOOD_ORDER.index('ENERGY_GUIDED')):
+            logging.info("Shaking based on [ENERGY_GUIDED]")
+            
+            occ_m = self.milp_solver.getOccupiedLocationNSlot()
+            if self.ACTIVATE_TABU:
+                occ_m = self._remTabuedOption(self.TABU_LOC_N_TIME, occ_m)
+                if len(occ_m) == 0: # all options tabu-ed
+                    logging.info("all ENERGY_GUIDED option tabued")
+                    return empty_ls
+            
+            if max_m_destroy > 0:
+                num_m = int(ceil(max_m_destroy*len(occ_m)))
+            else:
+                num_m = randrange(1, len(occ_m)+1)
+            mls = self._getCostlyMeetings(occ_m, num_m)
+            max_m = len(mls)
+            shakels = [[], [], mls]
+            
+            if self.ACTIVATE_TABU:
+                self._addTabuList(self.TABU_LOC_N_TIME, mls)
+            
         else:
-            logging.error("Unknown neighbourhood type %d" %nt)
+            logging.error("Unknown neighbourhood type %d", nt)
         
-        logging.info("Destroying meeting schedule based on [%s] in ([%d] location %s  and  [%d] time %s) or in [%d] meeting %s" %(self.LNS_NEIGHOURHOOD_ORDER[nt], max_l, locls, max_k, timels, max_m, mls))
+        logging.info("Destroying meeting schedule based on [%s] in ([%d] location %s  and  [%d] time %s) or in [%d] meeting %s", self.LNS_NEIGHOURHOOD_ORDER[nt], max_l, locls, max_k, timels, max_m, mls)
 #         print "******************************** Destroying meeting schedule based on [", self.LNS_NEIGHOURHOOD_ORDER[nt], "] in (", max_l, " location:", locls,  " and ", max_k, " time:", timels, ") or (", max_m, " meeting:", mls
         
         return shakels
         
         
+    def _getRelatedMeetings(self, occ_m, num_m):
+        """Up to num_m of the assignments [m,l,k] in occ_m: seed on the meeting type of a random assignment, 
+           then add the assignments of the most related meeting types (see EAMS.MTR) until num_m is reached. 
+           Re-seed if the related meeting types run out."""
+        bytype = {}         # d[m] = assignments of meeting type m in occ_m
+        for x in occ_m:
+            bytype.setdefault(x[0], []).append(x)
+        
+        mls = []
+        frontier = {}       # d[m] = highest relatedness score of meeting type m to the meeting types selected so far
+        while len(mls) < num_m and bytype:
+            if frontier:
+                m = max(frontier, key=frontier.get)
+                del frontier[m]
+            else:
+                m = occ_m[randrange(0, len(occ_m))][0]
+                if m not in bytype:
+                    m = bytype.keys()[randrange(0, len(bytype))]
+                logging.info("RELATED_MEETING seed meeting type %d", m)
+            
+            mls.extend(bytype.pop(m))
+            for [score, mr] in self.eams.MTR.get(m, []):
+                if mr in bytype and score > frontier.get(mr, 0.0):
+                    frontier[mr] = score
+                    
+        return mls[:num_m]
+        
+    def _getCostlyMeetings(self, occ_m, num_m):
+        """num_m of the assignments [m,l,k] in occ_m, sampled without replacement in proportion to the HVAC energy of their room 
+           from LNS_ENERGY_PRECOOL_SLOT slots before the meeting until its end, scaled by a random factor in [1, 1+LNS_ENERGY_NOISE]"""
+        energy = self.milp_solver.getEnergyLK()
+        
+        duration = {}       # d[m] = longest duration (slots) of the meetings of meeting type m
+        keys = []
+        for [m, l, k] in occ_m:
+            if m not in duration:
+                duration[m] = max([int(self.eams.ML[x].Duration) for x in self.eams.MTYPE[m].MLS])
+            cost = float(energy[l, max(0, k-self.LNS_ENERGY_PRECOOL_SLOT):k+duration[m]].sum())
+            keys.append(max(cost, 0.0) * (1.0 + self.LNS_ENERGY_NOISE * random()))
+        
+        # Weighted sampling without replacement: keep the num_m largest u^(1/w), u uniform in (0,1)
+        floor = 1.0e-09 * max(keys + [1.0])
+        keys = [(1.0 - random()) ** (1.0 / max(w, floor)) for w in keys]
+        idx = sorted(xrange(len(occ_m)), key=lambda i: keys[i], reverse=True)[:num_m]
+        return [occ_m[i] for i in idx]
+        
+    #===========================================================================
+    # Destroy size
+    #===========================================================================
+    def _initDestroySizeController(self):
+        if not self.LNS_ADAPTIVE_DESTROY:
+            return None
+        if self.MIP_TIMELIMIT_SEC <= 0:
+            logging.warning("LNS_ADAPTIVE_DESTROY requires MIP_TIMELIMIT_SEC > 0. Use static destroy size.")
+            return None
+        
+        fractions = {}
+        for [kind, frac] in [['K', self.LNS_MAX_K_DESTROY], ['L', self.LNS_MAX_L_DESTROY], ['M', self.LNS_MAX_M_DESTROY]]:
+            if frac > 0:
+                fractions[kind] = frac
+            else:
+                fractions[kind] = self.LNS_DESTROY_INIT_FRACTION
+        return LNS_DestroySizeController(self.NUM_NEIGHBOURHOOD_TYPE, fractions, 
+                                         self.LNS_DESTROY_TARGET_LO * self.MIP_TIMELIMIT_SEC, self.LNS_DESTROY_TARGET_HI * self.MIP_TIMELIMIT_SEC, 
+                                         self.milp_solver.LNS_CUTOFF)
+        
+    def _getDestroyFractions(self, nt):
+        """[K, L, M] fraction of occupied slots, locations and meetings to destroy for neighbourhood type nt. <= 0 for a random range."""
+        if self.destroy_ctrl is None:
+            return [self.LNS_MAX_K_DESTROY, self.LNS_MAX_L_DESTROY, self.LNS_MAX_M_DESTROY]
+        return self.destroy_ctrl.getFractions(nt)
+    
+    def _updateDestroySize(self, nt, solvestats):
+        if self.destroy_ctrl is None:
+            return
+        [status, runtime, mipgap] = solvestats
+        if status < len(self.STATUS):
+            status = self.STATUS[status]
+        self.destroy_ctrl.update(nt, str(status), runtime, mipgap)
+        
     def changeNeighbourhood(self, new_optval, curr_optval, curr_nt):
 
         logging.info("***************************************** ChangeNeighbourhood")
-        logging.info("new_optval + LNS_OBJVALUE_EPSILON - curr_optval, %g + %g - %g = %g" %(new_optval, self.LNS_OBJVALUE_EPSILON, curr_optval, new_optval+self.LNS_OBJVALUE_EPSILON-curr_optval))
+        logging.info("new_optval + LNS_OBJVALUE_EPSILON - curr_optval, %g + %g - %g = %g", new_optval, self.LNS_OBJVALUE_EPSILON, curr_optval, new_optval+self.LNS_OBJVALUE_EPSILON-curr_optval)
         
         
         if (new_optval + self.LNS_OBJVALUE_EPSILON)  <= curr_optval:    # new neighbourhood performs better than (or as good as) old neighbourhood
@@ -602,13 +950,17 @@ class Solver_LNS:
             
         if self.LNS_ORDER_RANDOMIZE == self.RANDOMIZE_ORDER:
             nt = randrange(0, self.NUM_NEIGHBOURHOOD_TYPE)
-            logging.info("********* Randomly changeNeighbourhood to = %s" %(self.LNS_NEIGHOURHOOD_ORDER[nt]))
+            logging.info("********* Randomly changeNeighbourhood to = %s", self.LNS_NEIGHOURHOOD_ORDER[nt])
+            return nt
+        elif self.LNS_ORDER_RANDOMIZE == self.ADAPTIVE_ORDER:
+            nt = self.op_selector.select()
+            logging.info("********* Adaptively changeNeighbourhood to = %s", self.LNS_NEIGHOURHOOD_ORDER[nt])
             return nt
         else:
             if (new_optval + self.LNS_OBJVALUE_EPSILON)  <= curr_optval:
                 # restart from first neighbourhood
                 # TODO: really?  Or do not change neighbourhood??? return curr_nt ??
-                logging.info("***************************************** changeNeighbourhood to %s" %(self.LNS_NEIGHOURHOOD_ORDER[0]))
+                logging.info("***************************************** changeNeighbourhood to %s", self.LNS_NEIGHOURHOOD_ORDER[0])
                 return 0       
             else: # TODO: since you rollback to previousBestSolution in exploreNeighbourhood, this will never happen
                 logging.info("***************************************** new_optval > curr_optval, no better solution found. ")   
@@ -625,94 +977,118 @@ class Solver_LNS:
         self.curr_optval = optval
         self.is_bestsche_initsol = isinitsol
                         
-        logging.info("***************************************** Below is the latest schedule")
         self.curr_best_schedule = self.milp_solver.getOccupiedLocationNSlot()
         
 #         print "***************************************** storeCurrentBestSchedule - objval:",  self.curr_optval, " - found at ", self.curr_best_from_start_t, "s"
-        logging.info("***************************************** storeCurrentBestSchedule - objval: %g - found at %g s" %(self.curr_optval, self.curr_best_from_start_t))
-        logging.info("curr_best_schedule = %s" %self.curr_best_schedule)
+        logging.info("***************************************** storeCurrentBestSchedule - objval: %g - found at %g s", self.curr_optval, self.curr_best_from_start_t)
+        logging.debug("curr_best_schedule = %s", self.curr_best_schedule)
+        self.milp_solver.storeIncumbent()
+        
+    def _syncCurrentBestSchedule(self):
+        """Rollback restores the best schedule from memory only. Re-solve it once so the model holds it for the final statistics. 
+           The final results are read from the solution snapshot, i.e. from the incumbent in memory if the re-solve fails."""
+        if not self.milp_solver.hasRestoredIncumbent():
+            return
+        # The incumbent, also the initial solution, is given as MIP start, so the re-solve has a solution within the tail of the time budget
+        self.milp_solver.setTimeLimit(self.budget.getTailTimeLimit())
+        self.milp_solver.syncIncumbent(self.lns_run_count, self.curr_best_schedule)
+        
+    def _initTabuStore(self):
+        if self.TABU_EXPIRED_TYPE == 0:    # 0: time-based, 1: cycle-based
+            return TabuStore(self.TABU_PERIOD_SEC)
+        return TabuStore(self.TABU_CYCLE)
+        
+    def _getTabuKey(self):
+        if self.TABU_EXPIRED_TYPE == 0:    # 0: time-based, 1: cycle-based
+            return time()
+        return self.lns_run_count
+    
+    def _getTabuAttribute(self, mlk):
+        """Finer tabu attributes [(lstype, attr)] of meeting [m,l,k], according to LNS_TABU_ATTRIBUTE"""
+        [m, l, k] = mlk
+        attrs = []
+        if self.LNS_TABU_ATTRIBUTE >= 1:
+            attrs.append([self.TABU_MTYPE_N_LOC, (m, l)])
+        if self.LNS_TABU_ATTRIBUTE >= 2:
+            attrs.append([self.TABU_LOC_N_DAY, (l, self.milp_solver._getDayForSlotIdx(k))])
+        return attrs
+    
+    def _isTabued(self, lstype, x):
+        if self.tabu.isTabu(lstype, x):
+            return True
+        if lstype == self.TABU_LOC_N_TIME:
+            for [t, attr] in self._getTabuAttribute(x):
+                if self.tabu.isTabu(t, attr):
+                    return True
+        return False
         
     def _remTabuedOption(self, lstype, candidatels):
-#         print "******************* candidatels =", candidatels
-        logging.info("******************* candidatels = %s" %(candidatels))     
-           
-        tabuls = self._getTabuList(lstype)
-#         print "tabuls=", tabuls
-        logging.info("tabuls=%s" %tabuls)
-        ls = [x for x in candidatels if x not in tabuls]
-#         print "******************* candidatels after removing tabu-ed option =", ls
-        logging.info("******************* candidatels after removing tabu-ed option = %s" %(ls))
+        if lstype == self.TABU_LOC_N_TIME and self.LNS_TABU_ATTRIBUTE:
+            ls = [x for x in candidatels if not self._isTabued(lstype, x)]
+        else:
+            ls = self.tabu.filter(lstype, candidatels)
+        logging.info("******************* %d of %d candidates left after removing tabu-ed option", len(ls), len(candidatels))
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("candidatels after removing tabu-ed option = %s", ls)
         return ls
     
     def _getTabuList(self, lstype):
-        tabu = []
-        val = self.tabulist[lstype]
-        for v in val.itervalues():
-            if v not in tabu:
-                tabu.extend(v)                
-        return tabu    
+        return self.tabu.getEntries(lstype)
     
     def _addTabuList(self, lstype, tabuls):
-        
-        if self.TABU_EXPIRED_TYPE == 0:    # 0: time-based, 1: cycle-based
-            tabu_key = time()
-        else:
-            tabu_key = self.lns_run_count
-                        
-        # add new tabu list
-        if not self.tabulist.get(lstype):
-            self.tabulist[lstype] = {tabu_key:tabuls}
-        elif self.tabulist[lstype].get(tabu_key):
-            self.tabulist[lstype].get(tabu_key).extend(tabuls)
-        else:
-            self.tabulist[lstype].update({tabu_key: tabuls})
-       
-#         print "updated tabulist:", self.tabulist
-        logging.info("updated  tabulist: %s" %(self.tabulist))
-        
+        tabu_key = self._getTabuKey()
+        self.tabu.add(lstype, tabuls, tabu_key)
+        if lstype == self.TABU_LOC_N_TIME and self.LNS_TABU_ATTRIBUTE:
+            for x in tabuls:
+                for [t, attr] in self._getTabuAttribute(x):
+                    self.tabu.add(t, [attr], tabu_key)
+        logging.info("updated tabu list: %d entries", self.tabu.size())
         
     def _remExpiredTabuList(self):
+        nexp = self.tabu.expire(self._getTabuKey())
+        logging.info("removed %d expired tabu entries, %d left", nexp, self.tabu.size())
         
-        if self.TABU_EXPIRED_TYPE == 0:    # 0: time-based, 1: cycle-based
-            tabu_key = time() 
-            expire_limit = self.TABU_PERIOD_SEC 
-        else:
-            tabu_key = self.lns_run_count
-            expire_limit = self.TABU_CYCLE
-        
-        # remove expired tabu list
-        expls = []
-        for k, v in self.tabulist.iteritems():        
-            for tk, _ in v.iteritems():            
-                if (tabu_key - tk) > expire_limit:
-                    expls.append([k, tk])
+    #===========================================================================
+    # Checkpoint
+    #===========================================================================
+    def _initTrace(self):
+        return LNS_Trace('Output/' + self.casecfgid + '_LNS_trace')
     
-#         print "expls:", expls
-        logging.info("expls: %s" %(expls))
+    def _initCheckpoint(self):
+        return LNS_Checkpoint('Output/' + self.casecfgid + '_LNS_checkpoint', self.LNS_CHECKPOINT_SEC)
+    
+    def _getCheckpointState(self):
+        """Everything resume() needs to continue the run: LNS configuration & benchmark (upper case attributes), 
+           incumbent (schedule & HVAC control), tabu memory, neighbourhood statistics, RNG state and the time budget used"""
+        param = dict((k, v) for k, v in self.__dict__.iteritems() if k.isupper())
+        return {'runcfg': self.runcfg,
+                'casecfg': self.casecfg,
+                'casecfgid': self.casecfgid,
+                'casecfgid_LNS_stats_only': self.casecfgid_LNS_stats_only,
+                'param': param,
+                'meetings': [m.Key for m in self.eams.ML],
+                'incumbent': self.milp_solver.incumbent,
+                'lns_run_count': self.lns_run_count,
+                'curr_optval': self.curr_optval,
+                'curr_best_schedule': self.curr_best_schedule,
+                'curr_best_from_start_t': self.curr_best_from_start_t,
+                'is_bestsche_initsol': self.is_bestsche_initsol,
+                'tabu': self.tabu,
+                'op_selector': self.op_selector,
+                'destroy_ctrl': self.destroy_ctrl,
+                'rng': getstate(),
+                'elapsed': self.budget.getElapsed()}
         
-        for i in xrange(len(expls)):
-            [k,tk] = expls[i]
-            del self.tabulist[k][tk]
+    def _saveCheckpoint(self, force=0):
+        if self.ckpt.isEnabled() and (force or self.ckpt.isDue()):
+            self.ckpt.save(self._getCheckpointState())
             
-#         print "after removing expired tabulist: ", self.tabulist
-        logging.info("after removing expired tabulist: %s" %(self.tabulist))
-        
-   
-        
     #===========================================================================
     # Diagnose
     #=========================================================================== 
-    def _log_ObjValue_Neighbourhood(self, logtime, objvalue, nt):
-        data = [logtime, objvalue, nt]
-        try:
-#             fstr = 'Output\\' + self.casecfgid + '_LNS_trace'
-            fstr = 'Output/' + self.casecfgid + '_LNS_trace'
-            f = open(fstr,'a')
-            f.write(",".join(map(str, data)))            
-            f.write("\n")
-            f.close()    
-        except (ValueError), e:
-            logging.critical('%s' % (e))    
+    def _log_ObjValue_Neighbourhood(self, logtime, objvalue, nt, runidx=-1, ndestroy=0, runtime=0.0, status=-1):
+        """Buffered, the trace file is written by a background thread, see LNS_Trace"""
+        self.trace.record(logtime, objvalue, nt, runidx, ndestroy, runtime, status)
     
     def _log_LNS_stats(self):      
         
@@ -730,8 +1106,16 @@ class Solver_LNS:
         logging.info("LNS_NS_TYPE: %s" %self.LNS_NS_TYPE)        
         logging.info("LNS_NS_IMPACT: %s" %self.LNS_NS_IMPACT)  
         
+        # Sub-MIP time, success and improvement of every neighbourhood type, and its final adaptive weight
+        self.op_selector.logStats()
+        self.op_selector.writeStats('Output/' + self.casecfgid_LNS_stats_only + '_LNS_operators', self.casecfgid)
+        if self.destroy_ctrl is not None:
+            self.destroy_ctrl.logStats(self.LNS_NEIGHOURHOOD_ORDER)
+        
 #         header = ["LNS_NEIGHOURHOOD_ORDER", "LNS_NS_TYPE_TRIGGER", "LNS_NS_TYPE_POS_IMPACT", "NUMVAR_BDV_x_MLK", "LNS_NS_DESTROY", "LNS_NS_TYPE", "LNS_NS_IMPACT", "curr_optval", "curr_best_from_start_t"]
         data = [self.casecfgid, self.LNS_NEIGHOURHOOD_ORDER, self.LNS_NS_TYPE_TRIGGER, self.LNS_NS_TYPE_POS_IMPACT, self.milp_solver.NUMVAR_BDV_x_MLK, self.LNS_NS_DESTROY, self.LNS_NS_TYPE, self.LNS_NS_IMPACT, self.curr_optval, self.curr_best_from_start_t]        
+        # For simplicity, also write to trace file
+        self.trace.stats(data)
 #         data = [self.LNS_NEIGHOURHOOD_ORDER, self.curr_optval, self.curr_best_from_start_t]        
         try:            
             # Write to stats file
@@ -743,13 +1127,6 @@ class Solver_LNS:
             f.write("\n")
             f.close()    
             
-            # For simplicity, also write to trace file
-            fstr = 'Output/' + self.casecfgid + '_LNS_trace'
-            f = open(fstr,'a')
-            f.write(" # ".join(map(str, data)))            
-            f.write("\n")
-            f.close()    
-            
         except (ValueError), e:
             logging.critical('%s' % (e))    
     
@@ -769,6 +1146,8 @@ class Solver_LNS:
         self.milp_solver.logEnergy(self.runcfg, self.casecfgid)
         self.milp_solver.logSchedules(self.casecfgid)
         self.milp_solver.logTemperatures(self.casecfgid)
+        self.milp_solver.saveResult()
+        self.milp_solver.logBuildProfile(self.casecfgid)
         
     
         
\ No newline at end of file
@@ -0,0 +1,150 @@
+import logging
+from random import random, randrange
+
+
+class LNS_OperatorSelector:
+    """Adaptive neighbourhood (destroy operator) selection in the style of Ropke & Pisinger's ALNS.
+       Every neighbourhood type has a weight, updated from the energy improvement per second of sub-MIP time it achieved:
+           w = DECAY * w + (1 - DECAY) * improvement / runtime
+       The next neighbourhood type is drawn by roulette wheel. Timing and success statistics are kept for every type."""
+
+    def __init__(self, names, decay, min_weight):
+        self.names = names                      # neighbourhood types, offset is nt
+        self.DECAY = decay                      # 0..1, weight given to the history
+        self.MIN_WEIGHT = min_weight            # lower bound of a weight relative to the largest one, keeps every type selectable
+        self.MIN_RUNTIME = 1.0e-03              # sec, avoid division by 0 for trivial sub-MIP
+        
+        n = len(names)
+        self.weights = [1.0] * n
+        self.calls = [0] * n                    # number of sub-MIP run
+        self.success = [0] * n                  # number of sub-MIP which improved the incumbent
+        self.runtime = [0.0] * n                # total sub-MIP time (sec)
+        self.improvement = [0.0] * n            # total energy improvement
+        
+    def select(self):
+        """Roulette-wheel selection of the next neighbourhood type"""
+        total = sum(self.weights)
+        if total <= 0:
+            return randrange(0, len(self.weights))
+        
+        r = random() * total
+        acc = 0.0
+        for nt in xrange(len(self.weights)):
+            acc = acc + self.weights[nt]
+            if r < acc:
+                return nt
+        return len(self.weights) - 1
+    
+    def update(self, nt, improvement, runtime):
+        """Record a sub-MIP of neighbourhood type nt which improved the incumbent by improvement (<= 0 if none) in runtime sec"""
+        improvement = max(0.0, improvement)
+        self.calls[nt] = self.calls[nt] + 1
+        self.runtime[nt] = self.runtime[nt] + runtime
+        if improvement > 0:
+            self.success[nt] = self.success[nt] + 1
+            self.improvement[nt] = self.improvement[nt] + improvement
+        
+        score = improvement / max(runtime, self.MIN_RUNTIME)
+        self.weights[nt] = self.DECAY * self.weights[nt] + (1.0 - self.DECAY) * score
+        
+        floor = self.MIN_WEIGHT * max(self.weights)
+        self.weights = [max(w, floor) for w in self.weights]
+        logging.info("LNS operator weights: %s", self.weights)
+        
+    #===========================================================================
+    # Statistics
+    #===========================================================================
+    def getStats(self):
+        stats = []
+        for nt in xrange(len(self.names)):
+            stats.append([self.names[nt], self.calls[nt], self.success[nt], self.runtime[nt], self.improvement[nt], self.weights[nt]])
+        return stats
+    
+    def logStats(self):
+        logging.info("%-30s %8s %8s %12s %14s %12s" %('Neighbourhood', 'Calls', 'Success', 'Runtime(s)', 'Improvement', 'Weight'))
+        for [name, calls, success, runtime, improvement, weight] in self.getStats():
+            logging.info("%-30s %8d %8d %12.3f %14.6g %12.6g" %(name, calls, success, runtime, improvement, weight))
+    
+    def writeStats(self, fn, casecfgid):
+        """Append one line per neighbourhood type to fn: casecfgid, type, calls, success, runtime, improvement, weight"""
+        try:
+            f = open(fn, 'a')
+            for stat in self.getStats():
+                f.write(",".join(map(str, [casecfgid] + stat)))
+                f.write("\n")
+            f.close()
+        except (IOError), e:
+            logging.critical('%s' % (e))
+
+
+class LNS_DestroySizeController:
+    """Self-tuning destroy size. Every neighbourhood type has its own fraction of occupied slots (K), locations (L) and meetings (M) to destroy.
+       The fractions aim for a sub-MIP which is proved (OPTIMAL or CUTOFF, also INFEASIBLE if the sub-MIP has a Cutoff, see LNS_CUTOFF) 
+       within the target runtime band [TARGET_LO, TARGET_HI] sec:
+       they grow by GROW if it is proved faster than TARGET_LO, and shrink by SHRINK if it is proved slower than TARGET_HI
+       or stops (e.g. TIME_LIMIT) with a MIPGap above GAP_TOL."""
+    
+    KINDS = ['K', 'L', 'M']
+    
+    def __init__(self, num_nt, fractions, target_lo, target_hi, cutoff=0):
+        self.TARGET_LO = target_lo              # sec
+        self.TARGET_HI = target_hi              # sec
+        self.CUTOFF = cutoff                    # 1 if sub-MIP are cut off at the incumbent: no improving completion ends INFEASIBLE
+        self.GROW = 1.2
+        self.SHRINK = 0.8
+        self.GAP_TOL = 0.01                     # MIPGap of a sub-MIP which stops unproved but is still considered close enough
+        self.MIN_FRACTION = 0.01
+        self.MAX_FRACTION = 1.0
+        
+        self.fractions = [dict(fractions) for _ in xrange(num_nt)]   # fractions[nt][kind] = fraction of occupied kind to destroy
+        self.calls = [0] * num_nt
+        self.grown = [0] * num_nt
+        self.shrunk = [0] * num_nt
+        
+    def getFractions(self, nt):
+        """[K, L, M] fraction to destroy for neighbourhood type nt"""
+        return [self.fractions[nt][kind] for kind in self.KINDS]
+        
+    def update(self, nt, status, runtime, gap):
+        """Adjust the fractions of neighbourhood type nt after its sub-MIP ended with status (name) after runtime sec with MIPGap gap"""
+        proved = status in ('OPTIMAL', 'CUTOFF') or (self.CUTOFF and status == 'INFEASIBLE')
+        if proved and runtime < self.TARGET_LO:
+            factor = self.GROW
+            self.grown[nt] = self.grown[nt] + 1
+        elif (proved and runtime > self.TARGET_HI) or (not proved and gap > self.GAP_TOL):
+            factor = self.SHRINK
+            self.shrunk[nt] = self.shrunk[nt] + 1
+        else:
+            factor = 1.0
+        
+        self.calls[nt] = self.calls[nt] + 1
+        for kind in self.KINDS:
+            frac = self.fractions[nt][kind] * factor
+            self.fractions[nt][kind] = min(self.MAX_FRACTION, max(self.MIN_FRACTION, frac))
+        logging.info("LNS destroy fractions of nt=%d (status=%s, runtime=%g s, gap=%g): %s", nt, status, runtime, gap, self.getFractions(nt))
+    
+    def logStats(self, names):
+        logging.info("%-30s %8s %8s %8s %8s %8s %8s" %('Neighbourhood', 'Calls', 'Grown', 'Shrunk', 'K', 'L', 'M'))
+        for nt in xrange(len(names)):
+            [k, l, m] = self.getFractions(nt)
+            logging.info("%-30s %8d %8d %8d %8.3f %8.3f %8.3f" %(names[nt], self.calls[nt], self.grown[nt], self.shrunk[nt], k, l, m))
+
+
+if __name__ == '__main__':
+    # Self-check of LNS_DestroySizeController.update() for every sub-MIP status
+    target = [1.0, 3.0]
+    for [cutoff, status, runtime, gap, factor] in [[1, 'OPTIMAL', 0.5, 0.0, 1.2],
+                                                   [1, 'OPTIMAL', 2.0, 0.0, 1.0],
+                                                   [1, 'OPTIMAL', 4.0, 0.0, 0.8],
+                                                   [1, 'CUTOFF', 0.5, 1e+100, 1.2],
+                                                   [1, 'CUTOFF', 4.0, 1e+100, 0.8],
+                                                   [1, 'INFEASIBLE', 0.5, 1e+100, 1.2],
+                                                   [1, 'INFEASIBLE', 2.0, 1e+100, 1.0],
+                                                   [0, 'INFEASIBLE', 0.5, 1e+100, 0.8],
+                                                   [1, 'TIME_LIMIT', 3.0, 0.005, 1.0],
+                                                   [1, 'TIME_LIMIT', 3.0, 0.5, 0.8],
+                                                   [1, 'SOLUTION_LIMIT', 2.0, 1e+100, 0.8]]:
+        ctrl = LNS_DestroySizeController(1, {'K': 0.1, 'L': 0.1, 'M': 0.1}, target[0], target[1], cutoff)
+        ctrl.update(0, status, runtime, gap)
+        assert abs(ctrl.getFractions(0)[0] - 0.1 * factor) < 1e-12, (cutoff, status, runtime, gap, ctrl.getFractions(0))
+    print "LNS_DestroySizeController.update() OK"
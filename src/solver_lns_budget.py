@@ -0,0 +1,62 @@
+import logging
+from time import time
+
+
+class LNS_TimeBudget:
+    """Wall-clock budget of an LNS run of TIMELIMIT_SEC, counted from start().
+       The last TAIL_SEC, but at least MIP_TIMELIMIT_SEC (up to half of the budget), are reserved for the final re-optimization 
+       of the best schedule and logging, the LNS loop (and every sub-MIP in it) stops at the deadline before the tail.
+       A sub-MIP is given min(MIP_TIMELIMIT_SEC, time left to the deadline), no sub-MIP is started with less than MIN_SOLVE_SEC left."""
+    
+    def __init__(self, timelimit, mip_timelimit, tail, min_solve):
+        self.TIMELIMIT_SEC = timelimit
+        self.MIP_TIMELIMIT_SEC = mip_timelimit      # <= 0 for no limit other than the deadline
+        self.TAIL_SEC = min(max(tail, min(mip_timelimit, 0.5 * timelimit), 0.0), timelimit)
+        self.MIN_SOLVE_SEC = min_solve
+        self.start_t = None
+        self.end_t = None                           # time() at which the run actually ended, see stop()
+        
+    def start(self, start_t=None):
+        if start_t is None:
+            start_t = time()
+        self.start_t = start_t
+        self.end_t = None
+        
+    def stop(self):
+        self.end_t = time()
+        
+    def getDeadline(self):
+        """time() at which the LNS loop must stop"""
+        return self.start_t + self.TIMELIMIT_SEC - self.TAIL_SEC
+    
+    def getEnd(self):
+        """time() at which the run must end, tail included"""
+        return self.start_t + self.TIMELIMIT_SEC
+    
+    def getElapsed(self):
+        return time() - self.start_t
+    
+    def getRemaining(self):
+        """Time left to the deadline of the LNS loop (sec)"""
+        return self.getDeadline() - time()
+    
+    def isExpired(self):
+        return self.getRemaining() < self.MIN_SOLVE_SEC
+    
+    def getMIPTimeLimit(self):
+        """Time limit of the next sub-MIP (sec)"""
+        timelimit = max(self.getRemaining(), self.MIN_SOLVE_SEC)
+        if self.MIP_TIMELIMIT_SEC > 0:
+            timelimit = min(timelimit, self.MIP_TIMELIMIT_SEC)
+        return timelimit
+    
+    def getTailTimeLimit(self):
+        """Time limit of a solve in the tail (sec)"""
+        return max(self.getEnd() - time(), self.MIN_SOLVE_SEC)
+    
+    def logSummary(self):
+        end_t = self.end_t
+        if end_t is None:
+            end_t = time()
+        logging.info("LNS time budget: %g s (tail %g s), used %g s, overshoot %g s" 
+                     %(self.TIMELIMIT_SEC, self.TAIL_SEC, end_t - self.start_t, end_t - self.getEnd()))
@@ -3,12 +3,14 @@ import logging
 from math import ceil
 from time import time
 from datetime import datetime
-from random import randrange, sample, uniform
+from random import randrange, sample, uniform, getstate, setstate
 from configobj import ConfigObj, ConfigObjError
 
 from eams import EAMS
 from solver_milp_dr import Solver_MILP
 from solver_error import SOLVER_LNS_Error
+from solver_checkpoint import LNS_Checkpoint
+from solver_lns_tabu import TabuStore
 
 class Solver_LNS:
     def __init__(self):        
@@ -36,6 +38,7 @@ class Solver_LNS:
         self.TABU_EXPIRED_TYPE                  = -1
         self.TABU_PERIOD_SEC                    = -1
         self.TABU_CYCLE                         = -1
+        self.LNS_CHECKPOINT_SEC                 = 0     # > 0 to checkpoint the run every LNS_CHECKPOINT_SEC, see resume()
         
         self.LNS_OBJVALUE_EPSILON = 1.0e-06
         
@@ -90,6 +93,7 @@ class Solver_LNS:
             
             self.LNS_DESTROY_MAX_ROOMS = int(config['LNS_DESTROY_MAX_ROOMS'])
             self.LNS_DESTROY_MAX_MEETINGS = int(config['LNS_DESTROY_MAX_MEETINGS'])
+            self.LNS_CHECKPOINT_SEC = float(config.get('LNS_CHECKPOINT_SEC', 0))
                         
             logging.info("=====================================================")
             logging.info("    Initialize LNS    ")
@@ -131,6 +135,8 @@ class Solver_LNS:
         self.casecfgid = casecfgid[1] + '_OPTCFG_' + datetime.now().strftime('%Y_%m_%d_%H_%M_%S_%f')
         self.casecfgid_LNS_stats_only = casecfgid[1]  
         self.runcfg = runcfg
+        self.casecfg = casecfg
+        self.LNS_SEED = LNS_SEED
         
         # Activate log file
         fn = 'Output/EAMS_LNS_' + self.casecfgid
@@ -143,9 +149,7 @@ class Solver_LNS:
          
         # Initialize & Read EAMS
         if reloadEAMS:
-            enable_log = 0   # do not need to enable log from within EAMS, it has been done by solver_lns ... this param is for solver_milp which need to log eams w/o LNS
-            self.eams = EAMS(enable_log)        
-            self.eams.readProblemInstance(casecfg, enable_log)
+            self._loadEAMS(casecfg)
         
         # Initialize MILP
         #     Note: self.MIP_TIMELIMIT_SEC = -1 for initial solution. For subsequent LNS-MIP, updateGurobiParam after getting initial solution
@@ -166,6 +170,8 @@ class Solver_LNS:
         self.casecfgid = casecfgid[1] + '_OPTCFG_' + datetime.now().strftime('%Y_%m_%d_%H_%M_%S_%f')
         self.casecfgid_LNS_stats_only = casecfgid[1]  
         self.runcfg = runcfg
+        self.casecfg = casecfg
+        self.LNS_SEED = LNS_SEED
         
         # Activate log file
         fn = 'Output/EAMS_LNS_' + self.casecfgid
@@ -203,14 +209,61 @@ class Solver_LNS:
 #         logging.info("LNS destroy up to max: %d meetings" %(self.LNS_DESTROY_MAX_MEETINGS))   
                 
         # Initialize & Read EAMS
-        enable_log = 0   # do not need to enable log from within EAMS, it has been done by solver_lns ... this param is for solver_milp which need to log eams w/o LNS
-        self.eams = EAMS(enable_log)        
-        self.eams.readProblemInstance(casecfg, enable_log) # casecfg is the eams config file
+        self._loadEAMS(casecfg) # casecfg is the eams config file
          
         # Initialize MILP
         #     Note: self.MIP_TIMELIMIT_SEC = -1 for initial solution. For subsequent LNS-MIP, updateGurobiParam after getting initial solution        
         self.milp_solver = Solver_MILP(self.eams, fn, self.casecfgid, -1, self.MIP_LOG_CB, LNS_SEED) 
         
+    def _loadEAMS(self, casecfg, meetings=None):
+        """Read the problem instance. meetings: meeting keys in the order of a checkpointed run, see resume()"""
+        enable_log = 0   # do not need to enable log from within EAMS, it has been done by solver_lns ... this param is for solver_milp which need to log eams w/o LNS
+        self.eams = EAMS(enable_log)        
+        self.eams.readProblemInstance(casecfg, enable_log, meetings)
+        
+    #===========================================================================
+    # EAMS_LNS Resume
+    #===========================================================================
+    def resume(self, fn):
+        """Continue an LNS run from its checkpoint fn (see LNS_CHECKPOINT_SEC) instead of init_run() + run(). 
+           The master schedule & HVAC control are restored, partial schedules are rebuilt from them by rebuildNeighbourhood().
+           Return the best objective value."""
+        state = LNS_Checkpoint(fn, 0).load()
+        if state is None:
+            self._lns_critical_err("Failed to load checkpoint %s" %fn)
+        
+        self.runcfg = state['runcfg']
+        self.casecfg = state['casecfg']
+        self.casecfgid = state['casecfgid']
+        self.casecfgid_LNS_stats_only = state['casecfgid_LNS_stats_only']
+        
+        # Activate log file
+        logfn = 'Output/EAMS_LNS_' + self.casecfgid + '_' + datetime.now().strftime('%Y_%m_%d_%H_%M_%S_%f')
+        self._activateLogFile(logfn)
+        logging.info("Resume LNS run #%d from checkpoint %s" %(state['lns_run_count'], fn))
+        
+        # LNS configuration & benchmark
+        self.__dict__.update(state['param'])
+        
+        # Read EAMS, the meeting list is in the order of the checkpointed run
+        self._loadEAMS(self.casecfg, state['meetings'])
+        
+        # Initialize MILP with the master schedule & HVAC control, no initial schedule is solved
+        self.milp_solver = Solver_MILP(self.eams, logfn, self.casecfgid, -1, self.MIP_LOG_CB, self.LNS_SEED)
+        self.milp_solver.initModel()
+        self.milp_solver.__dict__.update(state['master'])
+        self.milp_solver.hasInitialSolution = 1
+        
+        self.lns_run_count = state['lns_run_count']
+        self.curr_optval = state['curr_optval']
+        self.tabu = state['tabu']
+        setstate(state['rng'])
+        self.run_start_t = time() - state['elapsed']
+        self.ckpt = self._initCheckpoint()
+        logging.info("++++++++ OBJVALUE ++++++++ Resumed optimal value :  %g, %g s after the start of the run" %(self.curr_optval, state['elapsed']))
+        
+        return self.curr_optval
+        
     def run(self):
         
         # InitializeModel
@@ -218,10 +271,7 @@ class Solver_LNS:
         self.lns_run_count = 0
         self.curr_best_schedule = []
         self.curr_optval = -1
-        self.tabulist = {}
-        self.tabulist[self.TABU_LOC_ONLY] = {}
-        self.tabulist[self.TABU_TIME_ONLY] = {}
-        self.tabulist[self.TABU_LOC_N_TIME] = {}
+        self.tabu = self._initTabuStore()
            
         self.NUM_DESTROY_PER_ROOM = [0] * len(self.eams.RL)
         self.NUM_ROOM_DESTROYED_PER_ROUND = []
@@ -231,6 +281,7 @@ class Solver_LNS:
             #         self.SCHE_TYPE_ARBITRARY = 0
             #         self.SCHE_TYPE_MIN_ROOM_PER_DAY   = 1
         start = time()
+        self.run_start_t = start
         logging.info("\n\n==================================================================")
         logging.info("\t\t Initial Schedule")
         logging.info("==================================================================")
@@ -275,6 +326,8 @@ class Solver_LNS:
             self._log_ObjValue_Neighbourhood(datetime.strftime(datetime.now(), "%Y-%m-%d %H:%M:%S"), self.curr_optval, -1)
             self.log_hvac()
             self.milp_solver.logXW(self.casecfgid)
+            self.ckpt = self._initCheckpoint()
+            self._saveCheckpoint(1)
         
 # # # #         self.milp_solver.updateGurobiParam(self.MIP_TIMELIMIT_SEC)    # Update this after initial solution (because we don't want to limit initial solution)
 # # # #         self.start_t = time()
@@ -340,16 +393,17 @@ class Solver_LNS:
         
         if (e_nodr + newobj) < (self.curr_optval): # found a better solution
             self.curr_optval = e_nodr + newobj
-            logging.info("++++++++ OBJVALUE ++++++++ New optimal value with (%g + %g) :  %g. Accept" %(e_nodr, newobj, self.curr_optval))
+            logging.info("++++++++ OBJVALUE ++++++++ New optimal value with (%g + %g) :  %g. Accept", e_nodr, newobj, self.curr_optval)
 #             print "++++++++ OBJVALUE ++++++++ New optimal value : "+ str(self.curr_optval) +". Accept"
             return 1
         else:
-            logging.info("++++++++ OBJVALUE ++++++++ No better solution found with (%g + %g) =    %g (>= %g). Reject." %(e_nodr, newobj, e_nodr + newobj, self.curr_optval))
+            logging.info("++++++++ OBJVALUE ++++++++ No better solution found with (%g + %g) =    %g (>= %g). Reject.", e_nodr, newobj, e_nodr + newobj, self.curr_optval)
 #             print "++++++++ OBJVALUE ++++++++ No better solution found with ("+str(e_nodr)+"+"+str(newobj)+")="+str(e_nodr + newobj)+" (>= "+str(self.curr_optval)+"). Reject."
             return -1
         
     def _updateNeighbourhood(self, runidx):
         self.milp_solver.updateNeighbourhood(runidx)
+        self._saveCheckpoint()
         
         if self.LOG_LNS_EAMS:
             self.log_schedule() 
@@ -392,7 +446,7 @@ class Solver_LNS:
             num_rooms = 3
         else:
             num_rooms = 4
-        logging.info("Randomly generated %g, destroy %d rooms" %(a, num_rooms))
+        logging.info("Randomly generated %g, destroy %d rooms", a, num_rooms)
         
         self.NUM_ROOM_DESTROYED_PER_ROUND.append(num_rooms) 
         return num_rooms
@@ -420,7 +474,7 @@ class Solver_LNS:
         if self.ACTIVATE_TABU:
             self._addTabuList(self.TABU_LOC_ONLY, locls)
             
-        logging.info("Destroying meeting schedule in ( <%d> locations %s )" %(num_l, locls))
+        logging.info("Destroying meeting schedule in ( <%d> locations %s )", num_l, locls)
         
         return locls
         
@@ -428,65 +482,60 @@ class Solver_LNS:
     #===========================================================================
     # Tabu
     #===========================================================================   
+    def _initTabuStore(self):
+        if self.TABU_EXPIRED_TYPE == 0:    # 0: time-based, 1: cycle-based
+            return TabuStore(self.TABU_PERIOD_SEC)
+        return TabuStore(self.TABU_CYCLE)
+        
+    def _getTabuKey(self):
+        if self.TABU_EXPIRED_TYPE == 0:    # 0: time-based, 1: cycle-based
+            return time()
+        return self.lns_run_count
+    
     def _remTabuedOption(self, lstype, candidatels):
-
-        logging.info("******* TABU ************ candidatels = %s" %(candidatels))     
-           
-        tabuls = self._getTabuList(lstype)
-        logging.info("******* TABU ************ tabuls=%s" %tabuls)
-        ls = [x for x in candidatels if x not in tabuls]
-        logging.info("******* TABU ************ candidatels after removing tabu-ed option = %s" %(ls))
+        ls = self.tabu.filter(lstype, candidatels)
+        logging.info("******* TABU ************ %d of %d candidates left after removing tabu-ed option", len(ls), len(candidatels))
+        logging.debug("******* TABU ************ candidatels after removing tabu-ed option = %s", ls)
         return ls
     
     def _getTabuList(self, lstype):
-        tabu = []
-        val = self.tabulist[lstype]
-        for v in val.itervalues():
-            if v not in tabu:
-                tabu.extend(v)                
-        return tabu    
+        return self.tabu.getEntries(lstype)
     
     def _addTabuList(self, lstype, tabuls):
-        
-        if self.TABU_EXPIRED_TYPE == 0:    # 0: time-based, 1: cycle-based
-            tabu_key = time()
-        else:
-            tabu_key = self.lns_run_count
-                        
-        # add new tabu list
-        if not self.tabulist.get(lstype):
-            self.tabulist[lstype] = {tabu_key:tabuls}
-        elif self.tabulist[lstype].get(tabu_key):
-            self.tabulist[lstype].get(tabu_key).extend(tabuls)
-        else:
-            self.tabulist[lstype].update({tabu_key: tabuls})
-       
-        logging.info("******* TABU ************ updated  tabulist: %s" %(self.tabulist))
-        
+        self.tabu.add(lstype, tabuls, self._getTabuKey())
+        logging.info("******* TABU ************ updated tabu list: %d entries", self.tabu.size())
         
     def _remExpiredTabuList(self):
-        
-        if self.TABU_EXPIRED_TYPE == 0:    # 0: time-based, 1: cycle-based
-            tabu_key = time() 
-            expire_limit = self.TABU_PERIOD_SEC 
-        else:
-            tabu_key = self.lns_run_count
-            expire_limit = self.TABU_CYCLE
-        
-        # remove expired tabu list
-        expls = []
-        for k, v in self.tabulist.iteritems():        
-            for tk, _ in v.iteritems():            
-                if (tabu_key - tk) > expire_limit:
-                    expls.append([k, tk])
-    
-        logging.info("******* TABU ************ expls: %s" %(expls))
-        
-        for i in xrange(len(expls)):
-            [k,tk] = expls[i]
-            del self.tabulist[k][tk]
+        nexp = self.tabu.expire(self._getTabuKey())
+        logging.info("******* TABU ************ removed %d expired tabu entries, %d left", nexp, self.tabu.size())
             
-        logging.info("******* TABU ************ after removing expired tabulist: %s" %(self.tabulist))
+    #===========================================================================
+    # Checkpoint
+    #===========================================================================
+    def _initCheckpoint(self):
+        return LNS_Checkpoint('Output/' + self.casecfgid + '_LNS_checkpoint', self.LNS_CHECKPOINT_SEC)
+    
+    def _getCheckpointState(self):
+        """Everything resume() needs to continue the run: LNS configuration & statistics (upper case attributes), 
+           master schedule & HVAC control (MSTR_* of the MILP), tabu memory, RNG state and the time since the start of the run"""
+        param = dict((k, v) for k, v in self.__dict__.iteritems() if k.isupper())
+        master = dict((k, v) for k, v in self.milp_solver.__dict__.iteritems() if k.startswith('MSTR_'))
+        return {'runcfg': self.runcfg,
+                'casecfg': self.casecfg,
+                'casecfgid': self.casecfgid,
+                'casecfgid_LNS_stats_only': self.casecfgid_LNS_stats_only,
+                'param': param,
+                'meetings': [m.Key for m in self.eams.ML],
+                'master': master,
+                'lns_run_count': self.lns_run_count,
+                'curr_optval': self.curr_optval,
+                'tabu': self.tabu,
+                'rng': getstate(),
+                'elapsed': time() - self.run_start_t}
+        
+    def _saveCheckpoint(self, force=0):
+        if self.ckpt.isEnabled() and (force or self.ckpt.isDue()):
+            self.ckpt.save(self._getCheckpointState())
             
     #===========================================================================
     # Diagnose
@@ -515,6 +564,8 @@ class Solver_LNS:
         self.milp_solver.logMSTR_HVACResults()
         self.milp_solver.logMSTR_Schedules(self.casecfgid)
         self.milp_solver.logMSTR_Temperatures(self.casecfgid)
+        self.milp_solver.saveResult()
+        self.milp_solver.logBuildProfile(self.casecfgid)
 #         self.milp_solver.logStatistics(self.runcfg, self.casecfgid)        
 #         self.milp_solver.logEnergy(self.runcfg, self.casecfgid)
         
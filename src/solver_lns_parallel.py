@@ -0,0 +1,128 @@
+import logging
+from time import time
+from Queue import Empty
+from multiprocessing import Process, Queue
+
+from gurobipy import Env
+from solver_milp import Solver_MILP
+
+
+def _lnsWorker(wid, eams, fn, casecfgid, init_soltype, mip_timelimit, deadline, eps, incumbent, task_q, result_q):
+    """Worker process of LNS_WorkerPool. Repair the neighbourhoods sent by the coordinator on its own model.
+       A task is [runidx, nt, incumbent or None if unchanged, locls, timels, mls, sub-MIP time limit], 
+       a result is [wid, runidx, nt, objval, #BDV_x_MLK destroyed, sub-MIP time, [Status, Runtime, MIPGap], 
+                    solution if better than the worker's incumbent else None]."""
+    
+    # Log into the worker's own file
+    logger = logging.getLogger()
+    for old_handler in logger.handlers:
+        logger.removeHandler(old_handler)
+    logger.addHandler(logging.FileHandler(fn))
+    
+    try:
+        # Own Gurobi environment, the default one inherited from the coordinator is not fork-safe
+        env = Env(fn)
+        solver = Solver_MILP(eams, fn, casecfgid, -1, 0, env)
+        solver.initLNSWorkerModel(init_soltype, incumbent)
+        solver.updateGurobiParam(mip_timelimit, -1)
+        solver.setDeadline(deadline)
+    except Exception, e:
+        logging.critical("LNS worker %d failed to build its model. %s" %(wid, e))
+        result_q.put([wid, -1, -1, None, 0, 0.0, None, None])
+        return
+    
+    while True:
+        task = task_q.get()
+        if task is None:
+            break
+        
+        [runidx, nt, sol, locls, timels, mls, timelimit] = task
+        try:
+            if sol is not None:
+                solver.loadIncumbent(sol)
+            solver.setTimeLimit(timelimit)
+            
+            timestart = time()
+            newval = solver.solveLNSConstrainedMILP(runidx, locls, timels, mls)
+            runtime = time() - timestart
+            sol = None
+            if (newval != solver.MIP_TIMELIMITREACHED_NOSOLUTION) and (newval + eps <= solver.incumbent['ObjVal']):
+                solver.storeIncumbent()
+                sol = solver.incumbent
+            else:
+                solver.rollbackPreviousBestSchedule(runidx, [])
+            result_q.put([wid, runidx, nt, newval, solver.NUMVAR_BDV_x_MLK_DESTROY, runtime, solver.LNS_SOLVE_STATS, sol])
+            
+        except Exception, e:
+            logging.critical("LNS worker %d failed on run #%d. %s" %(wid, runidx, e))
+            result_q.put([wid, runidx, nt, None, 0, 0.0, None, None])
+            return
+    
+
+class LNS_WorkerPool:
+    """Worker processes which repair LNS neighbourhoods in parallel, each on its own Gurobi model of the same instance.
+       Workers are forked, so they share the EAMS instance (and its shuffled meeting list) of the coordinator,
+       but every worker creates its own Gurobi environment.
+       Destroy, tabu and acceptance are left to the coordinator, see Solver_LNS._runParallel().
+       Solves still running at deadline (time()) are terminated."""
+    
+    def __init__(self, num_worker, eams, fn, casecfgid, init_soltype, mip_timelimit, deadline, eps):
+        self.NUM_WORKER = num_worker
+        self.eams = eams
+        self.fn = fn
+        self.casecfgid = casecfgid
+        self.INIT_SOLTYPE = init_soltype
+        self.MIP_TIMELIMIT_SEC = mip_timelimit
+        self.DEADLINE = deadline
+        self.LNS_OBJVALUE_EPSILON = eps
+        
+        self.workers = []           # worker processes, offset is worker id
+        self.task_q = []            # task queue of every worker
+        self.result_q = Queue()     # results of all workers
+        self.failed = set()         # id of workers which failed or died
+        self.POLL_SEC = 1.0         # interval to check for dead workers while waiting for a result
+        
+    def start(self, incumbent):
+        """Start the workers. Every worker builds its model and starts from incumbent, see Solver_MILP.storeIncumbent()"""
+        for wid in xrange(self.NUM_WORKER):
+            task_q = Queue()
+            fn = '%s_W%d' %(self.fn, wid)
+            casecfgid = '%s_W%d' %(self.casecfgid, wid)
+            p = Process(target=_lnsWorker, args=(wid, self.eams, fn, casecfgid, self.INIT_SOLTYPE, 
+                                                 self.MIP_TIMELIMIT_SEC, self.DEADLINE, self.LNS_OBJVALUE_EPSILON, incumbent, task_q, self.result_q))
+            p.daemon = True
+            p.start()
+            self.workers.append(p)
+            self.task_q.append(task_q)
+        logging.info("Started %d LNS workers" %(self.NUM_WORKER))
+        
+    def submit(self, wid, runidx, nt, sol, locls, timels, mls, timelimit):
+        """Send a neighbourhood to repair within timelimit (sec) to worker wid. sol is the new incumbent, or None if the worker holds it already."""
+        self.task_q[wid].put([runidx, nt, sol, locls, timels, mls, timelimit])
+        
+    def getResult(self):
+        """Wait for the next result of any worker. A worker which died without reporting, e.g. killed or crashed in Gurobi,
+           yields a failure result [wid, -1, -1, None, ...] as a worker which failed on its own does."""
+        while True:
+            try:
+                result = self.result_q.get(True, self.POLL_SEC)
+                if result[3] is None:
+                    self.failed.add(result[0])
+                return result
+            except Empty:
+                for wid in xrange(len(self.workers)):
+                    if wid not in self.failed and not self.workers[wid].is_alive():
+                        logging.critical("LNS worker %d died with exit code %s" %(wid, self.workers[wid].exitcode))
+                        self.failed.add(wid)
+                        return [wid, -1, -1, None, 0, 0.0, None, None]
+    
+    def getNumAlive(self):
+        """Number of workers which have not failed"""
+        return self.NUM_WORKER - len(self.failed)
+    
+    def stop(self):
+        for task_q in self.task_q:
+            task_q.put(None)
+        for p in self.workers:
+            p.join()
+        logging.info("Stopped %d LNS workers" %(self.NUM_WORKER))
@@ -0,0 +1,51 @@
+import logging
+from heapq import heappush, heappop
+
+
+class TabuStore:
+    """Tabu memory of the LNS. Every entry is an attribute of a destroyed neighbourhood (a slot, a room, a meeting [m,l,k],
+       or finer ones such as (meeting type, room) and (room, day)) stamped with the key it was added with,
+       i.e. time() for time-based expiry or the LNS cycle for cycle-based expiry.
+       Membership is a dict lookup. Expiry pops a heap ordered by key, stale heap entries (attribute re-added later) are skipped."""
+
+    def __init__(self, limit):
+        self.LIMIT = limit          # entry expires once (now - key) > LIMIT
+        self.added = {}             # d[(lstype, attr)] = key of the latest add
+        self.heap = []              # (key, lstype, attr), one per add
+        
+    def _hashable(self, attr):
+        if isinstance(attr, list):
+            return tuple(attr)
+        return attr
+        
+    def add(self, lstype, attrs, key):
+        for attr in attrs:
+            entry = (lstype, self._hashable(attr))
+            self.added[entry] = key
+            heappush(self.heap, (key, entry[0], entry[1]))
+        
+    def isTabu(self, lstype, attr):
+        return (lstype, self._hashable(attr)) in self.added
+    
+    def filter(self, lstype, candidatels):
+        """Candidates which are not tabu"""
+        return [x for x in candidatels if (lstype, self._hashable(x)) not in self.added]
+        
+    def expire(self, now):
+        """Remove entries older than LIMIT. Return the number of entries removed."""
+        nexp = 0
+        while self.heap and (now - self.heap[0][0]) > self.LIMIT:
+            [key, lstype, attr] = heappop(self.heap)
+            entry = (lstype, attr)
+            if self.added.get(entry) == key:
+                del self.added[entry]
+                nexp = nexp + 1
+        return nexp
+    
+    def size(self, lstype=None):
+        if lstype is None:
+            return len(self.added)
+        return sum(1 for entry in self.added if entry[0] == lstype)
+    
+    def getEntries(self, lstype):
+        return [attr for (t, attr) in self.added if t == lstype]
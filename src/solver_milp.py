@@ -2,43 +2,64 @@ import logging
 from datetime import datetime
 from time import time
 
-from eams_log import cb_mipsol
+from eams_log import cb_mipsol, cb_deadline
 from eams import EAMS
 from solver_error import SOLVER_LNS_Error
+from solver_profiler import BuildProfiler
+from solver_solution import SolutionSnapshot
+from solver_result import RunResult
 
 from gurobipy import *
         
 class Solver_MILP:
-    def __init__(self, EAMS, fn, cfg_idx, timelimit, logcb):
-        self.model = Model('EAMS')
+    def __init__(self, EAMS, fn, cfg_idx, timelimit, logcb, env=None):
+        self.model = Model('EAMS', env=env)  # env: Gurobi environment, the default environment if None
         self.EAMS = EAMS
         self.GUROBI_LOGFILE = fn
         self.err = SOLVER_LNS_Error()
         
         self.USE_REDUCED_MODEL = 1          # switch to HVAC reduced model (which remove all internal wall, ignore zone conduction within building, just consider enthalpy and external wall)
-        logging.info("Use REDUCED HVAC Model? %s" %(self.USE_REDUCED_MODEL))
+        logging.info("Use REDUCED HVAC Model? %s", self.USE_REDUCED_MODEL)
         self.LOG_LP = 0                     # turn on to write LP file
+        self.LOG_MIP_EAMS = 0               # turn on to write schedules & temperatures of every LNS run. Turn this off to save more time for LNS operation!
+        self.LOG_RESULT_NPZ = 0             # turn on to write schedules & temperatures to Output/<CASE_CFG>_result.npz instead of text files, see solver_result.py
+        self.LOG_BUILD_PROFILE = 0          # turn on to profile every _create* model builder, see logBuildProfile()
+        self.LNS_WARM_START = 1             # turn on to pass the incumbent as MIP start (Start) to every LNS sub-MIP
+        self.LNS_VAR_HINT = 0               # turn on to pass the incumbent as VarHintVal as well
+        self.LNS_CUTOFF = 1                 # turn on to set Cutoff of every LNS sub-MIP to the incumbent objective
         
         self.solveTime = -1                 # TODO: in LNS, solveTime is calculated in solver_lns
         self.CASE_CFG = cfg_idx        
         self.TIME_LIMIT = float(timelimit)
         self.LOG_CB     = int(logcb)
         self.SOLUTION_LIMIT = -1            # do not impose limit
+        self.DEADLINE = None                # time() at which a running solve is terminated, see setDeadline()
                 
         self.NUM_SLOT = len(self.EAMS.TS)-1
         self.NUM_MEETING = len(self.EAMS.ML)
         self.NUM_MEETING_TYPE = len(self.EAMS.MTYPE)
         self.NUM_ROOM = len(self.EAMS.RL)
-        logging.debug("******************* #k = %d #m = %d #r = %d  #mtype = %d" %(self.NUM_SLOT, self.NUM_MEETING, self.NUM_ROOM, self.NUM_MEETING_TYPE))
+        logging.debug("******************* #k = %d #m = %d #r = %d  #mtype = %d", self.NUM_SLOT, self.NUM_MEETING, self.NUM_ROOM, self.NUM_MEETING_TYPE)
         
         # For benchmark
         self.NUMVAR_BDV_x_MLK = 0
+        self.LNS_SOLVE_STATS = [0, 0.0, GRB.INFINITY]   # [Status, Runtime, MIPGap] of the last solveLNSConstrainedMILP()
         
         self._initConstant()
+        self._initHVACBound()
         self._initScheduleVar()
         self._initHVACVar()
         
         self.hasInitialSolution = -1
+        self.solution = SolutionSnapshot(self)  # solution of the last optimize(), see _optimize()
+        self.incumbent = None                   # best solution kept in memory by storeIncumbent(), see rollbackPreviousBestSchedule()
+        self.result = None                      # binary result of the run if LOG_RESULT_NPZ, see _getResult()
+        self.result_sol = -1                    # solution.version of the last snapshot in result
+        
+        self.profiler = None
+        if self.LOG_BUILD_PROFILE:
+            self.profiler = BuildProfiler(self)
+            self.profiler.instrument()
         
         
     #===========================================================================
@@ -48,17 +69,29 @@ class Solver_MILP:
         start = time()
         self._createModel()
         if self.LOG_CB == 1:
-            self.model.optimize(cb_mipsol)
+            self._optimize(cb_mipsol)
         else:          
-            self.model.optimize()
+            self._optimize()
         self.solveTime = time() - start
     
+    def _optimize(self, callback=None):
+        """Optimize the model. Solution values cached from the previous solve are dropped."""
+        self.solution.invalidate()
+        if self.DEADLINE is not None:
+            self.model._CB = callback
+            self.model._DEADLINE = self.DEADLINE
+            callback = cb_deadline
+        if callback is None:
+            self.model.optimize()
+        else:
+            self.model.optimize(callback)
+    
     def _createModel(self):
         logging.info("===============================================================")
         logging.info("Gurobi - Create model ")
         logging.info("===============================================================")  
         
-        logging.info("EAMS ML - %s" %self.EAMS.ML)
+        logging.debug("EAMS ML - %s", self.EAMS.ML)
         
         self.initModel()        
         self._createScheduleModel(self.USE_MEETING_TYPE)
@@ -92,6 +125,22 @@ class Solver_MILP:
         self.model.update()
         return [self.model.getAttr(GRB.attr.NumVars), self.model.getAttr(GRB.attr.NumBinVars), self.model.getAttr(GRB.attr.NumNZs), self.model.getAttr(GRB.attr.NumConstrs)]
             
+    def initLNSWorkerModel(self, INITIAL_SCHEDULE_TYPE, incumbent):
+        """Build the model of getInitialSchedule() + initHVACModelNEnergyObjBasedOnInitialSchedule() without solving it, 
+           and start from the incumbent found by the coordinator. Used by parallel LNS workers (see solver_lns_parallel) and by Solver_LNS.resume()."""
+        logging.info("Initialize LNS worker model...")
+        
+        self.initModel()
+        self._createScheduleModel(self.USE_MEETING_TYPE)
+        if INITIAL_SCHEDULE_TYPE == self.SCHE_TYPE_MIN_ROOM_PER_DAY:
+            self._createMinRoomPerDayObjective()
+        self._createHVACModel()
+        self._createObjective()
+        self.model.update()
+        
+        self.loadIncumbent(incumbent)
+        self.hasInitialSolution = 1
+            
     def getInitialSchedule(self, INITIAL_SCHEDULE_TYPE):
 #         print "Get initial schedule..."    
         logging.info("Get initial schedule...")
@@ -118,12 +167,12 @@ class Solver_MILP:
             if self.LOG_CB == 1:
                 # Option 1: With callback, log all solutions' schedules and temperatures
                 # Only if an objective exists                 
-                self.model.optimize(cb_mipsol)
+                self._optimize(cb_mipsol)
             else:                
-                self.model.optimize()
+                self._optimize()
         else:
             # Option 2: No callback (because no objective function, just find a feasible solution)
-            self.model.optimize()
+            self._optimize()
         
         # Step 5: Check model status
         if self.STATUS.index('INFEASIBLE') != self.model.getAttr(GRB.attr.Status):
@@ -161,10 +210,10 @@ class Solver_MILP:
         if self.LOG_CB == 1:
             # Option 1: With callback, log all solutions' schedules and temperatures
             # Only if an objective exists                 
-            self.model.optimize(cb_mipsol)
+            self._optimize(cb_mipsol)
         else:
             # Option 2: No callback
-            self.model.optimize()
+            self._optimize()
             
         if self.model.getAttr(GRB.attr.Status) == self.STATUS.index('INFEASIBLE'):
             print "Error! Infeasible HVAC model for the given initial schedule"
@@ -182,7 +231,7 @@ class Solver_MILP:
         return self.model.getAttr(GRB.attr.ObjVal)
          
     def solveLNSConstrainedMILP(self, runidx, locationls, slotls, mls):
-        logging.info("\n\n*****************************solveLNSConstrainedMILP  Run #%d..." %runidx)
+        logging.info("\n\n*****************************solveLNSConstrainedMILP  Run #%d...", runidx)
 #         print "\n\n*****************************solveLNSConstrainedMILP  Run #", runidx, "..."
                 
         if self.hasInitialSolution < 0:
@@ -197,6 +246,7 @@ class Solver_MILP:
         
         # Step 2: Add constraint to model. Destroy x=1 in locationls and slotls
         self._createLNS_ScheduleCstr(locationls, slotls, mls)
+        self._warmStartFromIncumbent()
         
         # Step 3: Log schedule LP model
         if self.LOG_LP:
@@ -206,23 +256,28 @@ class Solver_MILP:
         if self.LOG_CB == 1:
             # Option 1: With callback, log all solutions' schedules and temperatures
             # Only if an objective exists                 
-            self.model.optimize(cb_mipsol)
+            self._optimize(cb_mipsol)
         else:
             # Option 2: No callback
-            self.model.optimize()
+            self._optimize()
         
         logging.info("solveLNSConstrainedMILP Status: %s", self.STATUS[self.model.getAttr(GRB.attr.Status)])
         logging.info("MIP Solution Count: %s", self.model.getAttr(GRB.attr.SolCount))
-        optval = self.model.getAttr(GRB.attr.ObjVal)
+        logging.info("MIP Runtime: %g s", self.model.getAttr(GRB.attr.Runtime))
+        mipgap = GRB.INFINITY
+        if self.model.getAttr(GRB.attr.SolCount) > 0:
+            mipgap = self.model.getAttr(GRB.attr.MIPGap)
+        self.LNS_SOLVE_STATS = [self.model.getAttr(GRB.attr.Status), self.model.getAttr(GRB.attr.Runtime), mipgap]
                 
         # log schedules & HVAC control
-        self.logSchedules(self.CASE_CFG + "_3c_LNS_RUN_"+ str(runidx))
-        self.logTemperatures(self.CASE_CFG + "_3c_LNS_RUN_"+ str(runidx))
+        if self.LOG_MIP_EAMS:
+            self.logSchedules(self.CASE_CFG + "_3c_LNS_RUN_"+ str(runidx))
+            self.logTemperatures(self.CASE_CFG + "_3c_LNS_RUN_"+ str(runidx))
         
-        if (self.model.getAttr(GRB.attr.SolCount) == 0):  # no solution found upon TimeLimit
+        if (self.model.getAttr(GRB.attr.SolCount) == 0):  # no solution found upon TimeLimit, or none better than Cutoff
             return self.MIP_TIMELIMITREACHED_NOSOLUTION
         else:
-            return optval
+            return self.model.getAttr(GRB.attr.ObjVal)
           
     def getOccupiedLocation(self):
         self._getBDV_x_MLK_setToOne()
@@ -235,9 +290,41 @@ class Solver_MILP:
     def getOccupiedLocationNSlot(self):
         self._getBDV_x_MLK_setToOne()
         return self.milp_alloc
+    
+    def getEnergyLK(self):
+        """Location x time array of HVAC power of the current solution, read from the solution snapshot"""
+        return self.solution.getEnergyLK()
           
+    def storeIncumbent(self):
+        """Keep the current solution (schedule, HVAC control and objective) in memory as the incumbent"""
+        self.incumbent = self.solution.save()
+        if self.result is not None and self.result_sol == self.solution.version:
+            self.result.markReference()
+        logging.info("storeIncumbent objval=%g, %d variables", self.incumbent['ObjVal'], len(self.incumbent['X']['*']))
+        
+    def loadIncumbent(self, sol):
+        """Take over an incumbent kept by storeIncumbent() of another solver of the same instance"""
+        self.incumbent = sol
+        self.solution.restore(sol)
+        logging.info("loadIncumbent objval=%g", sol['ObjVal'])
+        
+    def hasRestoredIncumbent(self):
+        """True if the solution is the incumbent restored from memory, i.e. the model itself still holds a rejected solution"""
+        return self.solution.restored
+        
     def rollbackPreviousBestSchedule(self, runidx, mls):
-        logging.info("rollbackPreviousBestSchedule mls=%s" %mls)
+        logging.debug("rollbackPreviousBestSchedule mls=%s", mls)
+        if self.incumbent is None:
+            return self._rollbackLNS_ScheduleCstr(runidx, mls)
+        return self._restoreIncumbent(runidx)
+        
+    def syncIncumbent(self, runidx, mls):
+        """Re-solve the incumbent schedule if it was restored from memory, so the model holds it for the final results.
+           The incumbent is given as MIP start, so this is a single cheap solve."""
+        if not self.hasRestoredIncumbent():
+            return self.model.getAttr(GRB.attr.ObjVal)
+        logging.info("syncIncumbent: re-solve the incumbent schedule")
+        self._warmStartFromIncumbent()
         return self._rollbackLNS_ScheduleCstr(runidx, mls)
         
         
@@ -250,35 +337,88 @@ class Solver_MILP:
                 for k in xrange(len(self.BDV_x_MLK[m][l])):
                     [fm,fl,fk] = self._getBDV_x_MLK([m,l,k])
                     if self.BDV_x_MLK[m][l][k].getAttr("LB") > 0:
-                        logging.info("[fm,fl,fk]: %d,%d,%d | MLK_%d_%d_%d = %g" %(fm, fl, fk, m, l, k, self.BDV_x_MLK[m][l][k].getAttr("LB"))) 
+                        logging.info("[fm,fl,fk]: %d,%d,%d | MLK_%d_%d_%d = %g", fm, fl, fk, m, l, k, self.BDV_x_MLK[m][l][k].getAttr("LB")) 
 #                     print "[fm,fl,fk]:", fm, ",", fl, "," , fk, " | MLK_", m, "_", l, "_", k, " = ", self.BDV_x_MLK[m][l][k].getAttr("LB")
         
     def _getBDV_x_MLK_setToOne(self):
 #         print "------------------- _getBDV_x_MLK_setToOne  Identify x=1"
-        logging.info("------------------- _getBDV_x_MLK_setToOne  Identify x=1")
+        logging.debug("------------------- _getBDV_x_MLK_setToOne  Identify x=1")
         
 #         for m in xrange(self.NUM_MEETING):  #TODO: change to num meeting ???
-        self.milp_alloc = []
-        self.milp_alloc_sl = []
-        self.milp_alloc_sk = []
-        for m in xrange(self.NUM_MEETING_TYPE):
-            for l in xrange(len(self.BDV_x_MLK[m])):
-                for k in xrange(len(self.BDV_x_MLK[m][l])):
-                    val = self.BDV_x_MLK[m][l][k].x                    
-                    if val > self.EPSILON:
-                        [fm,fl,fk] = self._getBDV_x_MLK([m,l,k]) 
-                        self.milp_alloc.append([fm,fl,fk])
-                        if fl not in self.milp_alloc_sl:
-                            self.milp_alloc_sl.append(fl)
-                        if fk not in self.milp_alloc_sk:
-                            self.milp_alloc_sk.append(fk) 
+        self.milp_alloc = self.solution.getAssignments()
+        self.milp_alloc_sl = self.solution.getOccupiedLocations()
+        self.milp_alloc_sk = self.solution.getOccupiedSlots()
                         
 #         print "[fm, fl, fk]: ", self.milp_alloc
 #         print "fl:", self.milp_alloc_sl
 #         print "fk:", self.milp_alloc_sk 
-        logging.info("[fm, fl, fk]: %s" %(self.milp_alloc))
-        logging.info("[fl]: %s" %(self.milp_alloc_sl))
-        logging.info("[fk]: %s" %(self.milp_alloc_sk))
+        logging.debug("[fm, fl, fk]: %s", self.milp_alloc)
+        logging.debug("[fl]: %s", self.milp_alloc_sl)
+        logging.debug("[fk]: %s", self.milp_alloc_sk)
+        
+    def _setBDV_x_MLK_LB(self, keys, lb):
+        """Set LB of BDV_x_MLK of keys (m,l,k) in one batched call"""
+        if len(keys) == 0:
+            return
+        
+        xls = []
+        for key in keys:
+            [m, ml, mk] = self.BDV_x_MLK_Dict[key]
+            xls.append(self.BDV_x_MLK[m][ml][mk])
+        self.model.setAttr("LB", xls, [lb]*len(xls))
+        
+    def _updateBDV_x_MLK_Fixed(self, fixed):
+        """Fix BDV_x_MLK of keys (m,l,k) in fixed to 1 and release the others. 
+           Only variables whose bound differs from the currently fixed set are touched."""
+        release = self.BDV_x_MLK_Fixed - fixed
+        enforce = fixed - self.BDV_x_MLK_Fixed
+        self._setBDV_x_MLK_LB(release, 0.0)
+        self._setBDV_x_MLK_LB(enforce, 1.0)
+        self.BDV_x_MLK_Fixed = fixed
+        logging.info("BDV_x_MLK fixed=%d: released %d, enforced %d", len(fixed), len(release), len(enforce))
+        
+    def _restoreIncumbent(self, runidx):
+        """Rollback to the incumbent kept in memory, without solving. The bounds of BDV_x_MLK are left as they are,
+           the next _createLNS_ScheduleCstr() fixes them based on the restored schedule.
+           The incumbent is passed to the next solve as MIP start, see _warmStartFromIncumbent()."""
+        
+        logging.info("----------------------------------------------")
+        logging.info("     Restore Incumbent       ")
+        logging.info("----------------------------------------------")
+        
+        self.solution.restore(self.incumbent)
+        
+        # log schedules & HVAC control               
+        if self.LOG_MIP_EAMS:
+            self.logSchedules(self.CASE_CFG + "_3c_LNS_RUN_"+ str(runidx) + "_rollback")
+            self.logTemperatures(self.CASE_CFG + "_3c_LNS_RUN_"+ str(runidx) + "_rollback")
+        
+        return self.incumbent['ObjVal']
+        
+    def _warmStartFromIncumbent(self):
+        """Pass the incumbent to the next LNS sub-MIP: all schedule & HVAC values as MIP start (and VarHintVal),
+           and its objective as Cutoff so nodes which cannot improve it are pruned."""
+        if self.incumbent is None:
+            return
+        
+        xls = self.model.getVars()
+        start = self.incumbent['X']['*']
+        if len(xls) != len(start):
+            logging.warning("Incumbent has %d variables, model has %d. No warm start.", len(start), len(xls))
+            return
+        
+        if self.LNS_WARM_START:
+            self.model.setAttr("Start", xls, start.tolist())
+        if self.LNS_VAR_HINT:
+            self.model.setAttr("VarHintVal", xls, start.tolist())
+        if self.LNS_CUTOFF:
+            self.model.setParam(GRB.Param.Cutoff, self.incumbent['ObjVal'])
+        logging.info("Warm start from incumbent objval=%g (Start=%d, VarHintVal=%d, Cutoff=%d)", 
+                     self.incumbent['ObjVal'], self.LNS_WARM_START, self.LNS_VAR_HINT, self.LNS_CUTOFF)
+        
+    def _clearCutoff(self):
+        if self.LNS_CUTOFF:
+            self.model.setParam(GRB.Param.Cutoff, GRB.INFINITY)
         
     def _rollbackLNS_ScheduleCstr(self, runidx, mls):
         """Rollback x=1 to previous best schedule. Note that this settings might be changed later by _createLNS_ScheduleCstr()"""
@@ -287,33 +427,33 @@ class Solver_MILP:
         logging.info("     Rollback LNS Schedule Cstr       ")
         logging.info("----------------------------------------------")
         
-        logging.info("Best schedule: %s" %(mls))
+        logging.debug("Best schedule: %s", mls)
         
 #         logging.info("******************* BEFORE ROLLBACK ********************")
 #         self._diagBDV_x_MLK_LB()
 #         logging.info("----------------------------------------------")
         
-        for m in xrange(self.NUM_MEETING_TYPE):
-            for l in xrange(len(self.BDV_x_MLK[m])):
-                for k in xrange(len(self.BDV_x_MLK[m][l])):
-                    [fm,fl,fk] = self._getBDV_x_MLK([m,l,k])
-                    
-                    if ([fm, fl, fk] in mls and
-                        self.BDV_x_MLK[m][l][k].getAttr("LB") == 0.0):
-                        self.BDV_x_MLK[m][l][k].setAttr("LB", 1.0)
-                        
-                    if ([fm, fl, fk] not in mls and
-                        self.BDV_x_MLK[m][l][k].getAttr("LB") == 1.0):
-                        self.BDV_x_MLK[m][l][k].setAttr("LB", 0.0)
+        fixed = set(tuple(x) for x in mls if tuple(x) in self.BDV_x_MLK_Dict)
+        self._updateBDV_x_MLK_Fixed(fixed)
                         
         self.model.update()
         if self.LOG_LP:
             self.model.write('Output/EAMS_LNS_' + str(self.CASE_CFG) + '_3b_LNS_RUN_' + str(runidx) + '_rollback' + '_'+ datetime.now().strftime('%Y_%m_%d_%H_%M_%S_%f') +'.lp')
-        self.model.optimize()
+        # The best schedule cannot beat its own objective, do not cut it off
+        self._clearCutoff()
+        self._optimize()
+        
+        if self.model.getAttr(GRB.attr.SolCount) == 0:
+            logging.critical("Rollback found no solution, status %s. Keep the incumbent in memory.", self.STATUS[self.model.getAttr(GRB.attr.Status)])
+            if self.incumbent is None:
+                return self.MIP_TIMELIMITREACHED_NOSOLUTION
+            self.solution.restore(self.incumbent)
+            return self.incumbent['ObjVal']
         
         # log schedules & HVAC control               
-        self.logSchedules(self.CASE_CFG + "_3c_LNS_RUN_"+ str(runidx) + "_rollback")
-        self.logTemperatures(self.CASE_CFG + "_3c_LNS_RUN_"+ str(runidx) + "_rollback")
+        if self.LOG_MIP_EAMS:
+            self.logSchedules(self.CASE_CFG + "_3c_LNS_RUN_"+ str(runidx) + "_rollback")
+            self.logTemperatures(self.CASE_CFG + "_3c_LNS_RUN_"+ str(runidx) + "_rollback")
         
                                 
 #         logging.info("******************* AFTER ROLLBACK ********************")
@@ -335,37 +475,23 @@ class Solver_MILP:
 #         self._diagBDV_x_MLK_LB()
 #         print "----------------------------------------------"
         
+        # Destroy x=1 in locationls, slotls or mls, fix the rest of x=1
+        locations = set(locationls)
+        slots = set(slotls)
+        destroyed = set(tuple(x) for x in mls)
+        
         self.NUMVAR_BDV_x_MLK_DESTROY = 0
-        for m in xrange(self.NUM_MEETING_TYPE):
-            for l in xrange(len(self.BDV_x_MLK[m])):
-                for k in xrange(len(self.BDV_x_MLK[m][l])):
-                    [fm,fl,fk] = self._getBDV_x_MLK([m,l,k])
-                    
-                    # Check destroy to be made
-                    if (self.BDV_x_MLK[m][l][k].x > 0 and
-                        ((fl in locationls or
-                         fk in slotls or
-                         [fm, fl, fk] in mls))):
-                        self.NUMVAR_BDV_x_MLK_DESTROY = self.NUMVAR_BDV_x_MLK_DESTROY + 1
-                        
-                        
-                    # Remove constraint on x=1 which has NOT been destroyed in the previous round, 
-                    #    but TO BE destroyed in the current round 
-                    if (self.BDV_x_MLK[m][l][k].getAttr("LB") == 1.0 and
-                        ((fl in locationls or
-                         fk in slotls or
-                         [fm, fl, fk] in mls))):
-                        self.BDV_x_MLK[m][l][k].setAttr("LB", 0.0)
-                        
-                    # Add constraint on x=1 which is NOT TO BE destroyed in the current round
-                    if (self.BDV_x_MLK[m][l][k].getAttr("LB") == 0.0 and
-                        [fm,fl,fk] in self.milp_alloc and
-                        fl not in locationls and
-                        fk not in slotls and
-                        [fm, fl,fk] not in mls):
-                        self.BDV_x_MLK[m][l][k].setAttr("LB", 1.0)
+        fixed = set()
+        for [fm,fl,fk] in self.milp_alloc:
+            if (fl in locations or 
+                fk in slots or 
+                (fm, fl, fk) in destroyed):
+                self.NUMVAR_BDV_x_MLK_DESTROY = self.NUMVAR_BDV_x_MLK_DESTROY + 1
+            else:
+                fixed.add((fm, fl, fk))
                         
-        logging.info("---------------------------- Number of meeting destroy: %d" %(self.NUMVAR_BDV_x_MLK_DESTROY))                        
+        logging.info("---------------------------- Number of meeting destroy: %d", self.NUMVAR_BDV_x_MLK_DESTROY)                        
+        self._updateBDV_x_MLK_Fixed(fixed)
         self.model.update()
                                 
 #         print "******************* AFTER ********************"
@@ -398,18 +524,27 @@ class Solver_MILP:
         
         
 #-------------------------------------------------------
+    def setDeadline(self, deadline):
+        """Terminate any solve still running at time() = deadline, through a callback. None to remove the deadline"""
+        self.DEADLINE = deadline
+        
+    def setTimeLimit(self, TIME_LIMIT):
+        """Time limit of the next solves only. Unlike updateGurobiParam(), TIME_LIMIT is not kept as the solver's time limit"""
+        self.model.setParam(GRB.Param.TimeLimit, TIME_LIMIT)
+        logging.debug("Set GRB.Param.TimeLimit to %g", TIME_LIMIT)
+        
     def updateGurobiParam(self, TIME_LIMIT, SOLUTION_LIMIT):
         """Set Gurobi param which apply to non-initial solution"""
         
         if SOLUTION_LIMIT > 0:
             self.SOLUTION_LIMIT = SOLUTION_LIMIT            
             self.model.setParam(GRB.Param.SolutionLimit, SOLUTION_LIMIT)
-            logging.info("Update GRB.Param.SolutionLimit to %d" %(self.SOLUTION_LIMIT) )
+            logging.info("Update GRB.Param.SolutionLimit to %d", self.SOLUTION_LIMIT)
                         
         if TIME_LIMIT > 0:
             self.TIME_LIMIT = TIME_LIMIT
             self.model.setParam(GRB.Param.TimeLimit, TIME_LIMIT) 
-            logging.info("Update GRB.Param.TimeLimit to %d" %(self.TIME_LIMIT) )
+            logging.info("Update GRB.Param.TimeLimit to %d", self.TIME_LIMIT)
                     
         self.model.update()
     
@@ -555,6 +690,8 @@ class Solver_MILP:
         self.DAV_Attendee_LK = []                   # Discrete Auxiliary variable: Number of attendee at room l at time k
         
         self.BDV_x_MLK_Dict = {}                    # d[(m,l,k)] = offset of (m,l,k) in BDV_x_MLK. Record index of meeting x location x time periods
+        self.BDV_x_MLK_InvDict = {}                 # d[(m,ml,mk)] = (m,l,k). Reverse of BDV_x_MLK_Dict
+        self.BDV_x_MLK_Fixed = set()                # (m,l,k) of BDV_x_MLK which are currently fixed to 1 (LB=1) by LNS
         self.BDV_w_LK_Dict = {}                     # d[(l,k)] = offset of (l,k) in BDV_w_LK. Record index of location x time periods
         
         self.BAV_y_LD = []                          # Binary Decision variable: represent if location l is occupied at day D
@@ -625,7 +762,7 @@ class Solver_MILP:
     
     def _createScheduleModel(self, f_useMT):
         
-        logging.info("EAMS ML - %s" %self.EAMS.ML)
+        logging.debug("EAMS ML - %s", self.EAMS.ML)
         
         self._createBAV_z_LK()
         self._createDAV_Attendee_LK()  
@@ -662,6 +799,7 @@ class Solver_MILP:
         self._createCAV_T_l_c()
         self._createCAV_A_SA_T_z_LK()
         self._createCAV_A_SA_T_SA_LK()    
+        self.model.update()
         
         self._createCSTR_RoomTemperature_LB()
         self._createCSTR_RoomTemperature_UB()
@@ -688,6 +826,7 @@ class Solver_MILP:
             self._createHVAC_CSTR_hasStandbyMode()        
             
         self._createHVAC_CSTR_Energy()
+        self.model.update()
             
     def _createHVAC_CSTR_noStandbyMode(self):
         self._createCSTR_SupplyAirTemperature_LB_noStandbyMode()        
@@ -704,22 +843,59 @@ class Solver_MILP:
         self._createHVAC_CSTR_A_SA_T_SA_hasStandbyMode()
         self._createHVAC_CSTR_A_SA_T_z_with_LooseBoundedT_hasStandbyMode()        
         
-    def _get_A_SA_LB(self, l, k):        
-        if self.EAMS.SH[k] == 1:
+    def _initHVACBound(self):
+        """Pre-compute lower bounds of T_SA (per time slot) and A_SA (per room x time slot) used by the HVAC constraints"""
+        self.T_SA_LB_K = []
+        for k in xrange(self.NUM_SLOT):
+            if self.EAMS.SH[k] == 1:
+                self.T_SA_LB_K.append(float(self.EAMS.TEMPERATURE_CONDITIONED_AIR))
+            else:
+                self.T_SA_LB_K.append(float(self.EAMS.INITIAL_TEMPERATURE_SUPPLY_AIR_UNOCC))
+        
+        self.A_SA_LB_LK = []
+        for l in xrange(self.NUM_ROOM):
             [width, length, height] = self.EAMS.getRoomThermalConfig(l, "Dim")
-            A_SA_LB = self.EAMS.ALPHA_IAQ_FACTOR_OF_SAFETY*(
+            A_SA_LB_OCC = float(self.EAMS.ALPHA_IAQ_FACTOR_OF_SAFETY*(
                                                     (self.EAMS.MASS_AIR_FLOW_OUTSIDE_AIR_PER_METER_SQUARE * width * length * height) /
-                                                    (1-self.EAMS.MASS_AIR_FLOW_RETURN_AIR_RATIO))
-        else:
-            A_SA_LB = self.EAMS.MASS_AIR_FLOW_SUPPLY_AIR_MIN
+                                                    (1-self.EAMS.MASS_AIR_FLOW_RETURN_AIR_RATIO)))
+            A_SA_LB_UNOCC = float(self.EAMS.MASS_AIR_FLOW_SUPPLY_AIR_MIN)
+            self.A_SA_LB_LK.append([A_SA_LB_OCC if self.EAMS.SH[k] == 1 else A_SA_LB_UNOCC for k in xrange(self.NUM_SLOT)])
         
-        return float(A_SA_LB)
+    def _get_A_SA_LB(self, l, k):        
+        return self.A_SA_LB_LK[l][k]
     
     def _get_T_SA_LB(self, l, k):
-        if self.EAMS.SH[k] == 1:
-            return float(self.EAMS.TEMPERATURE_CONDITIONED_AIR)
-        else:
-            return float(self.EAMS.INITIAL_TEMPERATURE_SUPPLY_AIR_UNOCC)
+        return self.T_SA_LB_K[k]
+    
+    def _hasWallNode(self, l, w):
+        """Wall w of location l is modelled: always in the full model, only external walls in the reduced model"""
+        return ((self.USE_REDUCED_MODEL == 0) or
+                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][w] == self.N_OUTDOOR) or
+                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][w] == self.N_NOT_EXIST))
+    
+    def _addVarsLK(self, vname, lb=0.0, ub=GRB.INFINITY, wall=None):
+        """Add continuous variables vname_l_k for all locations x time slots (only locations which model wall w if given)
+           in one addVars() call. Model is not updated here, _createHVACModel updates it once per phase."""
+        locs = [l for l in xrange(self.NUM_ROOM) if wall is None or self._hasWallNode(l, wall)]
+        vls = [[] for l in xrange(self.NUM_ROOM)]
+        if not locs:
+            return vls
+        
+        names = ['%s_%d_%d' %(vname, l, k) for l in locs for k in xrange(self.NUM_SLOT)]
+        vd = self.model.addVars(locs, xrange(self.NUM_SLOT), lb=lb, ub=ub, vtype=GRB.CONTINUOUS, name=names)
+        for l in locs:
+            vls[l] = [vd[l, k] for k in xrange(self.NUM_SLOT)]
+        return vls
+    
+    def _addConstrsLK(self, cls, tc):
+        """Add constraints tc = [[l, constraint, name]] in one addConstrs() call and append them to cls[l], in order of tc"""
+        if not tc:
+            return
+        cd = self.model.addConstrs(tc[i][1] for i in xrange(len(tc)))
+        constrs = [cd[i] for i in xrange(len(tc))]
+        self.model.setAttr(GRB.Attr.ConstrName, constrs, [t[2] for t in tc])
+        for i in xrange(len(tc)):
+            cls[tc[i][0]].append(constrs[i])
         
     def _createHVAC_CSTR_A_SA_T_SA_hasStandbyMode(self):
         self._createCSTR_A_SA_T_SA_1_LK_hasStandbyMode()
@@ -749,6 +925,7 @@ class Solver_MILP:
         self._createCAV_EnergyConsumption_Fan()
         self._createCAV_EnergyConsumption_Conditioning()
         self._createCAV_EnergyConsumption_Heating()
+        self.model.update()
         
         self._createCSTR_EnergyConsumption_Fan()
         self._createCSTR_EnergyConsumption_Conditioning()
@@ -772,20 +949,21 @@ class Solver_MILP:
                     self.BDV_x_MLK[m].append([])  
                     mk = 0                                      
                     for k in xrange(self.NUM_SLOT):                        
-                        if self.EAMS.isInTimeWindows(mid,k) > 0:
-                            logging.debug("M_L_K_%d_%d_%d = in array offset(%d, %d, %d)" %(m,l,k, m, ml, mk))
+                        if self.EAMS.MFS[mid][k]:
+                            logging.debug("M_L_K_%d_%d_%d = in array offset(%d, %d, %d)", m, l, k, m, ml, mk)
                             
                             name = ['BDV_x_MLK', str(m), str(l), str(k)]                            
                             name = '_'.join(name)         
                             self.BDV_x_MLK[m][ml].append(self.model.addVar(lb=0.0, ub=1.0, vtype=GRB.BINARY, name=name))                            
                             self.BDV_x_MLK_Dict[tuple([m,l,k])] = [m,ml,mk]
+                            self.BDV_x_MLK_InvDict[tuple([m,ml,mk])] = tuple([m,l,k])
                             self.NUMVAR_BDV_x_MLK = self.NUMVAR_BDV_x_MLK + 1
                             mk = mk+1
                     ml = ml+1
                 
         self.model.update()                           
-        logging.debug("BDV_x_MLK:\n %s" %self.BDV_x_MLK)
-        logging.debug("BDV_x_MLK_Dict:\n %s" %self.BDV_x_MLK_Dict) 
+        logging.debug("BDV_x_MLK:\n %s", self.BDV_x_MLK)
+        logging.debug("BDV_x_MLK_Dict:\n %s", self.BDV_x_MLK_Dict)
      
     def _createBDV_x_MLK(self):
         """For each meeting x feasible location x feasible time, create a decision variable  (M x L_m x K_m)"""
@@ -798,19 +976,20 @@ class Solver_MILP:
                     self.BDV_x_MLK[m].append([])  
                     mk = 0                                      
                     for k in xrange(self.NUM_SLOT):                        
-                        if self.EAMS.isInTimeWindows(m,k) > 0:
-                            logging.debug("M_L_K_%d_%d_%d = in array offset(%d, %d, %d)" %(m,l,k, m, ml, mk))
+                        if self.EAMS.MFS[m][k]:
+                            logging.debug("M_L_K_%d_%d_%d = in array offset(%d, %d, %d)", m, l, k, m, ml, mk)
                             
                             name = ['BDV_x_MLK', str(m), str(l), str(k)]                            
                             name = '_'.join(name)         
                             self.BDV_x_MLK[m][ml].append(self.model.addVar(vtype=GRB.BINARY, name=name))
                             self.BDV_x_MLK_Dict[tuple([m,l,k])] = [m,ml,mk]
+                            self.BDV_x_MLK_InvDict[tuple([m,ml,mk])] = tuple([m,l,k])
                             mk = mk+1
                     ml = ml+1
                 
         self.model.update()                           
-        logging.debug("BDV_x_MLK:\n %s" %self.BDV_x_MLK)
-        logging.debug("BDV_x_MLK_Dict:\n %s" %self.BDV_x_MLK_Dict) 
+        logging.debug("BDV_x_MLK:\n %s", self.BDV_x_MLK)
+        logging.debug("BDV_x_MLK_Dict:\n %s", self.BDV_x_MLK_Dict)
         
     def _createBDV_w_LK(self):
         """For each time k, where k falls on non-standard working hour, create a decision variable  (L x K)"""
@@ -827,41 +1006,19 @@ class Solver_MILP:
                     mk = mk+1
     
         self.model.update()
-        logging.debug("BDV_w_LK:\n %s" %self.BDV_w_LK)
-        logging.debug("BDV_w_LK_Dict:\n %s" %self.BDV_w_LK_Dict)
+        logging.debug("BDV_w_LK:\n %s", self.BDV_w_LK)
+        logging.debug("BDV_w_LK_Dict:\n %s", self.BDV_w_LK_Dict)
         
     def _createCDV_SupplyAirTemperature(self):
         """For each location at each timestep, create a decision variable of TSA, i.e. TSA(k,l)"""
+        self.CDV_T_SA_LK.extend(self._addVarsLK('CDV_T_SA_LK', ub=self.EAMS.TEMPERATURE_SUPPLY_AIR_HIGH))
+        logging.debug("CDV_T_SA_LK:\n %s", self.CDV_T_SA_LK)
         
-        T_SA_UB = self.EAMS.TEMPERATURE_SUPPLY_AIR_HIGH
-        for l in xrange(self.NUM_ROOM):
-            self.CDV_T_SA_LK.append([])
-            for k in xrange(self.NUM_SLOT):                
-                name = ['CDV_T_SA_LK', str(l), str(k)]
-                name = '_'.join(name)                
-                
-                self.CDV_T_SA_LK[l].append(self.model.addVar(lb=0, ub=T_SA_UB, vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CDV_T_SA_LK:\n %s" %self.CDV_T_SA_LK)
-        
-    
     def _createCDV_AirMassFlowRate(self):
         """For each location at each timestep, create a decision variable of aSA, i.e. aSA(k,l)"""
+        self.CDV_A_SA_LK.extend(self._addVarsLK('CDV_A_SA_LK', ub=self.EAMS.MASS_AIR_FLOW_SUPPLY_AIR_MAX))
+        logging.debug("CDV_A_SA_LK:\n %s", self.CDV_A_SA_LK)
         
-        A_SA_UB = self.EAMS.MASS_AIR_FLOW_SUPPLY_AIR_MAX
-        for l in xrange(self.NUM_ROOM):
-            self.CDV_A_SA_LK.append([])
-            for k in xrange(self.NUM_SLOT):                
-                name = ['CDV_A_SA_LK', str(l), str(k)]
-                name = '_'.join(name)                
-                
-                self.CDV_A_SA_LK[l].append(self.model.addVar(lb=0, ub=A_SA_UB, vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CDV_A_SA_LK:\n %s" %self.CDV_A_SA_LK)
-        
-
     #===========================================================================
     # Objective
     #===========================================================================    
@@ -872,7 +1029,7 @@ class Solver_MILP:
         """Create a scheduling objective which allocate meeting into minimum number of room per day"""
         
         self._populateSlotIdxPerDay()
-        logging.info("****** _createCSTR_MinRoom()  Daily Slot Index: %s" %self.k_m)
+        logging.info("****** _createCSTR_MinRoom()  Daily Slot Index: %s", self.k_m)
         
         start_time = time()
         self._createBAV_y_LD()        
@@ -904,32 +1061,13 @@ class Solver_MILP:
                 self.BAV_y_LD[l].append(self.model.addVar(lb=0, ub=1, vtype=GRB.CONTINUOUS, name=name))
              
         self.model.update()
-        logging.debug("BAV_y_LD:\n %s" %self.BAV_y_LD)
+        logging.debug("BAV_y_LD:\n %s", self.BAV_y_LD)
                 
     def _populateSlotIdxPerDay(self):
-        self.k_m = []
-        d_start = -1
-        d_end = -1        
-        for k, v in self.EAMS.TS.iteritems():
-            if (v.hour == 9 and v.minute == 0):
-                if d_start == -1 and d_end == -1:
-                    d_start = k 
-                else:
-#                     print "d_end or d_start != -1. Invalid start/end scheduling period"
-                    logging.error("d_end or d_start != -1. Invalid start/end scheduling period")
-                
-            if (v.hour == 16 and v.minute == 30):
-                if d_start != -1 and d_end == -1:
-                    d_end = k
-                    self.k_m.append([d_start, d_end])
-                    d_start = -1
-                    d_end = -1
-        
-            
+        self.k_m = self.EAMS.TG.getDailySlotIdx()
+                    
     def _getDayForSlotIdx(self, k):
-        for i in xrange(len(self.k_m)):
-            if k >= self.k_m[i][0] and k <= self.k_m[i][1]:
-                return i
+        return self.EAMS.TG.getDayForSlotIdx(k)
         
     def _createCSTR_MinRoom(self):
         """Force meeting allocation into minimum number of room per day"""
@@ -938,7 +1076,7 @@ class Solver_MILP:
             self.CSTR_MinRoom = []               
             for k in xrange(self.NUM_SLOT):
                 for m in xrange(self.NUM_MEETING):
-                    if self.EAMS.isInTimeWindows(m,k) > 0:
+                    if self.EAMS.MFS[m][k]:
                         if (m, l, k) in self.BDV_x_MLK_Dict:
                             [om, ol, ok] = self.BDV_x_MLK_Dict[m, l, k]  
                             day = self._getDayForSlotIdx(k) 
@@ -949,7 +1087,7 @@ class Solver_MILP:
                             self.CSTR_MinRoom.append(self.model.addConstr(lcstr <= rcstr, name))
                  
         self.model.update()
-        logging.debug("CSTR_MinRoom:\n %s" %self.CSTR_MinRoom)  
+        logging.debug("CSTR_MinRoom:\n %s", self.CSTR_MinRoom)
         
     
     #===========================================================================
@@ -985,7 +1123,7 @@ class Solver_MILP:
                 self.BAV_z_LK[l].append(self.model.addVar(lb=0, ub=1, vtype=GRB.CONTINUOUS, name=name))
              
         self.model.update()
-        logging.debug("BAV_z_LK:\n %s" %self.BAV_z_LK)
+        logging.debug("BAV_z_LK:\n %s", self.BAV_z_LK)
          
     def _createDAV_Attendee_LK(self):
         """For each location at each timestamp, create an auxiliary variable representing number of attendee"""
@@ -998,247 +1136,87 @@ class Solver_MILP:
 #                self.DAV_Attendee_LK[l].append(self.model.addVar(lb=0, vtype=GRB.INTEGER, name=name))
                 self.DAV_Attendee_LK[l].append(self.model.addVar(lb=0, vtype=GRB.CONTINUOUS, name=name))                 
         self.model.update()
-        logging.debug("DAV_Attendee_LK:\n %s" %self.DAV_Attendee_LK)
+        logging.debug("DAV_Attendee_LK:\n %s", self.DAV_Attendee_LK)
         
     #===========================================================================
     # Auxiliary Variables: HVAC
     #===========================================================================
     def _createCAV_RoomTemperature(self):
         """For each location at each timestep, create an auxiliary variable of room temperature T(k, l)"""
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_LK.append([])
-            for k in xrange(self.NUM_SLOT):
-                name = ['CAV_T_LK', str(l), str(k)]
-                name = '_'.join(name)         
-                
-                self.CAV_T_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_LK:\n %s" %self.CAV_T_LK)
+        self.CAV_T_LK.extend(self._addVarsLK('CAV_T_LK'))
+        logging.debug("CAV_T_LK:\n %s", self.CAV_T_LK)
         
     def _createCAV_T_z1_l(self):
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_z1_l_LK.append([])
-            
-            if ((self.USE_REDUCED_MODEL == 0) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][0] == self.N_OUTDOOR) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][0] == self.N_NOT_EXIST)):
-                                    
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_z1_l_LK', str(l), str(k)]                
-                    name = '_'.join(name)   
-                    self.CAV_T_z1_l_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_z1_l_LK:\n %s" %self.CAV_T_z1_l_LK)
+        self.CAV_T_z1_l_LK.extend(self._addVarsLK('CAV_T_z1_l_LK', wall=0))
+        logging.debug("CAV_T_z1_l_LK:\n %s", self.CAV_T_z1_l_LK)
         
     def _createCAV_T_z2_l(self):
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_z2_l_LK.append([])
-            
-            if ((self.USE_REDUCED_MODEL == 0) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][1] == self.N_OUTDOOR) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][1] == self.N_NOT_EXIST)):
-                
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_z2_l_LK', str(l), str(k)]
-                    name = '_'.join(name)   
-                    self.CAV_T_z2_l_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_z2_l_LK:\n %s" %self.CAV_T_z2_l_LK)
+        self.CAV_T_z2_l_LK.extend(self._addVarsLK('CAV_T_z2_l_LK', wall=1))
+        logging.debug("CAV_T_z2_l_LK:\n %s", self.CAV_T_z2_l_LK)
         
     def _createCAV_T_z3_l(self):
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_z3_l_LK.append([])
-            
-            if ((self.USE_REDUCED_MODEL == 0) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][2] == self.N_OUTDOOR) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][2] == self.N_NOT_EXIST)):
-            
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_z3_l_LK', str(l), str(k)]
-                    name = '_'.join(name)                            
-                    self.CAV_T_z3_l_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_z3_l_LK:\n %s" %self.CAV_T_z3_l_LK)
+        self.CAV_T_z3_l_LK.extend(self._addVarsLK('CAV_T_z3_l_LK', wall=2))
+        logging.debug("CAV_T_z3_l_LK:\n %s", self.CAV_T_z3_l_LK)
         
     def _createCAV_T_z4_l(self):
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_z4_l_LK.append([])
-            
-            if ((self.USE_REDUCED_MODEL == 0) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][3] == self.N_OUTDOOR) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][3] == self.N_NOT_EXIST)):
-                
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_z4_l_LK', str(l), str(k)]
-                    name = '_'.join(name)  
-                    self.CAV_T_z4_l_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_z4_l_LK:\n %s" %self.CAV_T_z4_l_LK)
+        self.CAV_T_z4_l_LK.extend(self._addVarsLK('CAV_T_z4_l_LK', wall=3))
+        logging.debug("CAV_T_z4_l_LK:\n %s", self.CAV_T_z4_l_LK)
         
     def _createCAV_T_l_z1(self):
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_l_z1_LK.append([])
-            
-            if ((self.USE_REDUCED_MODEL == 0) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][0] == self.N_OUTDOOR) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][0] == self.N_NOT_EXIST)):
-            
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_l_z1_LK', str(l), str(k)]                
-                    name = '_'.join(name)       
-                    self.CAV_T_l_z1_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_l_z1_LK:\n %s" %self.CAV_T_l_z1_LK)
+        self.CAV_T_l_z1_LK.extend(self._addVarsLK('CAV_T_l_z1_LK', wall=0))
+        logging.debug("CAV_T_l_z1_LK:\n %s", self.CAV_T_l_z1_LK)
         
     def _createCAV_T_l_z2(self):
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_l_z2_LK.append([])
-            
-            if ((self.USE_REDUCED_MODEL == 0) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][1] == self.N_OUTDOOR) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][1] == self.N_NOT_EXIST)):
-                
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_l_z2_LK', str(l), str(k)]
-                    name = '_'.join(name)
-                    self.CAV_T_l_z2_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_l_z2_LK:\n %s" %self.CAV_T_l_z2_LK)
+        self.CAV_T_l_z2_LK.extend(self._addVarsLK('CAV_T_l_z2_LK', wall=1))
+        logging.debug("CAV_T_l_z2_LK:\n %s", self.CAV_T_l_z2_LK)
         
     def _createCAV_T_l_z3(self):
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_l_z3_LK.append([])
-            
-            if ((self.USE_REDUCED_MODEL == 0) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][2] == self.N_OUTDOOR) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][2] == self.N_NOT_EXIST)):
-                
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_l_z3_LK', str(l), str(k)]
-                    name = '_'.join(name)
-                    self.CAV_T_l_z3_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_l_z3_LK:\n %s" %self.CAV_T_l_z3_LK)
+        self.CAV_T_l_z3_LK.extend(self._addVarsLK('CAV_T_l_z3_LK', wall=2))
+        logging.debug("CAV_T_l_z3_LK:\n %s", self.CAV_T_l_z3_LK)
         
     def _createCAV_T_l_z4(self):
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_l_z4_LK.append([])
-            
-            if ((self.USE_REDUCED_MODEL == 0) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][3] == self.N_OUTDOOR) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][3] == self.N_NOT_EXIST)):
-                
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_l_z4_LK', str(l), str(k)]
-                    name = '_'.join(name)
-                    self.CAV_T_l_z4_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_l_z4_LK:\n %s" %self.CAV_T_l_z4_LK)
+        self.CAV_T_l_z4_LK.extend(self._addVarsLK('CAV_T_l_z4_LK', wall=3))
+        logging.debug("CAV_T_l_z4_LK:\n %s", self.CAV_T_l_z4_LK)
         
     def _createCAV_T_l_f(self):
         
         if (self.USE_REDUCED_MODEL == 0):
-            for l in xrange(self.NUM_ROOM):
-                self.CAV_T_l_f_LK.append([])
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_l_f_LK', str(l), str(k)]
-                    name = '_'.join(name)         
-                    
-                    self.CAV_T_l_f_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                    
-            self.model.update()
-            logging.debug("CAV_T_l_f_LK:\n %s" %self.CAV_T_l_f_LK)
+            self.CAV_T_l_f_LK.extend(self._addVarsLK('CAV_T_l_f_LK'))
+            logging.debug("CAV_T_l_f_LK:\n %s", self.CAV_T_l_f_LK)
         
     def _createCAV_T_l_c(self):
         
         if (self.USE_REDUCED_MODEL == 0):
-            for l in xrange(self.NUM_ROOM):
-                self.CAV_T_l_c_LK.append([])
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_l_c_LK', str(l), str(k)]
-                    name = '_'.join(name)         
-                    
-                    self.CAV_T_l_c_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                    
-            self.model.update()
-            logging.debug("CAV_T_l_c_LK:\n %s" %self.CAV_T_l_c_LK)
+            self.CAV_T_l_c_LK.extend(self._addVarsLK('CAV_T_l_c_LK'))
+            logging.debug("CAV_T_l_c_LK:\n %s", self.CAV_T_l_c_LK)
         
     def _createCAV_A_SA_T_z_LK(self):
         """For each location at each timestep, create an auxiliary variable of aT(SA, z)"""
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_A_SA_T_z_LK.append([])
-            for k in xrange(self.NUM_SLOT):
-                name = ['CAV_A_SA_T_z_LK', str(l), str(k)]
-                name = '_'.join(name)         
-                
-                self.CAV_A_SA_T_z_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_A_SA_T_z_LK:\n %s" %self.CAV_A_SA_T_z_LK)
+        self.CAV_A_SA_T_z_LK.extend(self._addVarsLK('CAV_A_SA_T_z_LK'))
+        logging.debug("CAV_A_SA_T_z_LK:\n %s", self.CAV_A_SA_T_z_LK)
         
     def _createCAV_A_SA_T_SA_LK(self):
         """For each location at each timestep, create an auxiliary variable of aT(SA, SA)"""
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_A_SA_T_SA_LK.append([])
-            for k in xrange(self.NUM_SLOT):
-                name = ['CAV_A_SA_T_SA_LK', str(l), str(k)]
-                name = '_'.join(name)         
-                
-                self.CAV_A_SA_T_SA_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_A_SA_T_SA_LK:\n %s" %self.CAV_A_SA_T_SA_LK)
-    
+        self.CAV_A_SA_T_SA_LK.extend(self._addVarsLK('CAV_A_SA_T_SA_LK'))
+        logging.debug("CAV_A_SA_T_SA_LK:\n %s", self.CAV_A_SA_T_SA_LK)
+        
     #===========================================================================
     # Auxiliary Variables: Energy Consumption
     #===========================================================================
     def _createCAV_EnergyConsumption_Fan(self):
         """For each location at each timestep, create an auxiliary variable of e_fan(k, l)"""
-        
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_E_FAN_LK.append([])
-            for k in xrange(self.NUM_SLOT):
-                name = ['CAV_E_FAN_LK', str(l), str(k)]
-                name = '_'.join(name)         
-                self.CAV_E_FAN_LK[l].append(self.model.addVar(lb=0, vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_E_FAN_LK:\n %s" %self.CAV_E_FAN_LK)
+        self.CAV_E_FAN_LK.extend(self._addVarsLK('CAV_E_FAN_LK'))
+        logging.debug("CAV_E_FAN_LK:\n %s", self.CAV_E_FAN_LK)
         
     def _createCAV_EnergyConsumption_Conditioning(self):
         """For each location at each timestep, create an auxiliary variable of e_conditioning(k, l)"""
+        self.CAV_E_CONDITIONING_LK.extend(self._addVarsLK('CAV_E_CONDITIONING_LK'))
+        logging.debug("CAV_E_CONDITIONING_LK:\n %s", self.CAV_E_CONDITIONING_LK)
         
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_E_CONDITIONING_LK.append([])
-            for k in xrange(self.NUM_SLOT):
-                name = ['CAV_E_CONDITIONING_LK', str(l), str(k)]
-                name = '_'.join(name)         
-                self.CAV_E_CONDITIONING_LK[l].append(self.model.addVar(lb=0, vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_E_CONDITIONING_LK:\n %s" %self.CAV_E_CONDITIONING_LK)
-    
     def _createCAV_EnergyConsumption_Heating(self):
         """For each location at each timestep, create an auxiliary variable of e_heating(k, l)"""
-        
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_E_HEATING_LK.append([])
-            for k in xrange(self.NUM_SLOT):
-                name = ['CAV_E_HEATING_LK', str(l), str(k)]
-                name = '_'.join(name)         
-                self.CAV_E_HEATING_LK[l].append(self.model.addVar(lb=0, vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_E_HEATING_LK:\n %s" %self.CAV_E_HEATING_LK)
+        self.CAV_E_HEATING_LK.extend(self._addVarsLK('CAV_E_HEATING_LK'))
+        logging.debug("CAV_E_HEATING_LK:\n %s", self.CAV_E_HEATING_LK)
         
     #===========================================================================
     # Constraints
@@ -1263,7 +1241,7 @@ class Solver_MILP:
             self.CSTR_Schedule_Once_M[m].append(self.model.addConstr(lcstr == num_meeting, name))
                  
         self.model.update()
-        logging.debug("CSTR_Schedule_Once_M:\n %s" %self.CSTR_Schedule_Once_M)  
+        logging.debug("CSTR_Schedule_Once_M:\n %s", self.CSTR_Schedule_Once_M)
         
     def _createCSTR_LocationTimeOccupied_MT(self):
         """Set BAV_z_LK=1 at all time periods k if meeting type m is allocated in room L"""
@@ -1279,9 +1257,9 @@ class Solver_MILP:
                 mid = self.EAMS.MTYPE[m].MLS[0]
                    
                 k_m = []
-                k_m = self.EAMS.getFeasibleStartTime(mid, k)
+                k_m = self.EAMS.MKS[mid][k]
                 if k_m:
-                    logging.debug("Meeting Type %d starts at %s still on-going at time period %d" %(m, k_m, k))                        
+                    logging.debug("Meeting Type %d starts at %s still on-going at time period %d", m, k_m, k)
                     for l in xrange(self.NUM_ROOM):
                         if l in self.EAMS.MR[mid]:  #TODO: currently assume all meetings of the same type can use the same room! Need to re-group if not (_populateMeetingClique) !
                             for i in xrange(len(k_m)):
@@ -1299,7 +1277,7 @@ class Solver_MILP:
                     self.CSTR_LocationTimeOccupied[k].append(self.model.addConstr(lcstr[l] <= rcstr, name))
                     
         self.model.update()
-        logging.debug("CSTR_LocationTimeOccupied:\n %s" %self.CSTR_LocationTimeOccupied)
+        logging.debug("CSTR_LocationTimeOccupied:\n %s", self.CSTR_LocationTimeOccupied)
            
     def _createCSTR_NumAttendee_MT(self):
         """For each meeting type, represent number of attendee as a unique constraint. Note: Number of attendee is grouped by 5, 15, 30 people."""
@@ -1315,7 +1293,7 @@ class Solver_MILP:
                 mid = self.EAMS.MTYPE[m].MLS[0]
                      
                 k_m = []
-                k_m = self.EAMS.getFeasibleStartTime(mid, k)
+                k_m = self.EAMS.MKS[mid][k]
                 if k_m:
 #                     logging.debug("Meeting %d starts at %s still on-going at time period %d" %(m, k_m, k))                        
                     for l in xrange(self.NUM_ROOM):
@@ -1338,7 +1316,7 @@ class Solver_MILP:
                     self.CSTR_NumAttendee[k].append(self.model.addConstr(0 == rcstr, name))
                     
         self.model.update()
-        logging.debug("CSTR_NumAttendee:\n %s" %self.CSTR_NumAttendee)
+        logging.debug("CSTR_NumAttendee:\n %s", self.CSTR_NumAttendee)
         
     def _createCSTR_AttendeeConflict_MT(self):
         """Meetings Types which have the same attendee(s) should not be allocated into the same time period"""
@@ -1351,7 +1329,7 @@ class Solver_MILP:
         for s in xrange(len(mtls)):
             if mtls[s] not in uniq_mtls:
                 uniq_mtls.append(mtls[s]) 
-        logging.debug("************************************** uniq_mtls:%s" %uniq_mtls)
+        logging.debug("************************************** uniq_mtls:%s", uniq_mtls)
                 
         for k in xrange(self.NUM_SLOT):
             self.CSTR_AttendeeConflict.append([])
@@ -1362,24 +1340,24 @@ class Solver_MILP:
                 for mt in xrange(len(mts)):
                     mtid = mts[mt]                    
                     m = self.EAMS.MTYPE[mtid].MLS[0] # to get the time window of MTYPE, so simply get the first meeting in MLS
-                    if self.EAMS.isInTimeWindows(m,k) > 0:   
-                        logging.debug("++ k: %d" %k)    
-                        logging.debug("----%s" %self.EAMS.getFeasibleStartTime(m, k))
-                        om.append([mtid, self.EAMS.getFeasibleStartTime(m, k)])
+                    if self.EAMS.MFS[m][k]:   
+                        logging.debug("++ k: %d", k)
+                        logging.debug("----%s", self.EAMS.MKS[m][k])
+                        om.append([mtid, self.EAMS.MKS[m][k]])
                 
                 if len(om)>1: # has conflict
-                        logging.debug("om: %s" %om)
+                        logging.debug("om: %s", om)
                         lcstr = 0
                         for j in xrange(len(om)):    
-                            logging.debug("om[%d]: %s" %(j,om[j]))    
-                            logging.debug("om[%d][0]: %s" %(j, om[j][0]))
+                            logging.debug("om[%d]: %s", j, om[j])
+                            logging.debug("om[%d][0]: %s", j, om[j][0])
                             mk = om[j][1]
                             for p in xrange(len(mk)):
-                                logging.debug("om[%d][1] [%d]: %s" %(j, p, mk[p]))      
+                                logging.debug("om[%d][1] [%d]: %s", j, p, mk[p])
                                          
                                 for l in xrange(self.NUM_ROOM):
                                     mlk = self.BDV_x_MLK_Dict.get(tuple([om[j][0], l, mk[p]]))    
-                                    logging.debug("MLK_%s" %mlk)
+                                    logging.debug("MLK_%s", mlk)
                                     if mlk:
                                         lcstr += self.BDV_x_MLK[mlk[0]][mlk[1]][mlk[2]]
                         logging.debug(lcstr)
@@ -1388,13 +1366,14 @@ class Solver_MILP:
                         self.CSTR_AttendeeConflict[k].append(self.model.addConstr(lcstr <= 1, name))
                     
         self.model.update()
-        logging.debug("CSTR_AttendeeConflict:\n %s" %self.CSTR_AttendeeConflict)
+        logging.debug("CSTR_AttendeeConflict:\n %s", self.CSTR_AttendeeConflict)
         
         
     #===========================================================================
     # Constraints: HVAC
     #===========================================================================
     def _createCSTR_SupplyAirTemperature_LB_noStandbyMode(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):        
             self.CSTR_T_SA_LK.append([])
             for k in xrange(self.NUM_SLOT):                
@@ -1405,14 +1384,15 @@ class Solver_MILP:
 
                 if self.EAMS.SH[k] == 1:
                     rcstr = float(self.EAMS.TEMPERATURE_CONDITIONED_AIR)
-                    self.CSTR_T_SA_LK[l].append(self.model.addConstr(lcstr >= rcstr, name))
+                    tc.append([l, lcstr >= rcstr, name])
                 else:
-                    self.CSTR_T_SA_LK[l].append(self.model.addConstr(lcstr == 0, name))
+                    tc.append([l, lcstr == 0, name])
              
-        self.model.update()
-        logging.debug("CSTR_T_SA_LK:\n %s" %self.CSTR_T_SA_LK)
+        self._addConstrsLK(self.CSTR_T_SA_LK, tc)
+        logging.debug("CSTR_T_SA_LK:\n %s", self.CSTR_T_SA_LK)
                 
     def _createCSTR_SupplyAirTemperature_LB_hasStandbyMode(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):        
             self.CSTR_T_SA_LB_LK.append([])
             for k in xrange(self.NUM_SLOT):                
@@ -1422,16 +1402,17 @@ class Solver_MILP:
                 lcstr = self.CDV_T_SA_LK[l][k]
                 if self.EAMS.SH[k] == 1:
                     rcstr = float(self.EAMS.TEMPERATURE_CONDITIONED_AIR)
-                    self.CSTR_T_SA_LB_LK[l].append(self.model.addConstr(lcstr >= rcstr, name))
+                    tc.append([l, lcstr >= rcstr, name])
                 else:
                     lk = self.BDV_w_LK_Dict.get(tuple([l, k]))
                     rcstr = float(self.EAMS.TEMPERATURE_CONDITIONED_AIR) * self.BDV_w_LK[lk[0]][lk[1]]
-                    self.CSTR_T_SA_LB_LK[l].append(self.model.addConstr(lcstr >= rcstr, name))
+                    tc.append([l, lcstr >= rcstr, name])
                              
-        self.model.update()
-        logging.debug("CSTR_T_SA_LB_LK:\n %s" %self.CSTR_T_SA_LB_LK)
+        self._addConstrsLK(self.CSTR_T_SA_LB_LK, tc)
+        logging.debug("CSTR_T_SA_LB_LK:\n %s", self.CSTR_T_SA_LB_LK)
         
     def _createCSTR_SupplyAirTemperature_UB_hasStandbyMode(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):        
             self.CSTR_T_SA_UB_LK.append([])
             for k in xrange(self.NUM_SLOT):                
@@ -1443,15 +1424,16 @@ class Solver_MILP:
                 if self.EAMS.SH[k] == 0: 
                     lk = self.BDV_w_LK_Dict.get(tuple([l, k]))
                     rcstr = float(self.EAMS.TEMPERATURE_SUPPLY_AIR_HIGH) * self.BDV_w_LK[lk[0]][lk[1]]
-                    self.CSTR_T_SA_UB_LK[l].append(self.model.addConstr(lcstr <= rcstr, name))
+                    tc.append([l, lcstr <= rcstr, name])
                              
-        self.model.update()
-        logging.debug("CSTR_T_SA_UB_LK:\n %s" %self.CSTR_T_SA_UB_LK)
+        self._addConstrsLK(self.CSTR_T_SA_UB_LK, tc)
+        logging.debug("CSTR_T_SA_UB_LK:\n %s", self.CSTR_T_SA_UB_LK)
         
 #--------------------------------------    
     def _createCSTR_SupplyAirFlowRate_LB_noStandbyMode(self):
         """For each location at each timestep, create a constraint for lower bound of air mass flow rate"""
         
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_A_SA_LB_LK.append([])
             
@@ -1462,16 +1444,17 @@ class Solver_MILP:
                 lcstr = self.CDV_A_SA_LK[l][k]
                 rcstr = self._get_A_SA_LB(l,k)
                 if self.EAMS.SH[k] == 1:                    
-                    self.CSTR_A_SA_LB_LK[l].append(self.model.addConstr(lcstr >= rcstr, name))
+                    tc.append([l, lcstr >= rcstr, name])
                 else:
-                    self.CSTR_A_SA_LB_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_LB_LK:\n %s" %self.CSTR_A_SA_LB_LK)
+        self._addConstrsLK(self.CSTR_A_SA_LB_LK, tc)
+        logging.debug("CSTR_A_SA_LB_LK:\n %s", self.CSTR_A_SA_LB_LK)
         
     def _createCSTR_SupplyAirFlowRate_LB_hasStandbyMode(self):
         """For each location at each timestep, create a constraint for lower bound of air mass flow rate"""
         
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_A_SA_LB_LK.append([])
             
@@ -1486,12 +1469,13 @@ class Solver_MILP:
                     #TODO:  as long as ASA_LB for sh[k]=0 is set to 0, this cstr can be removed.
                     lk = self.BDV_w_LK_Dict.get(tuple([l, k]))
                     rcstr = self._get_A_SA_LB(l,k) * self.BDV_w_LK[lk[0]][lk[1]]
-                self.CSTR_A_SA_LB_LK[l].append(self.model.addConstr(lcstr >= rcstr, name))
+                tc.append([l, lcstr >= rcstr, name])
                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_LB_LK:\n %s" %self.CSTR_A_SA_LB_LK)
+        self._addConstrsLK(self.CSTR_A_SA_LB_LK, tc)
+        logging.debug("CSTR_A_SA_LB_LK:\n %s", self.CSTR_A_SA_LB_LK)
         
     def _createCSTR_SupplyAirFlowRate_UB_hasStandbyMode(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_A_SA_UB_LK.append([])            
             for k in xrange(self.NUM_SLOT):                
@@ -1502,13 +1486,14 @@ class Solver_MILP:
                 if self.EAMS.SH[k] == 0: # Not necessary to set the upper bound of SH==1, as it is the same as A_SA default UB
                     lk = self.BDV_w_LK_Dict.get(tuple([l, k]))
                     rcstr = self.EAMS.MASS_AIR_FLOW_SUPPLY_AIR_MAX * self.BDV_w_LK[lk[0]][lk[1]]
-                    self.CSTR_A_SA_UB_LK[l].append(self.model.addConstr(lcstr <= rcstr, name))
+                    tc.append([l, lcstr <= rcstr, name])
                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_UB_LK:\n %s" %self.CSTR_A_SA_UB_LK)
+        self._addConstrsLK(self.CSTR_A_SA_UB_LK, tc)
+        logging.debug("CSTR_A_SA_UB_LK:\n %s", self.CSTR_A_SA_UB_LK)
 
 #--------------------------------------             
     def _createCSTR_RoomTemperature_LB(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_LK_lb.append([])
             for k in xrange(self.NUM_SLOT):                
@@ -1517,12 +1502,13 @@ class Solver_MILP:
                  
                 lcstr = self.CAV_T_LK[l][k]
                 rcstr = float(self.EAMS.TEMPERATURE_UNOCC_MIN) + (float(self.EAMS.TEMPERATURE_OCC_COMFORT_RANGE_INCR) * self.BAV_z_LK[l][k])   
-                self.CSTR_T_LK_lb[l].append(self.model.addConstr(lcstr >= rcstr, name))
+                tc.append([l, lcstr >= rcstr, name])
              
-        self.model.update()
-        logging.debug("CSTR_T_LK_lb:\n %s" %self.CSTR_T_LK_lb)
+        self._addConstrsLK(self.CSTR_T_LK_lb, tc)
+        logging.debug("CSTR_T_LK_lb:\n %s", self.CSTR_T_LK_lb)
         
     def _createCSTR_RoomTemperature_UB(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_LK_ub.append([])
             for k in xrange(self.NUM_SLOT):                
@@ -1531,18 +1517,18 @@ class Solver_MILP:
                  
                 lcstr = self.CAV_T_LK[l][k]
                 rcstr = float(self.EAMS.TEMPERATURE_UNOCC_MAX) - (float(self.EAMS.TEMPERATURE_OCC_COMFORT_RANGE_DECR)*self.BAV_z_LK[l][k]) 
-                self.CSTR_T_LK_ub[l].append(self.model.addConstr(lcstr <= rcstr, name))
+                tc.append([l, lcstr <= rcstr, name])
              
-        self.model.update()
-        logging.debug("CSTR_T_LK_ub:\n %s" %self.CSTR_T_LK_ub)
+        self._addConstrsLK(self.CSTR_T_LK_ub, tc)
+        logging.debug("CSTR_T_LK_ub:\n %s", self.CSTR_T_LK_ub)
     
     def _createCSTR_RoomTemperature(self):
         """For each location at each timestep, create a constraint for room temperature T(k, l)"""
         
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_LK.append([])
             
-            A = self.EAMS.getRoomThermalConfig(l, "C")
             B1 =  self.EAMS.getRoomThermalConfig(l, "Rij")
             B2 =  self.EAMS.getRoomThermalConfig(l, "Rik")
             B3 =  self.EAMS.getRoomThermalConfig(l, "Ril")
@@ -1552,14 +1538,7 @@ class Solver_MILP:
             #TODO: For the moment, only 1 wall could have window. Test with more windows
             B7 = self.EAMS.getRoomThermalConfig(l, "Rwij")            
             C = self.EAMS.AIR_HEAT_CAPACITY_AT_CONSTANT_PRESSURE            
-            D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / A            
-            E1 = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (A*B1)
-            E2 = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (A*B2)
-            E3 = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (A*B3)
-            E4 = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (A*B4)
-            E5 = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (A*B5)
-            E6 = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (A*B6)
-            E7 = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (A*B7)
+            [D, E1, E2, E3, E4, E5, E6, E7] = self.EAMS.getRoomCoefficients(l)
             F = D * self.EAMS.OCCUPANT_SENSIBLE_HEAT_GAIN
                 
             for k in xrange(self.NUM_SLOT):          
@@ -1597,7 +1576,7 @@ class Solver_MILP:
                                  )
                                  ) + 
                                  EG +
-                                 (E7 * float(self.EAMS.OAT.values()[k-1])) +                             
+                                 (E7 * self.EAMS.OATV[k-1]) +                             
                                  (F * self.DAV_Attendee_LK[l][k-1]) + 
                                  (D * C * self.CAV_A_SA_T_SA_LK[l][k-1]))
                             
@@ -1623,7 +1602,7 @@ class Solver_MILP:
                                 (E4 * self.CAV_T_l_z4_LK[l][k-1]) +
                                 (E5 * self.CAV_T_l_f_LK[l][k-1]) +
                                 (E6 * self.CAV_T_l_c_LK[l][k-1]) +
-                                (E7 * float(self.EAMS.OAT.values()[k-1])) +                             
+                                (E7 * self.EAMS.OATV[k-1]) +                             
                                  (F * self.DAV_Attendee_LK[l][k-1]) + 
                                  (D * C * self.CAV_A_SA_T_SA_LK[l][k-1]))
                     
@@ -1631,13 +1610,14 @@ class Solver_MILP:
                     rcstr = self.EAMS.INITIAL_TEMPERATURE
                 
                 lcstr = self.CAV_T_LK[l][k]         
-                self.CSTR_T_LK[l].append(self.model.addConstr(lcstr==rcstr, name))
+                tc.append([l, lcstr==rcstr, name])
                 
-        self.model.update()
-        logging.debug("CSTR_T_LK:\n %s" %self.CSTR_T_LK)
+        self._addConstrsLK(self.CSTR_T_LK, tc)
+        logging.debug("CSTR_T_LK:\n %s", self.CSTR_T_LK)
         
    
     def _createCSTR_T_z1_l(self):        
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_z1_l_LK.append([])              
             
@@ -1646,18 +1626,12 @@ class Solver_MILP:
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][0] == self.N_NOT_EXIST)):
                 
                 nz = self.EAMS.RNL[l][0]
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(l, "Cij")
-                B = float(1)/self.EAMS.getRoomThermalConfig(l, "Rji")
-                C = float(1)/self.EAMS.getRoomThermalConfig(l, "Rimj")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cij") * self.EAMS.getRoomThermalConfig(l, "Rimj"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cij") * self.EAMS.getRoomThermalConfig(l, "Rji"))
-                H = 1-(A*(B+C)) 
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(l, 'z1_l')
+                QS = self.EAMS.getRoomSolarGainTable(l, 0)
                 
-                logging.debug("Cij = %s" %(self.EAMS.getRoomThermalConfig(l, "Cij")))  
-                logging.debug("A = %s" %(A))
-                logging.debug("B = %s" %(B))
-                logging.debug("C = %s" %(C))
-                logging.debug("H = %s" %(H))
+                logging.debug("Cij = %s", self.EAMS.getRoomThermalConfig(l, "Cij"))  
+                logging.debug("A = %s", A)
+                logging.debug("H = %s", H)
                                                      
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_z1_l_LK', str(l), str(k)]
@@ -1665,13 +1639,13 @@ class Solver_MILP:
                      
                     if k != 0:
                         if nz == self.N_OUTDOOR:
-                            F = float(self.EAMS.OAT.values()[k-1])
+                            F = self.EAMS.OATV[k-1]
                         elif nz == self.N_NOT_EXIST:
                             F = self.CAV_T_LK[l][k-1]
                         else:
                             F = self.CAV_T_LK[nz][k-1]
                         
-                        G = self.EAMS.getRoomSolarGain(k-1, l, 0)
+                        G = QS[k-1]
                             
                         rcstr = (
                                  (H * self.CAV_T_z1_l_LK[l][k-1]) +
@@ -1683,12 +1657,13 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE
      
                     lcstr = self.CAV_T_z1_l_LK[l][k]                 
-                    self.CSTR_T_z1_l_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                   
-        self.model.update()
-        logging.debug("CSTR_T_z1_l_LK:\n %s" %self.CSTR_T_z1_l_LK)
+        self._addConstrsLK(self.CSTR_T_z1_l_LK, tc)
+        logging.debug("CSTR_T_z1_l_LK:\n %s", self.CSTR_T_z1_l_LK)
         
     def _createCSTR_T_l_z1(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_l_z1_LK.append([])
             
@@ -1696,11 +1671,7 @@ class Solver_MILP:
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][0] == self.N_OUTDOOR) or
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][0] == self.N_NOT_EXIST)):
             
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(l, "Cji")
-                B = float(1)/self.EAMS.getRoomThermalConfig(l, "Rij")
-                C = float(1)/self.EAMS.getRoomThermalConfig(l, "Rimj")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cji") * self.EAMS.getRoomThermalConfig(l, "Rij"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cji") * self.EAMS.getRoomThermalConfig(l, "Rimj"))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(l, 'l_z1')
                 
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_l_z1_LK', str(l), str(k)]
@@ -1708,7 +1679,7 @@ class Solver_MILP:
                      
                     if k != 0:    
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_l_z1_LK[l][k-1]) +
+                                 (H * self.CAV_T_l_z1_LK[l][k-1]) +
                                  (D * self.CAV_T_LK[l][k-1]) +
                                  (E * self.CAV_T_z1_l_LK[l][k-1])
                                  )
@@ -1716,12 +1687,13 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE 
                     
                     lcstr = self.CAV_T_l_z1_LK[l][k]
-                    self.CSTR_T_l_z1_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-        self.model.update()
-        logging.debug("CSTR_T_l_z1_LK:\n %s" %self.CSTR_T_l_z1_LK)
+        self._addConstrsLK(self.CSTR_T_l_z1_LK, tc)
+        logging.debug("CSTR_T_l_z1_LK:\n %s", self.CSTR_T_l_z1_LK)
         
     def _createCSTR_T_z2_l(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_z2_l_LK.append([])
             
@@ -1730,11 +1702,8 @@ class Solver_MILP:
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][1] == self.N_NOT_EXIST)):
             
                 nz = self.EAMS.RNL[l][1]
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(l, "Cik")
-                B = float(1)/self.EAMS.getRoomThermalConfig(l, "Rki")
-                C = float(1)/self.EAMS.getRoomThermalConfig(l, "Rimk")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cik") * self.EAMS.getRoomThermalConfig(l, "Rimk"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cik") * self.EAMS.getRoomThermalConfig(l, "Rki"))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(l, 'z2_l')
+                QS = self.EAMS.getRoomSolarGainTable(l, 1)
                                          
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_z2_l_LK', str(l), str(k)]
@@ -1742,16 +1711,16 @@ class Solver_MILP:
                      
                     if k != 0:
                         if nz == self.N_OUTDOOR:
-                            F = float(self.EAMS.OAT.values()[k-1])
+                            F = self.EAMS.OATV[k-1]
                         elif nz == self.N_NOT_EXIST:
                             F = self.CAV_T_LK[l][k-1]
                         else:
                             F = self.CAV_T_LK[nz][k-1]
                         
-                        G = self.EAMS.getRoomSolarGain(k-1, l, 1)
+                        G = QS[k-1]
                             
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_z2_l_LK[l][k-1]) +
+                                 (H * self.CAV_T_z2_l_LK[l][k-1]) +
                                  (D * self.CAV_T_l_z2_LK[l][k-1]) +
                                  (E * F) +
                                  (A * G)
@@ -1760,12 +1729,13 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE
                         
                     lcstr = self.CAV_T_l_z2_LK[l][k]
-                    self.CSTR_T_z2_l_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-        self.model.update()
-        logging.debug("CSTR_T_z2_l_LK:\n %s" %self.CSTR_T_z2_l_LK)
+        self._addConstrsLK(self.CSTR_T_z2_l_LK, tc)
+        logging.debug("CSTR_T_z2_l_LK:\n %s", self.CSTR_T_z2_l_LK)
         
     def _createCSTR_T_l_z2(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_l_z2_LK.append([])
             
@@ -1773,11 +1743,7 @@ class Solver_MILP:
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][1] == self.N_OUTDOOR) or
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][1] == self.N_NOT_EXIST)):
             
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(l, "Cki")
-                B = float(1)/self.EAMS.getRoomThermalConfig(l, "Rik")
-                C = float(1)/self.EAMS.getRoomThermalConfig(l, "Rimk")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cki") * self.EAMS.getRoomThermalConfig(l, "Rik"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cki") * self.EAMS.getRoomThermalConfig(l, "Rimk"))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(l, 'l_z2')
                 
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_l_z2_LK', str(l), str(k)]
@@ -1785,7 +1751,7 @@ class Solver_MILP:
                      
                     if k != 0:    
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_l_z2_LK[l][k-1]) +
+                                 (H * self.CAV_T_l_z2_LK[l][k-1]) +
                                  (D * self.CAV_T_LK[l][k-1]) +
                                  (E * self.CAV_T_z2_l_LK[l][k-1])
                                  )
@@ -1793,12 +1759,13 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE       
                      
                     lcstr = self.CAV_T_l_z2_LK[l][k]
-                    self.CSTR_T_l_z2_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-        self.model.update()
-        logging.debug("CSTR_T_l_z2_LK:\n %s" %self.CSTR_T_l_z2_LK)
+        self._addConstrsLK(self.CSTR_T_l_z2_LK, tc)
+        logging.debug("CSTR_T_l_z2_LK:\n %s", self.CSTR_T_l_z2_LK)
         
     def _createCSTR_T_z3_l(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_z3_l_LK.append([])
             
@@ -1807,11 +1774,8 @@ class Solver_MILP:
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][2] == self.N_NOT_EXIST)):
             
                 nz = self.EAMS.RNL[l][2]
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(l, "Cil")
-                B = float(1)/self.EAMS.getRoomThermalConfig(l, "Rli")
-                C = float(1)/self.EAMS.getRoomThermalConfig(l, "Riml")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cil") * self.EAMS.getRoomThermalConfig(l, "Riml"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cil") * self.EAMS.getRoomThermalConfig(l, "Rli"))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(l, 'z3_l')
+                QS = self.EAMS.getRoomSolarGainTable(l, 2)
           
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_z3_l_LK', str(l), str(k)]
@@ -1819,16 +1783,16 @@ class Solver_MILP:
                     
                     if k != 0:
                         if nz == self.N_OUTDOOR:
-                            F = float(self.EAMS.OAT.values()[k-1])
+                            F = self.EAMS.OATV[k-1]
                         elif nz == self.N_NOT_EXIST:
                             F = self.CAV_T_LK[l][k-1]
                         else:
                             F = self.CAV_T_LK[nz][k-1]
                         
-                        G = self.EAMS.getRoomSolarGain(k-1, l, 2)
+                        G = QS[k-1]
                             
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_z3_l_LK[l][k-1]) +
+                                 (H * self.CAV_T_z3_l_LK[l][k-1]) +
                                  (D * self.CAV_T_l_z3_LK[l][k-1]) +
                                  (E * F) +
                                  (A * G)
@@ -1837,12 +1801,13 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE 
                      
                     lcstr = self.CAV_T_z3_l_LK[l][k]                
-                    self.CSTR_T_z3_l_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-        self.model.update()
-        logging.debug("CSTR_T_z3_l_LK:\n %s" %self.CSTR_T_z3_l_LK)
+        self._addConstrsLK(self.CSTR_T_z3_l_LK, tc)
+        logging.debug("CSTR_T_z3_l_LK:\n %s", self.CSTR_T_z3_l_LK)
         
     def _createCSTR_T_l_z3(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_l_z3_LK.append([])
             
@@ -1850,11 +1815,7 @@ class Solver_MILP:
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][2] == self.N_OUTDOOR) or
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][2] == self.N_NOT_EXIST)):
             
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(l, "Cli")
-                B = float(1)/self.EAMS.getRoomThermalConfig(l, "Ril")
-                C = float(1)/self.EAMS.getRoomThermalConfig(l, "Riml")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cli") * self.EAMS.getRoomThermalConfig(l, "Ril"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cli") * self.EAMS.getRoomThermalConfig(l, "Riml"))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(l, 'l_z3')
                 
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_l_z3_LK', str(l), str(k)]
@@ -1862,7 +1823,7 @@ class Solver_MILP:
                      
                     if k != 0:    
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_l_z3_LK[l][k-1]) +
+                                 (H * self.CAV_T_l_z3_LK[l][k-1]) +
                                  (D * self.CAV_T_LK[l][k-1]) +
                                  (E * self.CAV_T_z3_l_LK[l][k-1])
                                  )
@@ -1870,12 +1831,13 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE       
                      
                     lcstr = self.CAV_T_l_z3_LK[l][k]
-                    self.CSTR_T_l_z3_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-        self.model.update()
-        logging.debug("CSTR_T_l_z3_LK:\n %s" %self.CSTR_T_l_z3_LK)
+        self._addConstrsLK(self.CSTR_T_l_z3_LK, tc)
+        logging.debug("CSTR_T_l_z3_LK:\n %s", self.CSTR_T_l_z3_LK)
              
     def _createCSTR_T_z4_l(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_z4_l_LK.append([])
             
@@ -1884,11 +1846,8 @@ class Solver_MILP:
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][3] == self.N_NOT_EXIST)):
             
                 nz = self.EAMS.RNL[l][3]
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(l, "Cio")
-                B = float(1)/self.EAMS.getRoomThermalConfig(l, "Roi")
-                C = float(1)/self.EAMS.getRoomThermalConfig(l, "Rimo")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cio") * self.EAMS.getRoomThermalConfig(l, "Rimo"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cio") * self.EAMS.getRoomThermalConfig(l, "Roi"))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(l, 'z4_l')
+                QS = self.EAMS.getRoomSolarGainTable(l, 3)
           
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_z4_l_LK', str(l), str(k)]
@@ -1896,16 +1855,16 @@ class Solver_MILP:
                      
                     if k != 0:
                         if nz == self.N_OUTDOOR:
-                            F = float(self.EAMS.OAT.values()[k-1])
+                            F = self.EAMS.OATV[k-1]
                         elif nz == self.N_NOT_EXIST:
                             F = self.CAV_T_LK[l][k-1]
                         else:
                             F = self.CAV_T_LK[nz][k-1]
                         
-                        G = self.EAMS.getRoomSolarGain(k-1, l, 3)
+                        G = QS[k-1]
                             
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_z4_l_LK[l][k-1]) +
+                                 (H * self.CAV_T_z4_l_LK[l][k-1]) +
                                  (D * self.CAV_T_l_z4_LK[l][k-1]) +
                                  (E * F) +
                                  (A * G)
@@ -1914,12 +1873,13 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE 
                         
                     lcstr = self.CAV_T_z4_l_LK[l][k]                
-                    self.CSTR_T_z4_l_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-        self.model.update()
-        logging.debug("CSTR_T_z4_l_LK:\n %s" %self.CSTR_T_z4_l_LK)
+        self._addConstrsLK(self.CSTR_T_z4_l_LK, tc)
+        logging.debug("CSTR_T_z4_l_LK:\n %s", self.CSTR_T_z4_l_LK)
         
     def _createCSTR_T_l_z4(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_l_z4_LK.append([])
             
@@ -1927,11 +1887,7 @@ class Solver_MILP:
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][3] == self.N_OUTDOOR) or
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[l][3] == self.N_NOT_EXIST)):
             
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(l, "Coi")
-                B = float(1)/self.EAMS.getRoomThermalConfig(l, "Rio")
-                C = float(1)/self.EAMS.getRoomThermalConfig(l, "Rimo")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Coi") * self.EAMS.getRoomThermalConfig(l, "Rio"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Coi") * self.EAMS.getRoomThermalConfig(l, "Rimo"))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(l, 'l_z4')
                 
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_l_z4_LK', str(l), str(k)]
@@ -1939,7 +1895,7 @@ class Solver_MILP:
                      
                     if k != 0:    
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_l_z4_LK[l][k-1]) +
+                                 (H * self.CAV_T_l_z4_LK[l][k-1]) +
                                  (D * self.CAV_T_LK[l][k-1]) +
                                  (E * self.CAV_T_z4_l_LK[l][k-1])
                                  )
@@ -1947,57 +1903,51 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE                    
                      
                     lcstr = self.CAV_T_l_z4_LK[l][k]                
-                    self.CSTR_T_l_z4_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-        self.model.update()
-        logging.debug("CSTR_T_l_z4_LK:\n %s" %self.CSTR_T_l_z4_LK)
+        self._addConstrsLK(self.CSTR_T_l_z4_LK, tc)
+        logging.debug("CSTR_T_l_z4_LK:\n %s", self.CSTR_T_l_z4_LK)
         
     def _createCSTR_T_l_f(self):
         
         if (self.USE_REDUCED_MODEL == 0):
+            tc = []
             for l in xrange(self.NUM_ROOM):
                 self.CSTR_T_l_f_LK.append([])
             
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(l, "Cif")
-                B = float(1)/self.EAMS.getRoomThermalConfig(l, "Rif")
-                C = float(1)/self.EAMS.getRoomThermalConfig(l, "Rfi")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cif") * self.EAMS.getRoomThermalConfig(l, "Rif"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cif") * self.EAMS.getRoomThermalConfig(l, "Rfi"))
-                F = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(l, "Cfi")
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(l, 'l_f')
+                QS = self.EAMS.getRoomSolarGainTable(l, 4)
            
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_l_f_LK', str(l), str(k)]
                     name = '_'.join(name)                
                     
-                    G = self.EAMS.getRoomSolarGain(k-1, l, 4)
+                    G = QS[k-1]
                     
                     if k != 0:    
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_l_f_LK[l][k-1]) +
+                                 (H * self.CAV_T_l_f_LK[l][k-1]) +
                                  (D * self.CAV_T_LK[l][k-1]) +
                                  (E * self.CAV_T_LK[l][k-1]) +
-                                 (F * G)
+                                 (S * G)
                                  )
                     else:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE     
                     
                     lcstr = self.CAV_T_l_f_LK[l][k]
-                    self.CSTR_T_l_f_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-            self.model.update()
-            logging.debug("CSTR_T_l_f_LK:\n %s" %self.CSTR_T_l_f_LK)
+            self._addConstrsLK(self.CSTR_T_l_f_LK, tc)
+            logging.debug("CSTR_T_l_f_LK:\n %s", self.CSTR_T_l_f_LK)
         
     def _createCSTR_T_l_c(self):
         
         if (self.USE_REDUCED_MODEL == 0):
+            tc = []
             for l in xrange(self.NUM_ROOM):
                 self.CSTR_T_l_c_LK.append([])
                 
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(l, "Cic")
-                B = float(1)/self.EAMS.getRoomThermalConfig(l, "Ric")
-                C = float(1)/self.EAMS.getRoomThermalConfig(l, "Rci")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cic") * self.EAMS.getRoomThermalConfig(l, "Ric"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(l, "Cic") * self.EAMS.getRoomThermalConfig(l, "Rci"))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(l, 'l_c')
                 
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_l_c_LK', str(l), str(k)]
@@ -2005,7 +1955,7 @@ class Solver_MILP:
                     
                     if k != 0:    
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_l_c_LK[l][k-1]) +
+                                 (H * self.CAV_T_l_c_LK[l][k-1]) +
                                  (D * self.CAV_T_LK[l][k-1]) +
                                  (E * self.CAV_T_LK[l][k-1])
                                  )
@@ -2013,10 +1963,10 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE      
                      
                     lcstr = self.CAV_T_l_c_LK[l][k]
-                    self.CSTR_T_l_c_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-            self.model.update()
-            logging.debug("CSTR_T_l_c_LK:\n %s" %self.CSTR_T_l_c_LK)        
+            self._addConstrsLK(self.CSTR_T_l_c_LK, tc)
+            logging.debug("CSTR_T_l_c_LK:\n %s", self.CSTR_T_l_c_LK)
         
 #-----------------------------------
         
@@ -2039,8 +1989,7 @@ class Solver_MILP:
                     self.CSTR_A_SA_T_SA_1_LK[l].append(self.model.addQConstr(lcstr >= rcstr, name=name))
                     
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_SA_1_LK:\n %s" %self.CSTR_A_SA_T_SA_1_LK)
+        logging.debug("CSTR_A_SA_T_SA_1_LK:\n %s", self.CSTR_A_SA_T_SA_1_LK)
         
     def _createCSTR_A_SA_T_SA_2_LK_hasStandbyMode(self):        
         A_SA_UB = self.EAMS.MASS_AIR_FLOW_SUPPLY_AIR_MAX
@@ -2059,8 +2008,7 @@ class Solver_MILP:
                     rcstr = (A_SA_UB * T_SA) + (T_SA_UB * A_SA) - (A_SA_UB * T_SA_UB)
                     self.CSTR_A_SA_T_SA_2_LK[l].append(self.model.addQConstr(lcstr >= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_SA_2_LK:\n %s" %self.CSTR_A_SA_T_SA_2_LK)
+        logging.debug("CSTR_A_SA_T_SA_2_LK:\n %s", self.CSTR_A_SA_T_SA_2_LK)
         
         
     def _createCSTR_A_SA_T_SA_3_LK_hasStandbyMode(self):
@@ -2081,8 +2029,7 @@ class Solver_MILP:
                     rcstr = (A_SA_LB * T_SA) + (T_SA_UB * A_SA) - (A_SA_LB * T_SA_UB)
                     self.CSTR_A_SA_T_SA_3_LK[l].append(self.model.addQConstr(lcstr <= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_SA_3_LK:\n %s" %self.CSTR_A_SA_T_SA_3_LK)
+        logging.debug("CSTR_A_SA_T_SA_3_LK:\n %s", self.CSTR_A_SA_T_SA_3_LK)
         
     def _createCSTR_A_SA_T_SA_4_LK_hasStandbyMode(self):
         
@@ -2101,8 +2048,7 @@ class Solver_MILP:
                     rcstr = (A_SA_UB * T_SA) + (T_SA_LB * A_SA) - (A_SA_UB * T_SA_LB)
                     self.CSTR_A_SA_T_SA_4_LK[l].append(self.model.addQConstr(lcstr <= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_SA_4_LK:\n %s" %self.CSTR_A_SA_T_SA_4_LK)   
+        logging.debug("CSTR_A_SA_T_SA_4_LK:\n %s", self.CSTR_A_SA_T_SA_4_LK)
 
 #-----------------------------------
         
@@ -2129,8 +2075,7 @@ class Solver_MILP:
                     else:
                         self.CSTR_A_SA_T_SA_1_LK[l].append(self.model.addQConstr(lcstr == 0, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_SA_1_LK:\n %s" %self.CSTR_A_SA_T_SA_1_LK)
+        logging.debug("CSTR_A_SA_T_SA_1_LK:\n %s", self.CSTR_A_SA_T_SA_1_LK)
         
     def _createCSTR_A_SA_T_SA_2_LK_noStandbyMode(self):
         
@@ -2152,8 +2097,7 @@ class Solver_MILP:
                         rcstr = (A_SA_UB * T_SA) + (T_SA_UB * A_SA) - (A_SA_UB * T_SA_UB)
                         self.CSTR_A_SA_T_SA_2_LK[l].append(self.model.addQConstr(lcstr >= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_SA_2_LK:\n %s" %self.CSTR_A_SA_T_SA_2_LK)
+        logging.debug("CSTR_A_SA_T_SA_2_LK:\n %s", self.CSTR_A_SA_T_SA_2_LK)
         
         
     def _createCSTR_A_SA_T_SA_3_LK_noStandbyMode(self):
@@ -2176,8 +2120,7 @@ class Solver_MILP:
                         rcstr = (A_SA_LB * T_SA) + (T_SA_UB * A_SA) - (A_SA_LB * T_SA_UB)
                         self.CSTR_A_SA_T_SA_3_LK[l].append(self.model.addQConstr(lcstr <= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_SA_3_LK:\n %s" %self.CSTR_A_SA_T_SA_3_LK)
+        logging.debug("CSTR_A_SA_T_SA_3_LK:\n %s", self.CSTR_A_SA_T_SA_3_LK)
         
     def _createCSTR_A_SA_T_SA_4_LK_noStandbyMode(self):
         
@@ -2198,8 +2141,7 @@ class Solver_MILP:
                         rcstr = (A_SA_UB * T_SA) + (T_SA_LB * A_SA) - (A_SA_UB * T_SA_LB)
                         self.CSTR_A_SA_T_SA_4_LK[l].append(self.model.addQConstr(lcstr <= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_SA_4_LK:\n %s" %self.CSTR_A_SA_T_SA_4_LK)    
+        logging.debug("CSTR_A_SA_T_SA_4_LK:\n %s", self.CSTR_A_SA_T_SA_4_LK)
         
 #--------------------------------------------------
     def _createCSTR_A_SA_T_z_1_LK_looseboundedT_hasStandbyMode(self):
@@ -2219,8 +2161,7 @@ class Solver_MILP:
                     rcstr = (A_SA_LB * T) + (T_LB * A_SA) - (A_SA_LB * T_LB)
                     self.CSTR_A_SA_T_z_1_LK[l].append(self.model.addQConstr(lcstr >= rcstr, name=name))
                         
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_z_1_LK:\n %s" %self.CSTR_A_SA_T_z_1_LK)
+        logging.debug("CSTR_A_SA_T_z_1_LK:\n %s", self.CSTR_A_SA_T_z_1_LK)
         
     def _createCSTR_A_SA_T_z_2_LK_looseboundedT_hasStandbyMode(self):
         
@@ -2240,8 +2181,7 @@ class Solver_MILP:
                     rcstr = (A_SA_UB * T) + (T_UB * A_SA) - (A_SA_UB * T_UB)
                     self.CSTR_A_SA_T_z_2_LK[l].append(self.model.addQConstr(lcstr >= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_z_2_LK:\n %s" %self.CSTR_A_SA_T_z_2_LK)
+        logging.debug("CSTR_A_SA_T_z_2_LK:\n %s", self.CSTR_A_SA_T_z_2_LK)
         
         
     def _createCSTR_A_SA_T_z_3_LK_looseboundedT_hasStandbyMode(self):
@@ -2263,8 +2203,7 @@ class Solver_MILP:
                     rcstr = (A_SA_LB * T) + (T_UB * A_SA) - (A_SA_LB * T_UB)
                     self.CSTR_A_SA_T_z_3_LK[l].append(self.model.addQConstr(lcstr <= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_z_3_LK:\n %s" %self.CSTR_A_SA_T_z_3_LK)
+        logging.debug("CSTR_A_SA_T_z_3_LK:\n %s", self.CSTR_A_SA_T_z_3_LK)
         
     def _createCSTR_A_SA_T_z_4_LK_looseboundedT_hasStandbyMode(self):
         
@@ -2285,8 +2224,7 @@ class Solver_MILP:
                     self.CSTR_A_SA_T_z_4_LK[l].append(self.model.addQConstr(lcstr <= rcstr, name=name))
                     
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_z_4_LK:\n %s" %self.CSTR_A_SA_T_z_4_LK)
+        logging.debug("CSTR_A_SA_T_z_4_LK:\n %s", self.CSTR_A_SA_T_z_4_LK)
         
         
 #---------------------------------------
@@ -2311,8 +2249,7 @@ class Solver_MILP:
                     else:
                         self.CSTR_A_SA_T_z_1_LK[l].append(self.model.addQConstr(lcstr == 0, name=name))
                         
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_z_1_LK:\n %s" %self.CSTR_A_SA_T_z_1_LK)
+        logging.debug("CSTR_A_SA_T_z_1_LK:\n %s", self.CSTR_A_SA_T_z_1_LK)
         
     def _createCSTR_A_SA_T_z_2_LK_looseboundedT_noStandbyMode(self):
         
@@ -2334,8 +2271,7 @@ class Solver_MILP:
                         rcstr = (A_SA_UB * T) + (T_UB * A_SA) - (A_SA_UB * T_UB)
                         self.CSTR_A_SA_T_z_2_LK[l].append(self.model.addQConstr(lcstr >= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_z_2_LK:\n %s" %self.CSTR_A_SA_T_z_2_LK)
+        logging.debug("CSTR_A_SA_T_z_2_LK:\n %s", self.CSTR_A_SA_T_z_2_LK)
         
         
     def _createCSTR_A_SA_T_z_3_LK_looseboundedT_noStandbyMode(self):
@@ -2357,8 +2293,7 @@ class Solver_MILP:
                         rcstr = (A_SA_LB * T) + (T_UB * A_SA) - (A_SA_LB * T_UB)
                         self.CSTR_A_SA_T_z_3_LK[l].append(self.model.addQConstr(lcstr <= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_z_3_LK:\n %s" %self.CSTR_A_SA_T_z_3_LK)
+        logging.debug("CSTR_A_SA_T_z_3_LK:\n %s", self.CSTR_A_SA_T_z_3_LK)
         
     def _createCSTR_A_SA_T_z_4_LK_looseboundedT_noStandbyMode(self):
         
@@ -2380,8 +2315,7 @@ class Solver_MILP:
                         self.CSTR_A_SA_T_z_4_LK[l].append(self.model.addQConstr(lcstr <= rcstr, name=name))
                     
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_z_4_LK:\n %s" %self.CSTR_A_SA_T_z_4_LK)
+        logging.debug("CSTR_A_SA_T_z_4_LK:\n %s", self.CSTR_A_SA_T_z_4_LK)
 
     #===========================================================================
     # Constraints: Energy Consumption
@@ -2389,6 +2323,7 @@ class Solver_MILP:
     def _createCSTR_EnergyConsumption_Fan(self):
         """For each location at each timestep, create a constraint for e_fan(k, l)"""
         
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_E_FAN_LK.append([])
             for k in xrange(self.NUM_SLOT):
@@ -2399,14 +2334,15 @@ class Solver_MILP:
                 cstr = self.EAMS.BETA_FAN_POWER_CONSTANT * self.CDV_A_SA_LK[l][k]
                 
                 e_fan = self.CAV_E_FAN_LK[l][k]
-                self.CSTR_E_FAN_LK[l].append(self.model.addConstr(e_fan==cstr, name))
+                tc.append([l, e_fan==cstr, name])
                 
-        self.model.update()
-        logging.debug("CSTR_E_FAN_LK:\n %s" %self.CSTR_E_FAN_LK)
+        self._addConstrsLK(self.CSTR_E_FAN_LK, tc)
+        logging.debug("CSTR_E_FAN_LK:\n %s", self.CSTR_E_FAN_LK)
         
     def _createCSTR_EnergyConsumption_Conditioning(self):
         """For each location at each timestep, create a constraint for e_conditioning(k, l)"""
         
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_E_CONDITIONING_LK.append([])            
             for k in xrange(self.NUM_SLOT):               
@@ -2415,21 +2351,22 @@ class Solver_MILP:
                 
                 cstr = 0
                 # NOTE: only when OAT > T_CA!!
-                if (float(self.EAMS.OAT.values()[k]) > float(self.EAMS.TEMPERATURE_CONDITIONED_AIR)):            
+                if (self.EAMS.OATV[k] > float(self.EAMS.TEMPERATURE_CONDITIONED_AIR)):            
                     cstr += self.CDV_A_SA_LK[l][k] * (
-                                   ((float)(self.EAMS.AIR_HEAT_CAPACITY_AT_CONSTANT_PRESSURE) * (float)(self.EAMS.OAT.values()[k])) -
+                                   ((float)(self.EAMS.AIR_HEAT_CAPACITY_AT_CONSTANT_PRESSURE) * self.EAMS.OATV[k]) -
                                    ((float)(self.EAMS.AIR_HEAT_CAPACITY_AT_CONSTANT_PRESSURE) * (float)(self.EAMS.TEMPERATURE_CONDITIONED_AIR))
                                    )
 
                 e_conditioning = self.CAV_E_CONDITIONING_LK[l][k]
-                self.CSTR_E_CONDITIONING_LK[l].append(self.model.addConstr(e_conditioning==cstr, name))
+                tc.append([l, e_conditioning==cstr, name])
                 
-        self.model.update()
-        logging.debug("CSTR_E_CONDITIONING_LK:\n %s" %self.CSTR_E_CONDITIONING_LK)
+        self._addConstrsLK(self.CSTR_E_CONDITIONING_LK, tc)
+        logging.debug("CSTR_E_CONDITIONING_LK:\n %s", self.CSTR_E_CONDITIONING_LK)
         
     def _createCSTR_EnergyConsumption_Heating(self):
         """For each location at each timestep, create a constraint for e_heating(k, l)"""
                 
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_E_HEATING_LK.append([])
             for k in xrange(self.NUM_SLOT):
@@ -2448,19 +2385,17 @@ class Solver_MILP:
                          )
                         )
    
-                self.CSTR_E_HEATING_LK[l].append(self.model.addConstr(e_heating==cstr, name)) 
+                tc.append([l, e_heating==cstr, name]) 
                     
-        self.model.update()
-        logging.debug("CSTR_E_HEATING_LK:\n %s" %self.CSTR_E_HEATING_LK)
+        self._addConstrsLK(self.CSTR_E_HEATING_LK, tc)
+        logging.debug("CSTR_E_HEATING_LK:\n %s", self.CSTR_E_HEATING_LK)
                     
                     
     #===========================================================================
     # Diagnose
     #=========================================================================== 
     def _getBDV_x_MLK(self, idx):
-        for k,v in self.BDV_x_MLK_Dict.iteritems():
-            if v == idx:
-                return k        
+        return self.BDV_x_MLK_InvDict.get(tuple(idx))
             
     def _getBDV_w_LK(self, idx):
         for k,v in self.BDV_w_LK_Dict.iteritems():
@@ -2470,12 +2405,15 @@ class Solver_MILP:
     def _printVar_BDV_x_MLK_MT_Summary(self):        
 #         print "Summary BDV_x_MLK_MT:"  
         logging.info ("Summary BDV_x_MLK_MT:")          
-            
+        
+        x = self.solution.getX('BDV_x_MLK').tolist()
+        i = 0
         for m in xrange(self.NUM_MEETING_TYPE):
             alloc = []
             for l in xrange(len(self.BDV_x_MLK[m])):
                 for k in xrange(len(self.BDV_x_MLK[m][l])):
-                    val = self.BDV_x_MLK[m][l][k].x                    
+                    val = x[i]
+                    i = i + 1
 #                     print k, "=", val
                     if val > self.EPSILON:
 #                         print int(self.BDV_x_MLK[m][l][k].x),
@@ -2483,13 +2421,13 @@ class Solver_MILP:
                         alloc.append([fl,fk])
                         
             if len(alloc) != len(self.EAMS.MTYPE[m].MLS):
-                logging.critical("Critical Error! Number of allocated slot =%d Required slot=%s is Different!" %(len(alloc), len(self.EAMS.MTYPE[m].MLS)))
+                logging.critical("Critical Error! Number of allocated slot =%d Required slot=%s is Different!", len(alloc), len(self.EAMS.MTYPE[m].MLS))
             else:
                 for i in xrange(len(self.EAMS.MTYPE[m].MLS)):
                     mid =  self.EAMS.MTYPE[m].MLS[i]
                     [fl,fk] = alloc[i]
 #                     print "Meeting Type",m,"[#",i,"]", ' [', self.EAMS.ML[mid].Key , '] |', 'Location', fl, '[', self.EAMS.RL[fl], '] | Start Slot', fk, '[', self.EAMS.TS.get(fk), ']'
-                    logging.info("Meeting Type %d [#%d][%s]| Location %d [%s] | Start Slot %s [%s]" %(m, i, self.EAMS.ML[mid].Key, l, self.EAMS.RL[fl], fk, self.EAMS.TS.get(fk)))
+                    logging.info("Meeting Type %d [#%d][%s]| Location %d [%s] | Start Slot %s [%s]", m, i, self.EAMS.ML[mid].Key, l, self.EAMS.RL[fl], fk, self.EAMS.TS.get(fk))
                                  
     def _printVar_BDV_x_MLK_Summary(self):        
 #         print "Summary BDV_x_MLK:"  
@@ -2504,7 +2442,7 @@ class Solver_MILP:
 #                         print int(self.BDV_x_MLK[m][l][k].x),
                         [_,fl,fk] = self._getBDV_x_MLK([m,l,k])  
 #                         print '[mlk_', m, l, k,']=1: ', 'Meeting', m, ' [', self.EAMS.ML[m].Key , '] |', 'Location', fl, '[', self.EAMS.RL[fl], '] | Start Slot', fk, '[', self.EAMS.TS.get(fk), ']'
-                        logging.info("Meeting %d [%s]| Location %d [%s] | Start Slot %s [%s]" %(m, self.EAMS.ML[m].Key, fl, self.EAMS.RL[fl], fk, self.EAMS.TS.get(fk)))
+                        logging.info("Meeting %d [%s]| Location %d [%s] | Start Slot %s [%s]", m, self.EAMS.ML[m].Key, fl, self.EAMS.RL[fl], fk, self.EAMS.TS.get(fk))
 #                         break                
 #             print ""
 #         print ""
@@ -2513,6 +2451,7 @@ class Solver_MILP:
 #         print "BAV_z_LK:"
         logging.info("BAV_z_LK")
         
+        z = self.solution.getRows('BAV_z_LK')
         for l in xrange(self.NUM_ROOM):
 #             print 'Location', l            
             res = []
@@ -2520,12 +2459,12 @@ class Solver_MILP:
             res.append(str(l))
             res.append("|")
             for k in xrange(self.NUM_SLOT):
-                val = self.BAV_z_LK[l][k].x
+                val = z[l][k]
 #                 print val,
                 if val > self.EPSILON:
 #                     print int(self.BAV_z_LK[l][k].x),
 #                     print (self.BAV_z_LK[l][k].x),  
-                    res.append(str(self.BAV_z_LK[l][k].x))
+                    res.append(str(val))
                 else:
 #                     print 0,
                     res.append(str(0))
@@ -2538,6 +2477,7 @@ class Solver_MILP:
 #         print "DAV_Attendee"
         logging.info("DAV_Attendee")
         
+        att = self.solution.getRows('DAV_Attendee_LK')
         for l in xrange(self.NUM_ROOM):
 #             print 'Location', l,'|',
             res = []
@@ -2545,12 +2485,12 @@ class Solver_MILP:
             res.append(str(l))
             res.append("|")
             for k in xrange(self.NUM_SLOT):
-                val = self.DAV_Attendee_LK[l][k].x
+                val = att[l][k]
 #                 print val,
                 if val > self.EPSILON:
 #                     print int(self.DAV_Attendee_LK[l][k].x),
 #                     print (self.DAV_Attendee_LK[l][k].x),   
-                    res.append(str(self.DAV_Attendee_LK[l][k].x))                   
+                    res.append(str(val))                   
                 else:
 #                     print 0,
                     res.append(str(0))
@@ -2564,30 +2504,33 @@ class Solver_MILP:
         if self.BDV_w_LK: 
 #             print "Summary BDV_w_LK:"  
             logging.info ("Summary BDV_w_LK:")          
-                
+            
+            w = self.solution.getRows('BDV_w_LK')
             for l in xrange(len(self.BDV_w_LK)):
                 for k in xrange(len(self.BDV_w_LK[l])):
-                    val = self.BDV_w_LK[l][k].x
+                    val = w[l][k]
                     if val > self.EPSILON:
                         [fl,fk] = self._getBDV_w_LK([l,k])  
 #                         print '[lk_', l, k,']=1: ', 'Location', fl, '[', self.EAMS.RL[fl], '] | Start Slot', fk, '[', self.EAMS.TS.get(fk), ']'
-                        logging.info("Location %d [%s] | Start Slot %s [%s]" %(l, self.EAMS.RL[fl], fk, self.EAMS.TS.get(fk)))                               
+                        logging.info("Location %d [%s] | Start Slot %s [%s]", l, self.EAMS.RL[fl], fk, self.EAMS.TS.get(fk))
 #                 print ""
         
     def _printVar_Occupied_RoomTemperature_Summary(self):
 #         print "Room Temperature when BAV_z_LK=1:"   
         logging.info("Room Temperature when BAV_z_LK=1:")     
+        z = self.solution.getRows('BAV_z_LK')
+        t = self.solution.getRows('CAV_T_LK')
         for l in xrange(self.NUM_ROOM):
 #             print 'Location', l
-            logging.info("Location %s" %l)
+            logging.info("Location %s", l)
             res = []
             for k in xrange(self.NUM_SLOT):            
-                val = self.BAV_z_LK[l][k].x
+                val = z[l][k]
 #                 print k, "=", val, ", True?", (val > self.EPSILON)
                 if val > self.EPSILON:                    
 #                     print self.BAV_z_LK[l][k].x,
 #                     print self.CAV_T_LK[l][k].x,
-                    res.append(str(self.CAV_T_LK[l][k].x))
+                    res.append(str(t[l][k]))
 #             print ''
             s = ' '.join(res)
             logging.info(s)
@@ -2628,6 +2571,9 @@ class Solver_MILP:
         self.cond_energy_kWh = []
         self.heat_energy_kWh = []
         
+        e_fan = self.solution.getRows('CAV_E_FAN_LK')
+        e_cond = self.solution.getRows('CAV_E_CONDITIONING_LK')
+        e_heat = self.solution.getRows('CAV_E_HEATING_LK')
         for l in xrange(self.NUM_ROOM):
             self.total_power_kJs.append([])
             self.total_energy_kJ.append([])
@@ -2665,17 +2611,17 @@ class Solver_MILP:
             
             for k in xrange(self.NUM_SLOT):
                 # Power in kJ/s, equivalent to kW
-                self.fan_power_kJs[l].append(self.CAV_E_FAN_LK[l][k].x)
-                self.cond_power_kJs[l].append(self.CAV_E_CONDITIONING_LK[l][k].x)
-                self.heat_power_kJs[l].append(self.CAV_E_HEATING_LK[l][k].x)                   
-                loc_fan_power_kJs = loc_fan_power_kJs + self.CAV_E_FAN_LK[l][k].x
-                loc_cond_power_kJs = loc_cond_power_kJs + self.CAV_E_CONDITIONING_LK[l][k].x
-                loc_heat_power_kJs = loc_heat_power_kJs + self.CAV_E_HEATING_LK[l][k].x
+                self.fan_power_kJs[l].append(e_fan[l][k])
+                self.cond_power_kJs[l].append(e_cond[l][k])
+                self.heat_power_kJs[l].append(e_heat[l][k])                   
+                loc_fan_power_kJs = loc_fan_power_kJs + e_fan[l][k]
+                loc_cond_power_kJs = loc_cond_power_kJs + e_cond[l][k]
+                loc_heat_power_kJs = loc_heat_power_kJs + e_heat[l][k]
                 
                 # Energy in kJ = Power  (kJ/s)*scheduling interval in seconds   
-                fan_e_kJ = self.CAV_E_FAN_LK[l][k].x * self.EAMS.SCHEDULING_INTERVAL * 60
-                cond_e_kJ = self.CAV_E_CONDITIONING_LK[l][k].x * self.EAMS.SCHEDULING_INTERVAL * 60
-                heat_e_kJ = self.CAV_E_HEATING_LK[l][k].x * self.EAMS.SCHEDULING_INTERVAL * 60   
+                fan_e_kJ = e_fan[l][k] * self.EAMS.SCHEDULING_INTERVAL * 60
+                cond_e_kJ = e_cond[l][k] * self.EAMS.SCHEDULING_INTERVAL * 60
+                heat_e_kJ = e_heat[l][k] * self.EAMS.SCHEDULING_INTERVAL * 60   
                 self.fan_energy_kJ[l].append(fan_e_kJ)
                 self.cond_energy_kJ[l].append(cond_e_kJ)
                 self.heat_energy_kJ[l].append(heat_e_kJ)             
@@ -2761,7 +2707,7 @@ class Solver_MILP:
 
     def logSchedulingResults(self):      
         try:
-            if (self.model.getAttr(GRB.attr.SolCount) == 0):
+            if not self.solution.hasSolution():
                     raise ValueError("logSchedulingResults skipped. MIP failed to produce a solution.")
                 
             self._printVar_DAV_Attendee_LK()
@@ -2769,11 +2715,11 @@ class Solver_MILP:
     #         self._printVar_BDV_x_MLK_Summary()
     
         except (ValueError), e:
-            logging.critical('%s' % (e)) 
+            logging.critical('%s', e)
 
     def logHVACResults(self):
         try:
-            if (self.model.getAttr(GRB.attr.SolCount) == 0):
+            if not self.solution.hasSolution():
                     raise ValueError("logHVACResults skipped. MIP failed to produce a solution.")
             
             self._printVar_BAV_z_LK() 
@@ -2781,11 +2727,11 @@ class Solver_MILP:
             self._printVar_Occupied_RoomTemperature_Summary()
             
         except (ValueError), e:
-            logging.critical('%s' % (e)) 
+            logging.critical('%s', e)
 
     def logEnergy(self, logfile, logcase):
         try:
-            if (self.model.getAttr(GRB.attr.SolCount) == 0):
+            if not self.solution.hasSolution():
                     raise ValueError("logEnergy skipped. MIP failed to produce a solution.")
             
             # Calculate energy consumption
@@ -2809,20 +2755,29 @@ class Solver_MILP:
             f.close()   
             
         except (ValueError), e:
-            logging.critical('%s' % (e))     
+            logging.critical('%s', e)
         
     def logTemperatures(self, logcase):
         try:
             
-            if (self.model.getAttr(GRB.attr.SolCount) == 0):
+            if not self.solution.hasSolution():
                 raise ValueError("logTemperatures skipped. MIP failed to produce a solution.")
             
+            if self.LOG_RESULT_NPZ:
+                self._getResult().addTemperatures(logcase, self.NUM_ROOM, 
+                                                  self.solution.getArrayLK('CAV_T_LK'), 
+                                                  self.solution.getArrayLK('CDV_T_SA_LK'), 
+                                                  self.solution.getArrayLK('CDV_A_SA_LK'), 
+                                                  self._getHVACArrays())
+                self.result_sol = self.solution.version
+                return
+            
 #             fstr = 'Output\\' + logcase + '_temperatures'
             fstr = 'Output/' + logcase + '_temperatures'
             f = open(fstr,'a')   
             
             # Log timeslot
-            f.write(",".join(map(str,self.EAMS.TS.values())))            
+            f.write(",".join(map(str,self.EAMS.TG.getTimeSlotList())))            
             f.write("\n")
             
             # Log outdoor temperature
@@ -2834,14 +2789,13 @@ class Solver_MILP:
             f.write("\n")
               
             # Log room temperature, TSA, ASA            
+            T_LK = self.solution.getRows('CAV_T_LK')
+            T_SA_LK = self.solution.getRows('CDV_T_SA_LK')
+            A_SA_LK = self.solution.getRows('CDV_A_SA_LK')
             for r in xrange(self.NUM_ROOM):
-                T = []
-                TSA = []
-                ASA = []
-                for k in xrange(self.NUM_SLOT):   
-                    T.append(self.CAV_T_LK[r][k].x)
-                    TSA.append(self.CDV_T_SA_LK[r][k].x)
-                    ASA.append(self.CDV_A_SA_LK[r][k].x)
+                T = T_LK[r]
+                TSA = T_SA_LK[r]
+                ASA = A_SA_LK[r]
                                     
                 f.write(",".join(map(str,T)))
                 f.write("\n")
@@ -2853,20 +2807,26 @@ class Solver_MILP:
             f.close()      
             
         except (ValueError), e:
-            logging.critical('%s' % (e))  
+            logging.critical('%s', e)
     
     def logSchedules(self, logcase):
         try:
             
-            if (self.model.getAttr(GRB.attr.SolCount) == 0):
+            if not self.solution.hasSolution():
                 raise ValueError("logSchedules skipped. MIP failed to produce a solution.")
             
+            [Z_LK, W_LK] = self._getScheduleRows()
+            if self.LOG_RESULT_NPZ:
+                self._getResult().addSchedules(logcase, self.NUM_ROOM, self.NUM_SLOT, Z_LK, W_LK)
+                self.result_sol = self.solution.version
+                return
+            
 #             fstr = 'Output\\' + logcase + '_schedules'
             fstr = 'Output/' + logcase + '_schedules'
             f = open(fstr,'a')   
             
             # Log timeslot
-            f.write(",".join(map(str,self.EAMS.TS.values())))            
+            f.write(",".join(map(str,self.EAMS.TG.getTimeSlotList())))            
             f.write("\n")
             
             # Log number of rooms
@@ -2875,60 +2835,97 @@ class Solver_MILP:
               
             # Log room allocation            
             for r in xrange(self.NUM_ROOM):
-                vz = []                      
-                for k in xrange(self.NUM_SLOT):    
-                    if self.BAV_z_LK[r][k].x > self.EPSILON:   
-                        vz.append(1)
-                    else:
-                        vz.append(0)
-                                                                  
-                vw = []                    
-                if self.EAMS.STANDBY_MODE != '0' and len(self.BDV_w_LK) != 0: #len(self.BDV_w_LK[r])==0 -> HVAC control not running, for initial schedule only     
-                    vwidx = 0      
-                    for k in xrange(len(self.BDV_w_LK[r])):
-                        [_,fk] = self._getBDV_w_LK([r,k])                    
-                        if fk > vwidx:
-                            vw.extend([str(0)] * (fk-vwidx))
-                            
-                        if self.BDV_w_LK[r][k].x > self.EPSILON:
-                            vw.extend(str(1))
-                        else:
-                            vw.extend(str(0))
-                                                    
-                        vwidx = len(vw)
-                    
-                f.write(",".join(map(str,vz)))
+                f.write(",".join(map(str,Z_LK[r])))
                 f.write("\n")
-                f.write(",".join(map(str,vw)))
+                f.write(",".join(map(str,W_LK[r])))
                 f.write("\n")
                 
             f.close()      
             
         except (ValueError), e:
-            logging.critical('%s' % (e))  
+            logging.critical('%s', e)
+    
+    def _getScheduleRows(self):
+        """[room occupancy, standby mode] per room as written by logSchedules(). 
+           Standby mode is 0/1 of every slot up to the last slot with BDV_w_LK, empty if HVAC control is not running."""
+        Z_LK = self.solution.getRoomOccupancy().tolist()
+        W = self.solution.getRows('BDV_w_LK')
+        W_LK = []
+        for r in xrange(self.NUM_ROOM):
+            vw = []                    
+            if self.EAMS.STANDBY_MODE != '0' and len(self.BDV_w_LK) != 0: #len(self.BDV_w_LK[r])==0 -> HVAC control not running, for initial schedule only     
+                vwidx = 0      
+                for k in xrange(len(self.BDV_w_LK[r])):
+                    [_,fk] = self._getBDV_w_LK([r,k])                    
+                    if fk > vwidx:
+                        vw.extend([0] * (fk-vwidx))
+                        
+                    if W[r][k] > self.EPSILON:
+                        vw.append(1)
+                    else:
+                        vw.append(0)
+                                                
+                    vwidx = len(vw)
+            W_LK.append(vw)
+        return [Z_LK, W_LK]
+    
+    #===========================================================================
+    # Binary Run Result
+    #===========================================================================
+    def _getResult(self):
+        """Result of the run, written to Output/<CASE_CFG>_result.npz by saveResult() (or at exit).
+           The file of a resumed run replaces the one written before the checkpoint"""
+        if self.result is None:
+            # Deltas are taken against the incumbent, see storeIncumbent()
+            self.result = RunResult('Output/' + self.CASE_CFG + '_result.npz', 0)
+            self.result.setMeta('timeslots', ",".join(map(str,self.EAMS.TG.getTimeSlotList())))
+            self.result.setMeta('oat', ",".join(map(str,self.EAMS.OAT.values())))
+        return self.result
+    
+    def _getHVACArrays(self):
+        """Energy components and wall temperatures (NaN if not modelled) kept with the temperatures in the binary run result"""
+        arrays = {'E_FAN': self.solution.getArrayLK('CAV_E_FAN_LK'),
+                  'E_CONDITIONING': self.solution.getArrayLK('CAV_E_CONDITIONING_LK'),
+                  'E_HEATING': self.solution.getArrayLK('CAV_E_HEATING_LK')}
+        for name in self.solution.WALLS:
+            if len(getattr(self, name)):
+                arrays[name] = self.solution.getPaddedLK(name, self.NUM_SLOT)
+        return arrays
+    
+    def saveResult(self):
+        """Write & close the binary run result, only if LOG_RESULT_NPZ is on"""
+        if self.result is not None:
+            self.result.close()
     
             
     def logStatistics(self, logfile, logcase):
+        """Statistics of the last solve. The objective is the one of the solution snapshot, i.e. of a restored incumbent 
+           if the model holds none (no bound & gap then)"""
         try:
-            if (self.model.getAttr(GRB.attr.SolCount) == 0):
+            if not self.solution.hasSolution():
                 raise ValueError("logStatistics skipped. MIP failed to produce a solution.")
             
+            objval = self.solution.getObjVal()
+            bound = float('nan')
+            if self.model.getAttr(GRB.attr.SolCount) > 0:
+                bound = self.model.getAttr(GRB.attr.ObjBound)
+            
             logging.info("Status: %s", self.STATUS[self.model.getAttr(GRB.attr.Status)])
             logging.info("Model name: %s", self.model.getAttr(GRB.attr.ModelName))
-            logging.info("Objective: %s", self.model.getAttr(GRB.attr.ObjVal))
+            logging.info("Objective: %s", objval)
             logging.info("Number variables: %s", self.model.getAttr(GRB.attr.NumVars))
             logging.info("Number constraints: %s", self.model.getAttr(GRB.attr.NumConstrs))
             logging.info("Number iterations: %s", self.model.getAttr(GRB.attr.IterCount))
             if self.model.getAttr(GRB.attr.IsMIP) == 1:
                 logging.info("Number B&B nodes: %s", self.model.getAttr(GRB.attr.NodeCount))
             logging.info("Runtime: %s", self.model.getAttr(GRB.attr.Runtime))
-            logging.info("Solve time:%f" %self.solveTime)
+            logging.info("Solve time:%f", self.solveTime)
             
-            gap = (self.model.getAttr(GRB.attr.ObjVal) - self.model.getAttr(GRB.attr.ObjBound))/ self.model.getAttr(GRB.attr.ObjVal) * 100
-            logging.info("Num Solution Found:%d" %self.model.getAttr(GRB.attr.SolCount))
-            logging.info("Best Bound:%f" %self.model.getAttr(GRB.attr.ObjBound))
-            logging.info("Best Objective Value:%f" %self.model.getAttr(GRB.attr.ObjVal))
-            logging.info("Optimality Gap (%%):%f" %(gap))
+            gap = (objval - bound)/ objval * 100
+            logging.info("Num Solution Found:%d", self.model.getAttr(GRB.attr.SolCount))
+            logging.info("Best Bound:%f", bound)
+            logging.info("Best Objective Value:%f", objval)
+            logging.info("Optimality Gap (%%):%f", gap)
             
 #             fstr = 'Output\\' + logfile + '_stats'
             fstr = 'Output/' + logfile + '_stats'
@@ -2936,7 +2933,7 @@ class Solver_MILP:
             data = []
             data.append(logcase)
             data.append(self.STATUS[self.model.getAttr(GRB.attr.Status)])
-            data.append(self.model.getAttr(GRB.attr.ObjVal))            
+            data.append(objval)            
             data.append(self.model.getAttr(GRB.attr.NumVars))
             data.append(self.model.getAttr(GRB.attr.NumConstrs))
             data.append(self.model.getAttr(GRB.attr.IterCount))
@@ -2944,15 +2941,27 @@ class Solver_MILP:
             data.append(self.model.getAttr(GRB.attr.Runtime))
             data.append(self.solveTime)
             data.append(self.model.getAttr(GRB.attr.SolCount))            
-            data.append(self.model.getAttr(GRB.attr.ObjBound))
-            data.append(self.model.getAttr(GRB.attr.ObjVal))                        
+            data.append(bound)
+            data.append(objval)                        
             data.append(gap)
             f.write(" ".join(map(str,data)))
             f.write("\n")
             f.close()      
             
         except (ValueError), e:
-            logging.critical('%s' % (e))  
+            logging.critical('%s', e)
     
-     
-    
\ No newline at end of file
+    def logBuildProfile(self, logcase):
+        """Log & write the model build profile to Output/<logcase>_build_profile.json. Only if LOG_BUILD_PROFILE is on."""
+        if self.profiler is None:
+            return
+        
+        self.profiler.logSummary()
+        info = {'case': logcase, 
+                'model': self.model.getAttr(GRB.attr.ModelName), 
+                'reduced_model': self.USE_REDUCED_MODEL,
+                'num_slot': self.NUM_SLOT, 
+                'num_room': self.NUM_ROOM, 
+                'num_meeting': len(self.EAMS.ML), 
+                'num_meeting_type': len(self.EAMS.MTYPE)}
+        self.profiler.writeReport('Output/' + logcase + '_build_profile.json', info)
@@ -5,6 +5,9 @@ from time import time
 from eams_log import cb_mipsol
 from eams import EAMS
 from solver_error import SOLVER_LNS_Error
+from solver_profiler import BuildProfiler
+from solver_solution import SolutionSnapshot
+from solver_result import RunResult
 
 from gurobipy import *
         
@@ -17,9 +20,11 @@ class Solver_MILP:
         self.err = SOLVER_LNS_Error()
         
         self.USE_REDUCED_MODEL = 1          # switch to HVAC reduced model (which remove all internal wall, ignore zone conduction within building, just consider enthalpy and external wall)
-        logging.info("Use REDUCED HVAC Model? %s" %(self.USE_REDUCED_MODEL))
+        logging.info("Use REDUCED HVAC Model? %s", self.USE_REDUCED_MODEL)
         self.LOG_LP = 0                     # turn on to write LP file
+        self.LOG_BUILD_PROFILE = 0          # turn on to profile every _create* model builder, see logBuildProfile()
         self.LOG_MIP_EAMS = 0               # turn this off to save more time for LNS operation!
+        self.LOG_RESULT_NPZ = 0             # turn on to write schedules & temperatures to Output/<CASE_CFG>_result.npz instead of text files, see solver_result.py
         
         self.solveTime = -1                 # TODO: in LNS, solveTime is calculated in solver_lns
         self.CASE_CFG = cfg_idx        
@@ -32,11 +37,19 @@ class Solver_MILP:
         self.MSTR_NUM_MEETING = len(self.EAMS.ML)
         self.MSTR_NUM_MEETING_TYPE = len(self.EAMS.MTYPE)
         self.MSTR_NUM_ROOM = len(self.EAMS.RL)
-        logging.debug("******************* #k = %d #m = %d #r = %d  #mtype = %d" %(self.MSTR_NUM_SLOT, self.MSTR_NUM_MEETING, self.MSTR_NUM_ROOM, self.MSTR_NUM_MEETING_TYPE))
+        logging.debug("******************* #k = %d #m = %d #r = %d  #mtype = %d", self.MSTR_NUM_SLOT, self.MSTR_NUM_MEETING, self.MSTR_NUM_ROOM, self.MSTR_NUM_MEETING_TYPE)
         
         self._initConstant()
+        self._initHVACBound()
         self._initMstrScheduleVar()
         self._initMstrHVACVar()
+        self.solution = SolutionSnapshot(self)  # solution of the last optimize(), see _optimize()
+        self.result = None                      # binary result of the run if LOG_RESULT_NPZ, see _getResult()
+        
+        self.profiler = None
+        if self.LOG_BUILD_PROFILE:
+            self.profiler = BuildProfiler(self)
+            self.profiler.instrument()
         
             
         
@@ -49,13 +62,21 @@ class Solver_MILP:
         logging.info("===============================================================")          
         self._initializeGurobiCfg() 
         
+    def _optimize(self, callback=None):
+        """Optimize the model. Solution values cached from the previous solve are dropped."""
+        self.solution.invalidate()
+        if callback is None:
+            self.model.optimize()
+        else:
+            self.model.optimize(callback)
+        
     def updateGurobiParam(self, TIME_LIMIT):
         """Set Gurobi param which apply to non-initial solution"""
                         
         if TIME_LIMIT > 0:
             self.TIME_LIMIT = TIME_LIMIT
             self.model.setParam(GRB.Param.TimeLimit, TIME_LIMIT) 
-            logging.info("Update GRB.Param.TimeLimit to %f" %(self.TIME_LIMIT) )
+            logging.info("Update GRB.Param.TimeLimit to %f", self.TIME_LIMIT)
         
                     
         self.model.update()
@@ -242,12 +263,12 @@ class Solver_MILP:
                     self.MSTR_BDV_x_MLK[m].append([])  
                     mk = 0                                      
                     for k in xrange(self.MSTR_NUM_SLOT):                        
-                        if self.EAMS.isInTimeWindows(mid,k) > 0:
+                        if self.EAMS.MFS[mid][k]:
                             self.MSTR_BDV_x_MLK[m][ml].append(0)                            
                             self.MSTR_BDV_x_MLK_Dict[tuple([m,l,k])] = [m,ml,mk]                            
                             mk = mk+1
                     ml = ml+1
-        logging.info("self.MSTR_BDV_x_MLK_Dict: %s" %(self.MSTR_BDV_x_MLK_Dict))
+        logging.debug("self.MSTR_BDV_x_MLK_Dict: %s", self.MSTR_BDV_x_MLK_Dict)
                     
     def _initMSTR_BDV_w_LK(self):                
         for l in xrange(self.MSTR_NUM_ROOM):
@@ -329,6 +350,7 @@ class Solver_MILP:
         self._createCAV_T_l_c()
         self._createCAV_A_SA_T_z_LK()
         self._createCAV_A_SA_T_SA_LK()    
+        self.model.update()
         
         self._createCSTR_RoomTemperature_LB()
         self._createCSTR_RoomTemperature_UB()
@@ -355,6 +377,7 @@ class Solver_MILP:
             self._createHVAC_CSTR_hasStandbyMode()        
             
         self._createHVAC_CSTR_Energy()      
+        self.model.update()
         
     def _createHVAC_CSTR_noStandbyMode(self):
         self._createCSTR_SupplyAirTemperature_LB_noStandbyMode()        
@@ -371,22 +394,64 @@ class Solver_MILP:
         self._createHVAC_CSTR_A_SA_T_SA_hasStandbyMode()
         self._createHVAC_CSTR_A_SA_T_z_with_LooseBoundedT_hasStandbyMode()        
         
-    def _get_A_SA_LB(self, l, k):        
-        if self.EAMS.SH[k] == 1:
+    def _initHVACBound(self):
+        """Pre-compute lower bounds of T_SA (per time slot) and A_SA (per room x time slot) used by the HVAC constraints"""
+        self.T_SA_LB_K = []
+        for k in xrange(self.MSTR_NUM_SLOT):
+            if self.EAMS.SH[k] == 1:
+                self.T_SA_LB_K.append(float(self.EAMS.TEMPERATURE_CONDITIONED_AIR))
+            else:
+                self.T_SA_LB_K.append(float(self.EAMS.INITIAL_TEMPERATURE_SUPPLY_AIR_UNOCC))
+        
+        self.A_SA_LB_LK = []
+        for l in xrange(self.MSTR_NUM_ROOM):
             [width, length, height] = self.EAMS.getRoomThermalConfig(l, "Dim")
-            A_SA_LB = self.EAMS.ALPHA_IAQ_FACTOR_OF_SAFETY*(
+            A_SA_LB_OCC = float(self.EAMS.ALPHA_IAQ_FACTOR_OF_SAFETY*(
                                                     (self.EAMS.MASS_AIR_FLOW_OUTSIDE_AIR_PER_METER_SQUARE * width * length * height) /
-                                                    (1-self.EAMS.MASS_AIR_FLOW_RETURN_AIR_RATIO))
-        else:
-            A_SA_LB = self.EAMS.MASS_AIR_FLOW_SUPPLY_AIR_MIN
+                                                    (1-self.EAMS.MASS_AIR_FLOW_RETURN_AIR_RATIO)))
+            A_SA_LB_UNOCC = float(self.EAMS.MASS_AIR_FLOW_SUPPLY_AIR_MIN)
+            self.A_SA_LB_LK.append([A_SA_LB_OCC if self.EAMS.SH[k] == 1 else A_SA_LB_UNOCC for k in xrange(self.MSTR_NUM_SLOT)])
         
-        return float(A_SA_LB)
+    def _get_A_SA_LB(self, l, k):        
+        return self.A_SA_LB_LK[l][k]
     
     def _get_T_SA_LB(self, l, k):
-        if self.EAMS.SH[k] == 1:
-            return float(self.EAMS.TEMPERATURE_CONDITIONED_AIR)
+        return self.T_SA_LB_K[k]
+    
+    def _hasWallNode(self, l, w):
+        """Wall w of location l is modelled: always in the full model, only external walls in the reduced model"""
+        if self.SCHE_MODE == 1:
+            dl = self.CURR_DESTROY_LOCATION[l]
         else:
-            return float(self.EAMS.INITIAL_TEMPERATURE_SUPPLY_AIR_UNOCC)
+            dl = l
+        
+        return ((self.USE_REDUCED_MODEL == 0) or
+                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][w] == self.N_OUTDOOR) or
+                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][w] == self.N_NOT_EXIST))
+    
+    def _addVarsLK(self, vname, lb=0.0, ub=GRB.INFINITY, wall=None):
+        """Add continuous variables vname_l_k for all locations x time slots (only locations which model wall w if given)
+           in one addVars() call. Model is not updated here, _createHVACModel updates it once per phase."""
+        locs = [l for l in xrange(self.NUM_ROOM) if wall is None or self._hasWallNode(l, wall)]
+        vls = [[] for l in xrange(self.NUM_ROOM)]
+        if not locs:
+            return vls
+        
+        names = ['%s_%d_%d' %(vname, l, k) for l in locs for k in xrange(self.NUM_SLOT)]
+        vd = self.model.addVars(locs, xrange(self.NUM_SLOT), lb=lb, ub=ub, vtype=GRB.CONTINUOUS, name=names)
+        for l in locs:
+            vls[l] = [vd[l, k] for k in xrange(self.NUM_SLOT)]
+        return vls
+    
+    def _addConstrsLK(self, cls, tc):
+        """Add constraints tc = [[l, constraint, name]] in one addConstrs() call and append them to cls[l], in order of tc"""
+        if not tc:
+            return
+        cd = self.model.addConstrs(tc[i][1] for i in xrange(len(tc)))
+        constrs = [cd[i] for i in xrange(len(tc))]
+        self.model.setAttr(GRB.Attr.ConstrName, constrs, [t[2] for t in tc])
+        for i in xrange(len(tc)):
+            cls[tc[i][0]].append(constrs[i])
         
     def _createHVAC_CSTR_A_SA_T_SA_hasStandbyMode(self):
         self._createCSTR_A_SA_T_SA_1_LK_hasStandbyMode()
@@ -416,6 +481,7 @@ class Solver_MILP:
         self._createCAV_EnergyConsumption_Fan()
         self._createCAV_EnergyConsumption_Conditioning()
         self._createCAV_EnergyConsumption_Heating()
+        self.model.update()
         
         self._createCSTR_EnergyConsumption_Fan()
         self._createCSTR_EnergyConsumption_Conditioning()
@@ -436,12 +502,12 @@ class Solver_MILP:
             self.NUM_MEETING = len(self.EAMS.ML)
             self.NUM_MEETING_TYPE = len(self.EAMS.MTYPE)
             self.NUM_ROOM = len(self.EAMS.RL)
-            logging.info("******************* #k = %d #m = %d #r = %d  #mtype = %d" %(self.NUM_SLOT, self.NUM_MEETING, self.NUM_ROOM, self.NUM_MEETING_TYPE))
+            logging.info("******************* #k = %d #m = %d #r = %d  #mtype = %d", self.NUM_SLOT, self.NUM_MEETING, self.NUM_ROOM, self.NUM_MEETING_TYPE)
         else:
             logging.info("Building *PARTIAL* schedule")                       
             self.NUM_MEETING_TYPE = len(self.CURR_DESTROY_MTYPE)
             self.NUM_ROOM = len(self.CURR_DESTROY_LOCATION)
-            logging.info("******************* #k = %d #r = %d  #mtype = %d" %(self.NUM_SLOT, self.NUM_ROOM, self.NUM_MEETING_TYPE))
+            logging.info("******************* #k = %d #r = %d  #mtype = %d", self.NUM_SLOT, self.NUM_ROOM, self.NUM_MEETING_TYPE)
 
         
     def _resetScheduleVar(self):                
@@ -451,6 +517,8 @@ class Solver_MILP:
         self.DAV_Attendee_LK = []                   # Discrete Auxiliary variable: Number of attendee at room l at time k
         
         self.BDV_x_MLK_Dict = {}                    # d[(m,l,k)] = offset of (m,l,k) in BDV_x_MLK. Record index of meeting x location x time periods
+        self.BDV_x_MLK_InvDict = {}                 # d[(m,ml,mk)] = (m,l,k). Reverse of BDV_x_MLK_Dict
+        self.BDV_x_MLK_Fixed = set()                # (m,l,k) of BDV_x_MLK which are currently fixed to 1 (LB=1) by LNS
         self.BDV_w_LK_Dict = {}                     # d[(l,k)] = offset of (l,k) in BDV_w_LK. Record index of location x time periods
         
         self.BAV_y_LD = []                          # Binary Decision variable: represent if location l is occupied at day D
@@ -529,7 +597,7 @@ class Solver_MILP:
                 
         self.SCHE_MODE = 0
         self.USE_REDUCED_MODEL = use_reduced_model
-        logging.info("Use REDUCED HVAC Model? %s" %(self.USE_REDUCED_MODEL))
+        logging.info("Use REDUCED HVAC Model? %s", self.USE_REDUCED_MODEL)
         
         self._createScheduleModel()
         self._createHVACModel()        
@@ -541,11 +609,11 @@ class Solver_MILP:
         self.model.update()
         
         if self.LOG_CB == 1:
-            self.model.optimize(cb_mipsol)
+            self._optimize(cb_mipsol)
         else:                
-            self.model.optimize()
+            self._optimize()
         
-        logging.info("ObjValue: %g" %(self.model.getAttr(GRB.attr.ObjVal)))    
+        logging.info("ObjValue: %g", self.model.getAttr(GRB.attr.ObjVal))
         
     #===========================================================================
     # MILP (solve MILP given initial schedule)
@@ -560,7 +628,7 @@ class Solver_MILP:
          
         self.SCHE_MODE = 0
         self.USE_REDUCED_MODEL = use_reduced_model
-        logging.info("Use REDUCED HVAC Model? %s" %(self.USE_REDUCED_MODEL))
+        logging.info("Use REDUCED HVAC Model? %s", self.USE_REDUCED_MODEL)
         
         self._createScheduleModel()
         self._createHVACModel()        
@@ -586,11 +654,11 @@ class Solver_MILP:
 #         self.LOG_LP = 0
          
         if self.LOG_CB == 1:
-            self.model.optimize(cb_mipsol)
+            self._optimize(cb_mipsol)
         else:                
-            self.model.optimize()
+            self._optimize()
          
-        logging.info("ObjValue: %g" %(self.model.getAttr(GRB.attr.ObjVal)))    
+        logging.info("ObjValue: %g", self.model.getAttr(GRB.attr.ObjVal))
         
         return self.model.getAttr(GRB.attr.ObjVal) 
            
@@ -613,11 +681,11 @@ class Solver_MILP:
 #         self.LOG_LP = 0
          
         if self.LOG_CB == 1:
-            self.model.optimize(cb_mipsol)
+            self._optimize(cb_mipsol)
         else:                
-            self.model.optimize()
+            self._optimize()
          
-        logging.info("ObjValue: %g" %(self.model.getAttr(GRB.attr.ObjVal))) 
+        logging.info("ObjValue: %g", self.model.getAttr(GRB.attr.ObjVal))
         
         return [self.model.getAttr(GRB.attr.ObjVal), self.model.getAttr(GRB.attr.MIPGap)]
         
@@ -644,11 +712,11 @@ class Solver_MILP:
                 for i in xrange(num_m+2, num_m+2+num_w):
                     self.INIT_W.append(list(sche_lines[i].split(',')))
                     
-                logging.info("INIT_X = %s" %self.INIT_X)
-                logging.info("INIT_W = %s" %self.INIT_W)    
+                logging.info("INIT_X = %s", self.INIT_X)
+                logging.info("INIT_W = %s", self.INIT_W)
                                 
         except (ValueError), e:
-            logging.critical('%s' % (e))  
+            logging.critical('%s', e)
             
     def _initializeCallback(self):        
         self.model._CASE_CFG = self.CASE_CFG        
@@ -679,14 +747,14 @@ class Solver_MILP:
         t_start = time()
         self._createScheduleModel()
         self.model.update()
-        logging.info("getInitialSchedule _createScheduleModel takes %s s" %(time()-t_start))
+        logging.info("getInitialSchedule _createScheduleModel takes %s s", time()-t_start)
         
         # Step 2: If objective is set for room schedule, create 
         if INITIAL_SCHEDULE_TYPE == self.SCHE_TYPE_MIN_ROOM_PER_DAY:
             t_start = time()
             self._createMinRoomPerDayObjective()
             self.model.update()
-            logging.info("getInitialSchedule _createMinRoomPerDayObjective takes %s s" %(time()-t_start))
+            logging.info("getInitialSchedule _createMinRoomPerDayObjective takes %s s", time()-t_start)
             
         # Step 3: Log room schedule LP model
         if self.LOG_LP:
@@ -698,13 +766,13 @@ class Solver_MILP:
             if self.LOG_CB == 1:
                 # Option 1: With callback, log all solutions' schedules and temperatures
                 # Only if an objective exists                 
-                self.model.optimize(cb_mipsol)
+                self._optimize(cb_mipsol)
             else:                
-                self.model.optimize()
+                self._optimize()
         else:
             # Option 2: No callback (because no objective function, just find a feasible solution)
-            self.model.optimize()
-        logging.info("getInitialSchedule optimize takes %s s" %(time()-t_start))
+            self._optimize()
+        logging.info("getInitialSchedule optimize takes %s s", time()-t_start)
         
         # Step 5: Check model status
         if self.STATUS.index('INFEASIBLE') != self.model.getAttr(GRB.attr.Status):
@@ -725,93 +793,95 @@ class Solver_MILP:
         # Add scheduling constraint, for initial schedule, no destroy, just enforce initial schedule cstr.
         t_start = time()
         self._createLNS_ScheduleCstr([],[],[])
-        logging.info("initHVACModelNEnergyObjBasedOnInitialSchedule _createLNS_ScheduleCstr takes: %s s" %(time()-t_start))
+        logging.info("initHVACModelNEnergyObjBasedOnInitialSchedule _createLNS_ScheduleCstr takes: %s s", time()-t_start)
         
         # Initialize HVAC model
         t_start = time()
         self._createHVACModel()
-        logging.info("initHVACModelNEnergyObjBasedOnInitialSchedule _createHVACModel takes: %s s" %(time()-t_start))
+        logging.info("initHVACModelNEnergyObjBasedOnInitialSchedule _createHVACModel takes: %s s", time()-t_start)
 
         # Add energy minimization objective  
         t_start = time()
         self._createObjective()        
         self.model.update()
-        logging.info("initHVACModelNEnergyObjBasedOnInitialSchedule _createObjective takes: %s s" %(time()-t_start))           
+        logging.info("initHVACModelNEnergyObjBasedOnInitialSchedule _createObjective takes: %s s", time()-t_start)
         
                      
         if self.LOG_LP:
             self.model.write('Output/EAMS_LNS_' + str(self.CASE_CFG) + '_2b_LNS_INITSCHEHVAC_' + datetime.now().strftime('%Y_%m_%d_%H_%M_%S_%f') +'.lp')        
         
         t_start = time()
-        self.model.optimize()
-        logging.info("initHVACModelNEnergyObjBasedOnInitialSchedule optimize takes %s s" %(time()-t_start))
+        self._optimize()
+        logging.info("initHVACModelNEnergyObjBasedOnInitialSchedule optimize takes %s s", time()-t_start)
              
         if self.model.getAttr(GRB.attr.Status) != self.STATUS.index('INFEASIBLE'):
             t_start = time()
             self._updMSTR_HVAC()
-            logging.info("initHVACModelNEnergyObjBasedOnInitialSchedule _updMSTR_HVAC takes: %s s" %(time()-t_start))
+            logging.info("initHVACModelNEnergyObjBasedOnInitialSchedule _updMSTR_HVAC takes: %s s", time()-t_start)
             
 #             self.logSchedules(self.CASE_CFG + "_2c_LNS_INITSCHEHVAC")
 #             self.logTemperatures(self.CASE_CFG + "_2c_LNS_INITSCHEHVAC")      
             t_start = time()      
             self.logMSTR_Schedules(self.CASE_CFG + "_2c_LNS_INITSCHE_MASTER")
-            logging.info("initHVACModelNEnergyObjBasedOnInitialSchedule logMSTR_Schedules takes: %s s" %(time()-t_start))
+            logging.info("initHVACModelNEnergyObjBasedOnInitialSchedule logMSTR_Schedules takes: %s s", time()-t_start)
             
             t_start = time()
             self.logMSTR_Temperatures(self.CASE_CFG + "_2c_LNS_INITSCHEHVAC_MASTER")
-            logging.info("initHVACModelNEnergyObjBasedOnInitialSchedule logMSTR_Temperatures takes: %s s" %(time()-t_start))
+            logging.info("initHVACModelNEnergyObjBasedOnInitialSchedule logMSTR_Temperatures takes: %s s", time()-t_start)
         else:            
             logging.error("Error! Infeasible HVAC model for the given initial schedule")
             return self.err.solver_lns_infeasible_hvac_ctrl()
          
         return self.model.getAttr(GRB.attr.ObjVal)
         
+    def _setBDV_x_MLK_LB(self, keys, lb):
+        """Set LB of BDV_x_MLK of keys (m,l,k) in one batched call"""
+        if len(keys) == 0:
+            return
+        
+        xls = []
+        for key in keys:
+            [m, ml, mk] = self.BDV_x_MLK_Dict[key]
+            xls.append(self.BDV_x_MLK[m][ml][mk])
+        self.model.setAttr("LB", xls, [lb]*len(xls))
+        
+    def _updateBDV_x_MLK_Fixed(self, fixed):
+        """Fix BDV_x_MLK of keys (m,l,k) in fixed to 1 and release the others. 
+           Only variables whose bound differs from the currently fixed set are touched."""
+        release = self.BDV_x_MLK_Fixed - fixed
+        enforce = fixed - self.BDV_x_MLK_Fixed
+        self._setBDV_x_MLK_LB(release, 0.0)
+        self._setBDV_x_MLK_LB(enforce, 1.0)
+        self.BDV_x_MLK_Fixed = fixed
+        logging.info("BDV_x_MLK fixed=%d: released %d, enforced %d", len(fixed), len(release), len(enforce))
+        
     def _createLNS_ScheduleCstr(self, locationls, slotls, mls):
         """Limit the upper bound and lower bound of x=1 which is NOT IN locationls and slotls"""
         
         self._getBDV_x_MLK_setToOne()
-        for m in xrange(self.NUM_MEETING_TYPE):
-            for l in xrange(len(self.BDV_x_MLK[m])):
-                for k in xrange(len(self.BDV_x_MLK[m][l])):
-                    [fm,fl,fk] = self._getBDV_x_MLK([m,l,k])
-                        
-#                     # Remove constraint on x=1 which has NOT been destroyed in the previous round, 
-#                     #    but TO BE destroyed in the current round 
-#                     if (self.BDV_x_MLK[m][l][k].getAttr("LB") == 1.0 and
-#                         ((fl in locationls or
-#                          fk in slotls or
-#                          [fm, fl, fk] in mls))):
-#                         self.BDV_x_MLK[m][l][k].setAttr("LB", 0.0)
-#                         
-                    # Add constraint on x=1 which is NOT TO BE destroyed in the current round
-                    if (self.BDV_x_MLK[m][l][k].getAttr("LB") == 0.0 and
-                        [fm,fl,fk] in self.milp_alloc and
-                        fl not in locationls and
-                        fk not in slotls and
-                        [fm, fl,fk] not in mls):
-                        self.BDV_x_MLK[m][l][k].setAttr("LB", 1.0)
+        
+        # Add constraint on x=1 which is NOT TO BE destroyed in the current round
+        locations = set(locationls)
+        slots = set(slotls)
+        destroyed = set(tuple(x) for x in mls)
+        fixed = set()
+        for [fm,fl,fk] in self.milp_alloc:
+            if (fl not in locations and 
+                fk not in slots and 
+                (fm, fl, fk) not in destroyed):
+                fixed.add((fm, fl, fk))
+        self._updateBDV_x_MLK_Fixed(fixed)
                                 
         self.model.update()
         
     def _getBDV_x_MLK_setToOne(self):
-        logging.info("------------------- _getBDV_x_MLK_setToOne  Identify x=1")
-        self.milp_alloc = []
-        self.milp_alloc_sl = []
-        self.milp_alloc_sk = []
-        for m in xrange(self.NUM_MEETING_TYPE):
-            for l in xrange(len(self.BDV_x_MLK[m])):
-                for k in xrange(len(self.BDV_x_MLK[m][l])):
-                    val = self.BDV_x_MLK[m][l][k].x                    
-                    if val > self.EPSILON:
-                        [fm,fl,fk] = self._getBDV_x_MLK([m,l,k]) 
-                        self.milp_alloc.append([fm,fl,fk])
-                        if fl not in self.milp_alloc_sl:
-                            self.milp_alloc_sl.append(fl)
-                        if fk not in self.milp_alloc_sk:
-                            self.milp_alloc_sk.append(fk) 
-        logging.info("[fm, fl, fk]: %s" %(self.milp_alloc))
-        logging.info("[fl]: %s" %(self.milp_alloc_sl))
-        logging.info("[fk]: %s" %(self.milp_alloc_sk))
+        logging.debug("------------------- _getBDV_x_MLK_setToOne  Identify x=1")
+        self.milp_alloc = self.solution.getAssignments()
+        self.milp_alloc_sl = self.solution.getOccupiedLocations()
+        self.milp_alloc_sk = self.solution.getOccupiedSlots()
+        logging.debug("[fm, fl, fk]: %s", self.milp_alloc)
+        logging.debug("[fl]: %s", self.milp_alloc_sl)
+        logging.debug("[fk]: %s", self.milp_alloc_sk)
             
     def rebuildNeighbourhood(self, runidx, locationls, slotls, mls):    
                 
@@ -828,13 +898,13 @@ class Solver_MILP:
         self.model.update()
         if self.LOG_LP:
             self.model.write('Output/EAMS_LNS_' + str(self.CASE_CFG) + '_3b_LNS_RUN_' + str(runidx) + '_'+ datetime.now().strftime('%Y_%m_%d_%H_%M_%S_%f') +'.lp')
-        self.model.optimize()
+        self._optimize()
          
         if self.model.getAttr(GRB.attr.Status) == self.STATUS.index('INFEASIBLE'):
             logging.error("Error! Infeasible HVAC model for the given initial schedule")
             return self.err.solver_lns_infeasible_hvac_ctrl()
         else:
-            logging.info("Objective value: %g" %(self.model.getAttr(GRB.attr.ObjVal)))
+            logging.info("Objective value: %g", self.model.getAttr(GRB.attr.ObjVal))
             if self.LOG_MIP_EAMS:
                 self.logSchedules(self.CASE_CFG + "_3c_LNS_RUN_"+ str(runidx))
                 self.logTemperatures(self.CASE_CFG + "_3c_LNS_RUN_"+ str(runidx))    
@@ -853,7 +923,7 @@ class Solver_MILP:
                         for k in xrange(len(self.MSTR_BDV_x_MLK[m][l])):
                             if self.MSTR_BDV_x_MLK[m][l][k] == 1:
                                 occls.append([m,l,k])                                
-        logging.info("Meetings to be rescheduled: %s. Total: %d" %(occls, len(occls)))
+        logging.debug("Meetings to be rescheduled: %s. Total: %d", occls, len(occls))
         self.CURR_DESTROY_MEETINGS = occls
         
         # Group to get MTYPE and number of MTYPE in partial schedule
@@ -871,8 +941,8 @@ class Solver_MILP:
                 self.CURR_DESTROY_MTYPE.append(occls[i][0])
                 self.CURR_DESTROY_MTYPE_NUM.append(1)
         
-        logging.info("self.CURR_DESTROY_MTYPE: %s. Total: %d" %(self.CURR_DESTROY_MTYPE, len(self.CURR_DESTROY_MTYPE)))
-        logging.info("self.CURR_DESTROY_MTYPE_NUM: %s" %self.CURR_DESTROY_MTYPE_NUM)                          
+        logging.debug("self.CURR_DESTROY_MTYPE: %s. Total: %d", self.CURR_DESTROY_MTYPE, len(self.CURR_DESTROY_MTYPE))
+        logging.debug("self.CURR_DESTROY_MTYPE_NUM: %s", self.CURR_DESTROY_MTYPE_NUM)
         
     
     def updateNeighbourhood(self, runidx):
@@ -893,7 +963,7 @@ class Solver_MILP:
         """Create a scheduling objective which allocate meeting into minimum number of room per day"""
         
         self._populateSlotIdxPerDay()
-        logging.info("****** _createCSTR_MinRoom()  Daily Slot Index: %s" %self.k_m)
+        logging.info("****** _createCSTR_MinRoom()  Daily Slot Index: %s", self.k_m)
         
         start_time = time()
         self._createBAV_y_LD()        
@@ -911,7 +981,7 @@ class Solver_MILP:
                 self.BAV_y_LD[l].append(self.model.addVar(lb=0, ub=1, vtype=GRB.CONTINUOUS, name=name))
              
         self.model.update()
-        logging.debug("BAV_y_LD:\n %s" %self.BAV_y_LD)
+        logging.debug("BAV_y_LD:\n %s", self.BAV_y_LD)
         
     def _createLinearMinRoomObjective(self):
         """Create an objective to minimize number of room used """
@@ -936,7 +1006,7 @@ class Solver_MILP:
                 self.CSTR_MinRoom[m].append([])
                 if l in self.EAMS.MR[m]:    # TODO: assume all meetings of the same type can access the same room. Re-group required if not!
                     for k in xrange(self.NUM_SLOT):                        
-                        if self.EAMS.isInTimeWindows(mid,k) > 0:
+                        if self.EAMS.MFS[mid][k]:
                             day = self._getDayForSlotIdx(k) 
                             [om, ol, ok] = self.BDV_x_MLK_Dict[m, l, k]  
                             lcstr = self.BDV_x_MLK[om][ol][ok]
@@ -946,32 +1016,14 @@ class Solver_MILP:
                             self.CSTR_MinRoom[m][l].append(self.model.addConstr(lcstr <= rcstr, name))
                            
         self.model.update()
-        logging.debug("CSTR_MinRoom:\n %s" %self.CSTR_MinRoom)  
+        logging.debug("CSTR_MinRoom:\n %s", self.CSTR_MinRoom)
           
     
     def _populateSlotIdxPerDay(self):
-        self.k_m = []
-        d_start = -1
-        d_end = -1        
-        for k, v in self.EAMS.TS.iteritems():
-            if (v.hour == 9 and v.minute == 0):
-                if d_start == -1 and d_end == -1:
-                    d_start = k 
-                else:
-#                     print "d_end or d_start != -1. Invalid start/end scheduling period"
-                    logging.error("d_end or d_start != -1. Invalid start/end scheduling period")
-                
-            if (v.hour == 16 and v.minute == 30):
-                if d_start != -1 and d_end == -1:
-                    d_end = k
-                    self.k_m.append([d_start, d_end])
-                    d_start = -1
-                    d_end = -1
+        self.k_m = self.EAMS.TG.getDailySlotIdx()
                     
     def _getDayForSlotIdx(self, k):
-        for i in xrange(len(self.k_m)):
-            if k >= self.k_m[i][0] and k <= self.k_m[i][1]:
-                return i
+        return self.EAMS.TG.getDayForSlotIdx(k)
     #===========================================================================
     # Decision Variables
     #===========================================================================   
@@ -997,19 +1049,20 @@ class Solver_MILP:
                     self.BDV_x_MLK[m].append([])  
                     mk = 0                                      
                     for k in xrange(self.NUM_SLOT):                        
-                        if self.EAMS.isInTimeWindows(mid,k) > 0:
-                            logging.debug("M_L_K_%d_%d_%d = in array offset(%d, %d, %d)" %(m,l,k, m, ml, mk))
+                        if self.EAMS.MFS[mid][k]:
+                            logging.debug("M_L_K_%d_%d_%d = in array offset(%d, %d, %d)", m, l, k, m, ml, mk)
                             
                             name = ['BDV_x_MLK', str(m), str(l), str(k)]                            
                             name = '_'.join(name)         
                             self.BDV_x_MLK[m][ml].append(self.model.addVar(lb=0.0, ub=1.0, vtype=GRB.BINARY, name=name))                            
                             self.BDV_x_MLK_Dict[tuple([m,l,k])] = [m,ml,mk]                            
+                            self.BDV_x_MLK_InvDict[tuple([m,ml,mk])] = tuple([m,l,k])
                             mk = mk+1
                     ml = ml+1
                 
         self.model.update()                           
-        logging.debug("BDV_x_MLK:\n %s" %self.BDV_x_MLK)
-        logging.debug("BDV_x_MLK_Dict:\n %s" %self.BDV_x_MLK_Dict) 
+        logging.debug("BDV_x_MLK:\n %s", self.BDV_x_MLK)
+        logging.debug("BDV_x_MLK_Dict:\n %s", self.BDV_x_MLK_Dict)
     
     def _createBDV_w_LK(self):
         """For each time k, where k falls on non-standard working hour, create a decision variable  (L x K)"""
@@ -1026,39 +1079,18 @@ class Solver_MILP:
                     mk = mk+1
     
         self.model.update()
-        logging.debug("BDV_w_LK:\n %s" %self.BDV_w_LK)
-        logging.debug("BDV_w_LK_Dict:\n %s" %self.BDV_w_LK_Dict)
+        logging.debug("BDV_w_LK:\n %s", self.BDV_w_LK)
+        logging.debug("BDV_w_LK_Dict:\n %s", self.BDV_w_LK_Dict)
         
     def _createCDV_SupplyAirTemperature(self):
         """For each location at each timestep, create a decision variable of TSA, i.e. TSA(k,l)"""
+        self.CDV_T_SA_LK.extend(self._addVarsLK('CDV_T_SA_LK', ub=self.EAMS.TEMPERATURE_SUPPLY_AIR_HIGH))
+        logging.debug("CDV_T_SA_LK:\n %s", self.CDV_T_SA_LK)
         
-        T_SA_UB = self.EAMS.TEMPERATURE_SUPPLY_AIR_HIGH
-        for l in xrange(self.NUM_ROOM):
-            self.CDV_T_SA_LK.append([])
-            for k in xrange(self.NUM_SLOT):                
-                name = ['CDV_T_SA_LK', str(l), str(k)]
-                name = '_'.join(name)                
-                
-                self.CDV_T_SA_LK[l].append(self.model.addVar(lb=0, ub=T_SA_UB, vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CDV_T_SA_LK:\n %s" %self.CDV_T_SA_LK)
-        
-    
     def _createCDV_AirMassFlowRate(self):
         """For each location at each timestep, create a decision variable of aSA, i.e. aSA(k,l)"""
-        
-        A_SA_UB = self.EAMS.MASS_AIR_FLOW_SUPPLY_AIR_MAX
-        for l in xrange(self.NUM_ROOM):
-            self.CDV_A_SA_LK.append([])
-            for k in xrange(self.NUM_SLOT):                
-                name = ['CDV_A_SA_LK', str(l), str(k)]
-                name = '_'.join(name)                
-                
-                self.CDV_A_SA_LK[l].append(self.model.addVar(lb=0, ub=A_SA_UB, vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CDV_A_SA_LK:\n %s" %self.CDV_A_SA_LK)
+        self.CDV_A_SA_LK.extend(self._addVarsLK('CDV_A_SA_LK', ub=self.EAMS.MASS_AIR_FLOW_SUPPLY_AIR_MAX))
+        logging.debug("CDV_A_SA_LK:\n %s", self.CDV_A_SA_LK)
         
     #===========================================================================
     # Energy Minimization Objective
@@ -1093,7 +1125,7 @@ class Solver_MILP:
                 self.BAV_z_LK[l].append(self.model.addVar(lb=0, ub=1, vtype=GRB.CONTINUOUS, name=name))
              
         self.model.update()
-        logging.debug("BAV_z_LK:\n %s" %self.BAV_z_LK)
+        logging.debug("BAV_z_LK:\n %s", self.BAV_z_LK)
          
     def _createDAV_Attendee_LK(self):
         """For each location at each timestamp, create an auxiliary variable representing number of attendee"""
@@ -1106,287 +1138,87 @@ class Solver_MILP:
 #                self.DAV_Attendee_LK[l].append(self.model.addVar(lb=0, vtype=GRB.INTEGER, name=name))
                 self.DAV_Attendee_LK[l].append(self.model.addVar(lb=0, vtype=GRB.CONTINUOUS, name=name))                 
         self.model.update()
-        logging.debug("DAV_Attendee_LK:\n %s" %self.DAV_Attendee_LK)
+        logging.debug("DAV_Attendee_LK:\n %s", self.DAV_Attendee_LK)
         
     #===========================================================================
     # Auxiliary Variables: HVAC
     #===========================================================================
     def _createCAV_RoomTemperature(self):
         """For each location at each timestep, create an auxiliary variable of room temperature T(k, l)"""
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_LK.append([])
-            for k in xrange(self.NUM_SLOT):
-                name = ['CAV_T_LK', str(l), str(k)]
-                name = '_'.join(name)         
-                
-                self.CAV_T_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_LK:\n %s" %self.CAV_T_LK)
+        self.CAV_T_LK.extend(self._addVarsLK('CAV_T_LK'))
+        logging.debug("CAV_T_LK:\n %s", self.CAV_T_LK)
         
     def _createCAV_T_z1_l(self):
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_z1_l_LK.append([])
-            
-            if self.SCHE_MODE == 1:
-                dl = self.CURR_DESTROY_LOCATION[l]
-            else:
-                dl = l
-            
-            if ((self.USE_REDUCED_MODEL == 0) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][0] == self.N_OUTDOOR) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][0] == self.N_NOT_EXIST)):
-                                    
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_z1_l_LK', str(l), str(k)]                
-                    name = '_'.join(name)   
-                    self.CAV_T_z1_l_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_z1_l_LK:\n %s" %self.CAV_T_z1_l_LK)
+        self.CAV_T_z1_l_LK.extend(self._addVarsLK('CAV_T_z1_l_LK', wall=0))
+        logging.debug("CAV_T_z1_l_LK:\n %s", self.CAV_T_z1_l_LK)
         
     def _createCAV_T_z2_l(self):
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_z2_l_LK.append([])
-            
-            if self.SCHE_MODE == 1:
-                dl = self.CURR_DESTROY_LOCATION[l]
-            else:
-                dl = l
-            
-            if ((self.USE_REDUCED_MODEL == 0) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][1] == self.N_OUTDOOR) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][1] == self.N_NOT_EXIST)):
-                
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_z2_l_LK', str(l), str(k)]
-                    name = '_'.join(name)   
-                    self.CAV_T_z2_l_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_z2_l_LK:\n %s" %self.CAV_T_z2_l_LK)
+        self.CAV_T_z2_l_LK.extend(self._addVarsLK('CAV_T_z2_l_LK', wall=1))
+        logging.debug("CAV_T_z2_l_LK:\n %s", self.CAV_T_z2_l_LK)
         
     def _createCAV_T_z3_l(self):
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_z3_l_LK.append([])
-            
-            if self.SCHE_MODE == 1:
-                dl = self.CURR_DESTROY_LOCATION[l]
-            else:
-                dl = l
-            
-            if ((self.USE_REDUCED_MODEL == 0) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][2] == self.N_OUTDOOR) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][2] == self.N_NOT_EXIST)):
-            
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_z3_l_LK', str(l), str(k)]
-                    name = '_'.join(name)                            
-                    self.CAV_T_z3_l_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_z3_l_LK:\n %s" %self.CAV_T_z3_l_LK)
+        self.CAV_T_z3_l_LK.extend(self._addVarsLK('CAV_T_z3_l_LK', wall=2))
+        logging.debug("CAV_T_z3_l_LK:\n %s", self.CAV_T_z3_l_LK)
         
     def _createCAV_T_z4_l(self):
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_z4_l_LK.append([])
-            
-            if self.SCHE_MODE == 1:
-                dl = self.CURR_DESTROY_LOCATION[l]
-            else:
-                dl = l
-            
-            if ((self.USE_REDUCED_MODEL == 0) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][3] == self.N_OUTDOOR) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][3] == self.N_NOT_EXIST)):
-                
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_z4_l_LK', str(l), str(k)]
-                    name = '_'.join(name)  
-                    self.CAV_T_z4_l_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_z4_l_LK:\n %s" %self.CAV_T_z4_l_LK)
+        self.CAV_T_z4_l_LK.extend(self._addVarsLK('CAV_T_z4_l_LK', wall=3))
+        logging.debug("CAV_T_z4_l_LK:\n %s", self.CAV_T_z4_l_LK)
         
     def _createCAV_T_l_z1(self):
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_l_z1_LK.append([])
-            
-            if self.SCHE_MODE == 1:
-                dl = self.CURR_DESTROY_LOCATION[l]
-            else:
-                dl = l
-            
-            if ((self.USE_REDUCED_MODEL == 0) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][0] == self.N_OUTDOOR) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][0] == self.N_NOT_EXIST)):
-            
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_l_z1_LK', str(l), str(k)]                
-                    name = '_'.join(name)       
-                    self.CAV_T_l_z1_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_l_z1_LK:\n %s" %self.CAV_T_l_z1_LK)
+        self.CAV_T_l_z1_LK.extend(self._addVarsLK('CAV_T_l_z1_LK', wall=0))
+        logging.debug("CAV_T_l_z1_LK:\n %s", self.CAV_T_l_z1_LK)
         
     def _createCAV_T_l_z2(self):
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_l_z2_LK.append([])
-            
-            if self.SCHE_MODE == 1:
-                dl = self.CURR_DESTROY_LOCATION[l]
-            else:
-                dl = l
-            
-            if ((self.USE_REDUCED_MODEL == 0) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][1] == self.N_OUTDOOR) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][1] == self.N_NOT_EXIST)):
-                
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_l_z2_LK', str(l), str(k)]
-                    name = '_'.join(name)
-                    self.CAV_T_l_z2_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_l_z2_LK:\n %s" %self.CAV_T_l_z2_LK)
+        self.CAV_T_l_z2_LK.extend(self._addVarsLK('CAV_T_l_z2_LK', wall=1))
+        logging.debug("CAV_T_l_z2_LK:\n %s", self.CAV_T_l_z2_LK)
         
     def _createCAV_T_l_z3(self):
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_l_z3_LK.append([])
-            
-            if self.SCHE_MODE == 1:
-                dl = self.CURR_DESTROY_LOCATION[l]
-            else:
-                dl = l
-            
-            if ((self.USE_REDUCED_MODEL == 0) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][2] == self.N_OUTDOOR) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][2] == self.N_NOT_EXIST)):
-                
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_l_z3_LK', str(l), str(k)]
-                    name = '_'.join(name)
-                    self.CAV_T_l_z3_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_l_z3_LK:\n %s" %self.CAV_T_l_z3_LK)
+        self.CAV_T_l_z3_LK.extend(self._addVarsLK('CAV_T_l_z3_LK', wall=2))
+        logging.debug("CAV_T_l_z3_LK:\n %s", self.CAV_T_l_z3_LK)
         
     def _createCAV_T_l_z4(self):
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_T_l_z4_LK.append([])
-            
-            if self.SCHE_MODE == 1:
-                dl = self.CURR_DESTROY_LOCATION[l]
-            else:
-                dl = l
-            
-            if ((self.USE_REDUCED_MODEL == 0) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][3] == self.N_OUTDOOR) or
-                (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][3] == self.N_NOT_EXIST)):
-                
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_l_z4_LK', str(l), str(k)]
-                    name = '_'.join(name)
-                    self.CAV_T_l_z4_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_T_l_z4_LK:\n %s" %self.CAV_T_l_z4_LK)
+        self.CAV_T_l_z4_LK.extend(self._addVarsLK('CAV_T_l_z4_LK', wall=3))
+        logging.debug("CAV_T_l_z4_LK:\n %s", self.CAV_T_l_z4_LK)
         
     def _createCAV_T_l_f(self):
         
         if (self.USE_REDUCED_MODEL == 0):
-            for l in xrange(self.NUM_ROOM):
-                self.CAV_T_l_f_LK.append([])
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_l_f_LK', str(l), str(k)]
-                    name = '_'.join(name)         
-                    
-                    self.CAV_T_l_f_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                    
-            self.model.update()
-            logging.debug("CAV_T_l_f_LK:\n %s" %self.CAV_T_l_f_LK)
+            self.CAV_T_l_f_LK.extend(self._addVarsLK('CAV_T_l_f_LK'))
+            logging.debug("CAV_T_l_f_LK:\n %s", self.CAV_T_l_f_LK)
         
     def _createCAV_T_l_c(self):
         
         if (self.USE_REDUCED_MODEL == 0):
-            for l in xrange(self.NUM_ROOM):
-                self.CAV_T_l_c_LK.append([])
-                for k in xrange(self.NUM_SLOT):
-                    name = ['CAV_T_l_c_LK', str(l), str(k)]
-                    name = '_'.join(name)         
-                    
-                    self.CAV_T_l_c_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                    
-            self.model.update()
-            logging.debug("CAV_T_l_c_LK:\n %s" %self.CAV_T_l_c_LK)
+            self.CAV_T_l_c_LK.extend(self._addVarsLK('CAV_T_l_c_LK'))
+            logging.debug("CAV_T_l_c_LK:\n %s", self.CAV_T_l_c_LK)
         
     def _createCAV_A_SA_T_z_LK(self):
         """For each location at each timestep, create an auxiliary variable of aT(SA, z)"""
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_A_SA_T_z_LK.append([])
-            for k in xrange(self.NUM_SLOT):
-                name = ['CAV_A_SA_T_z_LK', str(l), str(k)]
-                name = '_'.join(name)         
-                
-                self.CAV_A_SA_T_z_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_A_SA_T_z_LK:\n %s" %self.CAV_A_SA_T_z_LK)
+        self.CAV_A_SA_T_z_LK.extend(self._addVarsLK('CAV_A_SA_T_z_LK'))
+        logging.debug("CAV_A_SA_T_z_LK:\n %s", self.CAV_A_SA_T_z_LK)
         
     def _createCAV_A_SA_T_SA_LK(self):
         """For each location at each timestep, create an auxiliary variable of aT(SA, SA)"""
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_A_SA_T_SA_LK.append([])
-            for k in xrange(self.NUM_SLOT):
-                name = ['CAV_A_SA_T_SA_LK', str(l), str(k)]
-                name = '_'.join(name)         
-                
-                self.CAV_A_SA_T_SA_LK[l].append(self.model.addVar(vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_A_SA_T_SA_LK:\n %s" %self.CAV_A_SA_T_SA_LK)
-    
+        self.CAV_A_SA_T_SA_LK.extend(self._addVarsLK('CAV_A_SA_T_SA_LK'))
+        logging.debug("CAV_A_SA_T_SA_LK:\n %s", self.CAV_A_SA_T_SA_LK)
+        
     #===========================================================================
     # Auxiliary Variables: Energy Consumption
     #===========================================================================
     def _createCAV_EnergyConsumption_Fan(self):
         """For each location at each timestep, create an auxiliary variable of e_fan(k, l)"""
-        
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_E_FAN_LK.append([])
-            for k in xrange(self.NUM_SLOT):
-                name = ['CAV_E_FAN_LK', str(l), str(k)]
-                name = '_'.join(name)         
-                self.CAV_E_FAN_LK[l].append(self.model.addVar(lb=0, vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_E_FAN_LK:\n %s" %self.CAV_E_FAN_LK)
+        self.CAV_E_FAN_LK.extend(self._addVarsLK('CAV_E_FAN_LK'))
+        logging.debug("CAV_E_FAN_LK:\n %s", self.CAV_E_FAN_LK)
         
     def _createCAV_EnergyConsumption_Conditioning(self):
         """For each location at each timestep, create an auxiliary variable of e_conditioning(k, l)"""
+        self.CAV_E_CONDITIONING_LK.extend(self._addVarsLK('CAV_E_CONDITIONING_LK'))
+        logging.debug("CAV_E_CONDITIONING_LK:\n %s", self.CAV_E_CONDITIONING_LK)
         
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_E_CONDITIONING_LK.append([])
-            for k in xrange(self.NUM_SLOT):
-                name = ['CAV_E_CONDITIONING_LK', str(l), str(k)]
-                name = '_'.join(name)         
-                self.CAV_E_CONDITIONING_LK[l].append(self.model.addVar(lb=0, vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_E_CONDITIONING_LK:\n %s" %self.CAV_E_CONDITIONING_LK)
-    
     def _createCAV_EnergyConsumption_Heating(self):
         """For each location at each timestep, create an auxiliary variable of e_heating(k, l)"""
-        
-        for l in xrange(self.NUM_ROOM):
-            self.CAV_E_HEATING_LK.append([])
-            for k in xrange(self.NUM_SLOT):
-                name = ['CAV_E_HEATING_LK', str(l), str(k)]
-                name = '_'.join(name)         
-                self.CAV_E_HEATING_LK[l].append(self.model.addVar(lb=0, vtype=GRB.CONTINUOUS, name=name))
-                
-        self.model.update()
-        logging.debug("CAV_E_HEATING_LK:\n %s" %self.CAV_E_HEATING_LK)
+        self.CAV_E_HEATING_LK.extend(self._addVarsLK('CAV_E_HEATING_LK'))
+        logging.debug("CAV_E_HEATING_LK:\n %s", self.CAV_E_HEATING_LK)
         
     #===========================================================================
     # Constraints
@@ -1415,7 +1247,7 @@ class Solver_MILP:
             self.CSTR_Schedule_Once_M[m].append(self.model.addConstr(lcstr == num_meeting, name))
                  
         self.model.update()
-        logging.debug("CSTR_Schedule_Once_M:\n %s" %self.CSTR_Schedule_Once_M)  
+        logging.debug("CSTR_Schedule_Once_M:\n %s", self.CSTR_Schedule_Once_M)
         
     def _createCSTR_LocationTimeOccupied_MT(self):
         """Set BAV_z_LK=1 at all time periods k if meeting type m is allocated in room L"""
@@ -1435,9 +1267,9 @@ class Solver_MILP:
                     mid = self.EAMS.MTYPE[m].MLS[0]
                    
                 k_m = []
-                k_m = self.EAMS.getFeasibleStartTime(mid, k)
+                k_m = self.EAMS.MKS[mid][k]
                 if k_m:
-                    logging.debug("Meeting Type %d starts at %s still on-going at time period %d" %(m, k_m, k))                        
+                    logging.debug("Meeting Type %d starts at %s still on-going at time period %d", m, k_m, k)
                     for l in xrange(self.NUM_ROOM):
                         if self.SCHE_MODE == 1:
                             dl = self.CURR_DESTROY_LOCATION[l]
@@ -1459,7 +1291,7 @@ class Solver_MILP:
                     self.CSTR_LocationTimeOccupied[k].append(self.model.addConstr(lcstr[l] <= rcstr, name))
                     
         self.model.update()
-        logging.debug("CSTR_LocationTimeOccupied:\n %s" %self.CSTR_LocationTimeOccupied)
+        logging.debug("CSTR_LocationTimeOccupied:\n %s", self.CSTR_LocationTimeOccupied)
            
     def _createCSTR_NumAttendee_MT(self):
         """For each meeting type, represent number of attendee as a unique constraint. Note: Number of attendee is grouped by 5, 15, 30 people."""
@@ -1479,7 +1311,7 @@ class Solver_MILP:
                     mid = self.EAMS.MTYPE[m].MLS[0]
                      
                 k_m = []
-                k_m = self.EAMS.getFeasibleStartTime(mid, k)
+                k_m = self.EAMS.MKS[mid][k]
                 if k_m:
 #                     logging.debug("Meeting %d starts at %s still on-going at time period %d" %(m, k_m, k))                        
                     for l in xrange(self.NUM_ROOM):
@@ -1506,7 +1338,7 @@ class Solver_MILP:
                     self.CSTR_NumAttendee[k].append(self.model.addConstr(0 == rcstr, name))
                     
         self.model.update()
-        logging.debug("CSTR_NumAttendee:\n %s" %self.CSTR_NumAttendee)
+        logging.debug("CSTR_NumAttendee:\n %s", self.CSTR_NumAttendee)
         
     def _createCSTR_AttendeeConflict_MT(self):
         """Meetings Types which have the same attendee(s) should not be allocated into the same time period"""
@@ -1519,7 +1351,7 @@ class Solver_MILP:
         for s in xrange(len(mtls)):
             if mtls[s] not in uniq_mtls:
                 uniq_mtls.append(mtls[s]) 
-        logging.debug("************************************** uniq_mtls:%s" %uniq_mtls)
+        logging.debug("************************************** uniq_mtls:%s", uniq_mtls)
         
         if self.SCHE_MODE == 1:
 #             Given  uniq_mtls:[[1, 4], [10, 18, 27], [0, 4], [20, 29], [7, 27], [9, 19], [11, 30], [6, 13], [17, 33], [2, 33], [16, 25]]
@@ -1527,11 +1359,11 @@ class Solver_MILP:
 #             Check if any combinations in uniq_mtls exists in CURR_DESTROY_MTYPE.
 #             In this example:  uniq_mtls:[[17, 33]]
             
-            logging.debug("self.CURR_DESTROY_MTYPE: %s" %(self.CURR_DESTROY_MTYPE))
+            logging.debug("self.CURR_DESTROY_MTYPE: %s", self.CURR_DESTROY_MTYPE)
             new_uniq_mtls = []
             for sublist in uniq_mtls:
                 new_uniq_mtls.append(list(set(sublist).intersection(set(self.CURR_DESTROY_MTYPE))))            
-            logging.debug("new_uniq_mtls: %s" %(new_uniq_mtls))
+            logging.debug("new_uniq_mtls: %s", new_uniq_mtls)
             uniq_mtls = new_uniq_mtls  # overwrite uniq_mtls
                 
         for k in xrange(self.NUM_SLOT):
@@ -1543,29 +1375,29 @@ class Solver_MILP:
                 for mt in xrange(len(mts)):
                     mtid = mts[mt]     
                     m = self.EAMS.MTYPE[mtid].MLS[0] # to get the time window of MTYPE, so simply get the first meeting in MLS
-                    if self.EAMS.isInTimeWindows(m,k) > 0:   
-                        logging.debug("++ k: %d" %k)    
-                        logging.debug("----%s" %self.EAMS.getFeasibleStartTime(m, k))
+                    if self.EAMS.MFS[m][k]:   
+                        logging.debug("++ k: %d", k)
+                        logging.debug("----%s", self.EAMS.MKS[m][k])
                         
                         if self.SCHE_MODE == 1:
                             did = self.CURR_DESTROY_MTYPE.index(mtid)
-                            om.append([did, self.EAMS.getFeasibleStartTime(m, k)])
+                            om.append([did, self.EAMS.MKS[m][k]])
                         else:
-                            om.append([mtid, self.EAMS.getFeasibleStartTime(m, k)])
+                            om.append([mtid, self.EAMS.MKS[m][k]])
                             
                 if len(om)>1: # has conflict
-                        logging.debug("om: %s" %om)
+                        logging.debug("om: %s", om)
                         lcstr = 0
                         for j in xrange(len(om)):    
-                            logging.debug("om[%d]: %s" %(j,om[j]))    
-                            logging.debug("om[%d][0]: %s" %(j, om[j][0]))
+                            logging.debug("om[%d]: %s", j, om[j])
+                            logging.debug("om[%d][0]: %s", j, om[j][0])
                             mk = om[j][1]
                             for p in xrange(len(mk)):
-                                logging.debug("om[%d][1] [%d]: %s" %(j, p, mk[p]))      
+                                logging.debug("om[%d][1] [%d]: %s", j, p, mk[p])
                                          
                                 for l in xrange(self.NUM_ROOM): #TODO: BUGGY!! need to map this for SCHE_MODE==1 
                                     mlk = self.BDV_x_MLK_Dict.get(tuple([om[j][0], l, mk[p]]))    
-                                    logging.debug("MLK_%s" %mlk)
+                                    logging.debug("MLK_%s", mlk)
                                     if mlk:
                                         lcstr += self.BDV_x_MLK[mlk[0]][mlk[1]][mlk[2]]
                         logging.debug(lcstr)
@@ -1574,12 +1406,13 @@ class Solver_MILP:
                         self.CSTR_AttendeeConflict[k].append(self.model.addConstr(lcstr <= 1, name))
                     
         self.model.update()
-        logging.debug("CSTR_AttendeeConflict:\n %s" %self.CSTR_AttendeeConflict)
+        logging.debug("CSTR_AttendeeConflict:\n %s", self.CSTR_AttendeeConflict)
 
     #===========================================================================
     # Constraints: HVAC
     #===========================================================================
     def _createCSTR_SupplyAirTemperature_LB_noStandbyMode(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):        
             self.CSTR_T_SA_LK.append([])
             for k in xrange(self.NUM_SLOT):                
@@ -1590,14 +1423,15 @@ class Solver_MILP:
 
                 if self.EAMS.SH[k] == 1:
                     rcstr = float(self.EAMS.TEMPERATURE_CONDITIONED_AIR)
-                    self.CSTR_T_SA_LK[l].append(self.model.addConstr(lcstr >= rcstr, name))
+                    tc.append([l, lcstr >= rcstr, name])
                 else:
-                    self.CSTR_T_SA_LK[l].append(self.model.addConstr(lcstr == 0, name))
+                    tc.append([l, lcstr == 0, name])
              
-        self.model.update()
-        logging.debug("CSTR_T_SA_LK:\n %s" %self.CSTR_T_SA_LK)
+        self._addConstrsLK(self.CSTR_T_SA_LK, tc)
+        logging.debug("CSTR_T_SA_LK:\n %s", self.CSTR_T_SA_LK)
                 
     def _createCSTR_SupplyAirTemperature_LB_hasStandbyMode(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):        
             self.CSTR_T_SA_LB_LK.append([])
             for k in xrange(self.NUM_SLOT):                
@@ -1607,16 +1441,17 @@ class Solver_MILP:
                 lcstr = self.CDV_T_SA_LK[l][k]
                 if self.EAMS.SH[k] == 1:
                     rcstr = float(self.EAMS.TEMPERATURE_CONDITIONED_AIR)
-                    self.CSTR_T_SA_LB_LK[l].append(self.model.addConstr(lcstr >= rcstr, name))
+                    tc.append([l, lcstr >= rcstr, name])
                 else:
                     lk = self.BDV_w_LK_Dict.get(tuple([l, k]))
                     rcstr = float(self.EAMS.TEMPERATURE_CONDITIONED_AIR) * self.BDV_w_LK[lk[0]][lk[1]]
-                    self.CSTR_T_SA_LB_LK[l].append(self.model.addConstr(lcstr >= rcstr, name))
+                    tc.append([l, lcstr >= rcstr, name])
                              
-        self.model.update()
-        logging.debug("CSTR_T_SA_LB_LK:\n %s" %self.CSTR_T_SA_LB_LK)
+        self._addConstrsLK(self.CSTR_T_SA_LB_LK, tc)
+        logging.debug("CSTR_T_SA_LB_LK:\n %s", self.CSTR_T_SA_LB_LK)
         
     def _createCSTR_SupplyAirTemperature_UB_hasStandbyMode(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):        
             self.CSTR_T_SA_UB_LK.append([])
             for k in xrange(self.NUM_SLOT):                
@@ -1628,15 +1463,16 @@ class Solver_MILP:
                 if self.EAMS.SH[k] == 0: 
                     lk = self.BDV_w_LK_Dict.get(tuple([l, k]))
                     rcstr = float(self.EAMS.TEMPERATURE_SUPPLY_AIR_HIGH) * self.BDV_w_LK[lk[0]][lk[1]]
-                    self.CSTR_T_SA_UB_LK[l].append(self.model.addConstr(lcstr <= rcstr, name))
+                    tc.append([l, lcstr <= rcstr, name])
                              
-        self.model.update()
-        logging.debug("CSTR_T_SA_UB_LK:\n %s" %self.CSTR_T_SA_UB_LK)
+        self._addConstrsLK(self.CSTR_T_SA_UB_LK, tc)
+        logging.debug("CSTR_T_SA_UB_LK:\n %s", self.CSTR_T_SA_UB_LK)
         
 #--------------------------------------    
     def _createCSTR_SupplyAirFlowRate_LB_noStandbyMode(self):
         """For each location at each timestep, create a constraint for lower bound of air mass flow rate"""
         
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_A_SA_LB_LK.append([])
             
@@ -1653,16 +1489,17 @@ class Solver_MILP:
                 rcstr = self._get_A_SA_LB(dl,k)
                 
                 if self.EAMS.SH[k] == 1:                    
-                    self.CSTR_A_SA_LB_LK[l].append(self.model.addConstr(lcstr >= rcstr, name))
+                    tc.append([l, lcstr >= rcstr, name])
                 else:
-                    self.CSTR_A_SA_LB_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_LB_LK:\n %s" %self.CSTR_A_SA_LB_LK)
+        self._addConstrsLK(self.CSTR_A_SA_LB_LK, tc)
+        logging.debug("CSTR_A_SA_LB_LK:\n %s", self.CSTR_A_SA_LB_LK)
         
     def _createCSTR_SupplyAirFlowRate_LB_hasStandbyMode(self):
         """For each location at each timestep, create a constraint for lower bound of air mass flow rate"""
         
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_A_SA_LB_LK.append([])
             
@@ -1683,12 +1520,13 @@ class Solver_MILP:
                     #TODO:  as long as ASA_LB for sh[k]=0 is set to 0, this cstr can be removed.
                     lk = self.BDV_w_LK_Dict.get(tuple([l, k]))
                     rcstr = self._get_A_SA_LB(dl,k) * self.BDV_w_LK[lk[0]][lk[1]]
-                self.CSTR_A_SA_LB_LK[l].append(self.model.addConstr(lcstr >= rcstr, name))
+                tc.append([l, lcstr >= rcstr, name])
                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_LB_LK:\n %s" %self.CSTR_A_SA_LB_LK)
+        self._addConstrsLK(self.CSTR_A_SA_LB_LK, tc)
+        logging.debug("CSTR_A_SA_LB_LK:\n %s", self.CSTR_A_SA_LB_LK)
         
     def _createCSTR_SupplyAirFlowRate_UB_hasStandbyMode(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_A_SA_UB_LK.append([])            
             for k in xrange(self.NUM_SLOT):                
@@ -1699,13 +1537,14 @@ class Solver_MILP:
                 if self.EAMS.SH[k] == 0: # Not necessary to set the upper bound of SH==1, as it is the same as A_SA default UB
                     lk = self.BDV_w_LK_Dict.get(tuple([l, k]))
                     rcstr = self.EAMS.MASS_AIR_FLOW_SUPPLY_AIR_MAX * self.BDV_w_LK[lk[0]][lk[1]]
-                    self.CSTR_A_SA_UB_LK[l].append(self.model.addConstr(lcstr <= rcstr, name))
+                    tc.append([l, lcstr <= rcstr, name])
                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_UB_LK:\n %s" %self.CSTR_A_SA_UB_LK)
+        self._addConstrsLK(self.CSTR_A_SA_UB_LK, tc)
+        logging.debug("CSTR_A_SA_UB_LK:\n %s", self.CSTR_A_SA_UB_LK)
 
 #--------------------------------------             
     def _createCSTR_RoomTemperature_LB(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_LK_lb.append([])
             for k in xrange(self.NUM_SLOT):                
@@ -1714,12 +1553,13 @@ class Solver_MILP:
                  
                 lcstr = self.CAV_T_LK[l][k]
                 rcstr = float(self.EAMS.TEMPERATURE_UNOCC_MIN) + (float(self.EAMS.TEMPERATURE_OCC_COMFORT_RANGE_INCR) * self.BAV_z_LK[l][k])   
-                self.CSTR_T_LK_lb[l].append(self.model.addConstr(lcstr >= rcstr, name))
+                tc.append([l, lcstr >= rcstr, name])
              
-        self.model.update()
-        logging.debug("CSTR_T_LK_lb:\n %s" %self.CSTR_T_LK_lb)
+        self._addConstrsLK(self.CSTR_T_LK_lb, tc)
+        logging.debug("CSTR_T_LK_lb:\n %s", self.CSTR_T_LK_lb)
         
     def _createCSTR_RoomTemperature_UB(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_LK_ub.append([])
             for k in xrange(self.NUM_SLOT):                
@@ -1728,14 +1568,15 @@ class Solver_MILP:
                  
                 lcstr = self.CAV_T_LK[l][k]
                 rcstr = float(self.EAMS.TEMPERATURE_UNOCC_MAX) - (float(self.EAMS.TEMPERATURE_OCC_COMFORT_RANGE_DECR)*self.BAV_z_LK[l][k]) 
-                self.CSTR_T_LK_ub[l].append(self.model.addConstr(lcstr <= rcstr, name))
+                tc.append([l, lcstr <= rcstr, name])
              
-        self.model.update()
-        logging.debug("CSTR_T_LK_ub:\n %s" %self.CSTR_T_LK_ub)
+        self._addConstrsLK(self.CSTR_T_LK_ub, tc)
+        logging.debug("CSTR_T_LK_ub:\n %s", self.CSTR_T_LK_ub)
     
     def _createCSTR_RoomTemperature(self):
         """For each location at each timestep, create a constraint for room temperature T(k, l)"""
         
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_LK.append([])
             
@@ -1744,7 +1585,6 @@ class Solver_MILP:
             else:
                 dl = l
             
-            A = self.EAMS.getRoomThermalConfig(dl, "C")
             B1 =  self.EAMS.getRoomThermalConfig(dl, "Rij")
             B2 =  self.EAMS.getRoomThermalConfig(dl, "Rik")
             B3 =  self.EAMS.getRoomThermalConfig(dl, "Ril")
@@ -1754,14 +1594,7 @@ class Solver_MILP:
             #TODO: For the moment, only 1 wall could have window. Test with more windows
             B7 = self.EAMS.getRoomThermalConfig(dl, "Rwij")            
             C = self.EAMS.AIR_HEAT_CAPACITY_AT_CONSTANT_PRESSURE            
-            D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / A            
-            E1 = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (A*B1)
-            E2 = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (A*B2)
-            E3 = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (A*B3)
-            E4 = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (A*B4)
-            E5 = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (A*B5)
-            E6 = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (A*B6)
-            E7 = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (A*B7)
+            [D, E1, E2, E3, E4, E5, E6, E7] = self.EAMS.getRoomCoefficients(dl)
             F = D * self.EAMS.OCCUPANT_SENSIBLE_HEAT_GAIN
                 
             for k in xrange(self.NUM_SLOT):          
@@ -1799,7 +1632,7 @@ class Solver_MILP:
                                  )
                                  ) + 
                                  EG +
-                                 (E7 * float(self.EAMS.OAT.values()[k-1])) +                             
+                                 (E7 * self.EAMS.OATV[k-1]) +                             
                                  (F * self.DAV_Attendee_LK[l][k-1]) + 
                                  (D * C * self.CAV_A_SA_T_SA_LK[l][k-1]))
                             
@@ -1825,7 +1658,7 @@ class Solver_MILP:
                                 (E4 * self.CAV_T_l_z4_LK[l][k-1]) +
                                 (E5 * self.CAV_T_l_f_LK[l][k-1]) +
                                 (E6 * self.CAV_T_l_c_LK[l][k-1]) +
-                                (E7 * float(self.EAMS.OAT.values()[k-1])) +                             
+                                (E7 * self.EAMS.OATV[k-1]) +                             
                                  (F * self.DAV_Attendee_LK[l][k-1]) + 
                                  (D * C * self.CAV_A_SA_T_SA_LK[l][k-1]))
                     
@@ -1833,13 +1666,14 @@ class Solver_MILP:
                     rcstr = self.EAMS.INITIAL_TEMPERATURE
                 
                 lcstr = self.CAV_T_LK[l][k]         
-                self.CSTR_T_LK[l].append(self.model.addConstr(lcstr==rcstr, name))
+                tc.append([l, lcstr==rcstr, name])
                 
-        self.model.update()
-        logging.debug("CSTR_T_LK:\n %s" %self.CSTR_T_LK)
+        self._addConstrsLK(self.CSTR_T_LK, tc)
+        logging.debug("CSTR_T_LK:\n %s", self.CSTR_T_LK)
         
    
     def _createCSTR_T_z1_l(self):        
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_z1_l_LK.append([])      
             
@@ -1853,18 +1687,12 @@ class Solver_MILP:
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][0] == self.N_NOT_EXIST)):
                 
                 nz = self.EAMS.RNL[dl][0]
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(dl, "Cij")
-                B = float(1)/self.EAMS.getRoomThermalConfig(dl, "Rji")
-                C = float(1)/self.EAMS.getRoomThermalConfig(dl, "Rimj")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cij") * self.EAMS.getRoomThermalConfig(dl, "Rimj"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cij") * self.EAMS.getRoomThermalConfig(dl, "Rji"))
-                H = 1-(A*(B+C)) 
-                
-                logging.debug("Cij = %s" %(self.EAMS.getRoomThermalConfig(dl, "Cij")))  
-                logging.debug("A = %s" %(A))
-                logging.debug("B = %s" %(B))
-                logging.debug("C = %s" %(C))
-                logging.debug("H = %s" %(H))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(dl, 'z1_l')
+                QS = self.EAMS.getRoomSolarGainTable(dl, 0)
+                
+                logging.debug("Cij = %s", self.EAMS.getRoomThermalConfig(dl, "Cij"))  
+                logging.debug("A = %s", A)
+                logging.debug("H = %s", H)
                                                      
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_z1_l_LK', str(l), str(k)]
@@ -1872,13 +1700,13 @@ class Solver_MILP:
                      
                     if k != 0:
                         if nz == self.N_OUTDOOR:
-                            F = float(self.EAMS.OAT.values()[k-1])
+                            F = self.EAMS.OATV[k-1]
                         elif nz == self.N_NOT_EXIST:
                             F = self.CAV_T_LK[l][k-1]
                         else:
                             F = self.CAV_T_LK[nz][k-1]
                         
-                        G = self.EAMS.getRoomSolarGain(k-1, dl, 0)
+                        G = QS[k-1]
                             
                         rcstr = (
                                  (H * self.CAV_T_z1_l_LK[l][k-1]) +
@@ -1890,12 +1718,13 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE
      
                     lcstr = self.CAV_T_z1_l_LK[l][k]                 
-                    self.CSTR_T_z1_l_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                   
-        self.model.update()
-        logging.debug("CSTR_T_z1_l_LK:\n %s" %self.CSTR_T_z1_l_LK)
+        self._addConstrsLK(self.CSTR_T_z1_l_LK, tc)
+        logging.debug("CSTR_T_z1_l_LK:\n %s", self.CSTR_T_z1_l_LK)
         
     def _createCSTR_T_l_z1(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_l_z1_LK.append([])
             
@@ -1908,11 +1737,7 @@ class Solver_MILP:
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][0] == self.N_OUTDOOR) or
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][0] == self.N_NOT_EXIST)):
             
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(dl, "Cji")
-                B = float(1)/self.EAMS.getRoomThermalConfig(dl, "Rij")
-                C = float(1)/self.EAMS.getRoomThermalConfig(dl, "Rimj")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cji") * self.EAMS.getRoomThermalConfig(dl, "Rij"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cji") * self.EAMS.getRoomThermalConfig(dl, "Rimj"))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(dl, 'l_z1')
                 
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_l_z1_LK', str(l), str(k)]
@@ -1920,7 +1745,7 @@ class Solver_MILP:
                      
                     if k != 0:    
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_l_z1_LK[l][k-1]) +
+                                 (H * self.CAV_T_l_z1_LK[l][k-1]) +
                                  (D * self.CAV_T_LK[l][k-1]) +
                                  (E * self.CAV_T_z1_l_LK[l][k-1])
                                  )
@@ -1928,12 +1753,13 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE 
                     
                     lcstr = self.CAV_T_l_z1_LK[l][k]
-                    self.CSTR_T_l_z1_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-        self.model.update()
-        logging.debug("CSTR_T_l_z1_LK:\n %s" %self.CSTR_T_l_z1_LK)
+        self._addConstrsLK(self.CSTR_T_l_z1_LK, tc)
+        logging.debug("CSTR_T_l_z1_LK:\n %s", self.CSTR_T_l_z1_LK)
         
     def _createCSTR_T_z2_l(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_z2_l_LK.append([])
             
@@ -1947,11 +1773,8 @@ class Solver_MILP:
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][1] == self.N_NOT_EXIST)):
             
                 nz = self.EAMS.RNL[dl][1]
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(dl, "Cik")
-                B = float(1)/self.EAMS.getRoomThermalConfig(dl, "Rki")
-                C = float(1)/self.EAMS.getRoomThermalConfig(dl, "Rimk")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cik") * self.EAMS.getRoomThermalConfig(dl, "Rimk"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cik") * self.EAMS.getRoomThermalConfig(dl, "Rki"))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(dl, 'z2_l')
+                QS = self.EAMS.getRoomSolarGainTable(dl, 1)
                                          
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_z2_l_LK', str(l), str(k)]
@@ -1959,16 +1782,16 @@ class Solver_MILP:
                      
                     if k != 0:
                         if nz == self.N_OUTDOOR:
-                            F = float(self.EAMS.OAT.values()[k-1])
+                            F = self.EAMS.OATV[k-1]
                         elif nz == self.N_NOT_EXIST:
                             F = self.CAV_T_LK[l][k-1]
                         else:
                             F = self.CAV_T_LK[nz][k-1]
                         
-                        G = self.EAMS.getRoomSolarGain(k-1, dl, 1)
+                        G = QS[k-1]
                             
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_z2_l_LK[l][k-1]) +
+                                 (H * self.CAV_T_z2_l_LK[l][k-1]) +
                                  (D * self.CAV_T_l_z2_LK[l][k-1]) +
                                  (E * F) +
                                  (A * G)
@@ -1977,12 +1800,13 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE
                         
                     lcstr = self.CAV_T_z2_l_LK[l][k]
-                    self.CSTR_T_z2_l_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-        self.model.update()
-        logging.debug("CSTR_T_z2_l_LK:\n %s" %self.CSTR_T_z2_l_LK)
+        self._addConstrsLK(self.CSTR_T_z2_l_LK, tc)
+        logging.debug("CSTR_T_z2_l_LK:\n %s", self.CSTR_T_z2_l_LK)
         
     def _createCSTR_T_l_z2(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_l_z2_LK.append([])
             
@@ -1995,11 +1819,7 @@ class Solver_MILP:
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][1] == self.N_OUTDOOR) or
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][1] == self.N_NOT_EXIST)):
             
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(dl, "Cki")
-                B = float(1)/self.EAMS.getRoomThermalConfig(dl, "Rik")
-                C = float(1)/self.EAMS.getRoomThermalConfig(dl, "Rimk")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cki") * self.EAMS.getRoomThermalConfig(dl, "Rik"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cki") * self.EAMS.getRoomThermalConfig(dl, "Rimk"))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(dl, 'l_z2')
                 
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_l_z2_LK', str(l), str(k)]
@@ -2007,7 +1827,7 @@ class Solver_MILP:
                      
                     if k != 0:    
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_l_z2_LK[l][k-1]) +
+                                 (H * self.CAV_T_l_z2_LK[l][k-1]) +
                                  (D * self.CAV_T_LK[l][k-1]) +
                                  (E * self.CAV_T_z2_l_LK[l][k-1])
                                  )
@@ -2015,12 +1835,13 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE       
                      
                     lcstr = self.CAV_T_l_z2_LK[l][k]
-                    self.CSTR_T_l_z2_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-        self.model.update()
-        logging.debug("CSTR_T_l_z2_LK:\n %s" %self.CSTR_T_l_z2_LK)
+        self._addConstrsLK(self.CSTR_T_l_z2_LK, tc)
+        logging.debug("CSTR_T_l_z2_LK:\n %s", self.CSTR_T_l_z2_LK)
         
     def _createCSTR_T_z3_l(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_z3_l_LK.append([])
             
@@ -2034,11 +1855,8 @@ class Solver_MILP:
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][2] == self.N_NOT_EXIST)):
             
                 nz = self.EAMS.RNL[dl][2]
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(dl, "Cil")
-                B = float(1)/self.EAMS.getRoomThermalConfig(dl, "Rli")
-                C = float(1)/self.EAMS.getRoomThermalConfig(dl, "Riml")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cil") * self.EAMS.getRoomThermalConfig(dl, "Riml"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cil") * self.EAMS.getRoomThermalConfig(dl, "Rli"))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(dl, 'z3_l')
+                QS = self.EAMS.getRoomSolarGainTable(dl, 2)
           
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_z3_l_LK', str(l), str(k)]
@@ -2046,16 +1864,16 @@ class Solver_MILP:
                     
                     if k != 0:
                         if nz == self.N_OUTDOOR:
-                            F = float(self.EAMS.OAT.values()[k-1])
+                            F = self.EAMS.OATV[k-1]
                         elif nz == self.N_NOT_EXIST:
                             F = self.CAV_T_LK[l][k-1]
                         else:
                             F = self.CAV_T_LK[nz][k-1]
                         
-                        G = self.EAMS.getRoomSolarGain(k-1, dl, 2)
+                        G = QS[k-1]
                             
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_z3_l_LK[l][k-1]) +
+                                 (H * self.CAV_T_z3_l_LK[l][k-1]) +
                                  (D * self.CAV_T_l_z3_LK[l][k-1]) +
                                  (E * F) +
                                  (A * G)
@@ -2064,12 +1882,13 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE 
                      
                     lcstr = self.CAV_T_z3_l_LK[l][k]                
-                    self.CSTR_T_z3_l_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-        self.model.update()
-        logging.debug("CSTR_T_z3_l_LK:\n %s" %self.CSTR_T_z3_l_LK)
+        self._addConstrsLK(self.CSTR_T_z3_l_LK, tc)
+        logging.debug("CSTR_T_z3_l_LK:\n %s", self.CSTR_T_z3_l_LK)
         
     def _createCSTR_T_l_z3(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_l_z3_LK.append([])
             
@@ -2082,11 +1901,7 @@ class Solver_MILP:
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][2] == self.N_OUTDOOR) or
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][2] == self.N_NOT_EXIST)):
             
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(dl, "Cli")
-                B = float(1)/self.EAMS.getRoomThermalConfig(dl, "Ril")
-                C = float(1)/self.EAMS.getRoomThermalConfig(dl, "Riml")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cli") * self.EAMS.getRoomThermalConfig(dl, "Ril"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cli") * self.EAMS.getRoomThermalConfig(dl, "Riml"))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(dl, 'l_z3')
                 
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_l_z3_LK', str(l), str(k)]
@@ -2094,7 +1909,7 @@ class Solver_MILP:
                      
                     if k != 0:    
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_l_z3_LK[l][k-1]) +
+                                 (H * self.CAV_T_l_z3_LK[l][k-1]) +
                                  (D * self.CAV_T_LK[l][k-1]) +
                                  (E * self.CAV_T_z3_l_LK[l][k-1])
                                  )
@@ -2102,12 +1917,13 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE       
                      
                     lcstr = self.CAV_T_l_z3_LK[l][k]
-                    self.CSTR_T_l_z3_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-        self.model.update()
-        logging.debug("CSTR_T_l_z3_LK:\n %s" %self.CSTR_T_l_z3_LK)
+        self._addConstrsLK(self.CSTR_T_l_z3_LK, tc)
+        logging.debug("CSTR_T_l_z3_LK:\n %s", self.CSTR_T_l_z3_LK)
              
     def _createCSTR_T_z4_l(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_z4_l_LK.append([])
             
@@ -2121,11 +1937,8 @@ class Solver_MILP:
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][3] == self.N_NOT_EXIST)):
             
                 nz = self.EAMS.RNL[dl][3]
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(dl, "Cio")
-                B = float(1)/self.EAMS.getRoomThermalConfig(dl, "Roi")
-                C = float(1)/self.EAMS.getRoomThermalConfig(dl, "Rimo")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cio") * self.EAMS.getRoomThermalConfig(dl, "Rimo"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cio") * self.EAMS.getRoomThermalConfig(dl, "Roi"))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(dl, 'z4_l')
+                QS = self.EAMS.getRoomSolarGainTable(dl, 3)
           
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_z4_l_LK', str(l), str(k)]
@@ -2133,16 +1946,16 @@ class Solver_MILP:
                      
                     if k != 0:
                         if nz == self.N_OUTDOOR:
-                            F = float(self.EAMS.OAT.values()[k-1])
+                            F = self.EAMS.OATV[k-1]
                         elif nz == self.N_NOT_EXIST:
                             F = self.CAV_T_LK[l][k-1]
                         else:
                             F = self.CAV_T_LK[nz][k-1]
                         
-                        G = self.EAMS.getRoomSolarGain(k-1, dl, 3)
+                        G = QS[k-1]
                             
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_z4_l_LK[l][k-1]) +
+                                 (H * self.CAV_T_z4_l_LK[l][k-1]) +
                                  (D * self.CAV_T_l_z4_LK[l][k-1]) +
                                  (E * F) +
                                  (A * G)
@@ -2151,12 +1964,13 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE 
                         
                     lcstr = self.CAV_T_z4_l_LK[l][k]                
-                    self.CSTR_T_z4_l_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-        self.model.update()
-        logging.debug("CSTR_T_z4_l_LK:\n %s" %self.CSTR_T_z4_l_LK)
+        self._addConstrsLK(self.CSTR_T_z4_l_LK, tc)
+        logging.debug("CSTR_T_z4_l_LK:\n %s", self.CSTR_T_z4_l_LK)
         
     def _createCSTR_T_l_z4(self):
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_T_l_z4_LK.append([])
             
@@ -2169,11 +1983,7 @@ class Solver_MILP:
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][3] == self.N_OUTDOOR) or
                 (self.USE_REDUCED_MODEL == 1 and self.EAMS.RNL[dl][3] == self.N_NOT_EXIST)):
             
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(dl, "Coi")
-                B = float(1)/self.EAMS.getRoomThermalConfig(dl, "Rio")
-                C = float(1)/self.EAMS.getRoomThermalConfig(dl, "Rimo")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Coi") * self.EAMS.getRoomThermalConfig(dl, "Rio"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Coi") * self.EAMS.getRoomThermalConfig(dl, "Rimo"))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(dl, 'l_z4')
                 
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_l_z4_LK', str(l), str(k)]
@@ -2181,7 +1991,7 @@ class Solver_MILP:
                      
                     if k != 0:    
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_l_z4_LK[l][k-1]) +
+                                 (H * self.CAV_T_l_z4_LK[l][k-1]) +
                                  (D * self.CAV_T_LK[l][k-1]) +
                                  (E * self.CAV_T_z4_l_LK[l][k-1])
                                  )
@@ -2189,14 +1999,15 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE                    
                      
                     lcstr = self.CAV_T_l_z4_LK[l][k]                
-                    self.CSTR_T_l_z4_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-        self.model.update()
-        logging.debug("CSTR_T_l_z4_LK:\n %s" %self.CSTR_T_l_z4_LK)
+        self._addConstrsLK(self.CSTR_T_l_z4_LK, tc)
+        logging.debug("CSTR_T_l_z4_LK:\n %s", self.CSTR_T_l_z4_LK)
         
     def _createCSTR_T_l_f(self):
         
         if (self.USE_REDUCED_MODEL == 0):
+            tc = []
             for l in xrange(self.NUM_ROOM):
                 self.CSTR_T_l_f_LK.append([])
                 
@@ -2205,38 +2016,35 @@ class Solver_MILP:
                 else:
                     dl = l 
             
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(dl, "Cif")
-                B = float(1)/self.EAMS.getRoomThermalConfig(dl, "Rif")
-                C = float(1)/self.EAMS.getRoomThermalConfig(dl, "Rfi")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cif") * self.EAMS.getRoomThermalConfig(dl, "Rif"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cif") * self.EAMS.getRoomThermalConfig(dl, "Rfi"))
-                F = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(dl, "Cfi")
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(dl, 'l_f')
+                QS = self.EAMS.getRoomSolarGainTable(dl, 4)
            
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_l_f_LK', str(l), str(k)]
                     name = '_'.join(name)                
                     
-                    G = self.EAMS.getRoomSolarGain(k-1, dl, 4)
+                    G = QS[k-1]
                     
                     if k != 0:    
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_l_f_LK[l][k-1]) +
+                                 (H * self.CAV_T_l_f_LK[l][k-1]) +
                                  (D * self.CAV_T_LK[l][k-1]) +
                                  (E * self.CAV_T_LK[l][k-1]) +
-                                 (F * G)
+                                 (S * G)
                                  )
                     else:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE     
                     
                     lcstr = self.CAV_T_l_f_LK[l][k]
-                    self.CSTR_T_l_f_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-            self.model.update()
-            logging.debug("CSTR_T_l_f_LK:\n %s" %self.CSTR_T_l_f_LK)
+            self._addConstrsLK(self.CSTR_T_l_f_LK, tc)
+            logging.debug("CSTR_T_l_f_LK:\n %s", self.CSTR_T_l_f_LK)
         
     def _createCSTR_T_l_c(self):
         
         if (self.USE_REDUCED_MODEL == 0):
+            tc = []
             for l in xrange(self.NUM_ROOM):
                 self.CSTR_T_l_c_LK.append([])
                 
@@ -2245,11 +2053,7 @@ class Solver_MILP:
                 else:
                     dl = l 
                 
-                A = float(self.EAMS.SCHEDULING_INTERVAL)*60 / self.EAMS.getRoomThermalConfig(dl, "Cic")
-                B = float(1)/self.EAMS.getRoomThermalConfig(dl, "Ric")
-                C = float(1)/self.EAMS.getRoomThermalConfig(dl, "Rci")
-                D = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cic") * self.EAMS.getRoomThermalConfig(dl, "Ric"))
-                E = float(self.EAMS.SCHEDULING_INTERVAL)*60 / (self.EAMS.getRoomThermalConfig(dl, "Cic") * self.EAMS.getRoomThermalConfig(dl, "Rci"))
+                [A, H, D, E, S] = self.EAMS.getNodeCoefficients(dl, 'l_c')
                 
                 for k in xrange(self.NUM_SLOT):                
                     name = ['CSTR_T_l_c_LK', str(l), str(k)]
@@ -2257,7 +2061,7 @@ class Solver_MILP:
                     
                     if k != 0:    
                         rcstr = (
-                                 ((1-A*(B+C))*self.CAV_T_l_c_LK[l][k-1]) +
+                                 (H * self.CAV_T_l_c_LK[l][k-1]) +
                                  (D * self.CAV_T_LK[l][k-1]) +
                                  (E * self.CAV_T_LK[l][k-1])
                                  )
@@ -2265,10 +2069,10 @@ class Solver_MILP:
                         rcstr = self.EAMS.INITIAL_TEMPERATURE      
                      
                     lcstr = self.CAV_T_l_c_LK[l][k]
-                    self.CSTR_T_l_c_LK[l].append(self.model.addConstr(lcstr == rcstr, name))
+                    tc.append([l, lcstr == rcstr, name])
                  
-            self.model.update()
-            logging.debug("CSTR_T_l_c_LK:\n %s" %self.CSTR_T_l_c_LK)        
+            self._addConstrsLK(self.CSTR_T_l_c_LK, tc)
+            logging.debug("CSTR_T_l_c_LK:\n %s", self.CSTR_T_l_c_LK)
         
 #-----------------------------------
         
@@ -2296,8 +2100,7 @@ class Solver_MILP:
                     self.CSTR_A_SA_T_SA_1_LK[l].append(self.model.addQConstr(lcstr >= rcstr, name=name))
                     
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_SA_1_LK:\n %s" %self.CSTR_A_SA_T_SA_1_LK)
+        logging.debug("CSTR_A_SA_T_SA_1_LK:\n %s", self.CSTR_A_SA_T_SA_1_LK)
         
     def _createCSTR_A_SA_T_SA_2_LK_hasStandbyMode(self):        
         A_SA_UB = self.EAMS.MASS_AIR_FLOW_SUPPLY_AIR_MAX
@@ -2316,8 +2119,7 @@ class Solver_MILP:
                     rcstr = (A_SA_UB * T_SA) + (T_SA_UB * A_SA) - (A_SA_UB * T_SA_UB)
                     self.CSTR_A_SA_T_SA_2_LK[l].append(self.model.addQConstr(lcstr >= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_SA_2_LK:\n %s" %self.CSTR_A_SA_T_SA_2_LK)
+        logging.debug("CSTR_A_SA_T_SA_2_LK:\n %s", self.CSTR_A_SA_T_SA_2_LK)
         
         
     def _createCSTR_A_SA_T_SA_3_LK_hasStandbyMode(self):
@@ -2343,8 +2145,7 @@ class Solver_MILP:
                     rcstr = (A_SA_LB * T_SA) + (T_SA_UB * A_SA) - (A_SA_LB * T_SA_UB)
                     self.CSTR_A_SA_T_SA_3_LK[l].append(self.model.addQConstr(lcstr <= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_SA_3_LK:\n %s" %self.CSTR_A_SA_T_SA_3_LK)
+        logging.debug("CSTR_A_SA_T_SA_3_LK:\n %s", self.CSTR_A_SA_T_SA_3_LK)
         
     def _createCSTR_A_SA_T_SA_4_LK_hasStandbyMode(self):
         
@@ -2369,8 +2170,7 @@ class Solver_MILP:
                     rcstr = (A_SA_UB * T_SA) + (T_SA_LB * A_SA) - (A_SA_UB * T_SA_LB)
                     self.CSTR_A_SA_T_SA_4_LK[l].append(self.model.addQConstr(lcstr <= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_SA_4_LK:\n %s" %self.CSTR_A_SA_T_SA_4_LK)   
+        logging.debug("CSTR_A_SA_T_SA_4_LK:\n %s", self.CSTR_A_SA_T_SA_4_LK)
 
 #-----------------------------------
         
@@ -2402,8 +2202,7 @@ class Solver_MILP:
                     else:
                         self.CSTR_A_SA_T_SA_1_LK[l].append(self.model.addQConstr(lcstr == 0, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_SA_1_LK:\n %s" %self.CSTR_A_SA_T_SA_1_LK)
+        logging.debug("CSTR_A_SA_T_SA_1_LK:\n %s", self.CSTR_A_SA_T_SA_1_LK)
         
     def _createCSTR_A_SA_T_SA_2_LK_noStandbyMode(self):
         
@@ -2425,8 +2224,7 @@ class Solver_MILP:
                         rcstr = (A_SA_UB * T_SA) + (T_SA_UB * A_SA) - (A_SA_UB * T_SA_UB)
                         self.CSTR_A_SA_T_SA_2_LK[l].append(self.model.addQConstr(lcstr >= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_SA_2_LK:\n %s" %self.CSTR_A_SA_T_SA_2_LK)
+        logging.debug("CSTR_A_SA_T_SA_2_LK:\n %s", self.CSTR_A_SA_T_SA_2_LK)
         
         
     def _createCSTR_A_SA_T_SA_3_LK_noStandbyMode(self):
@@ -2454,8 +2252,7 @@ class Solver_MILP:
                         rcstr = (A_SA_LB * T_SA) + (T_SA_UB * A_SA) - (A_SA_LB * T_SA_UB)
                         self.CSTR_A_SA_T_SA_3_LK[l].append(self.model.addQConstr(lcstr <= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_SA_3_LK:\n %s" %self.CSTR_A_SA_T_SA_3_LK)
+        logging.debug("CSTR_A_SA_T_SA_3_LK:\n %s", self.CSTR_A_SA_T_SA_3_LK)
         
     def _createCSTR_A_SA_T_SA_4_LK_noStandbyMode(self):
         
@@ -2476,8 +2273,7 @@ class Solver_MILP:
                         rcstr = (A_SA_UB * T_SA) + (T_SA_LB * A_SA) - (A_SA_UB * T_SA_LB)
                         self.CSTR_A_SA_T_SA_4_LK[l].append(self.model.addQConstr(lcstr <= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_SA_4_LK:\n %s" %self.CSTR_A_SA_T_SA_4_LK)    
+        logging.debug("CSTR_A_SA_T_SA_4_LK:\n %s", self.CSTR_A_SA_T_SA_4_LK)
         
 #--------------------------------------------------
     def _createCSTR_A_SA_T_z_1_LK_looseboundedT_hasStandbyMode(self):
@@ -2502,8 +2298,7 @@ class Solver_MILP:
                     rcstr = (A_SA_LB * T) + (T_LB * A_SA) - (A_SA_LB * T_LB)
                     self.CSTR_A_SA_T_z_1_LK[l].append(self.model.addQConstr(lcstr >= rcstr, name=name))
                         
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_z_1_LK:\n %s" %self.CSTR_A_SA_T_z_1_LK)
+        logging.debug("CSTR_A_SA_T_z_1_LK:\n %s", self.CSTR_A_SA_T_z_1_LK)
         
     def _createCSTR_A_SA_T_z_2_LK_looseboundedT_hasStandbyMode(self):
         
@@ -2523,8 +2318,7 @@ class Solver_MILP:
                     rcstr = (A_SA_UB * T) + (T_UB * A_SA) - (A_SA_UB * T_UB)
                     self.CSTR_A_SA_T_z_2_LK[l].append(self.model.addQConstr(lcstr >= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_z_2_LK:\n %s" %self.CSTR_A_SA_T_z_2_LK)
+        logging.debug("CSTR_A_SA_T_z_2_LK:\n %s", self.CSTR_A_SA_T_z_2_LK)
         
         
     def _createCSTR_A_SA_T_z_3_LK_looseboundedT_hasStandbyMode(self):
@@ -2551,8 +2345,7 @@ class Solver_MILP:
                     rcstr = (A_SA_LB * T) + (T_UB * A_SA) - (A_SA_LB * T_UB)
                     self.CSTR_A_SA_T_z_3_LK[l].append(self.model.addQConstr(lcstr <= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_z_3_LK:\n %s" %self.CSTR_A_SA_T_z_3_LK)
+        logging.debug("CSTR_A_SA_T_z_3_LK:\n %s", self.CSTR_A_SA_T_z_3_LK)
         
     def _createCSTR_A_SA_T_z_4_LK_looseboundedT_hasStandbyMode(self):
         
@@ -2573,8 +2366,7 @@ class Solver_MILP:
                     self.CSTR_A_SA_T_z_4_LK[l].append(self.model.addQConstr(lcstr <= rcstr, name=name))
                     
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_z_4_LK:\n %s" %self.CSTR_A_SA_T_z_4_LK)
+        logging.debug("CSTR_A_SA_T_z_4_LK:\n %s", self.CSTR_A_SA_T_z_4_LK)
         
         
 #---------------------------------------
@@ -2604,8 +2396,7 @@ class Solver_MILP:
                     else:
                         self.CSTR_A_SA_T_z_1_LK[l].append(self.model.addQConstr(lcstr == 0, name=name))
                         
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_z_1_LK:\n %s" %self.CSTR_A_SA_T_z_1_LK)
+        logging.debug("CSTR_A_SA_T_z_1_LK:\n %s", self.CSTR_A_SA_T_z_1_LK)
         
     def _createCSTR_A_SA_T_z_2_LK_looseboundedT_noStandbyMode(self):
         
@@ -2627,8 +2418,7 @@ class Solver_MILP:
                         rcstr = (A_SA_UB * T) + (T_UB * A_SA) - (A_SA_UB * T_UB)
                         self.CSTR_A_SA_T_z_2_LK[l].append(self.model.addQConstr(lcstr >= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_z_2_LK:\n %s" %self.CSTR_A_SA_T_z_2_LK)
+        logging.debug("CSTR_A_SA_T_z_2_LK:\n %s", self.CSTR_A_SA_T_z_2_LK)
         
         
     def _createCSTR_A_SA_T_z_3_LK_looseboundedT_noStandbyMode(self):
@@ -2655,8 +2445,7 @@ class Solver_MILP:
                         rcstr = (A_SA_LB * T) + (T_UB * A_SA) - (A_SA_LB * T_UB)
                         self.CSTR_A_SA_T_z_3_LK[l].append(self.model.addQConstr(lcstr <= rcstr, name=name))
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_z_3_LK:\n %s" %self.CSTR_A_SA_T_z_3_LK)
+        logging.debug("CSTR_A_SA_T_z_3_LK:\n %s", self.CSTR_A_SA_T_z_3_LK)
         
     def _createCSTR_A_SA_T_z_4_LK_looseboundedT_noStandbyMode(self):
         
@@ -2678,8 +2467,7 @@ class Solver_MILP:
                         self.CSTR_A_SA_T_z_4_LK[l].append(self.model.addQConstr(lcstr <= rcstr, name=name))
                     
                                     
-        self.model.update()
-        logging.debug("CSTR_A_SA_T_z_4_LK:\n %s" %self.CSTR_A_SA_T_z_4_LK)
+        logging.debug("CSTR_A_SA_T_z_4_LK:\n %s", self.CSTR_A_SA_T_z_4_LK)
         
     #===========================================================================
     # Constraints: Energy Consumption
@@ -2687,6 +2475,7 @@ class Solver_MILP:
     def _createCSTR_EnergyConsumption_Fan(self):
         """For each location at each timestep, create a constraint for e_fan(k, l)"""
         
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_E_FAN_LK.append([])
             for k in xrange(self.NUM_SLOT):
@@ -2697,14 +2486,15 @@ class Solver_MILP:
                 cstr = self.EAMS.BETA_FAN_POWER_CONSTANT * self.CDV_A_SA_LK[l][k]
                 
                 e_fan = self.CAV_E_FAN_LK[l][k]
-                self.CSTR_E_FAN_LK[l].append(self.model.addConstr(e_fan==cstr, name))
+                tc.append([l, e_fan==cstr, name])
                 
-        self.model.update()
-        logging.debug("CSTR_E_FAN_LK:\n %s" %self.CSTR_E_FAN_LK)
+        self._addConstrsLK(self.CSTR_E_FAN_LK, tc)
+        logging.debug("CSTR_E_FAN_LK:\n %s", self.CSTR_E_FAN_LK)
         
     def _createCSTR_EnergyConsumption_Conditioning(self):
         """For each location at each timestep, create a constraint for e_conditioning(k, l)"""
         
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_E_CONDITIONING_LK.append([])            
             for k in xrange(self.NUM_SLOT):               
@@ -2713,21 +2503,22 @@ class Solver_MILP:
                 
                 cstr = 0
                 # NOTE: only when OAT > T_CA!!
-                if (float(self.EAMS.OAT.values()[k]) > float(self.EAMS.TEMPERATURE_CONDITIONED_AIR)):            
+                if (self.EAMS.OATV[k] > float(self.EAMS.TEMPERATURE_CONDITIONED_AIR)):            
                     cstr += self.CDV_A_SA_LK[l][k] * (
-                                   ((float)(self.EAMS.AIR_HEAT_CAPACITY_AT_CONSTANT_PRESSURE) * (float)(self.EAMS.OAT.values()[k])) -
+                                   ((float)(self.EAMS.AIR_HEAT_CAPACITY_AT_CONSTANT_PRESSURE) * self.EAMS.OATV[k]) -
                                    ((float)(self.EAMS.AIR_HEAT_CAPACITY_AT_CONSTANT_PRESSURE) * (float)(self.EAMS.TEMPERATURE_CONDITIONED_AIR))
                                    )
 
                 e_conditioning = self.CAV_E_CONDITIONING_LK[l][k]
-                self.CSTR_E_CONDITIONING_LK[l].append(self.model.addConstr(e_conditioning==cstr, name))
+                tc.append([l, e_conditioning==cstr, name])
                 
-        self.model.update()
-        logging.debug("CSTR_E_CONDITIONING_LK:\n %s" %self.CSTR_E_CONDITIONING_LK)
+        self._addConstrsLK(self.CSTR_E_CONDITIONING_LK, tc)
+        logging.debug("CSTR_E_CONDITIONING_LK:\n %s", self.CSTR_E_CONDITIONING_LK)
         
     def _createCSTR_EnergyConsumption_Heating(self):
         """For each location at each timestep, create a constraint for e_heating(k, l)"""
                 
+        tc = []
         for l in xrange(self.NUM_ROOM):
             self.CSTR_E_HEATING_LK.append([])
             for k in xrange(self.NUM_SLOT):
@@ -2746,10 +2537,10 @@ class Solver_MILP:
                          )
                         )
    
-                self.CSTR_E_HEATING_LK[l].append(self.model.addConstr(e_heating==cstr, name)) 
+                tc.append([l, e_heating==cstr, name]) 
                     
-        self.model.update()
-        logging.debug("CSTR_E_HEATING_LK:\n %s" %self.CSTR_E_HEATING_LK)
+        self._addConstrsLK(self.CSTR_E_HEATING_LK, tc)
+        logging.debug("CSTR_E_HEATING_LK:\n %s", self.CSTR_E_HEATING_LK)
                     
         
     #===========================================================================
@@ -2785,6 +2576,8 @@ class Solver_MILP:
         
                  
     def _updMSTR_BDV_x_MLK_MT(self):
+        x = self.solution.getX('BDV_x_MLK').tolist()
+        i = 0
         for m in xrange(self.NUM_MEETING_TYPE):
             if self.SCHE_MODE == 1:
                 dm = self.CURR_DESTROY_MTYPE[m]
@@ -2798,14 +2591,15 @@ class Solver_MILP:
                     dl = l
                 
                 for k in xrange(len(self.BDV_x_MLK[m][l])):
-                    val = self.BDV_x_MLK[m][l][k].x
-                    if val > self.EPSILON:                         
+                    if x[i] > self.EPSILON:                         
                         self.MSTR_BDV_x_MLK[dm][dl][k] = 1
                     else:
                         self.MSTR_BDV_x_MLK[dm][dl][k] = 0
+                    i = i + 1
             
         
     def _updMSTR_BAV_z_LK(self):
+        vals = self.solution.getRows('BAV_z_LK')
         for l in xrange(self.NUM_ROOM):
             if self.SCHE_MODE == 1:
                 dl = self.CURR_DESTROY_LOCATION[l]
@@ -2813,13 +2607,14 @@ class Solver_MILP:
                 dl = l
             
             for k in xrange(self.NUM_SLOT):
-                val = self.BAV_z_LK[l][k].x
+                val = vals[l][k]
                 if val > self.EPSILON:
                     self.MSTR_BAV_z_LK[dl][k] = 1
                 else:
                     self.MSTR_BAV_z_LK[dl][k] = 0
                         
     def _updMSTR_DAV_Attendee_LK(self):
+        vals = self.solution.getRows('DAV_Attendee_LK')
         for l in xrange(self.NUM_ROOM):
             if self.SCHE_MODE == 1:
                 dl = self.CURR_DESTROY_LOCATION[l]
@@ -2827,13 +2622,14 @@ class Solver_MILP:
                 dl = l
             
             for k in xrange(self.NUM_SLOT):
-                val = self.DAV_Attendee_LK[l][k].x
+                val = vals[l][k]
                 if val > self.EPSILON:
-                    self.MSTR_DAV_Attendee_LK[dl][k] = self.DAV_Attendee_LK[l][k].x
+                    self.MSTR_DAV_Attendee_LK[dl][k] = val
                 else:
                     self.MSTR_DAV_Attendee_LK[dl][k] = 0
                         
     def _updMSTR_BDV_w_LK(self):
+        vals = self.solution.getRows('BDV_w_LK')
         for l in xrange(self.NUM_ROOM):
             if self.SCHE_MODE == 1:
                 dl = self.CURR_DESTROY_LOCATION[l]
@@ -2841,13 +2637,14 @@ class Solver_MILP:
                 dl = l
             
             for k in xrange(len(self.BDV_w_LK[l])):    
-                val = self.BDV_w_LK[l][k].x
+                val = vals[l][k]
                 if val > self.EPSILON:
                     self.MSTR_BDV_w_LK[dl][k] = 1
                 else:
                     self.MSTR_BDV_w_LK[dl][k] = 0
             
     def _updMSTR_CDV_T_SA_LK(self):
+        vals = self.solution.getRows('CDV_T_SA_LK')
         for l in xrange(self.NUM_ROOM):
             if self.SCHE_MODE == 1:
                 dl = self.CURR_DESTROY_LOCATION[l]
@@ -2855,9 +2652,10 @@ class Solver_MILP:
                 dl = l
                 
             for k in xrange(self.NUM_SLOT):                
-                self.MSTR_CDV_T_SA_LK[dl][k] = self.CDV_T_SA_LK[l][k].x
+                self.MSTR_CDV_T_SA_LK[dl][k] = vals[l][k]
                 
     def _updMSTR_CDV_A_SA_LK(self):
+        vals = self.solution.getRows('CDV_A_SA_LK')
         for l in xrange(self.NUM_ROOM):
             if self.SCHE_MODE == 1:
                 dl = self.CURR_DESTROY_LOCATION[l]
@@ -2865,9 +2663,10 @@ class Solver_MILP:
                 dl = l
                 
             for k in xrange(self.NUM_SLOT):                
-                self.MSTR_CDV_A_SA_LK[dl][k] = self.CDV_A_SA_LK[l][k].x
+                self.MSTR_CDV_A_SA_LK[dl][k] = vals[l][k]
           
     def _updMSTR_CAV_T_LK(self):
+        vals = self.solution.getRows('CAV_T_LK')
         for l in xrange(self.NUM_ROOM):
             if self.SCHE_MODE == 1:
                 dl = self.CURR_DESTROY_LOCATION[l]
@@ -2875,9 +2674,10 @@ class Solver_MILP:
                 dl = l
                 
             for k in xrange(self.NUM_SLOT):                
-                self.MSTR_CAV_T_LK[dl][k] = self.CAV_T_LK[l][k].x
+                self.MSTR_CAV_T_LK[dl][k] = vals[l][k]
             
     def _updMSTR_CAV_E_FAN_LK(self):
+        vals = self.solution.getRows('CAV_E_FAN_LK')
         for l in xrange(self.NUM_ROOM):
             if self.SCHE_MODE == 1:
                 dl = self.CURR_DESTROY_LOCATION[l]
@@ -2885,9 +2685,10 @@ class Solver_MILP:
                 dl = l
                 
             for k in xrange(self.NUM_SLOT):                
-                self.MSTR_CAV_E_FAN_LK[dl][k] = self.CAV_E_FAN_LK[l][k].x
+                self.MSTR_CAV_E_FAN_LK[dl][k] = vals[l][k]
                             
     def _updMSTR_CAV_E_CONDITIONING_LK(self):
+        vals = self.solution.getRows('CAV_E_CONDITIONING_LK')
         for l in xrange(self.NUM_ROOM):
             if self.SCHE_MODE == 1:
                 dl = self.CURR_DESTROY_LOCATION[l]
@@ -2895,9 +2696,10 @@ class Solver_MILP:
                 dl = l
                 
             for k in xrange(self.NUM_SLOT):                
-                self.MSTR_CAV_E_CONDITIONING_LK[dl][k] = self.CAV_E_CONDITIONING_LK[l][k].x
+                self.MSTR_CAV_E_CONDITIONING_LK[dl][k] = vals[l][k]
                 
     def _updMSTR_CAV_E_HEATING_LK(self):
+        vals = self.solution.getRows('CAV_E_HEATING_LK')
         for l in xrange(self.NUM_ROOM):
             if self.SCHE_MODE == 1:
                 dl = self.CURR_DESTROY_LOCATION[l]
@@ -2905,7 +2707,7 @@ class Solver_MILP:
                 dl = l
                 
             for k in xrange(self.NUM_SLOT):                
-                self.MSTR_CAV_E_HEATING_LK[dl][k] = self.CAV_E_HEATING_LK[l][k].x
+                self.MSTR_CAV_E_HEATING_LK[dl][k] = vals[l][k]
                 
                 
     def getEnergyConsumption(self, locls):
@@ -2973,7 +2775,7 @@ class Solver_MILP:
                 for k in xrange(len(self.MSTR_BDV_x_MLK[m][l])):
                     if self.MSTR_BDV_x_MLK[m][l][k] == 1:
                         [_,fl,fk] = self._getMSTR_BDV_x_MLK([m,l,k])
-                        logging.info("Meeting %d | Location %d [%s] | Start Slot %s [%s]" %(m, fl, self.EAMS.RL[fl], fk, self.EAMS.TS.get(fk)))
+                        logging.info("Meeting %d | Location %d [%s] | Start Slot %s [%s]", m, fl, self.EAMS.RL[fl], fk, self.EAMS.TS.get(fk))
                              
     def _printMSTR_Var_BDV_w_LK_Summary(self):
         if self.MSTR_BDV_w_LK: 
@@ -2983,7 +2785,7 @@ class Solver_MILP:
                 for k in xrange(len(self.MSTR_BDV_w_LK[l])):
                     if self.MSTR_BDV_w_LK[l][k] == 1:
                         [fl,fk] = self._getMSTR_BDV_w_LK([l,k])  
-                        logging.info("Location %d [%s] | Start Slot %s [%s]" %(l, self.EAMS.RL[fl], fk, self.EAMS.TS.get(fk)))                               
+                        logging.info("Location %d [%s] | Start Slot %s [%s]", l, self.EAMS.RL[fl], fk, self.EAMS.TS.get(fk))
 
     def _printMSTR_Var_BAV_z_LK(self):
         logging.info("BAV_z_LK")
@@ -3004,7 +2806,7 @@ class Solver_MILP:
     def _printMSTR_Var_Occupied_RoomTemperature_Summary(self):
         logging.info("Room Temperature when BAV_z_LK=1:")     
         for l in xrange(self.MSTR_NUM_ROOM):
-            logging.info("Location %s" %l)
+            logging.info("Location %s", l)
             res = []
             for k in xrange(self.MSTR_NUM_SLOT):            
                 if self.MSTR_BAV_z_LK[l][k] == 1:
@@ -3021,7 +2823,7 @@ class Solver_MILP:
             self._printMSTR_Var_BDV_x_MLK_MT_Summary()
             logging.info ("=============================================================")
         except (ValueError), e:
-            logging.critical('%s' % (e)) 
+            logging.critical('%s', e)
             
     def logMSTR_HVACResults(self):
         try:
@@ -3034,24 +2836,14 @@ class Solver_MILP:
             logging.info ("=============================================================")
             
         except (ValueError), e:
-            logging.critical('%s' % (e)) 
+            logging.critical('%s', e)
 
             
     def logMSTR_Schedules(self, logcase):
         try:
-            fstr = 'Output/' + logcase + '_schedules'
-            f = open(fstr,'a')   
-            
-            # Log timeslot
-            f.write(",".join(map(str,self.EAMS.TS.values())))            
-            f.write("\n")
-            
-            # Log number of rooms
-            f.write(str(self.MSTR_NUM_ROOM))
-            f.write("\n")
-              
-            # Log room allocation          
-            # TODO: maybe no need loop, just print????  
+            # Room allocation          
+            Z_LK = []
+            W_LK = []
             for r in xrange(self.MSTR_NUM_ROOM):
                 vz = []                      
                 for k in xrange(self.MSTR_NUM_SLOT):
@@ -3063,29 +2855,55 @@ class Solver_MILP:
                     for k in xrange(len(self.MSTR_BDV_w_LK[r])):
                         [_,fk] = self._getMSTR_BDV_w_LK([r,k])                    
                         if fk > vwidx:
-                            vw.extend([str(0)] * (fk-vwidx))
+                            vw.extend([0] * (fk-vwidx))
                             
                         vw.append(self.MSTR_BDV_w_LK[r][k])
                         vwidx = len(vw)
-                                            
-                f.write(",".join(map(str,vz)))
+                Z_LK.append(vz)
+                W_LK.append(vw)
+            
+            if self.LOG_RESULT_NPZ:
+                self._getResult().addSchedules(logcase, self.MSTR_NUM_ROOM, self.MSTR_NUM_SLOT, Z_LK, W_LK)
+                return
+            
+            fstr = 'Output/' + logcase + '_schedules'
+            f = open(fstr,'a')   
+            
+            # Log timeslot
+            f.write(",".join(map(str,self.EAMS.TG.getTimeSlotList())))            
+            f.write("\n")
+            
+            # Log number of rooms
+            f.write(str(self.MSTR_NUM_ROOM))
+            f.write("\n")
+              
+            # Log room allocation          
+            for r in xrange(self.MSTR_NUM_ROOM):
+                f.write(",".join(map(str,Z_LK[r])))
                 f.write("\n")
-                f.write(",".join(map(str,vw)))
+                f.write(",".join(map(str,W_LK[r])))
                 f.write("\n")
                 
             f.close()      
             
         except (ValueError), e:
-            logging.critical('%s' % (e))  
+            logging.critical('%s', e)
         
                             
     def logMSTR_Temperatures(self, logcase):
         try:
+            if self.LOG_RESULT_NPZ:
+                self._getResult().addTemperatures(logcase, self.NUM_ROOM, 
+                                                  [row[:self.NUM_SLOT] for row in self.MSTR_CAV_T_LK[:self.NUM_ROOM]], 
+                                                  [row[:self.NUM_SLOT] for row in self.MSTR_CDV_T_SA_LK[:self.NUM_ROOM]], 
+                                                  [row[:self.NUM_SLOT] for row in self.MSTR_CDV_A_SA_LK[:self.NUM_ROOM]])
+                return
+            
             fstr = 'Output/' + logcase + '_temperatures'
             f = open(fstr,'a')   
             
             # Log timeslot
-            f.write(",".join(map(str,self.EAMS.TS.values())))            
+            f.write(",".join(map(str,self.EAMS.TG.getTimeSlotList())))            
             f.write("\n")
             
             # Log outdoor temperature
@@ -3116,16 +2934,14 @@ class Solver_MILP:
             f.close()      
             
         except (ValueError), e:
-            logging.critical('%s' % (e))  
+            logging.critical('%s', e)
         
         
     #===========================================================================
     # Diagnose Current Partial Schedule
     #=========================================================================== 
     def _getBDV_x_MLK(self, idx):
-        for k,v in self.BDV_x_MLK_Dict.iteritems():
-            if v == idx:
-                return k        
+        return self.BDV_x_MLK_InvDict.get(tuple(idx))
             
     def _getBDV_w_LK(self, idx):
         for k,v in self.BDV_w_LK_Dict.iteritems():
@@ -3157,7 +2973,7 @@ class Solver_MILP:
                     val = self.BDV_x_MLK[m][l][k].x                    
                     if val > self.EPSILON:
                         [_,fl,fk] = self._getBDV_x_MLK([m,l,k])
-                        logging.info("Meeting %d | Location %d [%s] | Start Slot %s [%s]" %(m, fl, self.EAMS.RL[fl], fk, self.EAMS.TS.get(fk)))
+                        logging.info("Meeting %d | Location %d [%s] | Start Slot %s [%s]", m, fl, self.EAMS.RL[fl], fk, self.EAMS.TS.get(fk))
                                  
     def _printVar_BAV_z_LK(self):
         logging.info("BAV_z_LK")
@@ -3185,12 +3001,12 @@ class Solver_MILP:
                     val = self.BDV_w_LK[l][k].x
                     if val > self.EPSILON:
                         [fl,fk] = self._getBDV_w_LK([l,k])  
-                        logging.info("Location %d [%s] | Start Slot %s [%s]" %(l, self.EAMS.RL[fl], fk, self.EAMS.TS.get(fk)))                               
+                        logging.info("Location %d [%s] | Start Slot %s [%s]", l, self.EAMS.RL[fl], fk, self.EAMS.TS.get(fk))
         
     def _printVar_Occupied_RoomTemperature_Summary(self):
         logging.info("Room Temperature when BAV_z_LK=1:")     
         for l in xrange(self.NUM_ROOM):
-            logging.info("Location %s" %l)
+            logging.info("Location %s", l)
             res = []
             for k in xrange(self.NUM_SLOT):            
                 val = self.BAV_z_LK[l][k].x
@@ -3210,7 +3026,7 @@ class Solver_MILP:
             self._printVar_BDV_x_MLK_MT_Summary()
             logging.info ("=============================================================")
         except (ValueError), e:
-            logging.critical('%s' % (e)) 
+            logging.critical('%s', e)
             
     def logHVACResults(self):
         try:
@@ -3225,7 +3041,7 @@ class Solver_MILP:
             self._printVar_Occupied_RoomTemperature_Summary()
             logging.info ("=============================================================")
         except (ValueError), e:
-            logging.critical('%s' % (e)) 
+            logging.critical('%s', e)
             
     def logXW(self, logcase):
         try:            
@@ -3276,7 +3092,7 @@ class Solver_MILP:
             f.close()      
             
         except (ValueError), e:
-            logging.critical('%s' % (e))  
+            logging.critical('%s', e)
         
             
     def logSchedules(self, logcase):
@@ -3284,19 +3100,9 @@ class Solver_MILP:
             if (self.model.getAttr(GRB.attr.SolCount) == 0):
                 raise ValueError("logSchedules skipped. MIP failed to produce a solution.")
             
-#             fstr = 'Output\\' + logcase + '_schedules'
-            fstr = 'Output/' + logcase + '_schedules'
-            f = open(fstr,'a')   
-            
-            # Log timeslot
-            f.write(",".join(map(str,self.EAMS.TS.values())))            
-            f.write("\n")
-            
-            # Log number of rooms
-            f.write(str(self.NUM_ROOM))
-            f.write("\n")
-              
-            # Log room allocation            
+            # Room allocation            
+            Z_LK = []
+            W_LK = []
             for r in xrange(self.NUM_ROOM):
                 vz = []                      
                 for k in xrange(self.NUM_SLOT):    
@@ -3311,24 +3117,44 @@ class Solver_MILP:
                     for k in xrange(len(self.BDV_w_LK[r])):
                         [_,fk] = self._getBDV_w_LK([r,k])                    
                         if fk > vwidx:
-                            vw.extend([str(0)] * (fk-vwidx))
+                            vw.extend([0] * (fk-vwidx))
                             
                         if self.BDV_w_LK[r][k].x > self.EPSILON:
-                            vw.extend(str(1))
+                            vw.append(1)
                         else:
-                            vw.extend(str(0))
+                            vw.append(0)
                                                     
                         vwidx = len(vw)
-                    
-                f.write(",".join(map(str,vz)))
+                Z_LK.append(vz)
+                W_LK.append(vw)
+            
+            if self.LOG_RESULT_NPZ:
+                self._getResult().addSchedules(logcase, self.NUM_ROOM, self.NUM_SLOT, Z_LK, W_LK)
+                return
+            
+#             fstr = 'Output\\' + logcase + '_schedules'
+            fstr = 'Output/' + logcase + '_schedules'
+            f = open(fstr,'a')   
+            
+            # Log timeslot
+            f.write(",".join(map(str,self.EAMS.TG.getTimeSlotList())))            
+            f.write("\n")
+            
+            # Log number of rooms
+            f.write(str(self.NUM_ROOM))
+            f.write("\n")
+              
+            # Log room allocation            
+            for r in xrange(self.NUM_ROOM):
+                f.write(",".join(map(str,Z_LK[r])))
                 f.write("\n")
-                f.write(",".join(map(str,vw)))
+                f.write(",".join(map(str,W_LK[r])))
                 f.write("\n")
                 
             f.close()      
             
         except (ValueError), e:
-            logging.critical('%s' % (e))  
+            logging.critical('%s', e)
             
             
     def logTemperatures(self, logcase):
@@ -3336,11 +3162,18 @@ class Solver_MILP:
             if (self.model.getAttr(GRB.attr.SolCount) == 0):
                 raise ValueError("logTemperatures skipped. MIP failed to produce a solution.")
 
+            if self.LOG_RESULT_NPZ:
+                self._getResult().addTemperatures(logcase, self.NUM_ROOM, 
+                                                  [[self.CAV_T_LK[r][k].x for k in xrange(self.NUM_SLOT)] for r in xrange(self.NUM_ROOM)], 
+                                                  [[self.CDV_T_SA_LK[r][k].x for k in xrange(self.NUM_SLOT)] for r in xrange(self.NUM_ROOM)], 
+                                                  [[self.CDV_A_SA_LK[r][k].x for k in xrange(self.NUM_SLOT)] for r in xrange(self.NUM_ROOM)])
+                return
+            
             fstr = 'Output/' + logcase + '_temperatures'
             f = open(fstr,'a')   
             
             # Log timeslot
-            f.write(",".join(map(str,self.EAMS.TS.values())))            
+            f.write(",".join(map(str,self.EAMS.TG.getTimeSlotList())))            
             f.write("\n")
             
             # Log outdoor temperature
@@ -3371,6 +3204,37 @@ class Solver_MILP:
             f.close()      
             
         except (ValueError), e:
-            logging.critical('%s' % (e))  
+            logging.critical('%s', e)
+    
+    #===========================================================================
+    # Binary Run Result
+    #===========================================================================
+    def _getResult(self):
+        """Result of the run, written to Output/<CASE_CFG>_result.npz by saveResult() (or at exit).
+           The file of a resumed run replaces the one written before the checkpoint.
+           Every snapshot is a delta against the previous one, e.g. the previous master schedule."""
+        if self.result is None:
+            self.result = RunResult('Output/' + self.CASE_CFG + '_result.npz')
+            self.result.setMeta('timeslots', ",".join(map(str,self.EAMS.TG.getTimeSlotList())))
+            self.result.setMeta('oat', ",".join(map(str,self.EAMS.OAT.values())))
+        return self.result
     
+    def saveResult(self):
+        """Write & close the binary run result, only if LOG_RESULT_NPZ is on"""
+        if self.result is not None:
+            self.result.close()
     
+    def logBuildProfile(self, logcase):
+        """Log & write the model build profile to Output/<logcase>_build_profile.json. Only if LOG_BUILD_PROFILE is on."""
+        if self.profiler is None:
+            return
+        
+        self.profiler.logSummary()
+        info = {'case': logcase, 
+                'model': self.model.getAttr(GRB.attr.ModelName), 
+                'reduced_model': self.USE_REDUCED_MODEL,
+                'num_slot': self.NUM_SLOT, 
+                'num_room': self.NUM_ROOM, 
+                'num_meeting': len(self.EAMS.ML), 
+                'num_meeting_type': len(self.EAMS.MTYPE)}
+        self.profiler.writeReport('Output/' + logcase + '_build_profile.json', info)
@@ -0,0 +1,145 @@
+import os
+import json
+import logging
+from time import time
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class BuildProfiler:
+    """Instrument the model builders (methods named _create*) of a solver.
+       Record wall time, number of variables / constraints / nonzeros added and resident memory delta of every call."""
+
+    def __init__(self, solver, prefix='_create'):
+        self.solver = solver
+        self.PREFIX = prefix
+        self.stats = {}             # d[name] = aggregated statistic of builder 'name', see _newStat()
+        self.stack = []             # frames of the builders being executed, innermost last
+
+        self.PAGE_SIZE_KB = 4
+        try:
+            self.PAGE_SIZE_KB = os.sysconf('SC_PAGE_SIZE') / 1024
+        except (AttributeError, ValueError, OSError):
+            pass
+
+    def instrument(self):
+        """Replace every builder of the solver by a profiled one. Nested builders are profiled as well."""
+        for name in dir(self.solver.__class__):
+            if name.startswith(self.PREFIX) and callable(getattr(self.solver, name)):
+                setattr(self.solver, name, self._wrap(name, getattr(self.solver, name)))
+
+    def _wrap(self, name, func):
+        def profiled(*args, **kwargs):
+            self._enter(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._exit(name)
+        profiled.__name__ = name
+        profiled.__doc__ = func.__doc__
+        return profiled
+
+    #===========================================================================
+    # Measurement
+    #===========================================================================
+    def _getRSS(self):
+        """Resident memory of the process in KB (peak RSS if /proc is not available)"""
+        try:
+            f = open('/proc/self/statm', 'r')
+            try:
+                return int(f.read().split()[1]) * self.PAGE_SIZE_KB
+            finally:
+                f.close()
+        except (IOError, ValueError, IndexError):
+            if resource is not None:
+                return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return 0
+
+    def _getModelSize(self):
+        """[#variables, #constraints, #nonzeros] of the current model. Pending modifications are updated first."""
+        model = self.solver.model
+        model.update()
+        return [model.NumVars,
+                model.NumConstrs + model.NumQConstrs,
+                model.NumNZs + model.NumQCNZs]
+
+    def _measure(self):
+        [nvar, ncstr, nnz] = self._getModelSize()
+        return [time(), nvar, ncstr, nnz, self._getRSS()]
+
+    def _enter(self, name):
+        self.stack.append([name, self._measure(), [0.0, 0, 0, 0, 0]])
+
+    def _exit(self, name):
+        end = self._measure()
+        [_, start, child] = self.stack.pop()
+        total = [end[i] - start[i] for i in xrange(len(end))]
+
+        stat = self.stats.get(name)
+        if stat is None:
+            stat = self._newStat(name)
+            self.stats[name] = stat
+        stat['calls'] += 1
+        stat['wall_s'] += total[0]
+        stat['self_wall_s'] += total[0] - child[0]
+        stat['vars'] += total[1] - child[1]
+        stat['constrs'] += total[2] - child[2]
+        stat['nonzeros'] += total[3] - child[3]
+        stat['rss_delta_kb'] += total[4] - child[4]
+
+        # Sizes are reported exclusive of nested builders, charge this call to its caller
+        if self.stack:
+            parent = self.stack[-1][2]
+            for i in xrange(len(total)):
+                parent[i] += total[i]
+
+    def _newStat(self, name):
+        return {'name': name, 'calls': 0, 'wall_s': 0.0, 'self_wall_s': 0.0,
+                'vars': 0, 'constrs': 0, 'nonzeros': 0, 'rss_delta_kb': 0}
+
+    #===========================================================================
+    # Report
+    #===========================================================================
+    def getStats(self):
+        """Builder statistics, most expensive (self wall time) first"""
+        return sorted(self.stats.values(), key=lambda s: s['self_wall_s'], reverse=True)
+
+    def getTotals(self):
+        stats = self.stats.values()
+        return {'calls': sum(s['calls'] for s in stats),
+                'wall_s': sum(s['self_wall_s'] for s in stats),
+                'vars': sum(s['vars'] for s in stats),
+                'constrs': sum(s['constrs'] for s in stats),
+                'nonzeros': sum(s['nonzeros'] for s in stats),
+                'rss_delta_kb': sum(s['rss_delta_kb'] for s in stats)}
+
+    def logSummary(self):
+        totals = self.getTotals()
+        logging.info("===============================================================")
+        logging.info("Model build profile: %d builder calls, %.3f s, %d vars, %d constrs, %d nonzeros"
+                     %(totals['calls'], totals['wall_s'], totals['vars'], totals['constrs'], totals['nonzeros']))
+        logging.info("===============================================================")
+        logging.info("%-60s %6s %10s %10s %10s %10s %12s %10s" %('Builder', 'Calls', 'Self(s)', 'Total(s)', 'Vars', 'Constrs', 'Nonzeros', 'RSS(KB)'))
+        for s in self.getStats():
+            logging.info("%-60s %6d %10.3f %10.3f %10d %10d %12d %10d"
+                         %(s['name'], s['calls'], s['self_wall_s'], s['wall_s'], s['vars'], s['constrs'], s['nonzeros'], s['rss_delta_kb']))
+
+    def writeReport(self, fn, info=None):
+        """Write the profile as a JSON document to fn"""
+        report = {'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                  'info': info or {},
+                  'totals': self.getTotals(),
+                  'builders': self.getStats()}
+        try:
+            f = open(fn, 'w')
+            try:
+                json.dump(report, f, indent=2, sort_keys=True)
+            finally:
+                f.close()
+            logging.info("Model build profile is written to %s" %fn)
+        except (IOError, OSError), e:
+            logging.error("Failed to write model build profile %s. %s" %(fn, e))
@@ -0,0 +1,242 @@
+import os
+import sys
+import atexit
+import logging
+import numpy as np
+
+
+class RunResult:
+    """Per-run binary result container: typed arrays of every snapshot (schedules, temperatures, airflow, energy)
+       in one compressed NPZ file, instead of text appended to Output/<label>_schedules and Output/<label>_temperatures.
+
+       A snapshot is a dict of arrays, identified by its label. An array is stored as a delta against the same array
+       of the reference snapshot (flat indices and values which differ), or in full if there is no reference or its
+       shape / type differs. With auto_ref, every snapshot is the reference of the next one; otherwise the reference
+       is set by markReference(), e.g. whenever a new incumbent is found.
+
+       Entries of the NPZ file:
+           version, labels
+           m_<name>                static arrays, see setMeta()
+           s<i>_<name>             array of snapshot i in full
+           d_<name>.snap/.ref/.len deltas of array name: snapshot, its reference snapshot and number of changed values
+           d_<name>.idx/.val       flat indices and values of all deltas of array name, concatenated
+       See loadRunResult() and writeText()"""
+
+    VERSION = 1
+
+    def __init__(self, fn, auto_ref=1):
+        self.fn = fn
+        self.AUTO_REF = auto_ref
+        self.labels = []            # label of every snapshot
+        self.data = {}              # NPZ entries, except the deltas
+        self.deltas = {}            # d[name] = [snap, ref, len, idx, val] lists of the deltas of array name
+        self.last = {}              # d[name] = array of the last snapshot
+        self.ref = {}               # d[name] = [snapshot index, array] of the reference
+        self.ndelta = 0             # arrays stored as delta
+        self.nfull = 0              # arrays stored in full
+        _results.append(self)
+
+    def setMeta(self, name, arr):
+        self.data['m_' + name] = np.asarray(arr)
+
+    def hasMeta(self, name):
+        return ('m_' + name) in self.data
+
+    def add(self, label, arrays):
+        """Add arrays to snapshot label. A new snapshot is started unless label is the one of the last snapshot."""
+        if not self.labels or self.labels[-1] != label:
+            if self.AUTO_REF:
+                self.markReference()
+            self.labels.append(label)
+            self.last = {}
+        i = len(self.labels) - 1
+
+        for name, arr in arrays.iteritems():
+            arr = np.asarray(arr)
+            key = 's%d_%s' % (i, name)
+            ref = self.ref.get(name)
+            if ref is None or ref[1].shape != arr.shape or ref[1].dtype != arr.dtype:
+                self.data[key] = arr
+                self.nfull = self.nfull + 1
+            else:
+                idx = np.flatnonzero(_differs(arr, ref[1]))
+                delta = self.deltas.setdefault(name, [[], [], [], [], []])
+                delta[0].append(i)
+                delta[1].append(ref[0])
+                delta[2].append(len(idx))
+                delta[3].append(idx.astype(np.int32))
+                delta[4].append(arr.flat[idx])
+                self.ndelta = self.ndelta + 1
+            self.last[name] = arr
+
+    def addSchedules(self, label, num_room, num_slot, Z_LK, W_LK):
+        """Snapshot of logSchedules(): room occupancy Z and standby mode W (0/1) per room. 
+           W is padded with 0 to num_slot, W_LEN is the length of W of every room."""
+        W = np.zeros((len(W_LK), num_slot), dtype=np.int8)
+        W_LEN = np.zeros(len(W_LK), dtype=np.int32)
+        for r in xrange(len(W_LK)):
+            W[r][:len(W_LK[r])] = W_LK[r]
+            W_LEN[r] = len(W_LK[r])
+        self.add(label, {'NUM_ROOM_Z': np.int32(num_room),
+                         'Z': np.array(Z_LK, dtype=np.int8),
+                         'W': W,
+                         'W_LEN': W_LEN})
+        
+    def addTemperatures(self, label, num_room, T_LK, T_SA_LK, A_SA_LK, arrays=None):
+        """Snapshot of logTemperatures(): room temperature T, supply air temperature T_SA and air mass flow rate A_SA per room,
+           and further location x time arrays, e.g. energy components"""
+        snapshot = {'NUM_ROOM_T': np.int32(num_room),
+                    'T': np.array(T_LK, dtype=float),
+                    'T_SA': np.array(T_SA_LK, dtype=float),
+                    'A_SA': np.array(A_SA_LK, dtype=float)}
+        if arrays is not None:
+            snapshot.update(arrays)
+        self.add(label, snapshot)
+    
+    def markReference(self):
+        """Make the arrays of the last snapshot the reference of the next snapshots"""
+        i = len(self.labels) - 1
+        for name, arr in self.last.iteritems():
+            self.ref[name] = [i, arr]
+
+    def save(self):
+        if not self.labels:
+            return
+        try:
+            entries = dict(self.data)
+            entries['version'] = np.int32(self.VERSION)
+            entries['labels'] = np.array(self.labels)
+            for name, [snap, ref, length, idx, val] in self.deltas.iteritems():
+                entries['d_%s.snap' % name] = np.array(snap, dtype=np.int32)
+                entries['d_%s.ref' % name] = np.array(ref, dtype=np.int32)
+                entries['d_%s.len' % name] = np.array(length, dtype=np.int32)
+                entries['d_%s.idx' % name] = np.concatenate(idx)
+                entries['d_%s.val' % name] = np.concatenate(val)
+            tmp = self.fn + '.tmp.npz'
+            np.savez_compressed(tmp, **entries)
+            if os.name == 'nt' and os.path.exists(self.fn):
+                os.remove(self.fn)      # rename does not replace an existing file on Windows
+            os.rename(tmp, self.fn)
+            logging.info("Run result (%d snapshots, %d arrays in full, %d as delta) is written to %s",
+                         len(self.labels), self.nfull, self.ndelta, self.fn)
+        except (IOError, OSError), e:
+            logging.error("Failed to write run result %s. %s" %(self.fn, e))
+
+    def close(self):
+        self.save()
+        if self in _results:
+            _results.remove(self)
+
+
+def _differs(a, b):
+    """Element-wise a != b, NaN equals NaN"""
+    d = (a != b)
+    if a.dtype.kind == 'f':
+        d &= ~(np.isnan(a) & np.isnan(b))
+    return d
+
+
+#===========================================================================
+# Load & Convert
+#===========================================================================
+def loadRunResult(fn):
+    """[meta, snapshots] of a RunResult file. meta: d[name] = array, snapshots: [label, d[name] = array] in order"""
+    npz = np.load(fn)
+    try:
+        if int(npz['version']) != RunResult.VERSION:
+            raise ValueError("Run result %s has version %s, expect %s" %(fn, npz['version'], RunResult.VERSION))
+
+        meta = {}
+        full = {}           # d[i] = [names] stored in full in snapshot i
+        deltas = {}         # d[i] = [[name, ref, idx, val]] of snapshot i
+        for key in npz.files:
+            if key.startswith('m_'):
+                meta[key[2:]] = npz[key]
+            elif key.startswith('s'):
+                [i, name] = key[1:].split('_', 1)
+                full.setdefault(int(i), []).append(name)
+            elif key.startswith('d_') and key.endswith('.snap'):
+                name = key[2:-5]
+                snap = npz[key].tolist()
+                ref = npz['d_%s.ref' % name].tolist()
+                end = np.cumsum(npz['d_%s.len' % name])
+                idx = np.split(npz['d_%s.idx' % name], end[:-1])
+                val = np.split(npz['d_%s.val' % name], end[:-1])
+                for j in xrange(len(snap)):
+                    deltas.setdefault(snap[j], []).append([name, ref[j], idx[j], val[j]])
+
+        snapshots = []
+        for i, label in enumerate(npz['labels'].tolist()):
+            arrays = {}
+            for name in full.get(i, []):
+                arrays[name] = npz['s%d_%s' % (i, name)]
+            for [name, ref, idx, val] in deltas.get(i, []):
+                arr = snapshots[ref][1][name].copy()
+                arr.flat[idx] = val
+                arrays[name] = arr
+            snapshots.append([label, arrays])
+        return [meta, snapshots]
+    finally:
+        npz.close()
+
+def writeText(fn, outdir='Output/'):
+    """Convert a RunResult file back to the text files written by logSchedules() and logTemperatures(),
+       i.e. <outdir><label>_schedules and <outdir><label>_temperatures of every snapshot. Return the number of files written."""
+    [meta, snapshots] = loadRunResult(fn)
+    nfile = 0
+    for [label, arrays] in snapshots:
+        if 'Z' in arrays:
+            f = open(outdir + label + '_schedules', 'a')
+            try:
+                f.write(meta['timeslots'].tolist())
+                f.write("\n")
+                f.write(str(int(arrays['NUM_ROOM_Z'])))
+                f.write("\n")
+                for r in xrange(len(arrays['Z'])):
+                    f.write(",".join(map(str, arrays['Z'][r].tolist())))
+                    f.write("\n")
+                    f.write(",".join(map(str, arrays['W'][r][:arrays['W_LEN'][r]].tolist())))
+                    f.write("\n")
+            finally:
+                f.close()
+            nfile = nfile + 1
+
+        if 'T' in arrays:
+            f = open(outdir + label + '_temperatures', 'a')
+            try:
+                f.write(meta['timeslots'].tolist())
+                f.write("\n")
+                f.write(meta['oat'].tolist())
+                f.write("\n")
+                f.write(str(int(arrays['NUM_ROOM_T'])))
+                f.write("\n")
+                for r in xrange(len(arrays['T'])):
+                    for name in ['T', 'T_SA', 'A_SA']:
+                        f.write(",".join(map(str, arrays[name][r].tolist())))
+                        f.write("\n")
+            finally:
+                f.close()
+            nfile = nfile + 1
+    return nfile
+
+
+#===========================================================================
+# Open Results
+#===========================================================================
+_results = []            # open results, written at exit
+
+def closeRunResults():
+    for r in list(_results):
+        r.close()
+
+atexit.register(closeRunResults)
+
+
+if __name__ == '__main__':
+    # python solver_result.py Output/<case>_result.npz [outdir]
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python solver_result.py <result.npz> [outdir]")
+    outdir = 'Output/'
+    if len(sys.argv) > 2:
+        outdir = sys.argv[2]
+    print "%d text files are written to %s" %(writeText(sys.argv[1], outdir), outdir)
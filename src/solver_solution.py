@@ -0,0 +1,185 @@
+import numpy as np
+
+
+class SolutionSnapshot:
+    """Solution of the solver's model. Values are pulled in bulk, one getAttr('X', ...) per variable family,
+       on first access and cached until the next solve invalidates the snapshot.
+       A solution kept in memory by save() can be served again by restore(), without solving the model."""
+
+    # Wall temperature families, rows of walls which are not modelled are empty
+    WALLS = ['CAV_T_z1_l_LK', 'CAV_T_z2_l_LK', 'CAV_T_z3_l_LK', 'CAV_T_z4_l_LK',
+             'CAV_T_l_z1_LK', 'CAV_T_l_z2_LK', 'CAV_T_l_z3_LK', 'CAV_T_l_z4_LK',
+             'CAV_T_l_f_LK', 'CAV_T_l_c_LK']
+    
+    # Variable families kept by save(), i.e. everything read from the snapshot
+    SAVED = ['BDV_x_MLK', 'BDV_w_LK', 'BAV_z_LK', 'DAV_Attendee_LK',
+             'CAV_T_LK', 'CDV_T_SA_LK', 'CDV_A_SA_LK',
+             'CAV_E_FAN_LK', 'CAV_E_CONDITIONING_LK', 'CAV_E_HEATING_LK'] + WALLS
+
+    def __init__(self, solver):
+        self.solver = solver
+        self.keys_src = None        # BDV_x_MLK which keys_mlk is built for
+        self.keys_mlk = []          # (m,l,k) of BDV_x_MLK, flattened in (m, ml, mk) order
+        self.version = -1           # incremented by invalidate(), i.e. for every solution served
+        self.invalidate()
+
+    def invalidate(self):
+        """Drop all cached values. Called before every optimize()"""
+        self.version = self.version + 1
+        self.X = {}                 # d[name] = numpy array of X of all variables in solver.<name>, flattened in nesting order
+        self.alloc = None
+        self.objval = None          # objective of a restored solution
+        self.restored = False       # True if values are served from restore() rather than the model
+
+    def hasSolution(self):
+        if self.restored:
+            return True
+        return self.solver.model.getAttr('SolCount') > 0
+
+    def getObjVal(self):
+        if self.restored:
+            return self.objval
+        return self.solver.model.getAttr('ObjVal')
+
+    #===========================================================================
+    # Save & Restore
+    #===========================================================================
+    def save(self):
+        """Keep the solution in memory: objective, X of every variable of the model (in model.getVars() order, key '*'),
+           X of the SAVED families and the active assignments. See restore()"""
+        for name in self.SAVED:
+            if getattr(self.solver, name, None) is not None:
+                self.getX(name)
+        self.getAll()
+        self.getAssignments()
+        return {'ObjVal': self.getObjVal(),
+                'X': dict(self.X),
+                'alloc': list(self.alloc)}
+
+    def restore(self, sol):
+        """Serve a solution kept by save() instead of the model's until the next invalidate().
+           Only the SAVED families are restored."""
+        self.invalidate()
+        self.X = dict(sol['X'])
+        self.alloc = list(sol['alloc'])
+        self.objval = sol['ObjVal']
+        self.restored = True
+
+    def _flatten(self, vls):
+        """Flatten a nested (2 or 3 levels) list of variables"""
+        flat = []
+        for row in vls:
+            for col in row:
+                if isinstance(col, list):
+                    flat.extend(col)
+                else:
+                    flat.append(col)
+        return flat
+
+    #===========================================================================
+    # Variable Values
+    #===========================================================================
+    def getX(self, name):
+        """X of all variables in solver.<name>, flattened in nesting order"""
+        x = self.X.get(name)
+        if x is None:
+            flat = self._flatten(getattr(self.solver, name))
+            if len(flat):
+                x = np.array(self.solver.model.getAttr('X', flat), dtype=float)
+            else:
+                x = np.zeros(0)
+            self.X[name] = x
+        return x
+
+    def getAll(self):
+        """X of every variable of the model, in model.getVars() order"""
+        x = self.X.get('*')
+        if x is None:
+            x = np.array(self.solver.model.getAttr('X', self.solver.model.getVars()), dtype=float)
+            self.X['*'] = x
+        return x
+
+    def getRows(self, name):
+        """X of a location x time family solver.<name> as a list (per location) of lists of float. Rows may differ in length."""
+        vls = getattr(self.solver, name)
+        x = self.getX(name).tolist()
+        rows = []
+        i = 0
+        for row in vls:
+            rows.append(x[i:i+len(row)])
+            i = i + len(row)
+        return rows
+
+    def getArrayLK(self, name):
+        """X of a location x time family solver.<name> with equal length rows as a 2D numpy array"""
+        vls = getattr(self.solver, name)
+        if len(vls) == 0:
+            return np.zeros((0, 0))
+        return self.getX(name).reshape(len(vls), -1)
+    
+    def getPaddedLK(self, name, num_slot):
+        """X of a location x time family solver.<name> as a 2D numpy array, NaN for locations without variables (e.g. walls not modelled)"""
+        rows = self.getRows(name)
+        x = np.empty((len(rows), num_slot))
+        x.fill(np.nan)
+        for l in xrange(len(rows)):
+            x[l][:len(rows[l])] = rows[l]
+        return x
+
+    #===========================================================================
+    # Schedule & HVAC
+    #===========================================================================
+    def _getKeysMLK(self):
+        """(m,l,k) of every BDV_x_MLK in flattened order. Rebuilt only when the schedule model is rebuilt."""
+        vls = self.solver.BDV_x_MLK
+        if self.keys_src is not vls or len(self.keys_mlk) != len(self.getX('BDV_x_MLK')):
+            inv = self.solver.BDV_x_MLK_InvDict
+            keys = []
+            for m in xrange(len(vls)):
+                for ml in xrange(len(vls[m])):
+                    for mk in xrange(len(vls[m][ml])):
+                        keys.append(inv[(m, ml, mk)])
+            self.keys_src = vls
+            self.keys_mlk = keys
+        return self.keys_mlk
+
+    def getAssignments(self):
+        """Active assignments [m,l,k], i.e. BDV_x_MLK = 1, in BDV_x_MLK order"""
+        if self.alloc is None:
+            keys = self._getKeysMLK()
+            active = np.flatnonzero(self.getX('BDV_x_MLK') > self.solver.EPSILON).tolist()
+            self.alloc = [keys[i] for i in active]
+        return [list(key) for key in self.alloc]
+
+    def _getDistinct(self, idx):
+        """Distinct idx-th element of the active assignments, in order of first occurrence"""
+        self.getAssignments()
+        seen = set()
+        res = []
+        for key in self.alloc:
+            if key[idx] not in seen:
+                seen.add(key[idx])
+                res.append(key[idx])
+        return res
+    
+    def getOccupiedLocations(self):
+        """Locations of the active assignments, in order of first occurrence"""
+        return self._getDistinct(1)
+
+    def getOccupiedSlots(self):
+        """Starting time slots of the active assignments, in order of first occurrence"""
+        return self._getDistinct(2)
+
+    def getRoomOccupancy(self):
+        """Location x time 0/1 array of BAV_z_LK"""
+        return (self.getArrayLK('BAV_z_LK') > self.solver.EPSILON).astype(int)
+
+    def getRoomTemperature(self):
+        """Location x time array of room temperature CAV_T_LK"""
+        return self.getArrayLK('CAV_T_LK')
+    
+    def getEnergyLK(self):
+        """Location x time array of HVAC power, fan + conditioning + heating (CAV_E_*_LK)"""
+        return (self.getArrayLK('CAV_E_FAN_LK') + 
+                self.getArrayLK('CAV_E_CONDITIONING_LK') + 
+                self.getArrayLK('CAV_E_HEATING_LK'))
@@ -0,0 +1,148 @@
+import atexit
+import logging
+import threading
+from time import time
+
+
+class TraceWriter:
+    """Append lines to a text file without blocking the solver. Lines are buffered in memory and written
+       by a background thread once MAX_LINES are pending or FLUSH_SEC has passed, and by flush() / close().
+       Lines are written in the order they are passed to write()."""
+
+    def __init__(self, fn, max_lines=256, flush_sec=1.0):
+        self.fn = fn
+        self.MAX_LINES = max_lines      # pending lines which trigger a write
+        self.FLUSH_SEC = flush_sec      # max. time a line is kept in memory
+        self.pending = []
+        self.closed = False
+        self.nlines = 0                 # lines written so far
+        self.nwrites = 0                # file writes so far
+
+        self.cond = threading.Condition()   # guards pending & closed
+        self.io_lock = threading.Lock()     # one writer at a time, keeps the lines in order
+        self.thread = threading.Thread(target=self._run, name='TraceWriter ' + fn)
+        self.thread.daemon = True
+        self.thread.start()
+        _writers.append(self)
+
+    def write(self, data, sep=','):
+        """Queue one line, the fields of data joined by sep"""
+        line = sep.join(map(str, data))
+        self.cond.acquire()
+        try:
+            closed = self.closed
+            if not closed:
+                self.pending.append(line)
+                if len(self.pending) >= self.MAX_LINES:
+                    self.cond.notify()
+        finally:
+            self.cond.release()
+        # Late lines, e.g. from a callback after close(), are written directly
+        if closed:
+            self.io_lock.acquire()
+            try:
+                self._writeLines([line])
+            finally:
+                self.io_lock.release()
+
+    def flush(self):
+        """Write all pending lines now"""
+        self.io_lock.acquire()
+        try:
+            self.cond.acquire()
+            try:
+                lines = self.pending
+                self.pending = []
+            finally:
+                self.cond.release()
+            self._writeLines(lines)
+        finally:
+            self.io_lock.release()
+
+    def close(self):
+        """Stop the background thread and write all pending lines"""
+        self.cond.acquire()
+        try:
+            if self.closed:
+                return
+            self.closed = True
+            self.cond.notify()
+        finally:
+            self.cond.release()
+        self.thread.join()
+        self.flush()
+        if self in _writers:
+            _writers.remove(self)
+        logging.debug("TraceWriter %s: %d lines in %d writes", self.fn, self.nlines, self.nwrites)
+
+    def _run(self):
+        while True:
+            self.cond.acquire()
+            try:
+                deadline = time() + self.FLUSH_SEC
+                while not self.closed and len(self.pending) < self.MAX_LINES:
+                    remaining = deadline - time()
+                    if remaining <= 0:
+                        break
+                    self.cond.wait(remaining)
+                closed = self.closed
+            finally:
+                self.cond.release()
+            if closed:
+                break
+            self.flush()
+
+    def _writeLines(self, lines):
+        if not lines:
+            return
+        try:
+            f = open(self.fn, 'a')
+            try:
+                f.write("\n".join(lines))
+                f.write("\n")
+            finally:
+                f.close()
+            self.nlines = self.nlines + len(lines)
+            self.nwrites = self.nwrites + 1
+        except (IOError, OSError), e:
+            logging.critical("Failed to write %d lines to %s. %s" %(len(lines), self.fn, e))
+
+
+class LNS_Trace(TraceWriter):
+    """LNS trace, one record per LNS run. The first 3 fields [logtime, objvalue, nt] are read by plot_LNS"""
+
+    def record(self, logtime, objvalue, nt, runidx=-1, ndestroy=0, runtime=0.0, status=-1):
+        """nt: neighbourhood type (-1: initial solution, +10: all options are tabu-ed), ndestroy: #meeting destroyed,
+           runtime: sub-MIP time in sec, status: Gurobi status of the sub-MIP (-1: not solved)"""
+        self.write([logtime, objvalue, nt, runidx, ndestroy, runtime, status])
+
+    def stats(self, data):
+        """Summary of the LNS run, see Solver_LNS._log_LNS_stats()"""
+        self.write(data, " # ")
+
+
+#===========================================================================
+# Shared Writers
+#===========================================================================
+_writers = []            # open writers, closed at exit
+_shared = {}             # d[fn] = TraceWriter shared by getTraceWriter()
+_shared_lock = threading.Lock()
+
+def getTraceWriter(fn):
+    """TraceWriter of fn shared by all callers, e.g. Gurobi callbacks"""
+    _shared_lock.acquire()
+    try:
+        w = _shared.get(fn)
+        if w is None or w.closed:
+            w = TraceWriter(fn)
+            _shared[fn] = w
+        return w
+    finally:
+        _shared_lock.release()
+
+def closeTraceWriters():
+    """Write pending lines of every open writer"""
+    for w in list(_writers):
+        w.close()
+
+atexit.register(closeTraceWriters)